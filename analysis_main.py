@@ -65,7 +65,7 @@ import pandas as pd
 from typing import Dict, Any
 
 # 분할된 모듈 임포트
-from analysis_utils import check_initial_validity, setup_filtering_ui
+from analysis_utils import check_initial_validity, setup_filtering_ui, get_filter_index
 from aggregation_logic import aggregate_and_display_summary
 from detail_display import display_detail_section
 from df_search import display_df_search
@@ -91,10 +91,13 @@ def display_analysis_result(analysis_key: str, file_name: str, props: Dict[str,
     selected_jig, start_date, end_date, df_filtered = setup_filtering_ui(analysis_key, df_raw, all_dates, props)
     
     # Jig 필터링을 위한 리스트 (aggregation_logic과 detail_display에서 사용)
-    jigs_to_display = [selected_jig] if selected_jig != "전체" else sorted(df_raw[props['jig_col']].dropna().unique().tolist())
+    jigs_to_display = [selected_jig] if selected_jig != "전체" else get_filter_index(analysis_key, df_raw, props)['jig_list']
     
     # 세션 상태에 필터링된 DF 저장 (테이블/차트 생성을 위해 사용)
+    # df_filtered는 캐싱된 인덱스(df_sorted)의 슬라이스이므로, 세션에는 선택 구간만 복사해 독립된 프레임으로 저장합니다.
     st.session_state[f'filtered_df_{analysis_key}'] = df_filtered.copy()
+    # 요약 큐브 슬라이스(요약 테이블/차트)에 사용할 필터 조건 저장
+    st.session_state[f'filter_selection_{analysis_key}'] = {'jigs': jigs_to_display, 'start': start_date, 'end': end_date}
     
     # --- 최종 상태 확인 및 테이블 생성 플래그 설정 ---
     if df_filtered.empty:
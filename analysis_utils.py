@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, date
 from typing import Dict, Any, Tuple, List, Optional
 
+from data_token import get_data_token
+
 def check_initial_validity(analysis_key: str, props: Dict[str, str]) -> Optional[str]:
     """분석 시작 전 세션 상태의 필수 데이터 존재 여부를 확인합니다."""
     if st.session_state.analysis_results.get(analysis_key) is None:
@@ -28,16 +31,100 @@ def check_initial_validity(analysis_key: str, props: Dict[str, str]) -> Optional
         
     return None
 
+def build_filter_index(df_raw: pd.DataFrame, props: Dict[str, str]) -> Dict[str, Any]:
+    """
+    데이터셋 1개당 한 번만 계산하는 필터 인덱스를 생성합니다.
+    - df_sorted: 날짜 순(안정 정렬)으로 재배열한 원본 (날짜 변환 실패 행 제외)
+    - date_days: df_sorted 각 행의 날짜 (epoch 기준 일수, 오름차순)
+    - jig_rows: Jig → df_sorted 내 행 위치 배열 (오름차순)
+    - jig_list: 정렬된 Jig 목록
+    """
+    timestamp_col = props['timestamp_col']
+    jig_col = props['jig_col']
+
+    ts = pd.to_datetime(df_raw[timestamp_col], errors='coerce')
+    valid_pos = np.flatnonzero(ts.notna().to_numpy())
+    days = ts.to_numpy()[valid_pos].astype('datetime64[D]').astype(np.int64)
+
+    order = np.argsort(days, kind='stable')
+    sorted_pos = valid_pos[order]
+    df_sorted = df_raw.iloc[sorted_pos]
+    date_days = days[order]
+
+    jig_rows = {}
+    jig_list = []
+    if jig_col in df_sorted.columns:
+        jig_values = df_sorted[jig_col]
+        not_na = jig_values.notna().to_numpy()
+        codes, uniques = pd.factorize(jig_values, sort=True)
+        row_positions = np.arange(len(df_sorted))
+        for code, jig in enumerate(uniques):
+            jig_rows[jig] = row_positions[(codes == code) & not_na]
+        # 날짜 변환 실패 행의 Jig도 목록에는 표시합니다 (기존 UI 동작 유지).
+        jig_list = sorted(df_raw[jig_col].dropna().unique().tolist())
+
+    return {
+        'df_sorted': df_sorted,
+        'date_days': date_days,
+        'jig_rows': jig_rows,
+        'jig_list': jig_list,
+    }
+
+def get_filter_index(analysis_key: str, df_raw: pd.DataFrame, props: Dict[str, str]) -> Dict[str, Any]:
+    """세션 상태에 캐싱된 필터 인덱스를 반환합니다. 데이터 토큰이 바뀌면(새 업로드/분석) 다시 생성합니다."""
+    state_key = f'filter_index_{analysis_key}'
+    cached = st.session_state.get(state_key)
+    token = (get_data_token(analysis_key), props['jig_col'], props['timestamp_col'])
+
+    if cached is None or cached.get('token') != token:
+        cached = build_filter_index(df_raw, props)
+        cached['token'] = token
+        st.session_state[state_key] = cached
+    return cached
+
+def _date_to_days(d: date) -> int:
+    return int(np.datetime64(d, 'D').astype(np.int64))
+
+def apply_filter_index(filter_index: Dict[str, Any], start_date: date, end_date: date, selected_jig: str) -> pd.DataFrame:
+    """
+    날짜 범위는 searchsorted, Jig는 행 위치 배열의 구간 검색으로 필터링합니다.
+    Jig가 '전체'이면 df_sorted의 연속 구간(슬라이스)을 그대로 반환합니다.
+    """
+    df_sorted = filter_index['df_sorted']
+    date_days = filter_index['date_days']
+
+    lo = int(np.searchsorted(date_days, _date_to_days(start_date), side='left'))
+    hi = int(np.searchsorted(date_days, _date_to_days(end_date), side='right'))
+
+    if selected_jig == "전체":
+        return df_sorted.iloc[lo:hi]
+
+    jig_positions = filter_index['jig_rows'].get(selected_jig)
+    if jig_positions is None:
+        return df_sorted.iloc[0:0]
+
+    # jig_positions는 정렬되어 있으므로 [lo, hi) 구간에 속하는 위치만 잘라냅니다.
+    a = np.searchsorted(jig_positions, lo, side='left')
+    b = np.searchsorted(jig_positions, hi, side='left')
+    return df_sorted.iloc[jig_positions[a:b]]
+
 def setup_filtering_ui(analysis_key: str, df_raw: pd.DataFrame, all_dates: List[date], props: Dict[str, str]) -> Tuple[str, date, date, pd.DataFrame]:
     """
     기본 필터링 UI를 설정하고 사용자의 선택 및 필터링된 DF를 반환합니다.
+    날짜 변환/Jig 목록 계산은 get_filter_index에서 데이터셋당 한 번만 수행됩니다.
     """
     st.subheader("기본 필터링") 
     
     filter_col1, filter_col2, filter_col3 = st.columns(3)
+
+    try:
+        filter_index = get_filter_index(analysis_key, df_raw, props)
+    except Exception as e:
+        st.error(f"필터 목록을 만드는 중 오류가 발생했습니다. 날짜/Jig 컬럼 형식을 확인해주세요. ({e})")
+        filter_index = None
     
     with filter_col1:
-        jig_list = sorted(df_raw[props['jig_col']].dropna().unique().tolist()) if props['jig_col'] in df_raw.columns else []
+        jig_list = filter_index['jig_list'] if filter_index is not None else []
         selected_jig = st.selectbox("PC(Jig) 선택", ["전체"] + jig_list, key=f"jig_select_{analysis_key}") 
     
     min_date = min(all_dates)
@@ -52,33 +139,15 @@ def setup_filtering_ui(analysis_key: str, df_raw: pd.DataFrame, all_dates: List[
         st.error("시작 날짜는 종료 날짜보다 이전이어야 합니다.")
         # 오류 발생 시 빈 DataFrame 반환
         return selected_jig, min_date, max_date, pd.DataFrame()
+
+    if filter_index is None:
+        return selected_jig, start_date, end_date, pd.DataFrame()
         
-    # === 핵심 로직: 실제 필터링 재활성화 및 안전한 날짜 변환 ===
-    df_filtered = df_raw.copy()
-    timestamp_col = props['timestamp_col']
-    
+    # === 핵심 로직: 캐싱된 인덱스 기반 필터링 (전체 프레임 복사 없음) ===
     try:
-        # 날짜 컬럼을 강제 변환 후 필터링을 시도합니다.
-        df_temp = df_filtered.copy()
-        df_temp['__DATE_TEMP__'] = pd.to_datetime(df_temp[timestamp_col], errors='coerce').dt.date
-        df_temp = df_temp.dropna(subset=['__DATE_TEMP__']) 
-
-        # 1. 날짜 필터링
-        df_filtered = df_temp[
-            (df_temp['__DATE_TEMP__'] >= start_date) & 
-            (df_temp['__DATE_TEMP__'] <= end_date)
-        ].copy()
-        
-        # 2. Jig 필터링
-        if selected_jig != "전체" and not df_filtered.empty:
-            df_filtered = df_filtered[df_filtered[props['jig_col']] == selected_jig].copy()
-            
-        # 임시 컬럼 제거 및 최종 반환
-        if '__DATE_TEMP__' in df_filtered.columns:
-            df_filtered = df_filtered.drop(columns=['__DATE_TEMP__'])
-
+        df_filtered = apply_filter_index(filter_index, start_date, end_date, selected_jig)
     except Exception as e:
-        st.error(f"DEBUG ERROR: 필터링 중 심각한 오류 발생. 분석 함수 확인 필요. ({e})")
+        st.error(f"필터를 적용하는 중 오류가 발생했습니다. 날짜/Jig 선택을 확인해주세요. ({e})")
         df_filtered = pd.DataFrame() # 오류 시 빈 DF 반환
 
-    return selected_jig, start_date, end_date, df_filtered
\ No newline at end of file
+    return selected_jig, start_date, end_date, df_filtered
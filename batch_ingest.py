@@ -0,0 +1,207 @@
+# batch_ingest.py
+# 야간 배치: 디렉터리의 DB 적재용 CSV를 병렬로 파싱하여 DB에 적재하고,
+# Parquet 미러와 품목 × 일자별 리포트(quality_core.reports)를 갱신합니다.
+#
+#   python batch_ingest.py --input-dir ./exports
+#   python batch_ingest.py --input-dir ./exports --workers 4 --db ./product_quality_db_final_stable-74.db
+#   python batch_ingest.py --rebuild-reports          # 적재 없이 전체 일자 리포트만 다시 계산
+#   python batch_ingest.py --input-dir ./exports --publish mysql://user:pw@db-host/quality   # 적재 후 서버 DB에 게시
+#
+# - 파싱(청크 읽기 + prepare_chunk)은 워커 프로세스에서, SQLite 쓰기는 메인 프로세스 하나에서 수행합니다.
+# - 파일 내용 해시로 T_INGEST_LOG에 청크 단위 적재 이력을 남기므로, 같은 파일은 다시 실행해도 건너뜁니다.
+# - Spec(Min/Max) 조합은 이번 배치의 전체 파일에서 모아 마지막에 REPLACE 저장합니다.
+# - --publish가 주어지면 적재가 끝난 SQLite의 앱 조회 테이블을 서버 저장소로 복사합니다. (storage.copy_tables)
+
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Set
+
+from config import DB_FILE_NAME
+from db_ingest import (
+    INGEST_CHUNK_ROWS, catch_up_mirror, clear_ingest_log, collect_item_days, compute_source_key, create_initial_db_schema, flush_spc_stats,
+    flush_traceability, format_stats_log, load_done_chunks, merge_spec_rows, parse_csv_file, save_prepared_chunk, save_spec_rows
+)
+from parquet_mirror import PARQUET_MIRROR_DIR
+from quality_core.reports import REPORT_DIR, ITEM_TABLES, list_item_days, refresh_reports
+from storage import copy_tables, open_storage
+
+
+def find_csv_files(input_dir: str, pattern: str) -> List[str]:
+    return sorted(p for p in glob.glob(os.path.join(input_dir, pattern)) if os.path.isfile(p))
+
+
+def ingest_files(paths: List[str], db_file_name: str, workers: int = 1, chunk_rows: int = INGEST_CHUNK_ROWS,
+                 mirror_dir: str = None, merge_specs: bool = False, log=print) -> Dict[str, object]:
+    """
+    CSV 파일들을 적재합니다. 반환: {'success', 'stats', 'files', 'days_by_item', 'log'}
+    files: [{'path', 'rows', 'chunks', 'skipped_chunks', 'error'}]
+    merge_specs=True 이면 Spec 테이블을 교체하지 않고 신규 조합만 추가합니다. (다른 경로와 함께 증분 적재할 때)
+    """
+    log_messages: List[str] = []
+    stats: Dict[str, int] = {}
+    files = []
+    days_by_item: Dict[str, Set[str]] = {}
+    pcb_specs, semi_specs = [], []
+
+    conn = sqlite3.connect(db_file_name)
+    try:
+        cursor = conn.cursor()
+        create_initial_db_schema(cursor, conn)
+        cursor.execute("PRAGMA foreign_keys = ON;")
+
+        # 파일별 재개 키와 완료 청크 (메인 프로세스에서 읽어 워커에 전달)
+        jobs = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                source_key = compute_source_key(f, chunk_rows)
+            jobs.append((path, source_key, load_done_chunks(conn, source_key)))
+
+        if mirror_dir:
+            catch_up_mirror(conn, mirror_dir, stats, log_messages)
+
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            # 워커가 파싱하는 동안 메인 프로세스는 완료된 파일을 순서대로 DB에 씁니다.
+            # 한 번에 workers + 1개 파일만 제출하여 파싱 결과가 메모리에 쌓이지 않도록 합니다.
+            pending = []
+            job_iter = iter(jobs)
+
+            def submit_next():
+                job = next(job_iter, None)
+                if job is None:
+                    return
+                path, source_key, done = job
+                if pool:
+                    pending.append((job, pool.submit(parse_csv_file, path, chunk_rows, done)))
+                else:
+                    pending.append((job, None))
+
+            for _ in range((workers + 1) if pool else 1):
+                submit_next()
+
+            while pending:
+                (path, source_key, done), future = pending.pop(0)
+                submit_next()
+                file_result = {'path': path, 'rows': 0, 'chunks': 0, 'skipped_chunks': len(done), 'error': None}
+                started = time.perf_counter()
+                try:
+                    parsed = future.result() if future else parse_csv_file(path, chunk_rows, done)
+                    file_result.update(rows=parsed['rows'], chunks=parsed['n_chunks'])
+                    pcb_specs.extend(parsed['pcb_specs'])
+                    semi_specs.extend(parsed['semi_specs'])
+                    for chunk_no, df_chunk in parsed['chunks']:
+                        save_prepared_chunk(conn, df_chunk, chunk_no, stats, log_messages, source_key, mirror_dir)
+                        collect_item_days(df_chunk, days_by_item)
+                    del parsed
+                except Exception as e:
+                    conn.rollback()
+                    file_result['error'] = str(e)
+                files.append(file_result)
+                status = f"오류: {file_result['error']}" if file_result['error'] else \
+                    f"{file_result['rows']:,}행 / {file_result['chunks']}청크 (건너뜀 {file_result['skipped_chunks']})"
+                log(f"[{len(files)}/{len(jobs)}] {os.path.basename(path)}: {status} - {time.perf_counter() - started:.1f}s")
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+
+        log_messages.extend(format_stats_log(stats))
+        # 이번 배치에서 Spec이 하나도 없으면 기존 Spec 테이블을 유지합니다.
+        save_specs = merge_spec_rows if merge_specs else save_spec_rows
+        for spec_rows, spec_table, stat_key in ((pcb_specs, 'T_SPEC_PCB', 'spec_pcb'), (semi_specs, 'T_SPEC_SEMI', 'spec_semi')):
+            if spec_rows:
+                result = save_specs(spec_rows, spec_table, conn)
+                stats[stat_key] = result['count']
+                log_messages.append(result['message'])
+        conn.commit()
+        flush_traceability(conn, log_messages)
+        flush_spc_stats(conn, log_messages)
+        # 끝까지 적재된 파일은 재개 이력을 지웁니다. (다시 적재하면 처음부터 읽음)
+        for (path, source_key, _), file_result in zip(jobs, files):
+            if not file_result['error']:
+                clear_ingest_log(conn, source_key)
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        'success': not any(f['error'] for f in files),
+        'stats': stats,
+        'files': files,
+        'days_by_item': days_by_item,
+        'log': '\n'.join(log_messages),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="TM2360E 품질 DB 배치 적재 및 리포트 사전 계산")
+    parser.add_argument('--input-dir', help="DB 적재용 CSV가 있는 디렉터리")
+    parser.add_argument('--pattern', default='*.csv', help="입력 파일 glob 패턴 (기본: *.csv)")
+    parser.add_argument('--db', default=DB_FILE_NAME, help=f"대상 SQLite DB (기본: {DB_FILE_NAME})")
+    parser.add_argument('--workers', type=int, default=max(1, min(4, (os.cpu_count() or 2) - 1)), help="파싱/리포트 워커 프로세스 수")
+    parser.add_argument('--chunk-rows', type=int, default=INGEST_CHUNK_ROWS)
+    parser.add_argument('--mirror-dir', default=PARQUET_MIRROR_DIR, help="Parquet 미러 디렉터리")
+    parser.add_argument('--no-mirror', action='store_true', help="Parquet 미러를 갱신하지 않음")
+    parser.add_argument('--report-dir', default=REPORT_DIR, help="일자별 리포트 출력 디렉터리")
+    parser.add_argument('--no-reports', action='store_true', help="리포트를 계산하지 않음")
+    parser.add_argument('--rebuild-reports', action='store_true', help="적재된 전체 일자의 리포트를 다시 계산")
+    parser.add_argument('--publish', default=None, help="적재 후 조회 테이블을 복사할 서버 저장소 (mysql://사용자:비밀번호@호스트:포트/DB)")
+    args = parser.parse_args(argv)
+
+    if not args.input_dir and not args.rebuild_reports:
+        parser.error("--input-dir 또는 --rebuild-reports 가 필요합니다.")
+
+    exit_code = 0
+    days_by_item: Dict[str, Set[str]] = {}
+
+    if args.input_dir:
+        paths = find_csv_files(args.input_dir, args.pattern)
+        print(f"=== 적재: {len(paths)}개 파일 → {args.db} (워커 {args.workers}) ===", flush=True)
+        started = time.perf_counter()
+        result = ingest_files(paths, args.db, workers=args.workers, chunk_rows=args.chunk_rows,
+                              mirror_dir=None if args.no_mirror else args.mirror_dir,
+                              log=lambda message: print(message, flush=True))
+        print(result['log'])
+        print(f"적재 완료: {time.perf_counter() - started:.1f}s", flush=True)
+        days_by_item = result['days_by_item']
+        if not result['success']:
+            exit_code = 1
+
+    if args.rebuild_reports:
+        conn = sqlite3.connect(args.db)
+        try:
+            days_by_item = {item_key: set(list_item_days(conn, item_key)) for item_key in ITEM_TABLES}
+        finally:
+            conn.close()
+
+    if not args.no_reports and any(days_by_item.values()):
+        total = sum(len(days) for days in days_by_item.values())
+        print(f"\n=== 리포트 계산: {total}개 (품목 × 일자) → {args.report_dir} ===", flush=True)
+        started = time.perf_counter()
+        report_result = refresh_reports(args.db, days_by_item, args.report_dir, workers=args.workers)
+        print(f"리포트 {report_result['written']}개 저장: {time.perf_counter() - started:.1f}s")
+        for item_key, day, message in report_result['errors']:
+            print(f"⚠️ 리포트 실패 {item_key} {day}: {message}")
+        if report_result['errors']:
+            exit_code = 1
+
+    if args.publish:
+        target = open_storage(args.publish)
+        print(f"\n=== 게시: {args.db} → {target.name} ===", flush=True)
+        started = time.perf_counter()
+        publish_result = copy_tables(args.db, target, log=lambda message: print(message, flush=True))
+        target.close()
+        if not publish_result['success']:
+            print(publish_result['log'].splitlines()[-1])
+            exit_code = 1
+        print(f"게시 완료: {sum(publish_result['stats'].values()):,}행 / {time.perf_counter() - started:.1f}s")
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
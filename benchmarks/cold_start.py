@@ -0,0 +1,117 @@
+# benchmarks/cold_start.py
+# Streamlit 앱 콜드 스타트 측정: 새 Python 프로세스에서 streamlit_app.py를 처음 실행하여 사이드바가 그려질 때까지의 시간.
+# 이미 import된 모듈이 없는 상태여야 하므로 매번 자식 프로세스를 띄우고, 자식은 AppTest(headless)로 앱을 1회 실행합니다.
+#
+#   python -m benchmarks.cold_start --db ./product_quality_db_final_stable-74.db --repeat 5 --budget 1.0
+#
+# sidebar_s         : 스크립트 실행 시작 → 사이드바 렌더 완료 (lazy_imports.mark_startup('sidebar'))
+#                     `streamlit run` 서버는 streamlit을 미리 import해 두므로, 워커의 첫 실행과 같은 조건입니다. (목표 비교 대상)
+# first_run_s       : 스크립트 실행 시작 → 첫 화면 전체 렌더 완료 (탭 내용 포함)
+# process_sidebar_s : 프로세스 기동(인터프리터 + streamlit import 포함) → 사이드바 렌더 완료 (참고용)
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, 'streamlit_app.py')
+
+# 사이드바까지의 콜드 스타트 목표 (초)
+COLD_START_BUDGET_S = 1.0
+
+
+def _child(app_path: str) -> None:
+    """(자식 프로세스) 앱을 1회 실행하고 측정값을 JSON 한 줄로 출력합니다. 작업 디렉터리에 DB가 있어야 합니다."""
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(app_path, default_timeout=120)
+    # 프로세스 간 비교는 벽시계(time.time) 기준, 구간 길이는 perf_counter 기준으로 잽니다.
+    run_wall, run_started = time.time(), time.perf_counter()
+    app.run()
+    finished = time.perf_counter()
+
+    import lazy_imports
+    sidebar = lazy_imports.STARTUP_MARKS.get('sidebar')
+    print(json.dumps({
+        'run_started_at': run_wall,
+        'sidebar_s': None if sidebar is None else round(sidebar - run_started, 6),
+        'first_run_s': round(finished - run_started, 6),
+        'exception': [str(e.value) for e in app.exception],
+        'import_times': lazy_imports.import_times(),
+    }, ensure_ascii=False))
+
+
+def measure_cold_start(db_path: str, app_path: str = APP_PATH) -> Dict[str, Any]:
+    """
+    새 프로세스에서 앱을 1회 실행한 콜드 스타트 측정값.
+    db_path는 임시 디렉터리에 앱의 DB 파일 이름으로 복사하여 사용합니다. (원본은 변경하지 않습니다)
+    반환: {'sidebar_s', 'first_run_s', 'process_sidebar_s', 'import_times'}
+    """
+    from config import DB_FILE_NAME
+
+    with tempfile.TemporaryDirectory(prefix='cold_start_') as work_dir:
+        shutil.copyfile(db_path, os.path.join(work_dir, os.path.basename(DB_FILE_NAME)))
+        spawned_at = time.time()
+        completed = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.cold_start', '--child', app_path],
+            cwd=work_dir, env={**os.environ, 'PYTHONPATH': ROOT_DIR}, capture_output=True, text=True
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(f"콜드 스타트 실행 실패: {completed.stderr.strip()[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    if result['exception']:
+        raise RuntimeError(f"앱 실행 중 예외: {result['exception']}")
+    if result['sidebar_s'] is None:
+        raise RuntimeError("사이드바까지 실행되지 않았습니다. (DB 파일 확인)")
+    result['process_sidebar_s'] = round(result.pop('run_started_at') - spawned_at + result['sidebar_s'], 6)
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="streamlit_app 콜드 스타트 측정")
+    parser.add_argument('--db', default=None, help="측정에 사용할 DB 파일 (기본: config.DB_FILE_NAME)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget', type=float, default=COLD_START_BUDGET_S, help="사이드바까지 median 목표 (초)")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.child)
+        return 0
+
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    from config import DB_FILE_NAME
+    db_path = args.db or DB_FILE_NAME
+    if not os.path.exists(db_path):
+        parser.error(f"DB 파일이 없습니다: {db_path}")
+
+    results: List[Dict[str, Any]] = []
+    for i in range(args.repeat):
+        result = measure_cold_start(db_path)
+        results.append(result)
+        print(f"#{i + 1}  사이드바 {result['sidebar_s']:.3f}s  첫 화면 {result['first_run_s']:.3f}s  "
+              f"(프로세스 기동부터 사이드바 {result['process_sidebar_s']:.3f}s)", flush=True)
+
+    median_sidebar = statistics.median(result['sidebar_s'] for result in results)
+    print("\n지연 import 모듈 (첫 실행):")
+    for row in results[-1]['import_times']:
+        print(f"  {row['module']:30s} {row['seconds']:.3f}s")
+    print(f"\n사이드바 median {median_sidebar:.3f}s (목표 {args.budget:.2f}s)")
+    if median_sidebar > args.budget:
+        print("⚠️ 콜드 스타트 목표 초과")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# benchmarks/run.py
+# Streamlit 런타임 없이 시나리오를 실행하고 결과를 JSON으로 저장합니다.
+#
+#   python -m benchmarks.run --sizes 10k 100k --repeat 3
+#   python -m benchmarks.run --sizes 10k --only read_pcb analyze_pcb --compare bench_results/이전.json
+#
+# 결과 JSON: {'meta': {커밋, 시각, 버전 ...}, 'results': [{scenario, size, rows, times_s, min_s, median_s, status}]}
+# --compare 로 이전 결과와 median 비율을 비교하고, --fail-ratio 를 넘는 시나리오는 회귀로 표시합니다.
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+from datetime import datetime
+from typing import Any, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import numpy as np
+import pandas as pd
+
+try:
+    # streamlit_app 시나리오(run_analysis 등)의 st.* 호출은 런타임 없이 경고 로그만 남기므로 로그 레벨을 낮춥니다.
+    # (설정 파일을 처음 읽을 때 로그 레벨이 초기화되므로 먼저 설정을 읽은 뒤 변경합니다)
+    import streamlit.logger
+    from streamlit import config as st_config
+    st_config.get_config_options()
+    st_config.set_option('logger.level', 'error')
+    streamlit.logger.set_log_level('error')
+except ImportError:
+    pass
+
+from benchmarks.synthetic import SIZE_PRESETS
+from benchmarks.scenarios import SCENARIOS, BenchContext
+
+DEFAULT_RESULTS_DIR = os.path.join(ROOT_DIR, 'bench_results')
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.check_output(['git', *args], cwd=ROOT_DIR, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return ''
+
+
+def collect_meta(repeat: int) -> Dict[str, Any]:
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': _git('rev-parse', 'HEAD'),
+        'git_dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'repeat': repeat,
+    }
+
+
+def run_scenario(scenario, ctx: BenchContext, repeat: int) -> Dict[str, Any]:
+    """setup은 매 반복마다 새로 수행하고 run 구간만 측정합니다."""
+    result = {'scenario': scenario.name, 'rows': ctx.n_rows}
+
+    missing = scenario.requires()
+    if missing:
+        result.update(status='skipped', reason=missing)
+        return result
+
+    times = []
+    try:
+        for _ in range(repeat):
+            args = scenario.setup(ctx)
+            gc.collect()
+            started = time.perf_counter()
+            scenario.run(args)
+            times.append(time.perf_counter() - started)
+            del args
+    except Exception as e:
+        result.update(status='error', error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc())
+        return result
+
+    result.update(
+        status='ok',
+        times_s=[round(t, 6) for t in times],
+        min_s=round(min(times), 6),
+        median_s=round(statistics.median(times), 6),
+        rows_per_s=round(ctx.n_rows / statistics.median(times), 1) if statistics.median(times) > 0 else None,
+    )
+    return result
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], fail_ratio: float) -> List[Dict[str, Any]]:
+    """(scenario, size)별 median 비율(current / baseline)을 계산합니다."""
+    base_index = {(r['scenario'], r['size']): r for r in baseline.get('results', []) if r.get('status') == 'ok'}
+    rows = []
+    for r in current['results']:
+        base = base_index.get((r['scenario'], r['size']))
+        if r.get('status') != 'ok' or base is None:
+            continue
+        ratio = r['median_s'] / base['median_s'] if base['median_s'] > 0 else float('inf')
+        rows.append({
+            'scenario': r['scenario'], 'size': r['size'],
+            'baseline_s': base['median_s'], 'current_s': r['median_s'],
+            'ratio': round(ratio, 3), 'regression': ratio > fail_ratio,
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="TM2360E 품질 분석 벤치마크 (headless)")
+    parser.add_argument('--sizes', nargs='+', default=['10k', '100k'], help=f"행 수 또는 프리셋 {list(SIZE_PRESETS)}")
+    parser.add_argument('--only', nargs='*', default=None, help=f"실행할 시나리오 (기본: 전체) {list(SCENARIOS)}")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--work-dir', default=os.path.join(ROOT_DIR, 'bench_data'), help="합성 데이터/임시 DB 위치")
+    parser.add_argument('--out', default=None, help="결과 JSON 경로 (기본: bench_results/<커밋>_<시각>.json)")
+    parser.add_argument('--compare', default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument('--fail-ratio', type=float, default=1.2, help="median 비율이 이 값을 넘으면 회귀로 판단")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {unknown}")
+
+    report = {'meta': collect_meta(args.repeat), 'results': []}
+
+    for size in args.sizes:
+        n_rows = SIZE_PRESETS.get(size.lower()) or int(size)
+        print(f"\n=== {size} ({n_rows:,}행) 합성 데이터 준비 ===", flush=True)
+        ctx = BenchContext(args.work_dir, n_rows, seed=args.seed)
+
+        for name in names:
+            result = run_scenario(SCENARIOS[name], ctx, args.repeat)
+            result['size'] = size
+            report['results'].append(result)
+            if result['status'] == 'ok':
+                print(f"{name:40s} median {result['median_s']:10.4f}s  min {result['min_s']:10.4f}s", flush=True)
+            else:
+                print(f"{name:40s} {result['status']}: {result.get('reason') or result.get('error')}", flush=True)
+
+    out_path = args.out
+    if out_path is None:
+        os.makedirs(DEFAULT_RESULTS_DIR, exist_ok=True)
+        commit = (report['meta']['git_commit'] or 'nogit')[:10]
+        out_path = os.path.join(DEFAULT_RESULTS_DIR, f"{commit}_{datetime.now():%Y%m%d_%H%M%S}.json")
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparison = compare_results(report, baseline, args.fail_ratio)
+        report['comparison'] = {'baseline': args.compare, 'baseline_commit': baseline.get('meta', {}).get('git_commit'), 'rows': comparison}
+        print(f"\n=== 비교: {args.compare} ===")
+        for row in comparison:
+            flag = '  ⚠️ 회귀' if row['regression'] else ''
+            print(f"{row['scenario']:40s} {row['size']:>6s}  {row['baseline_s']:.4f}s → {row['current_s']:.4f}s  x{row['ratio']:.2f}{flag}")
+        if any(row['regression'] for row in comparison):
+            exit_code = 1
+
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {out_path}")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
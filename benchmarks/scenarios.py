@@ -0,0 +1,256 @@
+# benchmarks/scenarios.py
+# 벤치마크 시나리오 정의.
+# 각 시나리오는 setup(ctx) → 인자, run(인자) 로 나뉘며 run 구간만 측정합니다.
+# (분석 함수는 입력 DataFrame을 수정하므로 setup에서 매번 새 사본을 준비합니다.)
+
+import os
+import shutil
+import sqlite3
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from benchmarks.synthetic import write_exports
+
+# 공정 키 목록 (리더/분석 함수는 Streamlit에 의존하지 않는 quality_core 를 직접 사용합니다)
+PROCESSES = ['Pcb', 'Fw', 'RfTx', 'Semi', 'Batadc']
+
+
+class BenchContext:
+    """크기별 작업 디렉터리, 합성 파일 경로, 재사용 가능한 중간 결과(읽은 DataFrame, 적재된 DB)를 보관합니다."""
+
+    def __init__(self, work_dir: str, n_rows: int, seed: int = 0):
+        self.work_dir = os.path.join(work_dir, str(n_rows))
+        self.n_rows = n_rows
+        self.seed = seed
+        self.paths = write_exports(os.path.join(self.work_dir, 'data'), n_rows, seed=seed)
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._bytes: Dict[str, bytes] = {}
+        self._db_path: Optional[str] = None
+
+    def file_bytes(self, name: str) -> bytes:
+        if name not in self._bytes:
+            with open(self.paths[name], 'rb') as f:
+                self._bytes[name] = f.read()
+        return self._bytes[name]
+
+    def process_frame(self, process: str) -> pd.DataFrame:
+        """리더로 읽은 공정별 DataFrame (호출 측은 사본을 사용합니다)"""
+        if process not in self._frames:
+            from quality_core import READERS
+            self._frames[process], _ = READERS[process](self.file_bytes(process))
+        return self._frames[process]
+
+    def db_frame(self) -> pd.DataFrame:
+        if 'db' not in self._frames:
+            self._frames['db'] = pd.read_csv(self.paths['db'], low_memory=False, dtype={'SNumber': str})
+        return self._frames['db']
+
+    def fresh_db_path(self, name: str) -> str:
+        path = os.path.join(self.work_dir, f"{name}.db")
+        for suffix in ('', '-journal', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        return path
+
+    def loaded_db(self) -> str:
+        """DB 적재 CSV가 적재된 기준 DB (조회/삭제 시나리오에서 공용, 최초 1회만 적재)"""
+        if self._db_path is None:
+            from db_ingest import process_and_save_csv_stream_to_db
+            path = self.fresh_db_path('loaded')
+            result = process_and_save_csv_stream_to_db(self.paths['db'], path)
+            if not result['success']:
+                raise RuntimeError(result['error'])
+            self._db_path = path
+        return self._db_path
+
+    def date_range(self):
+        df = self.db_frame()
+        stamps = pd.to_datetime(df['Stamp'].astype('int64').astype(str), format='%Y%m%d%H%M%S')
+        return stamps.min().to_pydatetime(), stamps.max().to_pydatetime()
+
+
+class Scenario:
+    def __init__(self, name: str, run: Callable[[Any], Any], setup: Optional[Callable[[BenchContext], Any]] = None,
+                 requires: Optional[Callable[[], Optional[str]]] = None):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda ctx: None)
+        self.requires = requires or (lambda: None)
+
+
+# ---------------- 리더 / 분석 ----------------
+
+def _reader_scenario(process: str) -> Scenario:
+    def setup(ctx):
+        from quality_core import READERS
+        return READERS[process], ctx.file_bytes(process)
+
+    def run(args):
+        reader, data = args
+        df, _ = reader(data)
+        if df is None:
+            raise RuntimeError(f"{process} 리더가 헤더를 찾지 못했습니다.")
+        return df
+
+    return Scenario(f"read_{process.lower()}", run, setup)
+
+
+def _analyzer_scenario(process: str) -> Scenario:
+    def setup(ctx):
+        from quality_core import ANALYZERS
+        return ANALYZERS[process], ctx.process_frame(process).copy()
+
+    def run(args):
+        analyzer, df = args
+        return analyzer(df)
+
+    return Scenario(f"analyze_{process.lower()}", run, setup)
+
+
+def _qc_setup(ctx):
+    from quality_core import apply_qc_check, clean_string_format
+    df = ctx.process_frame('Pcb').copy()
+    for col in df.columns:
+        df[col] = df[col].apply(clean_string_format)
+    return apply_qc_check, df
+
+
+def _qc_run(args):
+    from quality_core import PCB_QC_COLUMNS
+    apply_qc_check, df = args
+    for col in PCB_QC_COLUMNS:
+        df = apply_qc_check(df, col)
+    return df
+
+
+# ---------------- DB 적재 ----------------
+
+def _ingest_setup(ctx):
+    from db_ingest import process_and_save_csv_to_db
+    return process_and_save_csv_to_db, ctx.db_frame().copy(), ctx.fresh_db_path('ingest')
+
+
+def _ingest_run(args):
+    process_and_save_csv_to_db, df, db_path = args
+    result = process_and_save_csv_to_db(df, db_path)
+    if not result['success']:
+        raise RuntimeError(result['error'])
+    return result
+
+
+def _stream_ingest_setup(ctx):
+    from db_ingest import process_and_save_csv_stream_to_db
+    return process_and_save_csv_stream_to_db, ctx.paths['db'], ctx.fresh_db_path('ingest_stream')
+
+
+def _stream_ingest_run(args):
+    process_and_save_csv_stream_to_db, csv_path, db_path = args
+    result = process_and_save_csv_stream_to_db(csv_path, db_path)
+    if not result['success']:
+        raise RuntimeError(result['error'])
+    return result
+
+
+# ---------------- 조회 / 분석 (streamlit_app) ----------------
+
+def _streamlit_app():
+    import streamlit_app
+    return streamlit_app
+
+
+def _analysis_setup(engine: str, data_source: str):
+    def setup(ctx):
+        app = _streamlit_app()
+        db_path = ctx.loaded_db()
+        mirror_dir = None
+        if data_source == 'Parquet':
+            import parquet_mirror
+            mirror_dir = os.path.join(ctx.work_dir, 'parquet_mirror')
+            if not os.path.isdir(mirror_dir):
+                parquet_mirror.export_db_to_mirror(db_path, mirror_dir)
+        start, end = ctx.date_range()
+        return app, db_path, mirror_dir, start, end, engine, data_source
+    return setup
+
+
+def _analysis_run(args):
+    app, db_path, mirror_dir, start, end, engine, data_source = args
+    saved = app.DB_FILE_NAME, app.PARQUET_MIRROR_DIR
+    app.DB_FILE_NAME = db_path
+    app.PARQUET_MIRROR_DIR = mirror_dir or app.PARQUET_MIRROR_DIR
+    try:
+        for item in ['pcb', 'fw']:
+            app.run_analysis(start, end, item, 10**9, '전체', '전체', data_source, engine)
+    finally:
+        app.DB_FILE_NAME, app.PARQUET_MIRROR_DIR = saved
+
+
+def _search_setup(ctx):
+    return _streamlit_app().search_snumber, sqlite3.connect(ctx.loaded_db(), check_same_thread=False)
+
+
+def _search_run(args):
+    search_snumber, conn = args
+    for pattern in ['THSR0000', '*9226', '12345']:
+        search_snumber(pattern, conn)
+
+
+def _delete_setup(ctx):
+    from db_ingest import delete_weeks_from_db
+    path = ctx.fresh_db_path('delete')
+    shutil.copyfile(ctx.loaded_db(), path)
+    conn = sqlite3.connect(path)
+    weeks = [row[0] for row in conn.execute("SELECT DISTINCT WEEK_NO FROM T_MASTER_DATA WHERE WEEK_NO IS NOT NULL ORDER BY WEEK_NO LIMIT 1")]
+    conn.close()
+    return delete_weeks_from_db, path, weeks
+
+
+def _delete_run(args):
+    delete_weeks_from_db, path, weeks = args
+    return delete_weeks_from_db(path, weeks)
+
+
+# ---------------- 앱 콜드 스타트 ----------------
+
+def _cold_start_setup(ctx):
+    return ctx.loaded_db()
+
+
+def _cold_start_run(db_path):
+    """새 프로세스에서 앱 첫 실행 (측정 시간 = 프로세스 기동 ~ 첫 화면). 사이드바가 목표 시간을 넘으면 실패로 기록합니다."""
+    from benchmarks.cold_start import COLD_START_BUDGET_S, measure_cold_start
+    result = measure_cold_start(db_path)
+    if result['sidebar_s'] > COLD_START_BUDGET_S:
+        raise RuntimeError(f"사이드바까지 {result['sidebar_s']:.3f}s - 목표 {COLD_START_BUDGET_S:.2f}s 초과")
+    return result
+
+
+def _requires_module(module_name: str):
+    def check():
+        try:
+            __import__(module_name)
+            return None
+        except ImportError:
+            return f"{module_name} 미설치"
+    return check
+
+
+def build_scenarios() -> List[Scenario]:
+    scenarios = [_reader_scenario(p) for p in PROCESSES]
+    scenarios += [_analyzer_scenario(p) for p in PROCESSES]
+    scenarios += [
+        Scenario('apply_qc_check', _qc_run, _qc_setup),
+        Scenario('process_and_save_csv_to_db', _ingest_run, _ingest_setup),
+        Scenario('process_and_save_csv_stream_to_db', _stream_ingest_run, _stream_ingest_setup),
+        Scenario('run_analysis', _analysis_run, _analysis_setup('pandas', 'SQLite')),
+        Scenario('run_analysis_duckdb_parquet', _analysis_run, _analysis_setup('DuckDB', 'Parquet'),
+                 requires=lambda: _requires_module('duckdb')() or _requires_module('pyarrow')()),
+        Scenario('search_snumber', _search_run, _search_setup),
+        Scenario('delete_week', _delete_run, _delete_setup),
+        Scenario('app_cold_start', _cold_start_run, _cold_start_setup),
+    ]
+    return scenarios
+
+
+SCENARIOS = {scenario.name: scenario for scenario in build_scenarios()}
@@ -0,0 +1,259 @@
+# benchmarks/synthetic.py
+# TM2360E 공정 데이터(Pcb / Fw / RfTx / Semi / Batadc)의 합성 CSV 생성기.
+# - 공정별 내보내기 파일: 각 리더(read_csv_with_dynamic_header*)가 읽는 형식 그대로 생성합니다.
+#   (Pcb: Min/Max 컬럼 + '="..."' 텍스트 인용, Semi: YYYYMMDDHHMMSS, RfTx: epoch ms, Fw/Batadc: YYYY-MM-DD HH:MM:SS)
+# - DB 적재용 통합 파일: process_and_save_csv_*_to_db가 읽는 형식 (시간 컬럼 YYYYMMDDhhmmss.f 숫자)
+# 대용량(1M/10M 행)은 청크 단위로 생성/기록하므로 메모리는 청크 크기로 제한됩니다.
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+PROCESSES = ['Pcb', 'Fw', 'RfTx', 'Semi', 'Batadc']
+
+SIZE_PRESETS = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+    '10m': 10_000_000,
+}
+
+GENERATE_CHUNK_ROWS = 500_000
+
+# 측정 항목별 (Min, Max, 정상 분포 평균, 표준편차)
+PCB_SPECS = {
+    'SleepCurr': (0.5, 30.0, 12.0, 4.0),
+    'BatVolt': (3.6, 4.3, 3.95, 0.08),
+    'IrCurr': (80.0, 160.0, 120.0, 10.0),
+    'IrPwr': (10.0, 40.0, 25.0, 4.0),
+    'WirelessVolt': (4.5, 5.5, 5.0, 0.1),
+    'UsbCurr': (100.0, 500.0, 300.0, 40.0),
+    'WirelessUsbVolt': (4.6, 5.4, 5.0, 0.1),
+    'Led': (200.0, 900.0, 550.0, 80.0),
+}
+SEMI_SPECS = {
+    'BatVolt': (3.6, 4.3, 3.95, 0.08),
+    'SolarVolt': (4.0, 7.0, 5.5, 0.4),
+}
+
+PCB_JIGS = np.array([40.0, 41.0, 42.0, 43.0, 44.0, 45.0])   # PcbMaxIrPwr (Jig별 IrPwr 상한 = Pcb 분석의 Jig 컬럼)
+SEMI_JIGS = np.array([7.0, 7.5, 8.0])      # SemiAssyMaxSolarVolt (Jig별 SolarVolt 상한 = Semi 분석의 Jig 컬럼)
+FW_PCS = np.array(['FW-01', 'FW-02', 'FW-03'])
+RFTX_PCS = np.array(['RF-01', 'RF-02', 'RF-03', 'RF-04'])
+BATADC_PCS = np.array(['BA-01', 'BA-02'])
+
+
+def _excel_text(values):
+    """Excel 텍스트 내보내기 형식 '="..."' 로 감쌉니다."""
+    return np.char.add(np.char.add('="', values.astype(str)), '"')
+
+
+def _yyyymmddhhmmss(times: pd.DatetimeIndex) -> np.ndarray:
+    return (times.year.to_numpy(np.int64) * 10**10 + times.month.to_numpy(np.int64) * 10**8
+            + times.day.to_numpy(np.int64) * 10**6 + times.hour.to_numpy(np.int64) * 10**4
+            + times.minute.to_numpy(np.int64) * 100 + times.second.to_numpy(np.int64))
+
+
+def _iso_seconds(times: pd.DatetimeIndex) -> np.ndarray:
+    return np.char.replace(np.datetime_as_string(times.to_numpy(), unit='s'), 'T', ' ')
+
+
+def _measure(rng, n, spec, fail_mask):
+    """정상 행은 Spec 범위 안, 불량 행은 일부를 미달/초과/0(제외)으로 만듭니다."""
+    min_v, max_v, mean, std = spec
+    values = np.clip(rng.normal(mean, std, n), min_v, max_v)
+    kind = rng.random(n)
+    below = fail_mask & (kind < 0.35)
+    above = fail_mask & (kind >= 0.35) & (kind < 0.7)
+    zero = fail_mask & (kind >= 0.7) & (kind < 0.8)
+    values[below] = min_v - np.abs(rng.normal(std, std, below.sum()))
+    values[above] = max_v + np.abs(rng.normal(std, std, above.sum()))
+    values[zero] = 0.0
+    return np.round(values, 3)
+
+
+def generate_frame(n_rows: int, seed: int = 0, start: str = '2025-10-01', days: int = 14,
+                   retest_rate: float = 0.15, fail_rate: float = 0.08, unit_offset: int = 0) -> pd.DataFrame:
+    """
+    공정 공통의 정규화된 합성 데이터(시간은 datetime, Pass는 'O'/'X')를 생성합니다.
+    retest_rate 비율만큼 같은 SNumber가 재검사(재투입)되어 가성불량이 생기도록 합니다.
+    """
+    rng = np.random.default_rng(seed)
+    n_units = max(int(n_rows / (1.0 + retest_rate)), 1)
+    unit_ids = unit_offset + rng.integers(0, n_units, n_rows)
+
+    base = pd.Timestamp(start)
+    seconds = np.sort(rng.integers(0, days * 86400, n_rows))
+    times = base + pd.to_timedelta(seconds, unit='s')
+
+    fail = rng.random(n_rows) < fail_rate
+    df = pd.DataFrame({
+        'SNumber': np.char.add('THSR', np.char.zfill(unit_ids.astype(str), 8)),
+        'Time': times,
+        'Fail': fail,
+    })
+
+    df['Pass'] = np.where(fail, 'X', 'O')
+    df['PcbJig'] = rng.choice(PCB_JIGS, n_rows)
+    df['SemiJig'] = rng.choice(SEMI_JIGS, n_rows)
+    df['FwPC'] = rng.choice(FW_PCS, n_rows)
+    df['RfTxPC'] = rng.choice(RFTX_PCS, n_rows)
+    df['BatadcPC'] = rng.choice(BATADC_PCS, n_rows)
+
+    for name, spec in PCB_SPECS.items():
+        df[f'Pcb{name}'] = _measure(rng, n_rows, spec, fail & (rng.random(n_rows) < 0.5))
+    for name, spec in SEMI_SPECS.items():
+        df[f'Semi{name}'] = _measure(rng, n_rows, spec, fail & (rng.random(n_rows) < 0.5))
+
+    df['RfTxPower'] = np.round(rng.normal(4.0, 1.0, n_rows), 2)
+    df['RfTxModul'] = np.round(rng.normal(250.0, 10.0, n_rows), 1)
+    df['RfTxCFOD'] = np.round(rng.normal(0.0, 15.0, n_rows), 1)
+    df['BatadcLevel'] = rng.integers(2800, 3300, n_rows)
+    df['BatadcVoiceTh'] = rng.integers(10, 40, n_rows)
+    df['BatadcRssiRx'] = rng.integers(-80, -30, n_rows)
+    df['BatadcRssiTx'] = rng.integers(-80, -30, n_rows)
+    return df
+
+
+def to_process_export(df: pd.DataFrame, process: str) -> pd.DataFrame:
+    """정규화된 합성 데이터를 공정별 설비 내보내기 형식으로 변환합니다."""
+    times = pd.DatetimeIndex(df['Time'])
+    stop_times = times + pd.to_timedelta(35, unit='s')
+    n = len(df)
+
+    if process == 'Pcb':
+        out = pd.DataFrame({
+            'SNumber': _excel_text(df['SNumber'].to_numpy()),
+            'PcbStartTime': _excel_text(_yyyymmddhhmmss(times)),
+            'PcbStopTime': _excel_text(_yyyymmddhhmmss(stop_times)),
+            'PcbPass': df['Pass'].to_numpy(),
+        })
+        for name, (min_v, max_v, _, _) in PCB_SPECS.items():
+            out[f'Pcb{name}'] = df[f'Pcb{name}'].to_numpy()
+            out[f'PcbMin{name}'] = min_v
+            out[f'PcbMax{name}'] = max_v
+        out['PcbMaxIrPwr'] = df['PcbJig'].to_numpy()
+        return out
+
+    if process == 'Semi':
+        out = pd.DataFrame({
+            'SNumber': _excel_text(df['SNumber'].to_numpy()),
+            'SemiAssyStartTime': _excel_text(_yyyymmddhhmmss(times)),
+            'SemiAssyStopTime': _excel_text(_yyyymmddhhmmss(stop_times)),
+            'SemiAssyPass': df['Pass'].to_numpy(),
+        })
+        for name, (min_v, max_v, _, _) in SEMI_SPECS.items():
+            out[f'SemiAssy{name}'] = df[f'Semi{name}'].to_numpy()
+            out[f'SemiAssyMin{name}'] = min_v
+            out[f'SemiAssyMax{name}'] = max_v
+        out['SemiAssyMaxSolarVolt'] = df['SemiJig'].to_numpy()
+        return out
+
+    if process == 'Fw':
+        return pd.DataFrame({
+            'SNumber': df['SNumber'].to_numpy(),
+            'FwStamp': _iso_seconds(times),
+            'FwPC': df['FwPC'].to_numpy(),
+            'FwWrMAC': np.char.add('00:1A:7D:', np.char.zfill((np.arange(n) % 65536).astype(str), 5)),
+            'FwFile': 'TM2360E_v1.2.3.bin',
+            'FwPass': df['Pass'].to_numpy(),
+        })
+
+    if process == 'RfTx':
+        return pd.DataFrame({
+            'SNumber': df['SNumber'].to_numpy(),
+            'RfTxStamp': times.to_numpy().astype('datetime64[ms]').astype(np.int64),
+            'RfTxPC': df['RfTxPC'].to_numpy(),
+            'RfTxPower': df['RfTxPower'].to_numpy(),
+            'RfTxModul': df['RfTxModul'].to_numpy(),
+            'RfTxCFOD': df['RfTxCFOD'].to_numpy(),
+            'RfTxPass': df['Pass'].to_numpy(),
+        })
+
+    if process == 'Batadc':
+        return pd.DataFrame({
+            'SNumber': df['SNumber'].to_numpy(),
+            'BatadcStamp': _iso_seconds(times),
+            'BatadcPC': df['BatadcPC'].to_numpy(),
+            'BatadcBtVer': '5.0',
+            'BatadcLevel': df['BatadcLevel'].to_numpy(),
+            'BatadcVoiceTh': df['BatadcVoiceTh'].to_numpy(),
+            'BatadcVoiceLvl': df['BatadcVoiceTh'].to_numpy() + 3,
+            'BatadcRssiRx': df['BatadcRssiRx'].to_numpy(),
+            'BatadcRssiTx': df['BatadcRssiTx'].to_numpy(),
+            'BatadcOffRaw1': 0,
+            'BatadcOnBase': 100,
+            'BatadcOnDiff': 5,
+            'BatadcSar': 1,
+            'BatadcPass': df['Pass'].to_numpy(),
+        })
+
+    raise ValueError(f"지원되지 않는 공정: '{process}'")
+
+
+def to_db_export(df: pd.DataFrame) -> pd.DataFrame:
+    """DB 적재용 통합 CSV 형식 (시간 컬럼은 YYYYMMDDhhmmss.f 숫자, 공정별 컬럼 전체 포함)"""
+    times = pd.DatetimeIndex(df['Time'])
+    stamp = _yyyymmddhhmmss(times).astype(np.float64) + 0.1
+
+    out = pd.DataFrame({'SNumber': df['SNumber'].to_numpy(), 'ICount': 1, 'Stamp': stamp})
+    for process in PROCESSES:
+        export = to_process_export(df, process)
+        for col in export.columns:
+            if col == 'SNumber':
+                continue
+            out[col] = export[col].to_numpy()
+
+    for col in ['PcbStartTime', 'SemiAssyStartTime', 'FwStamp', 'RfTxStamp', 'BatadcStamp']:
+        out[col] = stamp
+    for col in ['PcbStopTime', 'SemiAssyStopTime']:
+        out[col] = stamp + 35
+    for col in ['BatPass', 'BatStamp']:
+        out[col] = None
+    return out
+
+
+def write_exports(out_dir: str, n_rows: int, seed: int = 0, chunk_rows: int = GENERATE_CHUNK_ROWS,
+                  processes: Optional[list] = None, include_db_export: bool = True) -> Dict[str, str]:
+    """
+    공정별 내보내기 CSV와 DB 적재용 통합 CSV를 out_dir에 기록합니다. 반환: {이름: 경로}
+    이미 같은 크기로 생성된 파일이 있으면 다시 만들지 않습니다.
+    """
+    processes = processes or PROCESSES
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {process: os.path.join(out_dir, f"{process}_{n_rows}.csv") for process in processes}
+    if include_db_export:
+        paths['db'] = os.path.join(out_dir, f"DB_{n_rows}.csv")
+
+    marker = os.path.join(out_dir, f".done_{n_rows}_{seed}")
+    if os.path.exists(marker) and all(os.path.exists(p) for p in paths.values()):
+        return paths
+
+    units_per_chunk = int(chunk_rows / 1.15) + 1
+    for chunk_no, lo in enumerate(range(0, n_rows, chunk_rows)):
+        rows = min(chunk_rows, n_rows - lo)
+        df = generate_frame(rows, seed=seed + chunk_no, unit_offset=chunk_no * units_per_chunk)
+        mode, header = ('w', True) if chunk_no == 0 else ('a', False)
+        for process in processes:
+            to_process_export(df, process).to_csv(paths[process], mode=mode, header=header, index=False)
+        if include_db_export:
+            to_db_export(df).to_csv(paths['db'], mode=mode, header=header, index=False)
+
+    with open(marker, 'w') as f:
+        f.write(str(n_rows))
+    return paths
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TM2360E 합성 CSV 생성기")
+    parser.add_argument('--size', default='10k', help=f"행 수 또는 프리셋 {list(SIZE_PRESETS)}")
+    parser.add_argument('--out', default='./bench_data')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    n = SIZE_PRESETS.get(args.size.lower()) or int(args.size)
+    for name, path in write_exports(args.out, n, seed=args.seed).items():
+        print(f"{name}: {path}")
@@ -10,3 +10,9 @@ TAB_PROPS_MAP = {
     'Semi': {'jig_col': 'SemiAssyMaxSolarVolt', 'timestamp_col': 'SemiAssyStartTime'},
     'Batadc': {'jig_col': 'BatadcPC', 'timestamp_col': 'BatadcStamp'}
 }
+
+# 분석 DB 파일 (Streamlit 앱과 배치 적재(batch_ingest.py)가 같은 파일을 사용합니다)
+DB_FILE_NAME = r'./product_quality_db_final_stable-74.db'
+
+# WEEK_NO 파티션 Parquet 미러 경로 (parquet_mirror.py를 import하지 않고도 앱 시작 시 참조할 수 있도록 여기에 둡니다)
+PARQUET_MIRROR_DIR = r'./parquet_mirror'
@@ -0,0 +1,45 @@
+# data_token.py
+# 분석 데이터셋(업로드/분석 결과)마다 부여하는 세션 토큰.
+# 필터 인덱스, 요약 큐브, SNumber 인덱스 같은 파생 캐시는 이 토큰이 같을 때만 재사용합니다.
+# id(DataFrame)는 객체가 해제되면 재사용될 수 있어, 행 수가 같은 새 업로드에서 이전 캐시가 남을 수 있습니다.
+#
+# 토큰은 st.session_state.analysis_results[key]에 저장된 객체에 묶입니다.
+# 진입 앱이 분석 결과를 새 객체로 저장하기만 하면(재업로드/재분석) 다음 조회에서 새 토큰이 부여되므로,
+# 각 진입 앱이 new_data_token을 호출하지 않아도 캐시가 갱신됩니다. (토큰이 객체 참조를 보관하므로 id 재사용 문제 없음)
+#
+#   get_data_token('pcb')          # 캐시 키에 포함
+#   new_data_token('pcb')          # 같은 객체를 제자리에서 수정했을 때 강제로 토큰 갱신
+
+import itertools
+from typing import Any, Optional
+
+import streamlit as st
+
+# 프로세스 전체에서 증가하는 카운터 (세션이 초기화되어도 이전 토큰과 겹치지 않음)
+_counter = itertools.count(1)
+
+TOKEN_STATE_KEY = 'data_tokens'
+RESULTS_STATE_KEY = 'analysis_results'
+
+
+def _current_source(analysis_key: str) -> Any:
+    """토큰이 묶이는 데이터셋 객체 (session_state.analysis_results[analysis_key], 없으면 None)"""
+    results = st.session_state.get(RESULTS_STATE_KEY) or {}
+    return results.get(analysis_key)
+
+
+def new_data_token(analysis_key: str) -> int:
+    """analysis_key 데이터셋에 새 토큰을 부여하고 반환합니다. (현재 저장된 분석 결과 객체에 묶음)"""
+    tokens = st.session_state.setdefault(TOKEN_STATE_KEY, {})
+    token = next(_counter)
+    tokens[analysis_key] = (token, _current_source(analysis_key))
+    return token
+
+
+def get_data_token(analysis_key: str) -> Optional[int]:
+    """analysis_key 데이터셋의 현재 토큰. 아직 없거나 분석 결과 객체가 바뀌었으면 새로 부여합니다."""
+    tokens = st.session_state.get(TOKEN_STATE_KEY) or {}
+    entry = tokens.get(analysis_key)
+    if entry is None or entry[1] is not _current_source(analysis_key):
+        return new_data_token(analysis_key)
+    return entry[0]
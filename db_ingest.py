@@ -0,0 +1,1092 @@
+# db_ingest.py
+# CSV → SQLite(T_MASTER_DATA / T_ITEM_* / T_PC_INFO / T_SPEC_*) 적재 로직.
+# 검사 스테이션 DB(historyinspection) → T_* 직접 증분 동기화(sync_station_db)도 포함합니다.
+# Streamlit에 의존하지 않으므로 앱, 배치 작업 어디서든 사용할 수 있습니다.
+
+import pandas as pd
+import numpy as np
+import sqlite3
+import hashlib
+import os
+import uuid
+from datetime import datetime
+
+from jig_history import delete_snumbers as delete_jig_passes
+from lazy_imports import lazy_module
+from profiling import span
+from spc_stats import SPC_ITEMS, create_spc_schema, ensure_spc, flush_spc, mark_spc_pending
+from storage import DB_ERRORS
+from traceability import DERIVED_TABLES, create_traceability_schema, ensure_traceability, flush_pending, mark_pending
+
+# Parquet 미러(pyarrow.dataset)는 미러 경로가 주어진 적재/삭제에서만 필요하므로 처음 사용할 때 import합니다.
+parquet_mirror = lazy_module('parquet_mirror')
+
+# 한 번에 처리할 CSV 행 수 (청크 단위 적재)
+INGEST_CHUNK_ROWS = 50000
+
+DATE_COLUMNS_TO_CONVERT = [
+    'Stamp', 'SemiAssyStartTime', 'SemiAssyStopTime', 'PcbStartTime', 'PcbStopTime', 
+    'FwStamp', 'BatStamp', 'RfTxStamp', 'BatadcStamp'
+]
+
+MASTER_COLUMNS = ['SNumber', 'ICount', 'Stamp', 'FwPass', 'BatPass', 'RfTxPass', 'PcbPass', 'SemiAssyPass', 'BatadcPass', 'WEEK_NO']
+
+# 품목 테이블별 (통계 키, 테이블명, 시간 컬럼, Pass 컬럼, 저장 컬럼)
+ITEM_TABLE_SPECS = [
+    ('pcb', 'T_ITEM_PCB', 'PcbStartTime', 'PcbPass',
+     ['SNumber', 'PcbStartTime', 'PcbStopTime', 'PcbPass', 'PcbSleepCurr', 'PcbBatVolt', 'PcbIrCurr', 'PcbIrPwr', 'PcbWirelessVolt', 'PcbUsbCurr', 'PcbWirelessUsbVolt', 'PcbLed', 'pcbPC', 'PcbMaxIrPwr', 'ICount']),
+    ('semi', 'T_ITEM_SEMI', 'SemiAssyStartTime', 'SemiAssyPass',
+     ['SNumber', 'SemiAssyStartTime', 'SemiAssyStopTime', 'SemiAssyPass', 'SemiAssyBatVolt', 'SemiAssySolarVolt', 'semiPC', 'ICount']),
+    ('fw', 'T_ITEM_FW', 'FwStamp', 'FwPass',
+     ['SNumber', 'FwStamp', 'FwPC', 'FwWrMAC', 'FwFile', 'FwPass', 'ICount']),
+    ('rftx', 'T_ITEM_RFTX', 'RfTxStamp', 'RfTxPass',
+     ['SNumber', 'RfTxStamp', 'RfTxPC', 'RfTxPower', 'RfTxModul', 'RfTxCFOD', 'RfTxPass', 'ICount']),
+    ('batadc', 'T_ITEM_BATADC', 'BatadcStamp', 'BatadcPass',
+     ['SNumber', 'BatadcStamp', 'BatadcPC', 'BatadcBtVer', 'BatadcLevel', 'BatadcVoiceTh', 'BatadcVoiceLvl', 'BatadcRssiRx', 'BatadcRssiTx', 'BatadcOffRaw1', 'BatadcOnBase', 'BatadcOnDiff', 'BatadcSar', 'BatadcPass', 'ICount']),
+]
+
+PCB_ITEMS_MAP = {
+    'SleepCurr': ('Min', 'Max'), 
+    'BatVolt': ('Min', 'Max'), 
+    'IrCurr': ('Min', 'Max'), 
+    'IrPwr': ('Min', 'Max'), 
+    'WirelessVolt': ('Min', 'Max'), 
+    'UsbCurr': ('Min', 'Max'), 
+    'WirelessUsbVolt': ('Min', 'Max'), 
+    'Led': ('Min', 'Max')
+}
+
+SEMI_ITEMS_MAP = {
+    'BatVolt': ('Min', 'Max'), 
+    'SolarVolt': ('Min', 'Max')
+}
+
+def calculate_week_number(date_str):
+    """'YYYY-MM-DD HH:MM:SS' 형식에서 ISO 주차(YYYY-W##)를 계산합니다."""
+    try:
+        dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+        return f"{dt.year}-W{dt.isocalendar()[1]:02d}"
+    except:
+        return None
+
+def transform_datetime_columns(df_source, columns_to_transform):
+    """Epoch 또는 YYYYMMDDhhmmss.f 형태의 숫자 컬럼을 문자열 날짜로 변환합니다."""
+    for col in columns_to_transform:
+        if col in df_source.columns:
+            
+            # ✅ FutureWarning 해결: 명시적으로 컬럼을 object 타입으로 변환 후 문자열 할당
+            if df_source[col].dtype in ['float64', 'int64']:
+                df_source[col] = df_source[col].astype('object')
+                mask = df_source[col].notna()
+                df_source.loc[mask, col] = df_source.loc[mask, col].astype(str)
+
+            dt_str_series = df_source[col].astype(str).str.split(r'\.', expand=True)[0]
+            is_potential_datetime = (dt_str_series.str.len() >= 14) & (dt_str_series.str.startswith('20'))
+            
+            try:
+                dt_series_format = pd.to_datetime(dt_str_series.where(is_potential_datetime), format='%Y%m%d%H%M%S', errors='coerce')
+                mask_success = dt_series_format.notna()
+                if mask_success.any():
+                    formatted_dates = dt_series_format[mask_success].dt.strftime('%Y-%m-%d %H:%M:%S')
+                    df_source.loc[mask_success, col] = formatted_dates.values
+            except ValueError: pass
+            
+            if df_source[col].dtype != 'object':
+                df_source[col] = df_source[col].astype(str)
+            
+            is_numeric_epoch = df_source[col].str.contains(r'^\d+\.\d+$', na=False).fillna(False)
+            
+            try:
+                if is_numeric_epoch.any():
+                    dt_series_epoch = pd.to_datetime(df_source.loc[is_numeric_epoch, col].astype(float), unit='ms', origin='unix', errors='coerce', utc=True).dt.tz_convert('Asia/Seoul')
+                    str_series_epoch = dt_series_epoch.dt.strftime('%Y-%m-%d %H:%M:%S')
+                    mask_success_epoch = str_series_epoch.notna()
+                    if mask_success_epoch.any():
+                        df_source.loc[is_numeric_epoch, col] = str_series_epoch.values
+            except: pass
+            
+            df_source[col] = df_source[col].astype(str).replace('nan', None, regex=True)
+            df_source.loc[df_source[col] == '<NA>', col] = None
+                
+    return df_source
+
+def create_initial_db_schema(cursor, conn):
+    """DB 초기 스키마를 생성합니다."""
+    cursor.execute("PRAGMA foreign_keys = ON;")
+    
+    # 1. T_MASTER_DATA
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_MASTER_DATA (
+            SNumber TEXT PRIMARY KEY,
+            ICount INTEGER,
+            Stamp TEXT,
+            FwPass TEXT,          
+            BatPass TEXT,         
+            RfTxPass TEXT,        
+            PcbPass TEXT,         
+            SemiAssyPass TEXT,    
+            BatadcPass TEXT,      
+            WEEK_NO TEXT 
+        );
+    """)
+    
+    # ✅ 기존 테이블에 WEEK_NO 컬럼이 없으면 추가
+    try:
+        cursor.execute("SELECT WEEK_NO FROM T_MASTER_DATA LIMIT 1")
+    except:
+        try:
+            cursor.execute("ALTER TABLE T_MASTER_DATA ADD COLUMN WEEK_NO TEXT")
+            conn.commit()
+            print("✅ T_MASTER_DATA에 WEEK_NO 컬럼을 추가했습니다.")
+        except Exception as e:
+            print(f"⚠️ WEEK_NO 컬럼 추가 실패 (이미 존재할 수 있음): {e}")
+
+    # 2. T_PC_INFO
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_PC_INFO (
+            PC_ID TEXT PRIMARY KEY,
+            PC_Type TEXT
+        );
+    """)
+    
+    # 3. T_SPEC_PCB
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_SPEC_PCB (
+            Spec_ID INTEGER PRIMARY KEY,
+            Measure_Item TEXT,
+            Min_Value REAL,
+            Max_Value REAL,
+            Start_Date TEXT,
+            Spec_Key TEXT UNIQUE
+        );
+    """)
+    
+    # 4. T_SPEC_SEMI
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_SPEC_SEMI (
+            Spec_ID INTEGER PRIMARY KEY,
+            Measure_Item TEXT,
+            Min_Value REAL,
+            Max_Value REAL,
+            Start_Date TEXT,
+            Spec_Key TEXT UNIQUE
+        );
+    """)
+    
+    # 5. T_ITEM_PCB
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_ITEM_PCB (
+            SNumber TEXT,
+            PcbStartTime TEXT,
+            PcbStopTime TEXT,
+            PcbPass TEXT,
+            PcbSleepCurr REAL,
+            PcbBatVolt REAL,
+            PcbIrCurr REAL,
+            PcbIrPwr REAL,
+            PcbWirelessVolt REAL,
+            PcbUsbCurr REAL,
+            PcbWirelessUsbVolt REAL,
+            PcbLed REAL,
+            SleepCurr_Spec_ID INTEGER,
+            pcbPC TEXT,
+            PcbMaxIrPwr REAL,
+            ICount INTEGER,
+            PRIMARY KEY (SNumber, PcbStartTime),
+            FOREIGN KEY (SNumber) REFERENCES T_MASTER_DATA (SNumber)
+        );
+    """)
+
+    # 6. T_ITEM_SEMI
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_ITEM_SEMI (
+            SNumber TEXT, 
+            SemiAssyStartTime TEXT, 
+            SemiAssyStopTime TEXT, 
+            SemiAssyPass TEXT, 
+            SemiAssyBatVolt REAL, 
+            SemiAssySolarVolt REAL, 
+            BatVolt_Spec_ID INTEGER,
+            semiPC TEXT,
+            SemiAssyMaxBatVolt REAL,
+            ICount INTEGER,
+            PRIMARY KEY (SNumber, SemiAssyStartTime),
+            FOREIGN KEY (SNumber) REFERENCES T_MASTER_DATA (SNumber)
+        );
+    """)
+    
+    # 7. T_ITEM_FW (Pass 컬럼 추가)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_ITEM_FW (
+            SNumber TEXT, FwStamp TEXT, FwPC TEXT, FwWrMAC TEXT, FwFile TEXT, FwPass TEXT, ICount INTEGER,
+            PRIMARY KEY (SNumber, FwStamp),
+            FOREIGN KEY (SNumber) REFERENCES T_MASTER_DATA (SNumber)
+        );
+    """)
+    
+    # ✅ 기존 테이블에 FwPass 컬럼 추가 (없으면)
+    try:
+        cursor.execute("SELECT FwPass FROM T_ITEM_FW LIMIT 1")
+    except:
+        try:
+            cursor.execute("ALTER TABLE T_ITEM_FW ADD COLUMN FwPass TEXT")
+            conn.commit()
+            print("✅ T_ITEM_FW에 FwPass 컬럼 추가")
+        except Exception as e:
+            print(f"⚠️ FwPass 컬럼 추가 실패: {e}")
+    
+    # 8. T_ITEM_RFTX (Pass 컬럼 추가)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_ITEM_RFTX (
+            SNumber TEXT, RfTxStamp TEXT, RfTxPC TEXT, RfTxPower REAL, RfTxModul REAL, RfTxCFOD REAL, RfTxPass TEXT, ICount INTEGER,
+            PRIMARY KEY (SNumber, RfTxStamp),
+            FOREIGN KEY (SNumber) REFERENCES T_MASTER_DATA (SNumber)
+        );
+    """)
+    
+    # ✅ 기존 테이블에 RfTxPass 컬럼 추가 (없으면)
+    try:
+        cursor.execute("SELECT RfTxPass FROM T_ITEM_RFTX LIMIT 1")
+    except:
+        try:
+            cursor.execute("ALTER TABLE T_ITEM_RFTX ADD COLUMN RfTxPass TEXT")
+            conn.commit()
+            print("✅ T_ITEM_RFTX에 RfTxPass 컬럼 추가")
+        except Exception as e:
+            print(f"⚠️ RfTxPass 컬럼 추가 실패: {e}")
+    
+    # 9. T_ITEM_BATADC (Pass 컬럼 추가)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_ITEM_BATADC (
+            SNumber TEXT, BatadcStamp TEXT, BatadcPC TEXT, BatadcBtVer TEXT, BatadcLevel REAL, 
+            BatadcVoiceTh REAL, BatadcVoiceLvl REAL, BatadcRssiRx REAL, BatadcRssiTx REAL, 
+            BatadcOffRaw1 REAL, BatadcOnBase REAL, BatadcOnDiff REAL, BatadcSar TEXT, BatadcPass TEXT, ICount INTEGER,
+            PRIMARY KEY (SNumber, BatadcStamp),
+            FOREIGN KEY (SNumber) REFERENCES T_MASTER_DATA (SNumber)
+        );
+    """)
+    
+    # ✅ 기존 테이블에 BatadcPass 컬럼 추가 (없으면)
+    try:
+        cursor.execute("SELECT BatadcPass FROM T_ITEM_BATADC LIMIT 1")
+    except:
+        try:
+            cursor.execute("ALTER TABLE T_ITEM_BATADC ADD COLUMN BatadcPass TEXT")
+            conn.commit()
+            print("✅ T_ITEM_BATADC에 BatadcPass 컬럼 추가")
+        except Exception as e:
+            print(f"⚠️ BatadcPass 컬럼 추가 실패: {e}")
+    
+    # 10. T_INGEST_LOG (청크 단위 적재 이력 - 중단된 적재 재개용)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_INGEST_LOG (
+            Source_Key TEXT,
+            Chunk_No INTEGER,
+            Row_Count INTEGER,
+            Done_At TEXT,
+            PRIMARY KEY (Source_Key, Chunk_No)
+        );
+    """)
+
+    # 11. T_SYNC_STATE (검사 스테이션 DB 증분 동기화 워터마크: 마지막으로 반영한 historyinspection.Id)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_SYNC_STATE (
+            Source TEXT PRIMARY KEY,
+            Last_Id INTEGER,
+            Updated_At TEXT
+        );
+    """)
+
+    # 12. 품목 테이블 시간 컬럼 인덱스 (기간 조회 / 일자별 리포트 검증용)
+    for _, table_name, time_col, _, _ in ITEM_TABLE_SPECS:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS IX_{table_name}_{time_col} ON {table_name} ({time_col})")
+
+    # 13. T_DB_META (DB 세대 번호 등: 적재/삭제마다 증가하여 대시보드 메타데이터 캐시를 무효화)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS T_DB_META (
+            Meta_Key TEXT PRIMARY KEY,
+            Meta_Value INTEGER
+        );
+    """)
+
+    # 14. T_UNIT_STATUS (SNumber별 공정 최신 결과 + 상태 비트맵) / T_ATTEMPT_INDEX (공정별 검사 시도 순서), traceability.py
+    #     기존 DB에 처음 만들어지는 경우 T_ITEM_* 로부터 한 번 전체 계산하고, 중단된 적재가 남긴 갱신 대기분을 처리합니다.
+    #     (ICount 컬럼이 없는 기존 T_ITEM_* 에는 컬럼을 추가합니다 - 시도 순서 기준)
+    ensure_traceability(conn)
+
+    # 15. T_SPC_MOMENTS (품목 × 측정 항목 × 일자 × PC × 근무조 모멘트: 관리도 / Cpk) / T_SPC_SKETCH (분포 스케치), spc_stats.py
+    ensure_spc(conn)
+    
+    conn.commit()
+
+def create_or_update_pc_info_streamlit(df_source, conn):
+    """T_PC_INFO 테이블을 생성 또는 업데이트합니다 (APPEND 모드)"""
+    PC_FIELD_MAP = {
+        'FwPC': 'FW', 'RfTxPC': 'RFTX', 'BatadcPC': 'BATADC'
+    }
+
+    pc_data = []
+
+    # pcbPC: PcbMaxIrPwr 값(100, 101, 102, 103)을 그대로 PC_ID로 사용
+    if 'PcbMaxIrPwr' in df_source.columns:
+        df_pcb_values = df_source[['PcbMaxIrPwr']].dropna().drop_duplicates()
+        for value in df_pcb_values['PcbMaxIrPwr']:
+            if isinstance(value, (int, float, np.float64)):
+                pc_id = str(int(value))
+                pc_data.append({'PC_ID': pc_id, 'PC_Type': 'PCB'})
+
+    # 기존 PC 코드 로직 (FwPC, RfTxPC, BatadcPC)
+    for col_name, item_prefix in PC_FIELD_MAP.items():
+        if col_name in df_source.columns:
+            unique_values = df_source[col_name].dropna().unique()
+            for value in unique_values:
+                pc_id = str(value)
+                pc_type = item_prefix
+                pc_data.append({'PC_ID': pc_id, 'PC_Type': pc_type})
+
+    if not pc_data:
+        return {'count': 0, 'message': "⚠️ T_PC_INFO: 추가할 PC 데이터가 없습니다."}
+
+    df_pc_info = pd.DataFrame(pc_data).drop_duplicates(subset=['PC_ID'])
+    
+    # 기존 PC_INFO 조회
+    try:
+        df_existing_pc = pd.read_sql("SELECT PC_ID FROM T_PC_INFO", conn)
+        if len(df_existing_pc) > 0:
+            df_new_pc = df_pc_info[~df_pc_info['PC_ID'].isin(df_existing_pc['PC_ID'])]
+            if len(df_new_pc) == 0:
+                return {'count': 0, 'message': "ℹ️ T_PC_INFO: 추가할 신규 PC 데이터가 없습니다."}
+            df_pc_info = df_new_pc
+    except:
+        pass
+    
+    df_pc_info.to_sql('T_PC_INFO', conn, if_exists='append', index=False)
+    return {'count': len(df_pc_info), 'message': f"✅ T_PC_INFO: {len(df_pc_info)}행 추가"}
+
+def collect_spec_rows(df_source, prefix, items_map):
+    """Min/Max 컬럼에서 고유 Spec 조합을 추출합니다. (청크 간 누적용)"""
+    all_spec_data = []
+    
+    for item_name, (min_col_suffix, max_col_suffix) in items_map.items():
+        min_col = f'{prefix}{min_col_suffix}{item_name}' 
+        max_col = f'{prefix}{max_col_suffix}{item_name}'
+        
+        if min_col not in df_source.columns or max_col not in df_source.columns:
+            continue
+            
+        df_temp = df_source[[min_col, max_col]].dropna()
+        if len(df_temp) == 0:
+            continue
+            
+        unique_specs = df_temp.drop_duplicates()
+
+        for min_value, max_value in unique_specs.itertuples(index=False):
+            all_spec_data.append({
+                'Measure_Item': item_name, 
+                'Min_Value': min_value, 
+                'Max_Value': max_value, 
+                'Spec_Key': f"{item_name}_{min_value}_{max_value}", 
+                'Start_Date': '2025-01-01'
+            })
+    return all_spec_data
+
+def save_spec_rows(all_spec_data, spec_table_name, conn):
+    """누적된 Spec 조합을 Spec 테이블에 저장합니다 (REPLACE 모드)"""
+    if not all_spec_data:
+        return {'count': 0, 'message': f"⚠️ {spec_table_name}: 저장할 고유 Min/Max 조합을 찾을 수 없습니다."}
+
+    df_spec = pd.DataFrame(all_spec_data).drop_duplicates(subset=['Spec_Key'])
+    df_spec['Spec_ID'] = range(1, len(df_spec) + 1)
+    df_spec = df_spec[['Spec_ID', 'Measure_Item', 'Min_Value', 'Max_Value', 'Start_Date', 'Spec_Key']]
+    
+    df_spec.to_sql(spec_table_name, conn, if_exists='replace', index=False)
+    bump_db_generation(conn)
+    return {'count': len(df_spec), 'message': f"✅ {spec_table_name}: {len(df_spec)}행 저장 (REPLACE)"}
+
+def merge_spec_rows(new_spec_data, spec_table_name, conn):
+    """기존 Spec 테이블에 없는 조합만 추가합니다. (증분 적재용 - 기존 Spec_ID 순서 유지, 신규 조합이 없으면 테이블 유지)"""
+    try:
+        existing = pd.read_sql(
+            f"SELECT Measure_Item, Min_Value, Max_Value, Start_Date, Spec_Key FROM {spec_table_name} ORDER BY Spec_ID", conn
+        ).to_dict('records')
+    except Exception:
+        existing = []
+    known_keys = {row['Spec_Key'] for row in existing}
+    added = [row for row in new_spec_data if row['Spec_Key'] not in known_keys]
+    if not added:
+        return {'count': 0, 'message': f"ℹ️ {spec_table_name}: 신규 Spec 조합 없음"}
+    result = save_spec_rows(existing + added, spec_table_name, conn)
+    result['message'] = f"✅ {spec_table_name}: 신규 Spec 조합 {len({row['Spec_Key'] for row in added})}개 추가 (전체 {result['count']}행)"
+    return result
+
+def extract_and_save_spec_streamlit(df_source, prefix, items_map, spec_table_name, conn):
+    """Min/Max 추출 및 Spec 테이블 저장 (REPLACE 모드)"""
+    return save_spec_rows(collect_spec_rows(df_source, prefix, items_map), spec_table_name, conn)
+
+def bump_db_generation(conn):
+    """T_DB_META의 DB 세대 번호를 1 증가시킵니다. (커밋은 호출 측 담당 - 데이터 변경과 같은 트랜잭션)"""
+    conn.execute("CREATE TABLE IF NOT EXISTS T_DB_META (Meta_Key TEXT PRIMARY KEY, Meta_Value INTEGER)")
+    conn.execute(
+        "INSERT INTO T_DB_META (Meta_Key, Meta_Value) VALUES ('generation', 1) "
+        "ON CONFLICT(Meta_Key) DO UPDATE SET Meta_Value = Meta_Value + 1"
+    )
+
+def get_db_generation(conn):
+    """DB 세대 번호를 읽습니다. (T_DB_META가 없는 이전 DB는 0)"""
+    try:
+        row = conn.execute("SELECT Meta_Value FROM T_DB_META WHERE Meta_Key = 'generation'").fetchone()
+    except DB_ERRORS:
+        return 0
+    return row[0] if row and row[0] is not None else 0
+
+def _insert_or_ignore(conn, table_name, df, columns):
+    """PRIMARY KEY 중복 행은 건너뛰고 신규 행만 INSERT 합니다. 추가된 행 수를 반환합니다."""
+    if len(df) == 0:
+        return 0
+    df_values = df.reindex(columns=columns).astype(object)
+    df_values = df_values.where(df_values.notna(), None)
+    placeholders = ', '.join(['?'] * len(columns))
+    before = conn.total_changes
+    conn.executemany(
+        f"INSERT OR IGNORE INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})",
+        df_values.itertuples(index=False, name=None)
+    )
+    return conn.total_changes - before
+
+def _normalize_pass(series):
+    return series.astype(str).str.lower().replace({'nan': None, 'none': None})
+
+def prepare_chunk(df_chunk):
+    """날짜 변환, WEEK_NO, pcbPC/semiPC 파생 컬럼을 청크 단위로 생성합니다."""
+    df_chunk = transform_datetime_columns(df_chunk, DATE_COLUMNS_TO_CONVERT)
+    df_chunk['WEEK_NO'] = df_chunk['Stamp'].apply(calculate_week_number) if 'Stamp' in df_chunk.columns else None
+
+    if 'PcbMaxIrPwr' in df_chunk.columns:
+        df_chunk['pcbPC'] = df_chunk['PcbMaxIrPwr'].apply(
+            lambda x: str(int(x)) if pd.notna(x) and isinstance(x, (int, float, np.float64)) else None
+        )
+    else:
+        df_chunk['pcbPC'] = None
+
+    df_chunk['semiPC'] = None
+    return df_chunk
+
+def save_chunk_to_db(df_chunk, conn):
+    """
+    전처리된 청크 1개를 T_MASTER_DATA / T_ITEM_* / T_PC_INFO에 저장합니다 (커밋은 호출 측 담당).
+    반환: (stats, log_messages)
+    """
+    stats = {}
+    log_messages = []
+
+    # T_MASTER_DATA (SNumber 기준 신규만)
+    if 'SNumber' in df_chunk.columns:
+        df_master = df_chunk.dropna(subset=['SNumber']).reindex(columns=MASTER_COLUMNS).drop_duplicates(subset=['SNumber'])
+        stats['master'] = _insert_or_ignore(conn, 'T_MASTER_DATA', df_master, MASTER_COLUMNS)
+    else:
+        stats['master'] = 0
+
+    # T_ITEM_* (SNumber + 시간 기준 신규만)
+    for stat_key, table_name, time_col, pass_col, columns in ITEM_TABLE_SPECS:
+        if 'SNumber' not in df_chunk.columns or time_col not in df_chunk.columns:
+            stats[stat_key] = 0
+            continue
+
+        df_item = df_chunk.dropna(subset=['SNumber', time_col]).reindex(columns=columns)
+        if pass_col in df_chunk.columns:
+            df_item[pass_col] = _normalize_pass(df_item[pass_col])
+        else:
+            log_messages.append(f"⚠️ CSV에 {pass_col} 컬럼 없음 - NULL로 저장")
+
+        df_item = df_item.drop_duplicates(subset=['SNumber', time_col], keep='first')
+        stats[stat_key] = _insert_or_ignore(conn, table_name, df_item, columns)
+        # T_SPC_MOMENTS: 행이 추가된 일자를 갱신 대기로 표시 (적재가 끝나면 flush_spc_stats)
+        if stats[stat_key]:
+            mark_spc_pending(conn, stat_key, df_item[time_col].astype(str).str[:10].unique())
+
+    # T_PC_INFO
+    pc_info_result = create_or_update_pc_info_streamlit(df_chunk, conn)
+    stats['pc_info'] = pc_info_result['count']
+
+    # T_UNIT_STATUS / T_ATTEMPT_INDEX: 검사 행이 추가된 SNumber를 갱신 대기로 표시 (적재가 끝나면 flush_traceability)
+    if 'SNumber' in df_chunk.columns and any(stats[spec[0]] for spec in ITEM_TABLE_SPECS):
+        mark_pending(conn, df_chunk['SNumber'].dropna().unique())
+
+    if any(stats.values()):
+        bump_db_generation(conn)
+
+    return stats, log_messages
+
+def flush_traceability(conn, log_messages):
+    """적재 중 표시된 SNumber의 T_UNIT_STATUS / T_ATTEMPT_INDEX를 다시 계산하고 커밋합니다. (파일/동기화 끝에 1회)"""
+    with span('ingest.traceability') as current:
+        n_units = flush_pending(conn)
+        current.set_rows(n_units)
+    if n_units:
+        log_messages.append(f"✅ 공정 이력(T_UNIT_STATUS / T_ATTEMPT_INDEX) {n_units:,}개 SNumber 갱신")
+    return n_units
+
+def flush_spc_stats(conn, log_messages):
+    """적재 중 표시된 (품목, 일자)의 T_SPC_MOMENTS / T_SPC_SKETCH를 다시 계산하고 커밋합니다. (파일/동기화 끝에 1회)"""
+    with span('ingest.spc') as current:
+        n_days = flush_spc(conn)
+        current.set_rows(n_days)
+    if n_days:
+        log_messages.append(f"✅ SPC 통계(T_SPC_MOMENTS / T_SPC_SKETCH) {n_days:,}개 품목 × 일자 갱신")
+    return n_days
+
+def _merge_stats(total, stats):
+    for key, value in stats.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+def format_stats_log(stats):
+    messages = []
+    for stat_key, table_name in [('master', 'T_MASTER_DATA')] + [(spec[0], spec[1]) for spec in ITEM_TABLE_SPECS] + [('pc_info', 'T_PC_INFO')]:
+        count = stats.get(stat_key, 0)
+        messages.append(f"✅ {table_name}: {count}행 추가" if count > 0 else f"ℹ️ {table_name}: 신규 데이터 없음")
+    if 'parquet_rows' in stats:
+        messages.append(f"✅ Parquet 미러: {stats['parquet_rows']}행 기록")
+    return messages
+
+def compute_source_key(file_obj, chunk_rows, block_size=1024 * 1024):
+    """파일 내용 해시 + 청크 크기로 적재 재개용 키를 만듭니다. (파일 위치는 처음으로 되돌립니다)"""
+    sha1 = hashlib.sha1()
+    file_obj.seek(0)
+    while True:
+        block = file_obj.read(block_size)
+        if not block:
+            break
+        sha1.update(block if isinstance(block, bytes) else block.encode('utf-8'))
+    file_obj.seek(0)
+    return f"{sha1.hexdigest()}:{chunk_rows}"
+
+def _mirror_tag(chunk_no):
+    """Parquet 파일명 태그. 같은 초에 여러 파일/프로세스가 적재해도 겹치지 않도록 난수를 붙입니다."""
+    return f"{datetime.now():%Y%m%d%H%M%S}-c{chunk_no:05d}-{uuid.uuid4().hex[:6]}"
+
+def _mirror_new_rows(conn, marks, mirror_dir, tag, stats, log_messages):
+    """커밋된 청크의 신규 행을 Parquet 미러에 기록합니다. 미러 실패는 DB 적재를 되돌리지 않습니다."""
+    if not parquet_mirror.is_available():
+        if "⚠️ pyarrow 미설치 - Parquet 미러 기록 생략" not in log_messages:
+            log_messages.append("⚠️ pyarrow 미설치 - Parquet 미러 기록 생략")
+        return
+    try:
+        written = parquet_mirror.mirror_rows_since(conn, marks, mirror_dir, tag)
+        stats['parquet_rows'] = stats.get('parquet_rows', 0) + sum(written.values())
+    except Exception as e:
+        log_messages.append(f"⚠️ Parquet 미러 기록 실패 (DB 적재는 완료, '미러 재구성'으로 복구 가능): {e}")
+
+def catch_up_mirror(conn, mirror_dir, stats, log_messages):
+    """
+    미러 기록 위치 이후의 행(이전 적재의 미러 실패분, 다른 프로세스가 남긴 행)을 먼저 기록합니다.
+    재개된 적재는 완료된 청크를 건너뛰어 그 청크의 미러 기록도 다시 하지 않으므로, 적재 시작 시 호출합니다.
+    """
+    _mirror_new_rows(conn, parquet_mirror.capture_rowid_marks(conn), mirror_dir, _mirror_tag(0), stats, log_messages)
+
+def save_prepared_chunk(conn, df_chunk, chunk_no, stats, log_messages, source_key=None, mirror_dir=None):
+    """
+    prepare_chunk를 거친 청크 1개를 저장하고 커밋합니다. (T_INGEST_LOG 기록, Parquet 미러 포함)
+    청크 통계는 stats에 누적하고, 로그는 중복 없이 log_messages에 추가합니다. 반환: 청크 통계
+    """
+    marks = parquet_mirror.capture_rowid_marks(conn) if mirror_dir else None
+    with span('ingest.save_tables', rows=len(df_chunk)):
+        chunk_stats, chunk_log = save_chunk_to_db(df_chunk, conn)
+        if source_key:
+            conn.execute(
+                "INSERT OR REPLACE INTO T_INGEST_LOG (Source_Key, Chunk_No, Row_Count, Done_At) VALUES (?, ?, ?, ?)",
+                (source_key, chunk_no, len(df_chunk), datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+        conn.commit()
+    if mirror_dir:
+        with span('ingest.mirror'):
+            _mirror_new_rows(conn, marks, mirror_dir, _mirror_tag(chunk_no), chunk_stats, chunk_log)
+
+    _merge_stats(stats, chunk_stats)
+    for message in chunk_log:
+        if message not in log_messages:
+            log_messages.append(message)
+    return chunk_stats
+
+def _timed_chunks(reader):
+    """청크 읽기(CSV 파싱)를 'ingest.read_chunk' span으로 측정하며 청크를 돌려줍니다."""
+    while True:
+        with span('ingest.read_chunk') as current:
+            df_chunk = next(reader, None)
+            if df_chunk is not None:
+                current.set_rows(len(df_chunk))
+        if df_chunk is None:
+            return
+        yield df_chunk
+
+def _prepare_chunk_timed(df_chunk):
+    with span('ingest.prepare', rows=len(df_chunk)):
+        return prepare_chunk(df_chunk)
+
+def _collect_chunk_specs(df_chunk, pcb_specs, semi_specs):
+    with span('ingest.collect_specs', rows=len(df_chunk)):
+        pcb_specs.extend(collect_spec_rows(df_chunk, 'Pcb', PCB_ITEMS_MAP))
+        semi_specs.extend(collect_spec_rows(df_chunk, 'SemiAssy', SEMI_ITEMS_MAP))
+
+def parse_csv_file(csv_path, chunk_rows=INGEST_CHUNK_ROWS, skip_chunks=()):
+    """
+    CSV를 청크 단위로 읽어 prepare_chunk까지 수행합니다. (DB에 접근하지 않으므로 워커 프로세스에서 실행 가능)
+    skip_chunks의 청크(이미 적재됨)는 전처리하지 않지만 Spec 조합은 수집합니다.
+    반환: {'path', 'rows', 'n_chunks', 'chunks': [(chunk_no, df)], 'pcb_specs', 'semi_specs'}
+    """
+    skip_chunks = set(skip_chunks)
+    parsed = {'path': csv_path, 'rows': 0, 'n_chunks': 0, 'chunks': [], 'pcb_specs': [], 'semi_specs': []}
+    reader = pd.read_csv(csv_path, encoding='utf-8', low_memory=False, dtype={'SNumber': str}, chunksize=chunk_rows)
+    for chunk_no, df_chunk in enumerate(_timed_chunks(reader)):
+        parsed['rows'] += len(df_chunk)
+        parsed['n_chunks'] = chunk_no + 1
+        _collect_chunk_specs(df_chunk, parsed['pcb_specs'], parsed['semi_specs'])
+        if chunk_no not in skip_chunks:
+            parsed['chunks'].append((chunk_no, _prepare_chunk_timed(df_chunk)))
+    return parsed
+
+def load_done_chunks(conn, source_key):
+    """T_INGEST_LOG에서 source_key로 이미 적재된 청크 번호 집합을 읽습니다."""
+    return {row[0] for row in conn.execute("SELECT Chunk_No FROM T_INGEST_LOG WHERE Source_Key = ?", (source_key,))}
+
+def clear_ingest_log(conn, source_key=None):
+    """
+    T_INGEST_LOG에서 source_key(없으면 전체)의 청크 이력을 지웁니다. (커밋은 호출 측 담당) 반환: 삭제 행 수
+    이력은 중단된 적재를 재개할 때만 필요하므로, 파일 적재가 끝나거나 주차 삭제로 적재분이 사라지면 지웁니다.
+    남겨 두면 같은 CSV를 다시 적재할 때 모든 청크를 건너뛰어 삭제된 행이 복구되지 않습니다.
+    """
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'T_INGEST_LOG'").fetchone():
+        return 0
+    if source_key is None:
+        return conn.execute("DELETE FROM T_INGEST_LOG").rowcount
+    return conn.execute("DELETE FROM T_INGEST_LOG WHERE Source_Key = ?", (source_key,)).rowcount
+
+def get_sync_watermark(conn, source):
+    """T_SYNC_STATE에서 source의 마지막 동기화 Id를 읽습니다. (없으면 0)"""
+    row = conn.execute("SELECT Last_Id FROM T_SYNC_STATE WHERE Source = ?", (source,)).fetchone()
+    return row[0] if row and row[0] is not None else 0
+
+def set_sync_watermark(conn, source, last_id):
+    """source의 마지막 동기화 Id를 기록하고 커밋합니다."""
+    conn.execute(
+        "INSERT OR REPLACE INTO T_SYNC_STATE (Source, Last_Id, Updated_At) VALUES (?, ?, ?)",
+        (source, int(last_id), datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    )
+    conn.commit()
+
+def collect_item_days(df_chunk, days_by_item):
+    """전처리된 청크에 포함된 품목별 일자(YYYY-MM-DD)를 days_by_item({통계 키: set})에 모읍니다."""
+    for stat_key, _, time_col, _, _ in ITEM_TABLE_SPECS:
+        if time_col in df_chunk.columns:
+            days = df_chunk[time_col].dropna().astype(str).str[:10]
+            days_by_item.setdefault(stat_key, set()).update(d for d in days.unique() if len(d) == 10)
+
+# ---------------------------------------------------------------------------
+# 검사 스테이션 DB(historyinspection) → T_* 직접 동기화
+# 스테이션 DB를 ATTACH 하여 워터마크(Id) 이후 행만 INSERT ... SELECT 로 옮깁니다. (pandas 미사용)
+# 변환 규칙은 prepare_chunk / save_chunk_to_db 와 같습니다:
+#   날짜(YYYYMMDDhhmmss[.f] → 'YYYY-MM-DD HH:MM:SS', Epoch ms → KST), WEEK_NO, pcbPC, Pass 소문자, 빈 문자열 → NULL
+# ---------------------------------------------------------------------------
+
+STATION_TABLE = 'historyinspection'
+STATION_ALIAS = 'station'
+STATION_BATCH_ROWS = 5000
+_SYNC_BATCH_TABLE = 'temp._station_batch'
+# pd.read_csv 기본 결측 문자열 (CSV 내보내기 → 업로드 경로와 같은 값을 NULL로 봅니다)
+_STATION_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                      '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+def _sql_datetime(col):
+    """transform_datetime_columns와 같은 변환을 SQL 식으로 만듭니다."""
+    head = f"(CASE WHEN instr({col}, '.') > 0 THEN substr({col}, 1, instr({col}, '.') - 1) ELSE {col} END)"
+    iso = (f"datetime(substr({col}, 1, 4) || '-' || substr({col}, 5, 2) || '-' || substr({col}, 7, 2) || ' ' || "
+           f"substr({col}, 9, 2) || ':' || substr({col}, 11, 2) || ':' || substr({col}, 13, 2))")
+    return (
+        f"CASE WHEN {col} IS NULL THEN NULL "
+        f"WHEN length({head}) = 14 AND {col} GLOB '20*' AND {head} NOT GLOB '*[^0-9]*' THEN COALESCE({iso}, {col}) "
+        f"WHEN {col} GLOB '[0-9]*.[0-9]*' AND {col} NOT GLOB '*[^0-9.]*' AND {col} NOT GLOB '*.*.*' "
+        f"THEN datetime(CAST({col} AS REAL) / 1000, 'unixepoch', '+9 hours') "
+        f"ELSE {col} END"
+    )
+
+def _sql_week_no(col):
+    """calculate_week_number와 같은 'YYYY-W##' (연도는 달력 연도, 주차는 ISO 주차)"""
+    return (
+        f"CASE WHEN {col} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]' "
+        f"AND date({col}) IS NOT NULL "
+        f"THEN substr({col}, 1, 4) || '-W' || printf('%02d', (CAST(strftime('%j', date({col}, '-3 days', 'weekday 4')) AS INTEGER) - 1) / 7 + 1) "
+        f"END"
+    )
+
+def _sql_pc_from_number(col):
+    """PcbMaxIrPwr 숫자 값 → PC_ID 문자열 (str(int(x))와 같음)"""
+    return (f"CASE WHEN {col} GLOB '*[0-9]*' AND {col} NOT GLOB '*[^0-9.eE+-]*' "
+            f"THEN CAST(CAST(CAST({col} AS REAL) AS INTEGER) AS TEXT) END")
+
+def _sql_pass(col):
+    return f"CASE WHEN lower({col}) IN ('nan', 'none') THEN NULL ELSE lower({col}) END"
+
+def _station_batch_select(station_columns):
+    """스테이션 행 → 배치 임시 테이블 SELECT 식. 스테이션에 없는 컬럼은 NULL 입니다."""
+    wanted = [c for c in MASTER_COLUMNS if c != 'WEEK_NO']
+    for _, _, _, _, columns in ITEM_TABLE_SPECS:
+        wanted += [c for c in columns if c not in ('pcbPC', 'semiPC')]
+    for prefix, items_map in (('Pcb', PCB_ITEMS_MAP), ('SemiAssy', SEMI_ITEMS_MAP)):
+        for item_name, (min_suffix, max_suffix) in items_map.items():
+            wanted += [f'{prefix}{min_suffix}{item_name}', f'{prefix}{max_suffix}{item_name}']
+    wanted = list(dict.fromkeys(wanted))
+
+    # 1단계: 결측 문자열 → NULL, 숫자로 저장된 값은 문자열로 (CSV를 문자열로 읽은 것과 같게)
+    na_values = ', '.join(f"'{v}'" for v in _STATION_NA_VALUES)
+    raw = [f"CASE WHEN CAST({c} AS TEXT) IN ({na_values}) THEN NULL ELSE CAST({c} AS TEXT) END AS {c}"
+           if c in station_columns else f"NULL AS {c}" for c in wanted]
+    # 2단계: 날짜 / pcbPC 변환
+    derived = [f"{_sql_datetime(c)} AS {c}" if c in DATE_COLUMNS_TO_CONVERT else c for c in wanted]
+    derived.append(f"{_sql_pc_from_number('PcbMaxIrPwr')} AS pcbPC")
+    derived.append("NULL AS semiPC")
+    return (
+        f"SELECT Id, {', '.join(derived)} FROM ("
+        f"SELECT Id, {', '.join(raw)} FROM {STATION_ALIAS}.{STATION_TABLE} WHERE Id > ? ORDER BY Id LIMIT ?)"
+    )
+
+def _insert_select(conn, sql, params=()):
+    before = conn.total_changes
+    conn.execute(sql, params)
+    return conn.total_changes - before
+
+def _save_station_batch(conn, station_columns, log_messages):
+    """배치 임시 테이블 → T_MASTER_DATA / T_ITEM_* / T_PC_INFO (커밋은 호출 측 담당). 반환: stats"""
+    stats = {}
+    master_select = [_sql_week_no('Stamp') if c == 'WEEK_NO' else c for c in MASTER_COLUMNS]
+    stats['master'] = _insert_select(conn, (
+        f"INSERT OR IGNORE INTO T_MASTER_DATA ({', '.join(MASTER_COLUMNS)}) "
+        f"SELECT {', '.join(master_select)} FROM {_SYNC_BATCH_TABLE} WHERE SNumber IS NOT NULL ORDER BY Id"
+    ))
+
+    for stat_key, table_name, time_col, pass_col, columns in ITEM_TABLE_SPECS:
+        if time_col not in station_columns:
+            stats[stat_key] = 0
+            continue
+        if pass_col not in station_columns:
+            message = f"⚠️ 스테이션 DB에 {pass_col} 컬럼 없음 - NULL로 저장"
+            if message not in log_messages:
+                log_messages.append(message)
+        select = [_sql_pass(c) if c == pass_col else c for c in columns]
+        stats[stat_key] = _insert_select(conn, (
+            f"INSERT OR IGNORE INTO {table_name} ({', '.join(columns)}) "
+            f"SELECT {', '.join(select)} FROM {_SYNC_BATCH_TABLE} "
+            f"WHERE SNumber IS NOT NULL AND {time_col} IS NOT NULL ORDER BY Id"
+        ))
+        if stats[stat_key] and stat_key in SPC_ITEMS:
+            days = conn.execute(f"SELECT DISTINCT substr({time_col}, 1, 10) FROM {_SYNC_BATCH_TABLE} "
+                                f"WHERE SNumber IS NOT NULL AND {time_col} IS NOT NULL").fetchall()
+            mark_spc_pending(conn, stat_key, [row[0] for row in days])
+
+    # T_PC_INFO: create_or_update_pc_info_streamlit과 같은 순서(PCB → FW → RFTX → BATADC)로 신규 PC만 추가
+    pc_sources = [('pcbPC', 'PCB', 1), ('FwPC', 'FW', 2), ('RfTxPC', 'RFTX', 3), ('BatadcPC', 'BATADC', 4)]
+    union = ' UNION ALL '.join(
+        f"SELECT {col} AS PC_ID, '{pc_type}' AS PC_Type, {order} AS Src, Id FROM {_SYNC_BATCH_TABLE} WHERE {col} IS NOT NULL"
+        for col, pc_type, order in pc_sources
+    )
+    stats['pc_info'] = _insert_select(conn, (
+        f"INSERT OR IGNORE INTO T_PC_INFO (PC_ID, PC_Type) SELECT PC_ID, PC_Type FROM ({union}) ORDER BY Src, Id"
+    ))
+    if any(stats[spec[0]] for spec in ITEM_TABLE_SPECS):
+        mark_pending(conn, keys_sql=f"SELECT SNumber FROM {_SYNC_BATCH_TABLE}")
+    if any(stats.values()):
+        bump_db_generation(conn)
+    return stats
+
+def _collect_batch_specs(conn, prefix, items_map, spec_rows):
+    """배치 임시 테이블에서 고유 Min/Max 조합을 모읍니다. (collect_spec_rows와 같은 행 형식)"""
+    for item_name, (min_suffix, max_suffix) in items_map.items():
+        min_col, max_col = f'{prefix}{min_suffix}{item_name}', f'{prefix}{max_suffix}{item_name}'
+        rows = conn.execute(
+            f"SELECT DISTINCT {min_col}, {max_col} FROM {_SYNC_BATCH_TABLE} "
+            f"WHERE {min_col} IS NOT NULL AND {max_col} IS NOT NULL"
+        ).fetchall()
+        for min_text, max_text in rows:
+            min_value, max_value = _spec_number(min_text), _spec_number(max_text)
+            spec_rows.append({
+                'Measure_Item': item_name, 'Min_Value': min_value, 'Max_Value': max_value,
+                'Spec_Key': f"{item_name}_{min_value}_{max_value}", 'Start_Date': '2025-01-01'
+            })
+
+def _spec_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+def _collect_batch_days(conn, days_by_item):
+    for stat_key, _, time_col, _, _ in ITEM_TABLE_SPECS:
+        days = conn.execute(
+            f"SELECT DISTINCT substr({time_col}, 1, 10) FROM {_SYNC_BATCH_TABLE} WHERE length({time_col}) >= 10"
+        ).fetchall()
+        days_by_item.setdefault(stat_key, set()).update(row[0] for row in days)
+
+def station_source_key(station_path):
+    """T_SYNC_STATE의 Source 키: '<절대 경로>::historyinspection'"""
+    return f"{os.path.abspath(station_path)}::{STATION_TABLE}"
+
+def sync_station_db(conn, station_path, batch_rows=STATION_BATCH_ROWS, mirror_dir=None, stats=None,
+                    log_messages=None, days_by_item=None):
+    """
+    검사 스테이션 DB 1개의 historyinspection에서 워터마크 이후 행을 T_* 테이블에 동기화합니다.
+    스테이션 DB를 읽기 전용으로 ATTACH 하고, batch_rows 행마다 임시 테이블 → INSERT OR IGNORE ... SELECT 후
+    워터마크와 함께 커밋합니다. (중단되어도 다음 실행에서 커밋된 배치 이후부터 이어서 적재)
+    Spec 조합은 기존 테이블에 없는 것만 추가합니다. 반환: {'rows', 'batches', 'first_id', 'last_id', 'restarted'}
+    """
+    stats = stats if stats is not None else {}
+    log_messages = log_messages if log_messages is not None else []
+    days_by_item = days_by_item if days_by_item is not None else {}
+    source = station_source_key(station_path)
+
+    conn.commit()
+    uri = 'file:' + os.path.abspath(station_path).replace('\\', '/') + '?mode=ro'
+    conn.execute(f"ATTACH DATABASE ? AS {STATION_ALIAS}", (uri,))
+    try:
+        station_columns = {row[1] for row in conn.execute(f"PRAGMA {STATION_ALIAS}.table_info({STATION_TABLE})")}
+        if 'Id' not in station_columns:
+            raise ValueError(f"{STATION_TABLE} 테이블 또는 Id 컬럼이 없습니다.")
+
+        watermark = get_sync_watermark(conn, source)
+        max_id = conn.execute(f"SELECT COALESCE(MAX(Id), 0) FROM {STATION_ALIAS}.{STATION_TABLE}").fetchone()[0]
+        # 스테이션 DB가 새 파일로 교체되어 Id가 다시 시작된 경우 처음부터 읽습니다. (중복은 INSERT OR IGNORE로 무시)
+        result = {'rows': 0, 'batches': 0, 'first_id': watermark, 'last_id': watermark, 'restarted': max_id < watermark}
+        if result['restarted']:
+            watermark = result['first_id'] = result['last_id'] = 0
+
+        batch_select = _station_batch_select(station_columns)
+        pcb_specs, semi_specs = [], []
+        while result['last_id'] < max_id:
+            conn.execute(f"DROP TABLE IF EXISTS {_SYNC_BATCH_TABLE}")
+            conn.execute(f"CREATE TEMP TABLE _station_batch AS {batch_select}", (result['last_id'], batch_rows))
+            n_rows, last_id = conn.execute(f"SELECT COUNT(*), MAX(Id) FROM {_SYNC_BATCH_TABLE}").fetchone()
+            if not n_rows:
+                break
+
+            marks = parquet_mirror.capture_rowid_marks(conn) if mirror_dir else None
+            batch_log = []
+            batch_stats = _save_station_batch(conn, station_columns, batch_log)
+            _collect_batch_specs(conn, 'Pcb', PCB_ITEMS_MAP, pcb_specs)
+            _collect_batch_specs(conn, 'SemiAssy', SEMI_ITEMS_MAP, semi_specs)
+            _collect_batch_days(conn, days_by_item)
+            conn.execute(
+                "INSERT OR REPLACE INTO T_SYNC_STATE (Source, Last_Id, Updated_At) VALUES (?, ?, ?)",
+                (source, int(last_id), datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            conn.commit()
+            if mirror_dir:
+                _mirror_new_rows(conn, marks, mirror_dir, _mirror_tag(result['batches']), batch_stats, batch_log)
+
+            _merge_stats(stats, batch_stats)
+            for message in batch_log:
+                if message not in log_messages:
+                    log_messages.append(message)
+            result['rows'] += n_rows
+            result['batches'] += 1
+            result['last_id'] = last_id
+
+        conn.execute(f"DROP TABLE IF EXISTS {_SYNC_BATCH_TABLE}")
+        for spec_rows, spec_table, stat_key in ((pcb_specs, 'T_SPEC_PCB', 'spec_pcb'), (semi_specs, 'T_SPEC_SEMI', 'spec_semi')):
+            if spec_rows:
+                spec_result = merge_spec_rows(spec_rows, spec_table, conn)
+                if spec_result['count']:
+                    stats[stat_key] = stats.get(stat_key, 0) + spec_result['count']
+                    log_messages.append(spec_result['message'])
+        conn.commit()
+        flush_traceability(conn, log_messages)
+        flush_spc_stats(conn, log_messages)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute(f"DETACH DATABASE {STATION_ALIAS}")
+    return result
+
+def process_and_save_csv_stream_to_db(csv_source, db_file_name, chunk_rows=INGEST_CHUNK_ROWS, source_key=None, progress_callback=None, mirror_dir=None):
+    """
+    CSV를 chunk_rows 행 단위로 스트리밍하여 DB에 저장합니다. (APPEND 모드)
+    - 청크마다 날짜 변환/파생 컬럼/테이블 INSERT 후 커밋하므로 메모리는 청크 크기로 제한됩니다.
+    - source_key가 주어지면 T_INGEST_LOG에 완료된 청크를 기록하고, 같은 키로 다시 실행 시 건너뜁니다.
+      파일 전체가 적재되면 이력을 지우므로, 이후 같은 파일을 다시 적재하면 처음부터 읽습니다. (중복 행은 INSERT OR IGNORE)
+    - Spec(Min/Max) 조합은 청크 간 누적 후 마지막에 REPLACE 저장합니다.
+    progress_callback(chunk_no, rows_done, stats)는 청크 완료마다 호출됩니다.
+    mirror_dir가 주어지면 청크마다 신규 행을 WEEK_NO 파티션 Parquet 미러에도 기록합니다.
+    """
+    log_messages = []
+    stats = {}
+    conn = None
+    
+    try:
+        conn = sqlite3.connect(db_file_name)
+        cursor = conn.cursor()
+        create_initial_db_schema(cursor, conn)
+        cursor.execute("PRAGMA foreign_keys = ON;")
+        log_messages.append("✅ DB 연결 및 스키마 확인 성공")
+
+        done_chunks = set()
+        if source_key:
+            done_chunks = load_done_chunks(conn, source_key)
+            if done_chunks:
+                log_messages.append(f"ℹ️ 이전 적재 이력 발견: {len(done_chunks)}개 청크 건너뜀")
+        if mirror_dir:
+            catch_up_mirror(conn, mirror_dir, stats, log_messages)
+
+        pcb_specs = []
+        semi_specs = []
+        rows_done = 0
+        chunk_no = -1
+
+        reader = pd.read_csv(csv_source, encoding='utf-8', low_memory=False, dtype={'SNumber': str}, chunksize=chunk_rows)
+        for chunk_no, df_chunk in enumerate(_timed_chunks(reader)):
+            rows_done += len(df_chunk)
+            # Spec 조합은 건너뛰는 청크도 포함해야 REPLACE 결과가 파일 전체와 같습니다.
+            _collect_chunk_specs(df_chunk, pcb_specs, semi_specs)
+
+            if chunk_no in done_chunks:
+                continue
+
+            save_prepared_chunk(conn, _prepare_chunk_timed(df_chunk), chunk_no, stats, log_messages, source_key, mirror_dir)
+            if progress_callback:
+                progress_callback(chunk_no, rows_done, stats)
+
+        log_messages.append(f"✅ CSV {rows_done:,}행 / {chunk_no + 1}개 청크 처리 완료 (청크 크기 {chunk_rows:,}행)")
+        log_messages.extend(format_stats_log(stats))
+
+        log_messages.append("\n📋 T_SPEC 테이블 저장...")
+        with span('ingest.save_specs', rows=len(pcb_specs) + len(semi_specs)):
+            spec_pcb_result = save_spec_rows(pcb_specs, 'T_SPEC_PCB', conn)
+            stats['spec_pcb'] = spec_pcb_result['count']
+            log_messages.append(spec_pcb_result['message'])
+
+            spec_semi_result = save_spec_rows(semi_specs, 'T_SPEC_SEMI', conn)
+            stats['spec_semi'] = spec_semi_result['count']
+            log_messages.append(spec_semi_result['message'])
+
+            conn.commit()
+        flush_traceability(conn, log_messages)
+        flush_spc_stats(conn, log_messages)
+        if source_key:
+            clear_ingest_log(conn, source_key)
+            conn.commit()
+        log_messages.append("\n✅ DB 저장 완료")
+        
+        return {
+            'success': True,
+            'stats': stats,
+            'log': '\n'.join(log_messages)
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'log': '\n'.join(log_messages)
+        }
+    finally:
+        if conn:
+            conn.close()
+
+def process_and_save_csv_to_db(df_original, db_file_name, mirror_dir=None):
+    """이미 메모리에 로드된 DataFrame을 DB에 저장합니다. (APPEND 모드, 단일 청크)"""
+    log_messages = []
+    conn = None
+    
+    try:
+        conn = sqlite3.connect(db_file_name)
+        cursor = conn.cursor()
+        create_initial_db_schema(cursor, conn)
+        cursor.execute("PRAGMA foreign_keys = ON;")
+        log_messages.append("✅ DB 연결 및 스키마 확인 성공")
+
+        df_original = _prepare_chunk_timed(df_original)
+        log_messages.append("✅ 날짜 컬럼 변환 / WEEK_NO / pcbPC 생성 완료")
+
+        marks = parquet_mirror.capture_rowid_marks(conn) if mirror_dir else None
+        with span('ingest.save_tables', rows=len(df_original)):
+            stats, chunk_log = save_chunk_to_db(df_original, conn)
+        if mirror_dir:
+            conn.commit()
+            with span('ingest.mirror'):
+                _mirror_new_rows(conn, marks, mirror_dir, _mirror_tag(0), stats, chunk_log)
+        log_messages.extend(chunk_log)
+        log_messages.extend(format_stats_log(stats))
+
+        with span('ingest.save_specs', rows=len(df_original)):
+            spec_pcb_result = extract_and_save_spec_streamlit(df_original, 'Pcb', PCB_ITEMS_MAP, 'T_SPEC_PCB', conn)
+            stats['spec_pcb'] = spec_pcb_result['count']
+            log_messages.append(spec_pcb_result['message'])
+
+            spec_semi_result = extract_and_save_spec_streamlit(df_original, 'SemiAssy', SEMI_ITEMS_MAP, 'T_SPEC_SEMI', conn)
+            stats['spec_semi'] = spec_semi_result['count']
+            log_messages.append(spec_semi_result['message'])
+
+            conn.commit()
+        flush_traceability(conn, log_messages)
+        flush_spc_stats(conn, log_messages)
+        log_messages.append("\n✅ DB 저장 완료")
+        
+        return {
+            'success': True,
+            'stats': stats,
+            'log': '\n'.join(log_messages)
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'log': '\n'.join(log_messages)
+        }
+    finally:
+        if conn:
+            conn.close()
+
+def delete_weeks_from_db(db_file_name, weeks, mirror_dir=None):
+    """
+    선택한 WEEK_NO의 T_MASTER_DATA 행과 해당 SNumber의 T_ITEM_* 행을 삭제합니다.
+    mirror_dir가 주어지면 Parquet 미러의 같은 WEEK_NO 파티션도 삭제합니다. 반환: 테이블별 삭제 행 수
+    """
+    deleted = {}
+    if not weeks:
+        return deleted
+
+    placeholders = ', '.join(['?'] * len(weeks))
+    snumber_subquery = f"SELECT SNumber FROM T_MASTER_DATA WHERE WEEK_NO IN ({placeholders})"
+
+    conn = sqlite3.connect(db_file_name)
+    try:
+        cursor = conn.cursor()
+        # FOREIGN KEY 제약조건 임시 비활성화 (T_ITEM_* → T_MASTER_DATA 순서로 삭제)
+        cursor.execute("PRAGMA foreign_keys = OFF;")
+        # T_SPC_MOMENTS: 삭제될 행이 있는 일자를 표시해 두고 삭제 후 다시 계산합니다.
+        create_spc_schema(cursor)
+        for stat_key, (table_name, time_col, _, _, _) in SPC_ITEMS.items():
+            days = cursor.execute(f"SELECT DISTINCT substr({time_col}, 1, 10) FROM {table_name} "
+                                  f"WHERE SNumber IN ({snumber_subquery})", list(weeks)).fetchall()
+            mark_spc_pending(conn, stat_key, [row[0] for row in days])
+        for _, table_name, _, _, _ in ITEM_TABLE_SPECS:
+            cursor.execute(f"DELETE FROM {table_name} WHERE SNumber IN ({snumber_subquery})", list(weeks))
+            deleted[table_name] = cursor.rowcount
+        create_traceability_schema(cursor)
+        for table_name in DERIVED_TABLES:
+            cursor.execute(f"DELETE FROM {table_name} WHERE SNumber IN ({snumber_subquery})", list(weeks))
+            deleted[table_name] = cursor.rowcount
+        deleted['T_JIG_PASS'] = delete_jig_passes(conn, snumber_subquery, weeks)
+        cursor.execute(f"DELETE FROM T_MASTER_DATA WHERE WEEK_NO IN ({placeholders})", list(weeks))
+        deleted['T_MASTER_DATA'] = cursor.rowcount
+        # 삭제된 행을 같은 CSV로 다시 적재할 수 있도록 재개 이력을 지웁니다. (Source_Key는 내용 해시라 주차와 연결되지 않음)
+        deleted['T_INGEST_LOG'] = clear_ingest_log(conn)
+        parquet_mirror.clamp_mirror_marks(conn)
+        bump_db_generation(conn)
+        cursor.execute("PRAGMA foreign_keys = ON;")
+        conn.commit()
+        flush_spc(conn)
+    finally:
+        conn.close()
+
+    if mirror_dir:
+        parquet_mirror.delete_weeks_from_mirror(list(weeks), mirror_dir)
+    return deleted
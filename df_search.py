@@ -1,6 +1,81 @@
+import re
 import streamlit as st
 import pandas as pd
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, Optional
+
+from data_token import get_data_token
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow가 없으면 NumPy 문자열 검색으로 대체
+    pa = None
+    pc = None
+
+def build_snumber_index(df_raw: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """
+    데이터셋의 고유 SNumber를 소문자로 정규화해 정렬한 검색 인덱스를 생성합니다.
+    - values: 원본 SNumber 고유값 (lower 정렬 순서와 같은 순서)
+    - lower_sorted: 소문자 SNumber 정렬 배열 (pyarrow가 없을 때 부분 문자열 검색)
+    - lower_arrow: 부분 문자열 검색용 Arrow 문자열 배열 (pyarrow가 있을 때)
+    """
+    if 'SNumber' not in df_raw.columns:
+        return None
+
+    values = pd.unique(df_raw['SNumber'].dropna())
+    lower = np.array([str(v).lower() for v in values], dtype=object)
+    order = np.argsort(lower, kind='stable')
+
+    index = {
+        'values': values[order],
+        'lower_sorted': lower[order],
+        'lower_arrow': pa.array(lower[order], type=pa.string()) if pa is not None else None,
+    }
+    return index
+
+def get_snumber_index(analysis_key: str, df_raw: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """세션 상태에 캐싱된 SNumber 인덱스를 반환합니다. 데이터 토큰이 바뀌면(새 업로드/분석) 다시 생성합니다."""
+    state_key = f'snumber_index_{analysis_key}'
+    cached = st.session_state.get(state_key)
+    token = get_data_token(analysis_key)
+
+    if cached is None or cached.get('token') != token:
+        cached = {'token': token, 'index': build_snumber_index(df_raw)}
+        st.session_state[state_key] = cached
+    return cached['index']
+
+# 정규식 특수 문자 (포함되면 기존 str.contains와 같은 정규식 검색으로 처리)
+REGEX_CHARS = set('.^$*+?{}[]\\|()')
+
+SEARCH_HELP = (
+    "대소문자를 무시하고 SNumber에 검색어가 포함된 행을 찾습니다. "
+    "정규식 패턴(예: ^AB.*9$)도 사용할 수 있습니다."
+)
+
+def match_snumbers(index: Dict[str, Any], query: str) -> np.ndarray:
+    """
+    검색어와 일치하는 원본 SNumber 값 배열을 반환합니다. (기존 str.contains(query, case=False)와 같은 결과)
+    - 특수 문자가 없는 ASCII 검색어는 부분 문자열 검색 (정규식 검색과 결과가 같고 더 빠름)
+    - 그 외에는 정규식 검색 (고유 SNumber 대상). 잘못된 패턴은 부분 문자열로 검색합니다.
+    """
+    lowered = query.lower()
+    lower_sorted = index['lower_sorted']
+
+    if (set(query) & REGEX_CHARS) or not query.isascii():
+        try:
+            pattern = re.compile(query, re.IGNORECASE)
+        except re.error:
+            pattern = None
+        if pattern is not None:
+            mask = np.fromiter((pattern.search(str(v)) is not None for v in index['values']), dtype=bool, count=len(index['values']))
+            return index['values'][mask]
+
+    if index['lower_arrow'] is not None:
+        mask = pc.match_substring(index['lower_arrow'], lowered).to_numpy(zero_copy_only=False)
+    else:
+        mask = np.char.find(lower_sorted.astype(str), lowered) >= 0
+    return index['values'][mask]
 
 def display_df_search(analysis_key: str, df_filtered: pd.DataFrame, props: Dict[str, str]):
     """
@@ -18,7 +93,7 @@ def display_df_search(analysis_key: str, df_filtered: pd.DataFrame, props: Dict[
     applied_filters = st.session_state[filter_state_key]
     
     with search_col1:
-        snumber_query = st.text_input("SNumber 검색", key=f"snumber_search_{analysis_key}", value=applied_filters['snumber'])
+        snumber_query = st.text_input("SNumber 검색", key=f"snumber_search_{analysis_key}", value=applied_filters['snumber'], help=SEARCH_HELP)
     with search_col2:
         all_columns = df_filtered.columns.tolist()
         qc_cols_default = [col for col in all_columns if col.endswith('_QC')]
@@ -46,7 +121,7 @@ def display_df_search(analysis_key: str, df_filtered: pd.DataFrame, props: Dict[
         applied_filters = st.session_state[filter_state_key] # 필터 즉시 반영
     
     with st.expander("DF 조회"):
-        df_display = df_filtered.copy() # df_raw 대신 필터링된 df_filtered 사용
+        df_display = df_filtered # 복사하지 않고 필터링된 df_filtered를 그대로 사용
         
         has_snumber_query = False
         
@@ -54,8 +129,15 @@ def display_df_search(analysis_key: str, df_filtered: pd.DataFrame, props: Dict[
             query = applied_filters['snumber']
             has_snumber_query = True
             
-            if 'SNumber' in df_display.columns and pd.api.types.is_string_dtype(df_display['SNumber']):
-                df_display = df_display[df_display['SNumber'].str.contains(query, na=False, case=False)]
+            # 고유 SNumber 인덱스에서 일치 값을 찾은 뒤, 행 선택은 해시 기반 isin으로 처리합니다.
+            df_raw = st.session_state.analysis_results.get(analysis_key)
+            if df_raw is None or 'SNumber' not in df_raw.columns:
+                df_raw = df_filtered
+            snumber_index = get_snumber_index(analysis_key, df_raw)
+            
+            if snumber_index is not None and 'SNumber' in df_display.columns:
+                matched = match_snumbers(snumber_index, query)
+                df_display = df_display[df_display['SNumber'].isin(matched)]
             else:
                 try:
                     df_display = df_display[df_display.apply(lambda row: query.lower() in str(row.values).lower(), axis=1)]
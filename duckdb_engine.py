@@ -0,0 +1,293 @@
+# duckdb_engine.py
+# run_analysis의 분류/가성·진성 판정/일자별 crosstab을 DuckDB(인프로세스 컬럼형 엔진)의 SQL로 수행합니다.
+# - source='sqlite' : 기존 SQLite 파일을 ATTACH 하여 조회 (DuckDB sqlite 확장 필요)
+# - source='parquet': parquet_mirror의 WEEK_NO 파티션 Parquet 파일을 직접 조회
+# 결과 테이블은 기존 pandas 경로(run_analysis)와 동일한 형태(행: Pass/가성불량/진성불량/Total, 열: Pass/미달/초과/제외/Total)입니다.
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import uuid
+import pandas as pd
+from typing import Dict, Any, List, Optional
+
+from parquet_mirror import ITEM_MEASURES, PARQUET_MIRROR_DIR
+from quality_core.classification import SUMMARY_INDEX, SUMMARY_COLUMNS
+
+try:
+    import duckdb
+except ImportError:  # duckdb가 없으면 기존 pandas 경로만 사용합니다.
+    duckdb = None
+
+_connections: Dict[tuple, Any] = {}
+_connections_lock = threading.Lock()
+
+
+def is_available() -> bool:
+    """duckdb 설치 여부"""
+    return duckdb is not None
+
+
+def _get_connection(db_file_name: str, source: str, mirror_dir: str):
+    """(DB 파일, 소스)별 DuckDB 연결을 프로세스 단위로 재사용합니다. 호출 측은 cursor()로 사용합니다."""
+    key = (os.path.abspath(db_file_name), source, os.path.abspath(mirror_dir))
+    with _connections_lock:
+        con = _connections.get(key)
+        if con is None:
+            con = duckdb.connect(database=':memory:')
+            try:
+                if source == 'sqlite':
+                    con.execute("INSTALL sqlite; LOAD sqlite;")
+                    con.execute(f"ATTACH '{key[0]}' AS sq (TYPE SQLITE, READ_ONLY)")
+            except Exception:
+                # 확장 설치/ATTACH 실패 시 연결을 캐시하지 않고 닫습니다. (호출 측은 pandas 엔진으로 대체)
+                con.close()
+                raise
+            _connections[key] = con
+    return con.cursor()
+
+
+def _relation(table_name: str, source: str, mirror_dir: str) -> str:
+    if source == 'sqlite':
+        return f"sq.{table_name}"
+    path = os.path.join(mirror_dir, table_name, '**', '*.parquet').replace("'", "''")
+    return f"read_parquet('{path}', hive_partitioning = true, union_by_name = true)"
+
+
+def _load_spec(db_file_name: str, spec_table: str) -> pd.DataFrame:
+    """Spec 테이블은 행 수가 작으므로 SQLite에서 바로 읽어 DuckDB에 등록합니다."""
+    conn = sqlite3.connect(db_file_name)
+    try:
+        return pd.read_sql_query(f"SELECT Spec_ID, Measure_Item, Min_Value, Max_Value FROM {spec_table}", conn)
+    except Exception:
+        return pd.DataFrame({'Spec_ID': pd.Series(dtype='int64'), 'Measure_Item': pd.Series(dtype='object'),
+                             'Min_Value': pd.Series(dtype='float64'), 'Max_Value': pd.Series(dtype='float64')})
+    finally:
+        conn.close()
+
+
+def build_classified_query(item_key: str, source: str, mirror_dir: str = PARQUET_MIRROR_DIR, spec_view: str = 'spec') -> str:
+    """
+    get_query_and_columns와 같은 분류(Spec_Result_Detail) 결과를 내는 DuckDB SQL을 만듭니다.
+    spec_view: Spec 테이블을 등록한 DuckDB 뷰 이름 (호출마다 고유한 이름을 사용)
+    파라미터: (start, end, [pc_id, pc_id,] limit)  - PC 컬럼이 없는 품목(semi)은 pc_id 없음
+    """
+    spec = ITEM_MEASURES[item_key.lower()]
+    relation = _relation(spec['table'], source, mirror_dir)
+    date_col, pass_col, pc_col = spec['date_col'], spec['pass_col'], spec['pc_col']
+    spec_id_cols = spec.get('spec_id_cols', {})
+    row_filter = f" AND (? = '전체' OR T1.{pc_col} = ?)" if pc_col else ""
+    if spec.get('not_null_col'):
+        row_filter += f" AND T1.{spec['not_null_col']} IS NOT NULL"
+
+    unions = []
+    for ordinal, (measure_name, value_col) in enumerate(spec['measures']):
+        spec_id = f"T1.{spec_id_cols[measure_name]}" if measure_name in spec_id_cols else "NULL"
+        unions.append(
+            f"SELECT {ordinal} AS Measure_Ord, T1.SNumber, T1.{date_col} AS StartTime, '{measure_name}' AS Measure_Item, "
+            f"T1.{value_col} AS Test_Value, CAST({spec_id} AS BIGINT) AS Spec_ID, T1.{pass_col} AS Pass_Value FROM items AS T1"
+        )
+    union_sql = "\n            UNION ALL ".join(unions)
+
+    if spec['spec_table']:
+        spec_join = f"""
+        LEFT JOIN {spec_view} AS S
+            ON (U.Spec_ID IS NOT NULL AND U.Spec_ID = S.Spec_ID AND U.Measure_Item = S.Measure_Item)
+            OR (U.Spec_ID IS NULL AND U.Measure_Item = S.Measure_Item)"""
+        fail_case = """(
+                    CASE
+                        WHEN TRY_CAST(U.Test_Value AS DOUBLE) IS NULL OR TRY_CAST(U.Test_Value AS DOUBLE) = 0.0 THEN '제외'
+                        WHEN S.Min_Value IS NULL AND S.Max_Value IS NULL THEN '제외'
+                        WHEN TRY_CAST(U.Test_Value AS DOUBLE) < S.Min_Value THEN '미달'
+                        WHEN TRY_CAST(U.Test_Value AS DOUBLE) > S.Max_Value THEN '초과'
+                        ELSE '제외'
+                    END
+                )"""
+        limits = "S.Min_Value AS MinLimit, S.Max_Value AS MaxLimit"
+    else:
+        spec_join = ""
+        fail_case = "'미달'"
+        limits = "NULL AS MinLimit, NULL AS MaxLimit"
+
+    return f"""
+        WITH items AS (
+            SELECT * FROM {relation} AS T1
+            WHERE T1.{date_col} BETWEEN ? AND ?{row_filter}
+        ),
+        U AS (
+            {union_sql}
+        )
+        SELECT U.SNumber, U.StartTime, U.Measure_Item, U.Test_Value, {limits},
+            CASE
+                WHEN U.Pass_Value IN ('o', 'O') THEN 'Pass'
+                WHEN U.Pass_Value IN ('x', 'X') THEN {fail_case}
+                ELSE '제외'
+            END AS Spec_Result_Detail
+        FROM U{spec_join}
+        ORDER BY U.Measure_Ord
+        LIMIT ?
+    """
+
+
+def run_daily_summary(item_key: str, start_date_str: str, end_date_str: str, pc_id: Optional[str], limit: int,
+                      measure_item_filter: str, db_file_name: str, source: str = 'sqlite',
+                      mirror_dir: str = PARQUET_MIRROR_DIR) -> Dict[str, Any]:
+    """
+    기간 분류 + SNumber 가성/진성 판정 + 일자별 crosstab을 DuckDB에서 한 번에 계산합니다.
+    반환: {'rows_total', 'rows_filtered', 'daily': {Date_Only: (건수, summary_table)}}
+    """
+    if not is_available():
+        raise RuntimeError("duckdb가 설치되어 있지 않습니다.")
+
+    item_key = item_key.lower()
+    spec = ITEM_MEASURES[item_key]
+    cur = _get_connection(db_file_name, source, mirror_dir)
+    # 연결은 프로세스 단위로 공유되므로, 동시에 실행되는 분석끼리 Spec 뷰가 겹치지 않도록 호출마다 고유한 이름을 씁니다.
+    spec_view = f"spec_{uuid.uuid4().hex}"
+    try:
+        if spec['spec_table']:
+            cur.register(spec_view, _load_spec(db_file_name, spec['spec_table']))
+
+        classified_sql = build_classified_query(item_key, source, mirror_dir, spec_view)
+        pc_value = pc_id if pc_id else '전체'
+        params = [start_date_str, end_date_str] + ([pc_value, pc_value] if spec['pc_col'] else []) \
+            + [int(limit) if limit else None, measure_item_filter, measure_item_filter]  # LIMIT NULL = 제한 없음
+
+        df_counts = cur.execute(f"""
+            WITH base AS MATERIALIZED ({classified_sql}),
+            f AS MATERIALIZED (SELECT * FROM base WHERE ? = '전체' OR Measure_Item = ?),
+            sn AS (SELECT SNumber, bool_or(Spec_Result_Detail = 'Pass') AS Has_Pass FROM f WHERE SNumber IS NOT NULL GROUP BY SNumber)
+            SELECT substr(f.StartTime, 1, 10) AS Date_Only,
+                   CASE WHEN f.Spec_Result_Detail = 'Pass' THEN 'Pass'
+                        WHEN COALESCE(sn.Has_Pass, FALSE) THEN '가성불량'
+                        ELSE '진성불량' END AS Final_Failure_Category,
+                   f.Spec_Result_Detail,
+                   COUNT(*) AS Cnt,
+                   ANY_VALUE((SELECT COUNT(*) FROM base)) AS Rows_Total,
+                   ANY_VALUE((SELECT COUNT(*) FROM f)) AS Rows_Filtered
+            FROM f LEFT JOIN sn ON f.SNumber = sn.SNumber
+            WHERE f.Spec_Result_Detail IN ('Pass', '미달', '초과', '제외')
+            GROUP BY ALL
+            ORDER BY Date_Only
+        """, params).df()
+    finally:
+        if spec['spec_table']:
+            cur.unregister(spec_view)
+        cur.close()
+
+    rows_total = int(df_counts['Rows_Total'].iloc[0]) if len(df_counts) else 0
+    rows_filtered = int(df_counts['Rows_Filtered'].iloc[0]) if len(df_counts) else 0
+
+    daily = {}
+    for date_only, df_day in df_counts.groupby('Date_Only', sort=True):
+        table = df_day.pivot_table(index='Final_Failure_Category', columns='Spec_Result_Detail',
+                                   values='Cnt', aggfunc='sum', fill_value=0)
+        table['Total'] = table.sum(axis=1)
+        table.loc['Total'] = table.sum(axis=0)
+        table = table.reindex(index=SUMMARY_INDEX, columns=SUMMARY_COLUMNS, fill_value=0).astype('int64')
+        table.index.name = 'Final_Failure_Category'
+        table.columns.name = 'Spec_Result_Detail'
+        daily[date_only] = (int(df_day['Cnt'].sum()), table)
+
+    return {'rows_total': rows_total, 'rows_filtered': rows_filtered, 'daily': daily}
+
+
+# check_engine_parity용 FW 행: FwFile이 NULL / 빈 문자열 / 값이 있는 경우와 Pass/Fail을 섞습니다.
+_PARITY_FW_ROWS = [
+    ('SN001', '2025-10-01 09:00:00', 'PC1', 'fw_a.bin', 'O'),
+    ('SN001', '2025-10-01 10:00:00', 'PC1', 'fw_a.bin', 'X'),
+    ('SN002', '2025-10-01 11:00:00', 'PC2', None, 'X'),
+    ('SN002', '2025-10-02 09:00:00', 'PC2', None, 'O'),
+    ('SN003', '2025-10-02 10:00:00', 'PC1', '', 'X'),
+    ('SN003', '2025-10-02 11:00:00', 'PC1', '', 'O'),
+    ('SN004', '2025-10-02 12:00:00', 'PC2', 'fw_b.bin', None),
+    ('SN005', '2025-10-02 13:00:00', 'PC1', None, None),
+]
+
+
+def check_engine_parity(work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    같은 FW 데이터(FwFile NULL/빈 문자열 포함)에 대해 SQLite 쿼리, Parquet 미러, DuckDB 경로의
+    분석 행 수와 일자별 집계가 같은지 확인합니다. 임시 디렉터리에 DB와 미러를 만들고 마지막에 지웁니다.
+    반환: {'success', 'log'}
+    """
+    import parquet_mirror
+    from db_ingest import create_initial_db_schema
+    from quality_core.classification import summarize_daily
+    from quality_core.queries import load_item_measurements
+
+    log_messages: List[str] = []
+    failures = 0
+
+    def expect(label: str, actual, expected) -> None:
+        nonlocal failures
+        ok = actual == expected
+        failures += not ok
+        log_messages.append(f"{'✅' if ok else '❌'} {label}: {actual!r}" + ('' if ok else f" (기대값 {expected!r})"))
+
+    def daily_tables(daily) -> Dict[str, Any]:
+        return {day: (count, table.to_dict()) for day, (count, table) in daily.items()}
+
+    temp_dir = tempfile.mkdtemp(prefix='engine_parity_', dir=work_dir)
+    db_file_name = os.path.join(temp_dir, 'parity.db')
+    mirror_dir = os.path.join(temp_dir, 'mirror')
+    start, end = '2025-10-01 00:00:00', '2025-10-02 23:59:59'
+    try:
+        conn = sqlite3.connect(db_file_name)
+        try:
+            create_initial_db_schema(conn.cursor(), conn)
+            snumbers = sorted({row[0] for row in _PARITY_FW_ROWS})
+            conn.executemany("INSERT INTO T_MASTER_DATA (SNumber, WEEK_NO) VALUES (?, '2025-W40')", [(sn,) for sn in snumbers])
+            conn.executemany("INSERT INTO T_ITEM_FW (SNumber, FwStamp, FwPC, FwFile, FwPass) VALUES (?, ?, ?, ?, ?)", _PARITY_FW_ROWS)
+            conn.commit()
+            df_sqlite = load_item_measurements(conn, 'fw', start, end)
+        finally:
+            conn.close()
+        expected_rows = sum(row[3] is not None for row in _PARITY_FW_ROWS)
+        expect("SQLite 행 수 (FwFile NULL 제외)", len(df_sqlite), expected_rows)
+        expected_daily = daily_tables(summarize_daily(df_sqlite))
+
+        if not parquet_mirror.is_available():
+            log_messages.append("⚠️ pyarrow가 없어 Parquet/DuckDB 비교를 건너뜁니다.")
+        else:
+            parquet_mirror.export_db_to_mirror(db_file_name, mirror_dir)
+            df_parquet = parquet_mirror.load_item_measurements('fw', start, end, None, 0, db_file_name, mirror_dir)
+            expect("Parquet 미러 행 수", len(df_parquet), expected_rows)
+            expect("Parquet 미러 일자별 집계 = SQLite", daily_tables(summarize_daily(df_parquet)) == expected_daily, True)
+
+            sources = ['parquet', 'sqlite'] if is_available() else []
+            if not is_available():
+                log_messages.append("⚠️ duckdb가 없어 DuckDB 비교를 건너뜁니다.")
+            for source in sources:
+                try:
+                    summary = run_daily_summary('fw', start, end, None, 0, '전체', db_file_name, source, mirror_dir)
+                except Exception as e:  # sqlite 확장을 내려받을 수 없는 환경 등
+                    log_messages.append(f"⚠️ DuckDB({source}) 실행 불가로 건너뜀: {e}")
+                    continue
+                expect(f"DuckDB({source}) 행 수", summary['rows_total'], expected_rows)
+                expect(f"DuckDB({source}) 일자별 집계 = SQLite", daily_tables(summary['daily']) == expected_daily, True)
+    finally:
+        for key in [key for key in _connections if key[0] == os.path.abspath(db_file_name)]:
+            _connections.pop(key).close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return {'success': failures == 0, 'log': '\n'.join(log_messages)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="DuckDB/Parquet 분석 경로 확인")
+    commands = parser.add_subparsers(dest='command', required=True)
+    check_parser = commands.add_parser('check', help="SQLite / Parquet / DuckDB 경로의 FW 집계 일치 확인 (임시 DB 사용)")
+    check_parser.add_argument('--work-dir', default=None, help="임시 DB/미러를 만들 디렉터리 (기본: 시스템 임시 디렉터리)")
+    args = parser.parse_args(argv)
+
+    result = check_engine_parity(args.work_dir)
+    print(result['log'])
+    return 0 if result['success'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+# ingest_watcher.py
+# 검사 스테이션 출력 디렉터리를 주기적으로 확인하여 분석 DB에 증분 적재하는 상주 서비스입니다.
+#   - 스테이션 SQLite(*.sqlite3, *.db): historyinspection.Id 워터마크(T_SYNC_STATE) 이후 행만 작은 배치로 적재
+#     (db_ingest.sync_station_db - ATTACH 후 INSERT ... SELECT, pandas를 거치지 않습니다)
+#   - CSV 내보내기(*.csv): 크기/수정 시각이 한 주기 동안 변하지 않은(쓰기가 끝난) 파일만 적재
+#     (batch_ingest.ingest_files 사용 - 중단된 파일은 T_INGEST_LOG 청크 이력으로 이어서 적재하고, 이미 있는 행은 INSERT OR IGNORE로 건너뜁니다)
+# 적재 후 Parquet 미러와 해당 일자의 리포트(quality_core.reports)도 갱신합니다.
+#
+#   python ingest_watcher.py --watch-dir D:/station_export --interval 60
+#   python ingest_watcher.py --watch-dir ./db --once          # 한 번만 확인 (작업 스케줄러/cron 용)
+#
+# 적재는 INSERT OR IGNORE(기본 키 중복 무시)이고 워터마크는 배치와 같은 트랜잭션으로 커밋하므로,
+# 중간에 중단되어도 다음 실행에서 마지막으로 커밋된 배치 이후부터 이어서 적재합니다.
+
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import DB_FILE_NAME
+from batch_ingest import ingest_files
+from db_ingest import INGEST_CHUNK_ROWS, STATION_BATCH_ROWS, STATION_TABLE, create_initial_db_schema, sync_station_db
+from parquet_mirror import PARQUET_MIRROR_DIR
+from quality_core.reports import REPORT_DIR, refresh_reports
+
+STATION_PATTERNS = ['*.sqlite3', '*.db']
+CSV_PATTERNS = ['*.csv']
+POLL_INTERVAL_SEC = 60
+
+
+def _log(message: str) -> None:
+    print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}", flush=True)
+
+
+def _open_station_readonly(station_path: str) -> sqlite3.Connection:
+    """스테이션 프로그램이 쓰는 중인 파일이므로 읽기 전용으로 열고, 잠겨 있으면 잠시 기다립니다."""
+    uri = 'file:' + os.path.abspath(station_path).replace('\\', '/') + '?mode=ro'
+    return sqlite3.connect(uri, uri=True, timeout=10)
+
+
+def is_station_db(path: str) -> bool:
+    try:
+        conn = _open_station_readonly(path)
+        try:
+            return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (STATION_TABLE,)).fetchone() is not None
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+
+def sync_station(station_path: str, conn: sqlite3.Connection, batch_rows: int = STATION_BATCH_ROWS,
+                 mirror_dir: Optional[str] = None, stats: Optional[Dict[str, int]] = None,
+                 days_by_item: Optional[Dict[str, Set[str]]] = None, log=_log) -> Dict[str, int]:
+    """스테이션 DB 1개를 워터마크 이후로 동기화하고 결과를 로그로 남깁니다. 반환: db_ingest.sync_station_db 결과"""
+    log_messages: List[str] = []
+    result = sync_station_db(conn, station_path, batch_rows, mirror_dir, stats, log_messages, days_by_item)
+    name = os.path.basename(station_path)
+    if result['restarted']:
+        log(f"⚠️ {name}: 최대 Id < 워터마크 - 새 파일로 보고 처음부터 다시 동기화")
+    if result['rows']:
+        log(f"{name}: {result['rows']:,}행 / {result['batches']}배치 적재 (Id {result['first_id']} → {result['last_id']})")
+    for message in log_messages:
+        log(message)
+    return result
+
+
+class IngestWatcher:
+    """감시 디렉터리의 스테이션 DB와 CSV를 주기적으로 확인하여 적재합니다."""
+
+    def __init__(self, watch_dir: str, db_file_name: str = DB_FILE_NAME, batch_rows: int = STATION_BATCH_ROWS,
+                 chunk_rows: int = INGEST_CHUNK_ROWS, mirror_dir: Optional[str] = PARQUET_MIRROR_DIR,
+                 report_dir: Optional[str] = REPORT_DIR, log=_log):
+        self.watch_dir = watch_dir
+        self.db_file_name = db_file_name
+        self.batch_rows = batch_rows
+        self.chunk_rows = chunk_rows
+        self.mirror_dir = mirror_dir
+        self.report_dir = report_dir
+        self.log = log
+        # CSV 경로 → 직전 확인 시 (크기, 수정 시각). 두 번 연속 같으면 쓰기가 끝난 것으로 봅니다.
+        self._csv_seen: Dict[str, Tuple[int, float]] = {}
+        # 이미 적재한 CSV 경로 → (크기, 수정 시각)
+        self._csv_done: Dict[str, Tuple[int, float]] = {}
+
+    def _list(self, patterns: List[str]) -> List[str]:
+        paths = set()
+        for pattern in patterns:
+            paths.update(p for p in glob.glob(os.path.join(self.watch_dir, pattern)) if os.path.isfile(p))
+        return sorted(paths)
+
+    def _ready_csv_files(self, wait_for_stable: bool = True) -> List[str]:
+        ready = []
+        for path in self._list(CSV_PATTERNS):
+            stat = os.stat(path)
+            signature = (stat.st_size, stat.st_mtime)
+            if self._csv_done.get(path) == signature:
+                continue
+            if not wait_for_stable or self._csv_seen.get(path) == signature:
+                ready.append((path, signature))
+            self._csv_seen[path] = signature
+        return ready
+
+    def poll_once(self, wait_for_stable: bool = True) -> Dict[str, object]:
+        """한 번 확인하고 적재합니다. 반환: {'station_rows', 'csv_files', 'reports', 'errors'}"""
+        summary = {'station_rows': 0, 'csv_files': 0, 'reports': 0, 'errors': []}
+        days_by_item: Dict[str, Set[str]] = {}
+        stats: Dict[str, int] = {}
+
+        conn = sqlite3.connect(self.db_file_name, timeout=30)
+        try:
+            create_initial_db_schema(conn.cursor(), conn)
+            for station_path in self._list(STATION_PATTERNS):
+                if os.path.abspath(station_path) == os.path.abspath(self.db_file_name) or not is_station_db(station_path):
+                    continue
+                try:
+                    result = sync_station(station_path, conn, self.batch_rows, self.mirror_dir, stats, days_by_item, self.log)
+                    summary['station_rows'] += result['rows']
+                except Exception as e:
+                    conn.rollback()
+                    summary['errors'].append(f"{station_path}: {e}")
+                    self.log(f"❌ {os.path.basename(station_path)} 동기화 실패: {e}")
+        finally:
+            conn.close()
+
+        ready = self._ready_csv_files(wait_for_stable)
+        if ready:
+            result = ingest_files([path for path, _ in ready], self.db_file_name, chunk_rows=self.chunk_rows,
+                                  mirror_dir=self.mirror_dir, merge_specs=True, log=self.log)
+            signatures = dict(ready)
+            for file_result in result['files']:
+                if file_result['error']:
+                    summary['errors'].append(f"{file_result['path']}: {file_result['error']}")
+                else:
+                    self._csv_done[file_result['path']] = signatures[file_result['path']]
+                    summary['csv_files'] += 1
+            for item_key, days in result['days_by_item'].items():
+                days_by_item.setdefault(item_key, set()).update(days)
+
+        if self.report_dir and any(days_by_item.values()):
+            report_result = refresh_reports(self.db_file_name, days_by_item, self.report_dir)
+            summary['reports'] = report_result['written']
+            for item_key, day, message in report_result['errors']:
+                summary['errors'].append(f"리포트 {item_key} {day}: {message}")
+        return summary
+
+    def run_forever(self, interval: float = POLL_INTERVAL_SEC) -> None:
+        self.log(f"감시 시작: {os.path.abspath(self.watch_dir)} → {self.db_file_name} (주기 {interval}s)")
+        while True:
+            started = time.perf_counter()
+            try:
+                summary = self.poll_once()
+                if summary['station_rows'] or summary['csv_files']:
+                    self.log(f"주기 완료: 스테이션 {summary['station_rows']:,}행, CSV {summary['csv_files']}개, "
+                             f"리포트 {summary['reports']}개 ({time.perf_counter() - started:.1f}s)")
+            except Exception as e:
+                self.log(f"❌ 주기 실행 실패: {e}")
+            time.sleep(max(0.0, interval - (time.perf_counter() - started)))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="검사 스테이션 출력 디렉터리 증분 적재 서비스")
+    parser.add_argument('--watch-dir', required=True, help="스테이션 SQLite / CSV 내보내기 디렉터리")
+    parser.add_argument('--db', default=DB_FILE_NAME, help=f"대상 분석 DB (기본: {DB_FILE_NAME})")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL_SEC, help="확인 주기 (초)")
+    parser.add_argument('--batch-rows', type=int, default=STATION_BATCH_ROWS, help="스테이션 DB 배치 크기 (행)")
+    parser.add_argument('--chunk-rows', type=int, default=INGEST_CHUNK_ROWS, help="CSV 청크 크기 (행)")
+    parser.add_argument('--mirror-dir', default=PARQUET_MIRROR_DIR)
+    parser.add_argument('--no-mirror', action='store_true')
+    parser.add_argument('--report-dir', default=REPORT_DIR)
+    parser.add_argument('--no-reports', action='store_true')
+    parser.add_argument('--once', action='store_true', help="한 번만 확인하고 종료 (CSV는 크기 안정 대기 없이 적재)")
+    args = parser.parse_args(argv)
+
+    watcher = IngestWatcher(args.watch_dir, args.db, batch_rows=args.batch_rows, chunk_rows=args.chunk_rows,
+                            mirror_dir=None if args.no_mirror else args.mirror_dir,
+                            report_dir=None if args.no_reports else args.report_dir)
+    if args.once:
+        summary = watcher.poll_once(wait_for_stable=False)
+        _log(f"완료: 스테이션 {summary['station_rows']:,}행, CSV {summary['csv_files']}개, 리포트 {summary['reports']}개")
+        for error in summary['errors']:
+            _log(f"❌ {error}")
+        return 1 if summary['errors'] else 0
+
+    try:
+        watcher.run_forever(args.interval)
+    except KeyboardInterrupt:
+        _log("감시 종료")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
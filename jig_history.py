@@ -0,0 +1,139 @@
+# jig_history.py
+# Jig별 PASS 이력 저장소 (T_JIG_PASS: 공정 × Jig × SNumber → 첫 PASS 시각).
+# 파일 분석의 가성/진성 판정(quality_core.analyzers)은 "이 Jig에서 한 번이라도 PASS한 SNumber인가"를 묻습니다.
+# 현재 파일만 보면 어제 적재된 PASS가 있는 SNumber가 진성불량이 되므로, DB의 PASS 사실을 모아 두고
+# 새 파일은 자기 FAIL 행의 (Jig, SNumber)만 기본 키로 조회합니다. (파일 하나의 비용 = 그 파일의 행 수)
+#   - DB 적재: traceability가 갱신한 T_ATTEMPT_INDEX의 PASS 행을 record_attempt_passes()로 추가
+#   - 파일 분석: JigPassHistory.passed()로 조회만 합니다. (분석만 한 파일이 DB 판정에 남지 않도록 기록하지 않음)
+#   - 주차 삭제: 삭제한 SNumber의 행을 함께 지웁니다. (delete_snumbers)
+# T_JIG_PASS는 적재된 검사로부터 다시 만들 수 있는 파생 테이블입니다. (rebuild_jig_passes)
+
+import os
+import sqlite3
+from typing import Iterable, Optional, Set, Tuple
+
+import pandas as pd
+
+from config import DB_FILE_NAME
+
+JIG_PASS_TABLE = 'T_JIG_PASS'
+_LOOKUP_TABLE = 'temp._jig_lookup'
+
+# 공정 키: traceability.STAGE_KEYS 와 같은 소문자 키 (분석 함수의 'Pcb' / 'RfTx' 등은 lower()로 맞춥니다)
+PASS_VALUE = 'O'
+
+
+# T_DB_META에 기록하는 T_JIG_PASS 구성 버전. 2: 적재된 검사로만 채움 (이전 버전은 파일 분석의 PASS도 기록)
+JIG_PASS_VERSION = 2
+_VERSION_META_KEY = 'jig_pass_version'
+
+
+def create_jig_pass_schema(cursor) -> None:
+    """T_JIG_PASS 테이블을 만듭니다. (커밋은 호출 측 담당)"""
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {JIG_PASS_TABLE} (
+            Process TEXT,
+            Jig TEXT,
+            SNumber TEXT,
+            First_Pass_Time TEXT,
+            PRIMARY KEY (Process, Jig, SNumber)
+        ) WITHOUT ROWID;
+    """)
+    # 주차 삭제(SNumber 단위)용
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS IX_{JIG_PASS_TABLE}_SNumber ON {JIG_PASS_TABLE} (SNumber)")
+
+
+def jig_key(value) -> Optional[str]:
+    """
+    Jig 값을 저장/조회용 문자열로 맞춥니다. 정수 값의 숫자(100.0)는 '100'으로 바꿔
+    파일의 PcbMaxIrPwr 과 DB의 pcbPC(str(int(PcbMaxIrPwr)))가 같은 키가 되도록 합니다.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    text = str(value).strip()
+    return text or None
+
+
+def _upsert_sql(select_sql: str) -> str:
+    # SELECT에 WHERE가 있어야 ON CONFLICT가 JOIN 구문으로 해석되지 않습니다.
+    return (
+        f"INSERT INTO {JIG_PASS_TABLE} (Process, Jig, SNumber, First_Pass_Time) {select_sql} "
+        f"ON CONFLICT (Process, Jig, SNumber) DO UPDATE SET First_Pass_Time = excluded.First_Pass_Time "
+        f"WHERE excluded.First_Pass_Time < {JIG_PASS_TABLE}.First_Pass_Time OR {JIG_PASS_TABLE}.First_Pass_Time IS NULL"
+    )
+
+
+def record_attempt_passes(conn: sqlite3.Connection, keys_sql: Optional[str] = None) -> None:
+    """
+    T_ATTEMPT_INDEX의 PASS 행(keys_sql의 SNumber만, 없으면 전체)을 T_JIG_PASS에 추가합니다. (커밋은 호출 측 담당)
+    DB의 Jig는 공정별 PC 컬럼(pcbPC / FwPC / RfTxPC / BatadcPC)입니다. PC가 없는 Semi는 건너뜁니다.
+    """
+    key_filter = f"AND SNumber IN ({keys_sql})" if keys_sql else ''
+    conn.execute(_upsert_sql(
+        f"SELECT Stage, PC, SNumber, MIN(Test_Time) FROM T_ATTEMPT_INDEX "
+        f"WHERE Result = '{PASS_VALUE.lower()}' AND PC IS NOT NULL {key_filter} GROUP BY Stage, PC, SNumber"
+    ))
+
+
+def delete_snumbers(conn: sqlite3.Connection, keys_sql: str, params: Iterable = ()) -> int:
+    """keys_sql이 돌려주는 SNumber의 PASS 이력을 지웁니다. (주차 삭제와 같은 트랜잭션, 커밋은 호출 측 담당) 반환: 삭제 행 수"""
+    create_jig_pass_schema(conn.cursor())
+    return conn.execute(f"DELETE FROM {JIG_PASS_TABLE} WHERE SNumber IN ({keys_sql})", list(params)).rowcount
+
+
+def rebuild_jig_passes(conn: sqlite3.Connection) -> None:
+    """T_JIG_PASS를 T_ATTEMPT_INDEX의 PASS 행으로 다시 채우고 구성 버전을 기록합니다. (커밋은 호출 측 담당)"""
+    conn.execute(f"DELETE FROM {JIG_PASS_TABLE}")
+    record_attempt_passes(conn)
+    conn.execute("CREATE TABLE IF NOT EXISTS T_DB_META (Meta_Key TEXT PRIMARY KEY, Meta_Value INTEGER)")
+    conn.execute("INSERT OR REPLACE INTO T_DB_META (Meta_Key, Meta_Value) VALUES (?, ?)", (_VERSION_META_KEY, JIG_PASS_VERSION))
+
+
+def jig_pass_version(conn: sqlite3.Connection) -> int:
+    """T_JIG_PASS 구성 버전 (기록이 없으면 0 - 파일 분석 PASS가 섞여 있을 수 있는 이전 DB)"""
+    try:
+        row = conn.execute("SELECT Meta_Value FROM T_DB_META WHERE Meta_Key = ?", (_VERSION_META_KEY,)).fetchone()
+    except sqlite3.Error:
+        return 0
+    return int(row[0]) if row else 0
+
+
+def lookup_passed(conn: sqlite3.Connection, process: str, pairs: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+    """(Jig 키, SNumber) 쌍 중 T_JIG_PASS에 PASS 이력이 있는 쌍의 집합 (기본 키 조회)"""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS _jig_lookup (Jig TEXT, SNumber TEXT, PRIMARY KEY (Jig, SNumber))")
+    conn.execute(f"DELETE FROM {_LOOKUP_TABLE}")
+    conn.executemany(f"INSERT OR IGNORE INTO {_LOOKUP_TABLE} (Jig, SNumber) VALUES (?, ?)", pairs)
+    found = conn.execute(
+        f"SELECT k.Jig, k.SNumber FROM {_LOOKUP_TABLE} k JOIN {JIG_PASS_TABLE} p "
+        f"ON p.Process = ? AND p.Jig = k.Jig AND p.SNumber = k.SNumber",
+        (process.lower(),)
+    ).fetchall()
+    conn.execute(f"DELETE FROM {_LOOKUP_TABLE}")
+    return set(found)
+
+
+class JigPassHistory:
+    """파일 분석에서 사용하는 T_JIG_PASS 조회 객체. 호출마다 연결을 새로 엽니다. (스레드/워커 간 공유 가능)"""
+
+    def __init__(self, db_file_name: str = DB_FILE_NAME, timeout: float = 30):
+        self.db_file_name = db_file_name
+        self.timeout = timeout
+
+    def passed(self, process: str, jigs: Iterable, snumbers: Iterable) -> Set[Tuple[str, str]]:
+        """(Jig, SNumber) 쌍 중 이전에 PASS한 쌍 - 반환 집합의 Jig는 jig_key()로 변환된 값입니다."""
+        pairs = {(jig_key(jig), str(sn)) for jig, sn in zip(jigs, snumbers) if jig_key(jig) is not None and pd.notna(sn)}
+        if not pairs:
+            return set()
+        conn = sqlite3.connect(self.db_file_name, timeout=self.timeout)
+        try:
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (JIG_PASS_TABLE,)).fetchone()
+            return lookup_passed(conn, process, pairs) if exists else set()
+        finally:
+            conn.close()
+
+
+def default_pass_history() -> Optional[JigPassHistory]:
+    """분석 DB가 있으면 그 DB의 T_JIG_PASS를 사용하는 JigPassHistory, 없으면 None"""
+    return JigPassHistory(DB_FILE_NAME) if os.path.exists(DB_FILE_NAME) else None
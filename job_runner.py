@@ -0,0 +1,172 @@
+# job_runner.py
+# 오래 걸리는 DB 작업(CSV 적재, 주차 삭제, 대용량 분석)을 Streamlit 스크립트 밖의 스레드에서 실행하는 작업 실행기입니다.
+#   - 작업 테이블(job_id → Job)에 상태/단계/진행률/통계/로그를 기록하고, 화면은 주기적으로 스냅샷을 읽어 표시합니다.
+#   - 위젯을 조작해 스크립트가 다시 실행되어도 작업은 중단되지 않으며, 완료되면 결과를 가져가 출력합니다.
+#   - SQLite 쓰기 작업(적재/삭제)은 전용 워커 1개에서 순서대로, 읽기 작업(분석)은 별도 풀에서 병렬로 실행합니다.
+# Streamlit에 의존하지 않으므로 앱에서는 st.cache_resource로 프로세스당 하나를 만들어 세션 간에 공유합니다.
+
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+# 완료된 작업을 작업 테이블에 남겨 둘 최대 개수 (오래된 것부터 정리)
+MAX_FINISHED_JOBS = 50
+
+
+class JobCancelled(BaseException):
+    """
+    작업 함수가 취소 요청을 확인하고 중단할 때 발생시킵니다.
+    적재 함수들이 except Exception으로 오류를 결과에 담으므로, 취소는 그 처리를 건너뛰도록 BaseException을 상속합니다.
+    """
+
+
+class JobContext:
+    """작업 함수에 전달되는 진행 상황 보고 객체"""
+
+    def __init__(self, runner: 'JobRunner', job_id: str):
+        self._runner = runner
+        self.job_id = job_id
+
+    def progress(self, ratio: Optional[float] = None, stage: Optional[str] = None, check_cancel: bool = True) -> None:
+        """
+        진행률(0~1)과 현재 단계를 기록합니다. 취소 요청이 있으면 JobCancelled를 발생시킵니다.
+        되돌릴 수 없는 단계 이후(예: DB 삭제 후 미러 정리)에는 check_cancel=False로 보고합니다.
+        """
+        self._runner._update(self.job_id, progress=ratio, stage=stage)
+        if check_cancel:
+            self.check_cancelled()
+
+    def log(self, message: str) -> None:
+        self._runner._append_log(self.job_id, message)
+
+    def set_stats(self, stats: Dict[str, Any]) -> None:
+        self._runner._update(self.job_id, stats=dict(stats))
+
+    @property
+    def cancelled(self) -> bool:
+        return self._runner._is_cancel_requested(self.job_id)
+
+    def check_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled()
+
+
+class JobRunner:
+    """작업 테이블 + 스레드 풀. submit()으로 등록하고 get()/list_jobs()로 상태를 조회합니다."""
+
+    def __init__(self, analysis_workers: int = 2):
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._cancel_requested = set()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='job-writer')
+        self._readers = ThreadPoolExecutor(max_workers=analysis_workers, thread_name_prefix='job-reader')
+
+    def submit(self, kind: str, label: str, fn: Callable[..., Any], *args, writes_db: bool = False, **kwargs) -> str:
+        """
+        fn(JobContext, *args, **kwargs)를 백그라운드에서 실행합니다. 반환값은 작업의 result가 됩니다.
+        writes_db=True 인 작업은 쓰기 전용 워커에서 하나씩 실행됩니다. 반환: job_id
+        """
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._jobs[job_id] = {
+                'job_id': job_id, 'kind': kind, 'label': label, 'status': QUEUED,
+                'stage': '대기 중', 'progress': 0.0, 'stats': {}, 'log': [],
+                'result': None, 'error': None, 'traceback': None,
+                'submitted_at': datetime.now(), 'started_at': None, 'finished_at': None,
+            }
+            self._prune_locked()
+        pool = self._writer if writes_db else self._readers
+        pool.submit(self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job_id: str, fn: Callable[..., Any], args, kwargs) -> None:
+        context = JobContext(self, job_id)
+        if context.cancelled:
+            self._update(job_id, status=CANCELLED, stage='취소됨', finished_at=datetime.now())
+            return
+        self._update(job_id, status=RUNNING, stage='실행 중', started_at=datetime.now())
+        try:
+            result = fn(context, *args, **kwargs)
+        except JobCancelled:
+            self._update(job_id, status=CANCELLED, stage='취소됨', finished_at=datetime.now())
+        except Exception as e:
+            self._update(job_id, status=FAILED, stage='실패', error=str(e), traceback=traceback.format_exc(),
+                         finished_at=datetime.now())
+        else:
+            self._update(job_id, status=DONE, stage='완료', progress=1.0, result=result, finished_at=datetime.now())
+        finally:
+            with self._lock:
+                self._cancel_requested.discard(job_id)
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            for key, value in fields.items():
+                if value is not None:
+                    job[key] = value
+
+    def _append_log(self, job_id: str, message: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job['log'].append(message)
+
+    def _is_cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancel_requested
+
+    def _prune_locked(self) -> None:
+        finished = sorted((job for job in self._jobs.values() if job['status'] in FINISHED_STATES),
+                          key=lambda job: job['finished_at'])
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job['job_id']]
+
+    def get(self, job_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """작업 상태의 스냅샷 (log는 복사본). 없으면 None"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot['log'] = list(job['log'])
+            snapshot['stats'] = dict(job['stats'])
+            return snapshot
+
+    def list_jobs(self, kinds: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """작업 스냅샷 목록 (최근 등록 순)"""
+        with self._lock:
+            job_ids = [job_id for job_id, job in self._jobs.items() if kinds is None or job['kind'] in kinds]
+        jobs = [self.get(job_id) for job_id in job_ids]
+        return sorted((job for job in jobs if job), key=lambda job: job['submitted_at'], reverse=True)
+
+    def cancel(self, job_id: str) -> bool:
+        """취소를 요청합니다. 작업 함수가 다음 진행 보고(JobContext.progress) 시점에 중단합니다."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] in FINISHED_STATES:
+                return False
+            self._cancel_requested.add(job_id)
+            return True
+
+    def forget(self, job_id: str) -> None:
+        """완료된 작업을 작업 테이블에서 지웁니다. (결과를 가져간 뒤 호출)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job['status'] in FINISHED_STATES:
+                del self._jobs[job_id]
+
+    def has_active(self, job_ids: List[Optional[str]]) -> bool:
+        with self._lock:
+            return any(job_id in self._jobs and self._jobs[job_id]['status'] not in FINISHED_STATES for job_id in job_ids)
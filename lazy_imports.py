@@ -0,0 +1,85 @@
+# lazy_imports.py
+# 무거운 기능 모듈의 지연 import와 import 시간 측정.
+# Streamlit 워커는 시작할 때 스크립트의 최상위 import를 모두 실행하므로, 사이드바에 필요 없는 기능
+# (기간 분석 엔진의 duckdb, Parquet 미러의 pyarrow.dataset 등)까지 import하면 첫 화면이 그만큼 늦어집니다.
+# 이런 모듈은 프록시로 두고 처음 속성에 접근할 때 import합니다.
+#
+#   analysis = lazy_module('quality_core.analysis')   # 아직 import하지 않음
+#   analysis.analyze_period(...)                      # 여기서 import (소요 시간은 IMPORT_TIMES에 기록)
+#
+# import는 열려 있는 프로파일 세션이 있으면 'import.<모듈>' span으로도 기록됩니다.
+# 측정값은 "그 시점에 추가로 걸린 시간"입니다. (이미 import된 하위 모듈은 포함되지 않습니다)
+
+import importlib
+import sys
+import time
+from typing import Any, Dict, List
+
+from profiling import span
+
+# 모듈 이름 → 이 프로세스에서 처음 import할 때 걸린 시간(초). 재실행(rerun)은 sys.modules 캐시를 쓰므로 첫 값만 유지합니다.
+IMPORT_TIMES: Dict[str, float] = {}
+
+# 시작 구간 이름(예: 'sidebar') → 처음 도달한 시각(time.perf_counter). 콜드 스타트 벤치마크가 읽습니다.
+STARTUP_MARKS: Dict[str, float] = {}
+
+
+def record_import_time(name: str, seconds: float) -> None:
+    """import 소요 시간을 기록합니다. (같은 이름은 첫 기록만 유지)"""
+    IMPORT_TIMES.setdefault(name, round(seconds, 6))
+
+
+def timed_import(name: str):
+    """모듈을 import하고 처음 import한 경우 소요 시간을 기록합니다."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    with span(f'import.{name}'):
+        module = importlib.import_module(name)
+    record_import_time(name, time.perf_counter() - started)
+    return module
+
+
+class LazyModule:
+    """처음 속성에 접근할 때 import되는 모듈 프록시 (이후에는 실제 모듈의 속성을 그대로 돌려줍니다)"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = timed_import(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        if attr in ('_name', '_module'):
+            object.__setattr__(self, attr, value)
+        else:
+            setattr(self._load(), attr, value)
+
+    def is_loaded(self) -> bool:
+        return self._module is not None or self._name in sys.modules
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.is_loaded() else 'not loaded'
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def mark_startup(name: str) -> None:
+    """시작 구간 도달 시각을 기록합니다. (프로세스에서 처음 도달한 시각만 유지)"""
+    STARTUP_MARKS.setdefault(name, time.perf_counter())
+
+
+def import_times() -> List[Dict[str, Any]]:
+    """기록된 import 시간 목록 - 오래 걸린 순서. [{'module', 'seconds'}]"""
+    rows = [{'module': name, 'seconds': seconds} for name, seconds in IMPORT_TIMES.items()]
+    return sorted(rows, key=lambda row: row['seconds'], reverse=True)
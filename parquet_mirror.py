@@ -0,0 +1,426 @@
+# parquet_mirror.py
+# SQLite DB의 T_MASTER_DATA / T_ITEM_* 테이블을 WEEK_NO 단위로 파티션된 Parquet 미러로 유지합니다.
+# - 적재 시 청크마다 아직 미러에 기록하지 않은 행(rowid 기준)만 Parquet 파일로 추가 기록합니다.
+#   미러별 기록 위치는 DB의 T_MIRROR_STATE에 두고 쓰기 잠금 안에서 갱신하므로, 여러 프로세스가 동시에 적재해도
+#   같은 행을 두 번 기록하지 않고, 기록에 실패한 행은 다음 기록 때 다시 포함됩니다.
+# - 분석 화면은 날짜/PC 조건을 Parquet 필터로 내려보내고(predicate pushdown), 필요한 컬럼만 읽습니다.
+
+import os
+import shutil
+import sqlite3
+import uuid
+import pandas as pd
+import numpy as np
+from typing import Dict, Iterator, List, Optional
+
+from config import PARQUET_MIRROR_DIR
+from spc_stats import rebuild_spc
+from traceability import rebuild_traceability
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow가 없으면 미러 기능만 비활성화됩니다.
+    pa = None
+    ds = None
+    pq = None
+
+MIRROR_TABLES = ['T_MASTER_DATA', 'T_ITEM_PCB', 'T_ITEM_SEMI', 'T_ITEM_FW', 'T_ITEM_RFTX', 'T_ITEM_BATADC']
+PARTITION_COLUMN = 'WEEK_NO'
+MIRROR_STATE_TABLE = 'T_MIRROR_STATE'
+# 분석 시 청크 하나의 측정 행 수 (Parquet 스캐너 배치는 이 값 ÷ 항목 수의 품목 행)
+MEASURE_CHUNK_ROWS = 50000
+
+# 품목별 측정 항목 정의 (get_query_and_columns의 UNION ALL 구성과 동일)
+ITEM_MEASURES = {
+    'pcb': {
+        'table': 'T_ITEM_PCB', 'date_col': 'PcbStartTime', 'pass_col': 'PcbPass', 'pc_col': 'pcbPC', 'spec_table': 'T_SPEC_PCB',
+        'spec_id_cols': {'SleepCurr': 'SleepCurr_Spec_ID'},
+        'measures': [('SleepCurr', 'PcbSleepCurr'), ('BatVolt', 'PcbBatVolt'), ('IrCurr', 'PcbIrCurr'), ('IrPwr', 'PcbIrPwr'),
+                     ('WirelessVolt', 'PcbWirelessVolt'), ('UsbCurr', 'PcbUsbCurr'), ('WirelessUsbVolt', 'PcbWirelessUsbVolt'), ('Led', 'PcbLed')],
+    },
+    'semi': {
+        'table': 'T_ITEM_SEMI', 'date_col': 'SemiAssyStartTime', 'pass_col': 'SemiAssyPass', 'pc_col': None, 'spec_table': 'T_SPEC_SEMI',
+        'measures': [('BatVolt', 'SemiAssyBatVolt'), ('SolarVolt', 'SemiAssySolarVolt')],
+    },
+    'fw': {
+        'table': 'T_ITEM_FW', 'date_col': 'FwStamp', 'pass_col': 'FwPass', 'pc_col': 'FwPC', 'spec_table': None,
+        'measures': [('FileCheck', 'FwFile')],
+        # SQLite 쿼리의 "FwFile LIKE '%'" 조건과 동일하게 FwFile이 NULL인 행은 분석에서 제외합니다.
+        'not_null_col': 'FwFile',
+    },
+    'rftx': {
+        'table': 'T_ITEM_RFTX', 'date_col': 'RfTxStamp', 'pass_col': 'RfTxPass', 'pc_col': 'RfTxPC', 'spec_table': None,
+        'measures': [('Power', 'RfTxPower'), ('Modul', 'RfTxModul'), ('CFOD', 'RfTxCFOD')],
+    },
+    'batadc': {
+        'table': 'T_ITEM_BATADC', 'date_col': 'BatadcStamp', 'pass_col': 'BatadcPass', 'pc_col': 'BatadcPC', 'spec_table': None,
+        'measures': [('Level', 'BatadcLevel'), ('VoiceTh', 'BatadcVoiceTh')],
+    },
+}
+
+_SQLITE_TO_ARROW = {'TEXT': 'string', 'REAL': 'float64', 'INTEGER': 'int64'}
+
+
+def is_available() -> bool:
+    """pyarrow 설치 여부"""
+    return pa is not None
+
+
+def _table_schema(conn, table_name):
+    """SQLite 선언 타입으로부터 Arrow 스키마를 만듭니다. (파일마다 타입이 달라지는 것을 방지)"""
+    fields = []
+    for _, name, decl_type, *_ in conn.execute(f"PRAGMA table_info({table_name})"):
+        arrow_type = _SQLITE_TO_ARROW.get((decl_type or 'TEXT').upper(), 'string')
+        fields.append(pa.field(name, pa.type_for_alias(arrow_type)))
+    return pa.schema(fields)
+
+
+def _select_with_week(table_name):
+    if table_name == 'T_MASTER_DATA':
+        return "SELECT T.* FROM T_MASTER_DATA AS T"
+    return f"SELECT T.*, M.WEEK_NO FROM {table_name} AS T LEFT JOIN T_MASTER_DATA AS M ON T.SNumber = M.SNumber"
+
+
+def _write_partitioned(df, schema, table_dir, tag):
+    """WEEK_NO hive 파티션(WEEK_NO=2025-W43/...)으로 Parquet 파일을 추가 기록합니다."""
+    if PARTITION_COLUMN not in schema.names:
+        schema = schema.append(pa.field(PARTITION_COLUMN, pa.string()))
+    df = df.reindex(columns=schema.names)
+    # SQLite는 숫자 선언 컬럼에도 변환할 수 없는 텍스트('null' 등 스테이션 원본 값)를 그대로 저장하므로 NULL로 맞춥니다.
+    for field in schema:
+        if (pa.types.is_floating(field.type) or pa.types.is_integer(field.type)) and df[field.name].dtype == object:
+            df[field.name] = pd.to_numeric(df[field.name], errors='coerce')
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    ds.write_dataset(
+        table, table_dir, format='parquet',
+        partitioning=ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor='hive'),
+        basename_template=f"part-{tag}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+    )
+
+
+def create_mirror_state_schema(cursor) -> None:
+    """T_MIRROR_STATE(미러 디렉터리 × 테이블별 마지막 기록 rowid) 테이블을 만듭니다. (커밋은 호출 측 담당)"""
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MIRROR_STATE_TABLE} (
+            Mirror_Dir TEXT,
+            Table_Name TEXT,
+            Last_Rowid INTEGER,
+            PRIMARY KEY (Mirror_Dir, Table_Name)
+        );
+    """)
+
+
+def _mirror_key(mirror_dir: str) -> str:
+    return os.path.abspath(mirror_dir)
+
+
+def _load_mirror_marks(conn, mirror_dir: str) -> Dict[str, int]:
+    rows = conn.execute(f"SELECT Table_Name, Last_Rowid FROM {MIRROR_STATE_TABLE} WHERE Mirror_Dir = ?", (_mirror_key(mirror_dir),))
+    return {table_name: last_rowid for table_name, last_rowid in rows}
+
+
+def _save_mirror_mark(conn, mirror_dir: str, table_name: str, last_rowid: int) -> None:
+    conn.execute(f"INSERT OR REPLACE INTO {MIRROR_STATE_TABLE} (Mirror_Dir, Table_Name, Last_Rowid) VALUES (?, ?, ?)",
+                 (_mirror_key(mirror_dir), table_name, int(last_rowid)))
+
+
+def _max_rowid(conn, table_name: str) -> Optional[int]:
+    try:
+        return conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table_name}").fetchone()[0]
+    except sqlite3.Error:
+        return None
+
+
+def capture_rowid_marks(conn) -> Dict[str, int]:
+    """
+    청크 INSERT 전 테이블별 최대 rowid를 기록합니다.
+    mirror_rows_since는 미러의 기록 위치(T_MIRROR_STATE)가 아직 없을 때만 이 값을 시작점으로 사용합니다.
+    """
+    return {table_name: _max_rowid(conn, table_name) for table_name in MIRROR_TABLES}
+
+
+def mirror_rows_since(conn, marks: Dict[str, int], mirror_dir: str = PARQUET_MIRROR_DIR, tag: Optional[str] = None) -> Dict[str, int]:
+    """
+    미러에 아직 기록하지 않은 행을 Parquet 미러에 기록합니다. 테이블별 기록 행 수를 반환합니다.
+    기록 위치 조회 → Parquet 기록 → 위치 갱신을 BEGIN IMMEDIATE(DB 쓰기 잠금) 안에서 수행하므로
+    - 다른 프로세스가 커밋한 행은 그 프로세스든 이 프로세스든 한 번만 기록되고,
+    - 기록에 실패한 테이블은 위치가 그대로 남아 다음 호출(재개된 적재 포함)에서 다시 기록됩니다.
+    열린 트랜잭션이 없는 연결(커밋 직후)로 호출해야 합니다.
+    """
+    if not is_available():
+        return {}
+    tag = tag or uuid.uuid4().hex[:12]
+    written = {}
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        create_mirror_state_schema(conn)
+        stored = _load_mirror_marks(conn, mirror_dir)
+        for table_name in MIRROR_TABLES:
+            mark = stored.get(table_name, marks.get(table_name))
+            max_rowid = _max_rowid(conn, table_name)
+            if mark is None or max_rowid is None:
+                continue
+            if max_rowid > mark:
+                df_new = pd.read_sql_query(f"{_select_with_week(table_name)} WHERE T.rowid > ? AND T.rowid <= ?",
+                                           conn, params=(mark, max_rowid))
+                if not df_new.empty:
+                    _write_partitioned(df_new, _table_schema(conn, table_name), os.path.join(mirror_dir, table_name), tag)
+                    written[table_name] = len(df_new)
+            _save_mirror_mark(conn, mirror_dir, table_name, max_rowid)
+    finally:
+        # 실패해도 이미 기록한 테이블의 위치는 저장합니다. (실패한 테이블은 다음 호출에서 다시 기록)
+        conn.commit()
+    return written
+
+
+def clamp_mirror_marks(conn) -> None:
+    """
+    행 삭제 후 기록 위치를 남은 최대 rowid 이하로 낮춥니다. (삭제 트랜잭션 안에서 호출, 커밋은 호출 측 담당)
+    SQLite는 최대 rowid 행이 지워지면 그 rowid를 다시 쓰므로, 낮추지 않으면 새 행이 미러에서 빠집니다.
+    """
+    create_mirror_state_schema(conn)
+    for table_name in MIRROR_TABLES:
+        max_rowid = _max_rowid(conn, table_name)
+        if max_rowid is not None:
+            conn.execute(f"UPDATE {MIRROR_STATE_TABLE} SET Last_Rowid = ? WHERE Table_Name = ? AND Last_Rowid > ?",
+                         (max_rowid, table_name, max_rowid))
+
+
+def export_db_to_mirror(db_file_name: str, mirror_dir: str = PARQUET_MIRROR_DIR, batch_rows: int = 200000) -> Dict[str, int]:
+    """
+    기존 DB 전체를 Parquet 미러로 다시 만듭니다. (최초 1회 또는 미러 재구성용)
+    rowid 구간 단위로 나누어 읽으므로 메모리는 batch_rows 크기로 제한됩니다.
+    """
+    if not is_available():
+        raise RuntimeError("pyarrow가 설치되어 있지 않아 Parquet 미러를 만들 수 없습니다.")
+
+    conn = sqlite3.connect(db_file_name)
+    written = {}
+    try:
+        for table_name in MIRROR_TABLES:
+            table_dir = os.path.join(mirror_dir, table_name)
+            # 기존 파일 삭제와 기록 위치 설정은 쓰기 잠금 안에서 합니다. 이후 커밋되는 행은 적재 측 mirror_rows_since가 기록합니다.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                create_mirror_state_schema(conn)
+                max_rowid = _max_rowid(conn, table_name)
+                if max_rowid is not None:
+                    if os.path.isdir(table_dir):
+                        shutil.rmtree(table_dir)
+                    _save_mirror_mark(conn, mirror_dir, table_name, max_rowid)
+            finally:
+                conn.commit()
+            if max_rowid is None:
+                continue
+            schema = _table_schema(conn, table_name)
+            written[table_name] = 0
+            for batch_no, lo in enumerate(range(0, max_rowid, batch_rows)):
+                df_batch = pd.read_sql_query(
+                    f"{_select_with_week(table_name)} WHERE T.rowid > ? AND T.rowid <= ?",
+                    conn, params=(lo, min(lo + batch_rows, max_rowid))
+                )
+                if df_batch.empty:
+                    continue
+                _write_partitioned(df_batch, schema, table_dir, f"export{batch_no:05d}")
+                written[table_name] += len(df_batch)
+    finally:
+        conn.close()
+    return written
+
+
+def import_mirror_to_db(mirror_dir: str, db_file_name: str, batch_rows: int = 100000) -> Dict[str, int]:
+    """Parquet 미러를 SQLite DB로 가져옵니다. (PRIMARY KEY 중복 행은 건너뜀)"""
+    if not is_available():
+        raise RuntimeError("pyarrow가 설치되어 있지 않아 Parquet 미러를 읽을 수 없습니다.")
+
+    from db_ingest import create_initial_db_schema, _insert_or_ignore
+
+    conn = sqlite3.connect(db_file_name)
+    inserted = {}
+    try:
+        create_initial_db_schema(conn.cursor(), conn)
+        for table_name in MIRROR_TABLES:
+            table_dir = os.path.join(mirror_dir, table_name)
+            if not os.path.isdir(table_dir):
+                continue
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")]
+            dataset = ds.dataset(table_dir, format='parquet', partitioning='hive')
+            read_columns = [col for col in columns if col in dataset.schema.names]
+            inserted[table_name] = 0
+            for batch in dataset.to_batches(columns=read_columns, batch_size=batch_rows):
+                inserted[table_name] += _insert_or_ignore(conn, table_name, batch.to_pandas(), read_columns)
+            # 가져온 행은 이미 이 미러에 있으므로, 같은 트랜잭션에서 기록 위치를 현재 최대 rowid로 맞춥니다.
+            create_mirror_state_schema(conn)
+            _save_mirror_mark(conn, mirror_dir, table_name, _max_rowid(conn, table_name))
+            conn.commit()
+        # 가져온 검사 행으로 공정 이력 파생 테이블(T_UNIT_STATUS / T_ATTEMPT_INDEX)과 SPC 통계를 다시 계산합니다.
+        if any(inserted.values()):
+            rebuild_traceability(conn)
+            rebuild_spc(conn)
+    finally:
+        conn.close()
+    return inserted
+
+
+def delete_weeks_from_mirror(weeks: List[str], mirror_dir: str = PARQUET_MIRROR_DIR) -> int:
+    """선택한 WEEK_NO 파티션 디렉터리를 삭제합니다. 삭제한 디렉터리 수를 반환합니다."""
+    removed = 0
+    for table_name in MIRROR_TABLES:
+        for week in weeks:
+            partition_dir = os.path.join(mirror_dir, table_name, f"{PARTITION_COLUMN}={week}")
+            if os.path.isdir(partition_dir):
+                shutil.rmtree(partition_dir)
+                removed += 1
+    return removed
+
+
+def has_mirror(table_name: str, mirror_dir: str = PARQUET_MIRROR_DIR) -> bool:
+    return is_available() and os.path.isdir(os.path.join(mirror_dir, table_name))
+
+
+def read_mirror(table_name: str, columns: Optional[List[str]] = None, filter_expr=None, mirror_dir: str = PARQUET_MIRROR_DIR) -> pd.DataFrame:
+    """
+    미러 테이블을 읽습니다. columns로 필요한 컬럼만, filter_expr(pyarrow.dataset 표현식)로
+    조건에 맞는 row group/파티션만 읽습니다.
+    """
+    dataset = ds.dataset(os.path.join(mirror_dir, table_name), format='parquet', partitioning='hive')
+    if columns is not None:
+        columns = [col for col in columns if col in dataset.schema.names]
+    return dataset.to_table(columns=columns, filter=filter_expr).to_pandas()
+
+
+def _item_filter(item_key: str, start_date_str: str, end_date_str: str, pc_id: Optional[str] = None):
+    """품목 테이블의 날짜 범위(문자열 'YYYY-MM-DD HH:MM:SS') / PC / 필수 컬럼 조건 (pyarrow.dataset 표현식)"""
+    spec = ITEM_MEASURES[item_key.lower()]
+    date_col = spec['date_col']
+    filter_expr = (ds.field(date_col) >= start_date_str) & (ds.field(date_col) <= end_date_str)
+    if pc_id and pc_id != '전체' and spec['pc_col']:
+        filter_expr = filter_expr & (ds.field(spec['pc_col']) == str(pc_id))
+    if spec.get('not_null_col'):
+        filter_expr = filter_expr & ds.field(spec['not_null_col']).is_valid()
+    return filter_expr
+
+
+def read_item_range(item_key: str, start_date_str: str, end_date_str: str, pc_id: Optional[str] = None,
+                    columns: Optional[List[str]] = None, mirror_dir: str = PARQUET_MIRROR_DIR) -> pd.DataFrame:
+    """품목 테이블에서 날짜 범위(문자열 'YYYY-MM-DD HH:MM:SS')와 PC 조건을 pushdown 하여 읽습니다."""
+    spec = ITEM_MEASURES[item_key.lower()]
+    return read_mirror(spec['table'], columns=columns, filter_expr=_item_filter(item_key, start_date_str, end_date_str, pc_id),
+                       mirror_dir=mirror_dir)
+
+
+def _classify_spec_result(pass_values, test_values, min_values, max_values, uses_spec):
+    """get_query_and_columns의 Spec_Result_Detail CASE 식과 동일한 분류를 벡터 연산으로 수행합니다."""
+    pass_norm = pass_values.fillna('').astype(str)
+    is_pass = pass_norm.isin(['o', 'O'])
+    is_fail = pass_norm.isin(['x', 'X'])
+
+    result = np.full(len(pass_norm), '제외', dtype=object)
+    result[is_pass.to_numpy()] = 'Pass'
+
+    if not uses_spec:
+        result[is_fail.to_numpy()] = '미달'
+        return result
+
+    value = pd.to_numeric(test_values, errors='coerce')
+    no_value = value.isna() | (value == 0.0)
+    no_spec = min_values.isna() & max_values.isna()
+    below = is_fail & ~no_value & ~no_spec & (value < min_values)
+    above = is_fail & ~no_value & ~no_spec & ~below & (value > max_values)
+    result[below.to_numpy()] = '미달'
+    result[above.to_numpy()] = '초과'
+    return result
+
+
+def _load_spec_limits(spec_table: str, db_file_name: str) -> pd.DataFrame:
+    conn = sqlite3.connect(db_file_name)
+    try:
+        return pd.read_sql_query(f"SELECT Spec_ID, Measure_Item, Min_Value AS MinLimit, Max_Value AS MaxLimit FROM {spec_table}", conn)
+    except Exception:
+        return pd.DataFrame(columns=['Spec_ID', 'Measure_Item', 'MinLimit', 'MaxLimit'])
+    finally:
+        conn.close()
+
+
+def _item_to_long(df_item: pd.DataFrame, spec: Dict, measures: List, df_spec: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """품목 행(df_item)을 measures 항목별 long-format 측정 행으로 펼치고 Spec 매칭 / Spec_Result_Detail 분류를 합니다."""
+    date_col, pass_col = spec['date_col'], spec['pass_col']
+    spec_id_cols = spec.get('spec_id_cols', {})
+    frames = []
+    for measure_name, value_col in measures:
+        spec_id_col = spec_id_cols.get(measure_name)
+        frames.append(pd.DataFrame({
+            'SNumber': df_item['SNumber'],
+            'StartTime': df_item[date_col],
+            'Measure_Item': measure_name,
+            'Test_Value': df_item[value_col] if value_col in df_item.columns else None,
+            'Spec_ID': df_item[spec_id_col] if spec_id_col in df_item.columns else None,
+            '_pass': df_item[pass_col] if pass_col in df_item.columns else None,
+        }))
+    df_long = pd.concat(frames, ignore_index=True)
+
+    if df_spec is not None:
+        # SQL의 LEFT JOIN 조건과 동일: Spec_ID가 있으면 (Spec_ID, Measure_Item), 없으면 Measure_Item으로 매칭
+        has_id = df_long['Spec_ID'].notna()
+        df_by_id = df_long[has_id].merge(df_spec, on=['Spec_ID', 'Measure_Item'], how='left')
+        df_by_item = df_long[~has_id].merge(df_spec.drop(columns=['Spec_ID']), on='Measure_Item', how='left')
+        df_long = pd.concat([df_by_id, df_by_item], ignore_index=True)
+    else:
+        df_long['MinLimit'] = None
+        df_long['MaxLimit'] = None
+
+    df_long['Spec_Result_Detail'] = _classify_spec_result(
+        df_long['_pass'], df_long['Test_Value'],
+        pd.to_numeric(df_long['MinLimit'], errors='coerce'), pd.to_numeric(df_long['MaxLimit'], errors='coerce'),
+        uses_spec=df_spec is not None
+    )
+    return df_long.drop(columns=['_pass', 'Spec_ID'])
+
+
+def iter_item_measurements(item_key: str, start_date_str: str, end_date_str: str, pc_id: Optional[str], limit: Optional[int],
+                           db_file_name: str, mirror_dir: str = PARQUET_MIRROR_DIR,
+                           chunk_rows: int = MEASURE_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    load_item_measurements의 스트리밍 버전 - Parquet 스캐너의 레코드 배치마다 약 chunk_rows 측정 행의 청크를 돌려줍니다.
+    필요한 컬럼만 읽고, 날짜/PC 조건은 Parquet 스캔 단계에서 적용됩니다. (limit이 0/None이면 제한 없음)
+    limit이 있으면 SQL의 ORDER BY Measure_Ord LIMIT과 같도록 항목 순서대로 스캔하다가 limit에서 멈춥니다.
+    """
+    spec = ITEM_MEASURES[item_key.lower()]
+    dataset = ds.dataset(os.path.join(mirror_dir, spec['table']), format='parquet', partitioning='hive')
+    filter_expr = _item_filter(item_key, start_date_str, end_date_str, pc_id)
+    df_spec = _load_spec_limits(spec['spec_table'], db_file_name) if spec['spec_table'] else None
+
+    remaining = int(limit) if limit else None
+    # 제한이 없으면 한 번의 스캔으로 배치마다 모든 항목을 펼칩니다.
+    measure_groups = [[measure] for measure in spec['measures']] if remaining is not None else [spec['measures']]
+    for measures in measure_groups:
+        wanted = ['SNumber', spec['date_col'], spec['pass_col']] + [col for _, col in measures] \
+            + [spec.get('spec_id_cols', {})[name] for name, _ in measures if name in spec.get('spec_id_cols', {})]
+        columns = [col for col in dict.fromkeys(wanted) if col in dataset.schema.names]
+        batch_rows = max(chunk_rows // len(measures), 1)
+        for batch in dataset.scanner(columns=columns, filter=filter_expr, batch_size=batch_rows).to_batches():
+            if batch.num_rows == 0:
+                continue
+            df_long = _item_to_long(batch.to_pandas(), spec, measures, df_spec)
+            if remaining is not None:
+                df_long = df_long.head(remaining)
+                remaining -= len(df_long)
+            yield df_long
+            if remaining == 0:
+                return
+
+
+def load_item_measurements(item_key: str, start_date_str: str, end_date_str: str, pc_id: Optional[str], limit: int,
+                           db_file_name: str, mirror_dir: str = PARQUET_MIRROR_DIR) -> pd.DataFrame:
+    """
+    Parquet 미러에서 run_analysis의 SQL_STEP1과 같은 형태의 결과
+    (SNumber, StartTime, Measure_Item, Test_Value, MinLimit, MaxLimit, Spec_Result_Detail)를 만듭니다.
+    (iter_item_measurements의 청크를 하나로 합칩니다. 집계만 필요하면 iter_item_measurements를 사용하세요)
+    """
+    chunks = list(iter_item_measurements(item_key, start_date_str, end_date_str, pc_id, limit, db_file_name, mirror_dir))
+    if not chunks:
+        return pd.DataFrame(columns=['SNumber', 'StartTime', 'Measure_Item', 'Test_Value', 'MinLimit', 'MaxLimit', 'Spec_Result_Detail'])
+    return pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,196 @@
+# profiling.py
+# 단계별 실행 시간 측정(span). 리더/분석/DB 적재/기간 분석의 각 단계를 span으로 감싸 두고,
+# profile_session()이 열려 있을 때만 기록합니다. (세션이 없으면 컨텍스트 변수 조회 1회로 끝나므로 평소 비용은 무시할 수준입니다)
+#
+#   with profile_session('run_analysis', track_memory=True) as profile:
+#       analyze_period(...)            # 내부의 with span('analysis.extract') as sp: ... sp.set_rows(len(df))
+#   profile.spans                      # [{'name', 'depth', 'start_s', 'duration_s', 'rows', 'peak_mb'}, ...]
+#   profile.write_jsonl(PROFILE_LOG_PATH)
+#
+# peak_mb 는 span 시작 시점 대비 최대 추가 할당량(tracemalloc)이며, 하위 span의 최대치를 포함합니다.
+# 세션은 contextvars로 전달되므로 스레드(job_runner 워커)마다 따로 열어야 합니다.
+# tracemalloc은 프로세스 전역이라 여러 세션이 동시에 메모리를 추적하면 peak_mb는 근사치가 됩니다.
+
+import contextvars
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+PROFILE_LOG_PATH = './logs/profile.jsonl'
+
+_active_profile: contextvars.ContextVar = contextvars.ContextVar('active_profile', default=None)
+
+# 메모리를 추적 중인 세션 수. 마지막 세션이 끝날 때 이 모듈이 켠 tracemalloc만 끕니다.
+_tracing_lock = threading.Lock()
+_tracing_sessions = 0
+_tracing_started_here = False
+
+
+def _acquire_tracing() -> None:
+    global _tracing_sessions, _tracing_started_here
+    with _tracing_lock:
+        if _tracing_sessions == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started_here = True
+        _tracing_sessions += 1
+
+
+def _release_tracing() -> None:
+    global _tracing_sessions, _tracing_started_here
+    with _tracing_lock:
+        _tracing_sessions -= 1
+        if _tracing_sessions == 0 and _tracing_started_here:
+            tracemalloc.stop()
+            _tracing_started_here = False
+
+
+class _NullSpan:
+    """세션이 없을 때 돌려주는 빈 span"""
+
+    def set_rows(self, rows: Optional[int]) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, record: Dict[str, Any]):
+        self._record = record
+
+    def set_rows(self, rows: Optional[int]) -> None:
+        """처리한 행 수를 기록합니다. (span 안에서 결과 크기를 알게 된 뒤 호출)"""
+        self._record['rows'] = None if rows is None else int(rows)
+
+
+class Profile:
+    """프로파일 세션 1회의 span 기록"""
+
+    def __init__(self, label: str, track_memory: bool = False):
+        self.session_id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.track_memory = track_memory
+        self.started_at = datetime.now()
+        self.spans: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, rows: Optional[int] = None):
+        record = {'name': name, 'depth': len(self._stack), 'start_s': round(time.perf_counter() - self._t0, 6),
+                  'duration_s': None, 'rows': None if rows is None else int(rows), 'peak_mb': None}
+        self.spans.append(record)
+        parent = self._stack[-1] if self._stack else None
+        if self.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent['_peak'] = max(parent['_peak'], peak)
+            tracemalloc.reset_peak()
+            record['_base'] = record['_peak'] = current
+        self._stack.append(record)
+        started = time.perf_counter()
+        try:
+            yield _Span(record)
+        finally:
+            record['duration_s'] = round(time.perf_counter() - started, 6)
+            self._stack.pop()
+            if self.track_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(record.pop('_peak'), peak)
+                record['peak_mb'] = round((peak - record.pop('_base')) / 2 ** 20, 3)
+                if parent is not None:
+                    parent['_peak'] = max(parent['_peak'], peak)
+                tracemalloc.reset_peak()
+
+    def total_seconds(self) -> float:
+        return sum(record['duration_s'] or 0 for record in self.spans if record['depth'] == 0)
+
+    def write_jsonl(self, path: str = PROFILE_LOG_PATH) -> str:
+        """span을 한 줄에 하나씩 JSONL로 추가 기록합니다. 반환: 파일 경로"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        recorded_at = self.started_at.strftime('%Y-%m-%d %H:%M:%S')
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in self.spans:
+                line = {'session': self.session_id, 'label': self.label, 'recorded_at': recorded_at}
+                line.update((key, value) for key, value in record.items() if not key.startswith('_'))
+                f.write(json.dumps(line, ensure_ascii=False) + '\n')
+        return path
+
+
+@contextmanager
+def profile_session(label: str, track_memory: bool = False):
+    """
+    이 블록 안(같은 스레드)에서 실행되는 span을 기록합니다.
+    track_memory=True 이면 tracemalloc을 켜서 span별 최대 메모리도 기록합니다. (실행 속도가 느려집니다)
+    """
+    profile = Profile(label, track_memory)
+    if track_memory:
+        _acquire_tracing()
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+        if track_memory:
+            _release_tracing()
+
+
+@contextmanager
+def span(name: str, rows: Optional[int] = None):
+    """열려 있는 프로파일 세션에 단계 하나를 기록합니다. 세션이 없으면 아무것도 하지 않습니다."""
+    profile = _active_profile.get()
+    if profile is None:
+        yield _NULL_SPAN
+        return
+    with profile.span(name, rows) as current:
+        yield current
+
+
+def current_profile() -> Optional[Profile]:
+    return _active_profile.get()
+
+
+def run_profiled(label: str, fn, *args, enabled: bool = True, track_memory: bool = True,
+                 log_path: Optional[str] = PROFILE_LOG_PATH, **kwargs):
+    """
+    enabled이면 프로파일 세션 안에서 fn(*args, **kwargs)를 실행하고 span을 log_path(JSONL)에 추가합니다.
+    반환: (fn 결과, span 목록 또는 None)  - 로그 기록 실패는 무시합니다.
+    """
+    if not enabled:
+        return fn(*args, **kwargs), None
+    with profile_session(label, track_memory) as profile:
+        result = fn(*args, **kwargs)
+    if log_path:
+        try:
+            profile.write_jsonl(log_path)
+        except OSError:
+            pass
+    return result, profile.spans
+
+
+def summarize_spans(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    같은 이름의 span을 합산합니다. (청크마다 반복되는 적재 단계 등)
+    반환: [{'name', 'calls', 'duration_s', 'rows', 'peak_mb'}]  - 전체 시간이 긴 순서
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    for record in spans:
+        total = totals.setdefault(record['name'], {'name': record['name'], 'calls': 0, 'duration_s': 0.0,
+                                                   'rows': None, 'peak_mb': None})
+        total['calls'] += 1
+        total['duration_s'] += record['duration_s'] or 0.0
+        if record['rows'] is not None:
+            total['rows'] = (total['rows'] or 0) + record['rows']
+        if record['peak_mb'] is not None:
+            total['peak_mb'] = max(total['peak_mb'] or 0.0, record['peak_mb'])
+    for total in totals.values():
+        total['duration_s'] = round(total['duration_s'], 6)
+    return sorted(totals.values(), key=lambda total: total['duration_s'], reverse=True)
@@ -0,0 +1,38 @@
+# quality_core
+# Streamlit에 의존하지 않는 분석 코어 (리더 / 분석 / QC / 분류 / DB 적재).
+# 화면 출력 대신 Diagnostics로 메시지를 돌려주므로 워커 프로세스, 배치(CLI), 벤치마크에서 그대로 사용할 수 있습니다.
+# Streamlit 앱은 csv*.py 어댑터와 st_diagnostics.py 를 통해 이 코어를 화면에 출력합니다.
+
+from quality_core.diagnostics import Diagnostics
+from quality_core.readers import (
+    READERS, read_pcb_csv, read_fw_csv, read_rftx_csv, read_semi_csv, read_batadc_csv, read_source_bytes,
+    source_path, spool_to_temp_file
+)
+from quality_core.analyzers import (
+    ANALYZERS, analyze_pcb, analyze_fw, analyze_rftx, analyze_semi, analyze_batadc
+)
+from quality_core.qc import (
+    PCB_QC_COLUMNS, apply_qc_check, clean_string_format, get_defect_counts_false, get_defect_counts_true
+)
+from quality_core.classification import (
+    SUMMARY_INDEX, SUMMARY_COLUMNS, DailySummaryAccumulator, classify_snumbers, summarize_daily
+)
+from db_ingest import (
+    process_and_save_csv_to_db, process_and_save_csv_stream_to_db, delete_weeks_from_db, INGEST_CHUNK_ROWS
+)
+
+PROCESSES = list(READERS)
+
+
+def read_and_analyze(process: str, source, diagnostics: Diagnostics = None, pass_history=None):
+    """
+    공정 파일 하나를 읽고 분석합니다. pass_history(jig_history.JigPassHistory)는 가성/진성 판정의 누적 PASS 이력입니다.
+    반환: (df, summary_data, all_dates, Diagnostics)  - 읽기에 실패하면 df/summary_data/all_dates 는 None
+    """
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+    df, _ = READERS[process](source, diagnostics)
+    if df is None or df.empty:
+        diagnostics.error(f"{process.upper()} 데이터 파일을 읽을 수 없거나 내용이 비어 있습니다. 파일 형식을 확인해주세요.")
+        return df, None, None, diagnostics
+    summary_data, all_dates, _ = ANALYZERS[process](df, diagnostics, pass_history)
+    return df, summary_data, all_dates, diagnostics
@@ -0,0 +1,147 @@
+# quality_core/analysis.py
+# 대시보드 '기간별 품질 분석'의 계산 부분 (Streamlit 미사용).
+# 사전 계산 리포트 → DuckDB 엔진 → pandas(저장소 / Parquet 미러) 순서로 일자별 집계를 만들고,
+# 화면 메시지는 Diagnostics로 돌려줍니다. pandas 경로는 쿼리 결과를 ANALYSIS_CHUNK_ROWS 행씩 읽어 바로 집계하므로
+# (DailySummaryAccumulator) 메모리는 조회 행 수가 아닌 SNumber/일자 그룹 수에 비례합니다. 앱은 결과를 바로 출력하거나 백그라운드 작업(job_runner)으로 실행합니다.
+# db_file_name은 storage.open_storage 대상(SQLite 경로 또는 mysql:// 주소)입니다. 사전 계산 리포트, Parquet 미러,
+# DuckDB 엔진은 SQLite 적재 DB를 기준으로 만들어지므로 SQLite 저장소에서만 사용하고, 그 밖의 저장소는 pandas 경로로 조회합니다.
+
+import traceback
+from typing import Any, Callable, Dict, Optional
+
+from lazy_imports import lazy_module
+from profiling import span
+from quality_core.classification import DailySummaryAccumulator
+from quality_core.diagnostics import Diagnostics
+from quality_core.metadata import range_has_data
+from quality_core.queries import iter_item_measurements
+from quality_core.reports import load_day_report
+from storage import SQLiteStorage, open_storage
+
+# DuckDB 엔진 / Parquet 미러는 해당 옵션을 선택했을 때만 import합니다. (duckdb, pyarrow.dataset import 비용)
+duckdb_engine = lazy_module('duckdb_engine')
+parquet_mirror = lazy_module('parquet_mirror')
+
+# pandas 경로(저장소 / Parquet)에서 한 번에 읽어 집계하는 측정 행 수
+ANALYSIS_CHUNK_ROWS = 50000
+
+
+def analyze_period(start_date, end_date, item: str, limit: int, pc_id: Optional[str], measure_item_filter: str,
+                   data_source: str, engine: str, db_file_name: str, report_dir: str, mirror_dir: str,
+                   db_metadata: Optional[Dict[str, Any]] = None, diagnostics: Optional[Diagnostics] = None,
+                   progress: Optional[Callable[[float, str], None]] = None) -> Dict[str, Any]:
+    """
+    기간별 일자 집계를 계산합니다. (start_date / end_date 는 datetime)
+    반환: {'item', 'daily': {Date_Only: (건수, summary_table)} 또는 None, 'n_days', 'report_generated_at',
+           'diagnostics', 'traceback'}  - daily가 None이면 출력할 결과가 없습니다. (데이터 없음 / 오류)
+    progress(비율, 단계)는 단계가 바뀔 때 호출됩니다. limit이 0/None이면 조회 행 수를 제한하지 않습니다.
+    """
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+    progress = progress or (lambda ratio, stage: None)
+    result = {'item': item, 'daily': None, 'n_days': 0, 'report_generated_at': None,
+              'diagnostics': diagnostics, 'traceback': None}
+
+    try:
+        item_key = item.lower()
+        limit = int(limit) if limit else None
+
+        start_date_str = start_date.strftime('%Y-%m-%d 00:00:00')
+        end_date_str = end_date.strftime('%Y-%m-%d 23:59:59')
+
+        # 조회 기간이 품목 데이터 기간과 겹치지 않으면 쿼리 없이 종료합니다. (메타데이터 캐시)
+        if db_metadata is not None and not range_has_data(db_metadata, item_key, start_date_str, end_date_str):
+            diagnostics.warning("⚠️ 해당 기간에 조회된 데이터가 없습니다.")
+            return result
+
+        storage = open_storage(db_file_name)
+        if not storage.exists():
+            raise FileNotFoundError(f"DB에 접근할 수 없습니다: {storage.name}")
+        is_sqlite = isinstance(storage, SQLiteStorage)
+        source_label = 'SQLite' if is_sqlite else storage.dialect.upper()
+
+        if data_source == 'Parquet' and not is_sqlite:
+            diagnostics.warning(f"⚠️ Parquet 미러는 SQLite 적재 DB 전용이라 {source_label}에서 조회합니다.")
+            use_parquet = False
+        else:
+            use_parquet = data_source == 'Parquet' and parquet_mirror.has_mirror(parquet_mirror.ITEM_MEASURES[item_key]['table'], mirror_dir)
+            if data_source == 'Parquet' and not use_parquet:
+                diagnostics.warning("⚠️ Parquet 미러가 없어 SQLite에서 조회합니다. ('DB 업로드 및 저장' 화면에서 미러를 생성하세요)")
+
+        diagnostics.info(f"조회 기간: **{start_date_str}** 부터 **{end_date_str}** 까지 | 항목: **{item.upper()}** | PC: **{pc_id}** | 유형: **{measure_item_filter}** | 소스: **{'Parquet' if use_parquet else source_label}** | 엔진: **{engine}**")
+
+        # 하루 단위 전체 조회는 배치(batch_ingest.py)가 미리 계산한 리포트를 사용합니다. (DB 지문이 같을 때만)
+        # (화면의 종료 일시는 23:59:59까지 포함하므로 날짜 부분만 비교합니다. 지문은 SQLite rowid 기준)
+        day = start_date.strftime('%Y-%m-%d')
+        if is_sqlite and day == end_date.strftime('%Y-%m-%d') and pc_id in (None, '전체') and measure_item_filter == '전체':
+            progress(0.1, "사전 계산 리포트 확인")
+            with span('analysis.report_cache'), storage.connect() as conn:
+                cached = load_day_report(conn, item_key, day, report_dir)
+            if cached is not None and (limit is None or cached['measurement_rows'] <= limit):
+                result['daily'] = {day: (cached['row_count'], cached['table'])} if cached['table'] is not None else {}
+                result['n_days'] = 1
+                result['report_generated_at'] = cached['generated_at']
+                return result
+
+        if engine == 'DuckDB':
+            if not is_sqlite:
+                diagnostics.warning(f"⚠️ DuckDB 엔진은 SQLite 파일 / Parquet 미러만 읽을 수 있어 기본(pandas) 엔진으로 분석합니다. (소스: {source_label})")
+            elif not duckdb_engine.is_available():
+                diagnostics.warning("⚠️ duckdb가 설치되어 있지 않아 기본(pandas) 엔진으로 분석합니다.")
+            else:
+                progress(0.2, "DuckDB에서 데이터 분류 및 집계 중")
+                try:
+                    with span('analysis.duckdb') as current:
+                        summary = duckdb_engine.run_daily_summary(
+                            item_key, start_date_str, end_date_str, pc_id, limit, measure_item_filter,
+                            db_file_name, source='parquet' if use_parquet else 'sqlite', mirror_dir=mirror_dir
+                        )
+                        current.set_rows(summary['rows_filtered'])
+                except Exception as e:
+                    diagnostics.warning(f"⚠️ DuckDB 엔진 실행 실패 - 기본(pandas) 엔진으로 분석합니다: {e}")
+                else:
+                    if measure_item_filter != '전체':
+                        diagnostics.info(f"✅ 유형 필터링: {summary['rows_total']}건 → {summary['rows_filtered']}건 (유형: {measure_item_filter})")
+                    if summary['rows_filtered'] == 0:
+                        diagnostics.warning("⚠️ 해당 기간에 조회된 데이터가 없습니다.")
+                        return result
+                    result['daily'] = summary['daily']
+                    result['n_days'] = len(summary['daily'])
+                    return result
+
+        # 2. 데이터 추출 + 가성/진성 분류 (청크마다 유형 필터 후 바로 집계 - 측정 행은 보관하지 않습니다)
+        progress(0.2, "DB에서 데이터 추출 및 집계 중")
+        accumulator = DailySummaryAccumulator()
+        rows_total = 0
+        with span('analysis.extract') as current:
+            if use_parquet:
+                chunks = parquet_mirror.iter_item_measurements(item_key, start_date_str, end_date_str, pc_id, limit,
+                                                               db_file_name, mirror_dir, chunk_rows=ANALYSIS_CHUNK_ROWS)
+            else:
+                # ✅ T_ITEM 테이블만 사용하는 쿼리 (quality_core.queries.get_query_and_columns)
+                chunks = iter_item_measurements(storage, item_key, start_date_str, end_date_str,
+                                                pc_id, limit, chunk_rows=ANALYSIS_CHUNK_ROWS)
+            for df_chunk in chunks:
+                rows_total += len(df_chunk)
+                if measure_item_filter != '전체':
+                    df_chunk = df_chunk[df_chunk['Measure_Item'] == measure_item_filter]
+                accumulator.add(df_chunk)
+            current.set_rows(rows_total)
+
+        if measure_item_filter != '전체':
+            diagnostics.info(f"✅ 유형 필터링: {rows_total}건 → {accumulator.rows}건 (유형: {measure_item_filter})")
+
+        if accumulator.rows == 0:
+            diagnostics.warning("⚠️ 해당 기간에 조회된 데이터가 없습니다.")
+            return result
+
+    except Exception as e:
+        diagnostics.error(f"❌ 데이터 추출 오류: {e}")
+        result['traceback'] = traceback.format_exc()
+        return result
+
+    # ✅✅✅ 3. 일자별 집계 테이블 (대기 중인 SNumber는 여기서 진성불량으로 확정)
+    progress(0.9, f"일자별 집계 테이블 생성 중 ({accumulator.rows:,}건)")
+    with span('classify.summary', rows=accumulator.rows):
+        result['daily'] = accumulator.result()
+    result['n_days'] = len(accumulator.days)
+    return result
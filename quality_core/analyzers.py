@@ -0,0 +1,399 @@
+# quality_core/analyzers.py
+# 공정별 분석 로직: Jig × 날짜별 Pass/가성불량/진성불량 집계와 상세 데이터.
+# 반환: (summary_data, all_dates, Diagnostics)  - summary_data/all_dates 는 기존 csv*.py 분석 함수와 동일한 형태입니다.
+# 입력 DataFrame은 기존과 같이 제자리에서 정리/변환됩니다. (호출 측은 분석 후 df를 상세 조회용으로 사용합니다)
+# pass_history(jig_history.JigPassHistory)를 넘기면 가성/진성 판정에 DB에 적재된 Jig PASS 이력도 사용합니다. (Semi 제외, 조회 전용)
+
+import sqlite3
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from jig_history import jig_key
+from profiling import span
+from quality_core.diagnostics import Diagnostics
+from quality_core.qc import (
+    PCB_QC_COLUMNS, apply_qc_check, clean_string_format, get_defect_counts_false, get_defect_counts_true
+)
+
+AnalyzeResult = Tuple[Optional[Dict[Any, Dict[str, Dict[str, Any]]]], Optional[List[date]], Diagnostics]
+
+
+def clean_semi_string_format(value):
+    """SemiAssy 데이터의 다양한 형태의 문자열 포맷을 정리하는 함수"""
+    if pd.isna(value):
+        return value
+
+    value_str = str(value).strip()
+
+    if value_str.startswith('="') and value_str.endswith('"'):
+        return value_str[2:-1]
+
+    if value_str.startswith('""') and value_str.endswith('""'):
+        return value_str[2:-2]
+
+    if value_str.startswith('"') and value_str.endswith('"') and len(value_str) > 2:
+        return value_str[1:-1]
+
+    return value_str
+
+
+def _jig_pass_sets(df: pd.DataFrame, jig_col: str, process: str, pass_history,
+                   diagnostics: Diagnostics) -> Dict[Any, set]:
+    """
+    Jig별로 한 번이라도 PASS한 SNumber 집합.
+    pass_history가 있으면 이 파일에서 PASS가 없는 FAIL (Jig, SNumber)만 누적 이력에서 찾아 더합니다.
+    (조회만 합니다. 이력은 DB에 적재된 검사로만 채워지므로 파일 분석은 DB를 바꾸지 않습니다)
+    """
+    jig_pass_history = df[df['PassStatusNorm'] == 'O'].groupby(jig_col)['SNumber'].unique().apply(set).to_dict()
+    if pass_history is None:
+        return jig_pass_history
+
+    fail_pairs = df.loc[df['PassStatusNorm'] == 'X', [jig_col, 'SNumber']].dropna().drop_duplicates()
+    unknown = [sn not in jig_pass_history.get(jig, ()) for jig, sn in zip(fail_pairs[jig_col], fail_pairs['SNumber'])]
+    fail_pairs = fail_pairs[unknown]
+    try:
+        with span('analyze.jig_history', rows=len(fail_pairs)):
+            known = pass_history.passed(process, fail_pairs[jig_col], fail_pairs['SNumber'])
+    except sqlite3.Error as e:
+        diagnostics.warning(f"누적 Jig PASS 이력을 사용할 수 없어 현재 파일 기준으로 판정합니다: {e}")
+        return jig_pass_history
+
+    added = 0
+    for jig, sn in zip(fail_pairs[jig_col], fail_pairs['SNumber']):
+        if (jig_key(jig), str(sn)) in known:
+            jig_pass_history.setdefault(jig, set()).add(sn)
+            added += 1
+    if added:
+        diagnostics.info(f"누적 Jig PASS 이력: 이 파일에서 PASS가 없는 {added}건의 (Jig, SNumber)를 이전 PASS 기준으로 가성불량 판정합니다.")
+    return jig_pass_history
+
+
+def _summarize_by_jig(df: pd.DataFrame, jig_col: str, timestamp_col: str, with_qc_counts: bool = False,
+                      process: str = '', pass_history=None,
+                      diagnostics: Optional[Diagnostics] = None) -> Dict[Any, Dict[str, Dict[str, Any]]]:
+    """
+    Jig × 날짜별 집계 (Pcb / Fw / RfTx / Batadc 공통).
+    가성불량: 해당 Jig에서 한 번이라도 PASS한 SNumber의 FAIL, 진성불량: 그 외 FAIL
+    (pass_history가 있으면 DB에 적재된 PASS 이력 포함)
+    """
+    summary_data = {}
+
+    # 전체 데이터에서 Jig별로 한 번이라도 PASS한 SNumber들을 미리 계산
+    jig_pass_history = _jig_pass_sets(df, jig_col, process, pass_history,
+                                      diagnostics if diagnostics is not None else Diagnostics())
+
+    for jig, group in df.groupby(jig_col):
+        group = group.dropna(subset=[timestamp_col])
+        if group.empty:
+            continue
+
+        for d, day_group in group.groupby(group[timestamp_col].dt.date):
+            if pd.isna(d):
+                continue
+
+            date_iso = pd.to_datetime(d).strftime("%Y-%m-%d")
+            current_jig_passed_sns = jig_pass_history.get(jig, set())
+
+            pass_df = day_group[day_group['PassStatusNorm'] == 'O']
+            fail_df = day_group[day_group['PassStatusNorm'] == 'X']
+
+            false_defect_df = fail_df[fail_df['SNumber'].isin(current_jig_passed_sns)]
+            true_defect_df = fail_df[~fail_df['SNumber'].isin(current_jig_passed_sns)]
+
+            pass_count = len(pass_df)
+            total_test = len(day_group)
+            rate = 100 * pass_count / total_test if total_test > 0 else 0
+
+            entry = {
+                'total_test': total_test,
+                'pass': pass_count,
+                'false_defect': len(false_defect_df),
+                'true_defect': len(true_defect_df),
+                'fail': len(fail_df),
+                'pass_rate': f"{rate:.1f}%",
+            }
+
+            if with_qc_counts:
+                # 가성/진성 불량의 세부 원인(QC) 카운트
+                true_counts = get_defect_counts_true(true_defect_df)
+                false_counts = get_defect_counts_false(false_defect_df)
+                entry.update({
+                    'true_defect_미달': true_counts['미달'],
+                    'true_defect_초과': true_counts['초과'],
+                    'true_defect_제외': true_counts['제외'],
+                    'false_defect_미달': false_counts['미달2'],
+                    'false_defect_초과': false_counts['초과2'],
+                    'false_defect_제외': false_counts['제외2'],
+                })
+
+            entry.update({
+                # 상세 데이터: DataFrame의 모든 컬럼을 dict 리스트로 저장
+                'pass_data': pass_df.to_dict('records'),
+                'false_defect_data': false_defect_df.to_dict('records'),
+                'true_defect_data': true_defect_df.to_dict('records'),
+                'fail_data': fail_df.to_dict('records'),
+
+                # 고유 SN 건수
+                'pass_unique_count': len(pass_df['SNumber'].unique()),
+                'false_defect_unique_count': len(false_defect_df['SNumber'].unique()),
+                'true_defect_unique_count': len(true_defect_df['SNumber'].unique()),
+                'fail_unique_count': len(fail_df['SNumber'].unique())
+            })
+
+            summary_data.setdefault(jig, {})[date_iso] = entry
+
+    return summary_data
+
+
+def analyze_pcb(df: pd.DataFrame, diagnostics: Optional[Diagnostics] = None, pass_history=None) -> AnalyzeResult:
+    """
+    PCB 데이터 분석. QC 체크 후 PcbStartTime 컬럼의 다양한 타임스탬프 형식을 처리하고,
+    상세 데이터를 전체 컬럼으로 저장합니다. 실패 시 ({}, []) 를 반환합니다.
+    """
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+
+    with span('analyze.clean_strings', rows=len(df)):
+        for col in df.columns:
+            df[col] = df[col].apply(clean_string_format)
+
+    with span('analyze.qc', rows=len(df)):
+        for col_name in PCB_QC_COLUMNS:
+            df = apply_qc_check(df, col_name, diagnostics)
+
+    # PassStatusNorm 컬럼 생성 (최우선)
+    pass_col = 'PcbPass'
+    try:
+        pass_col_actual = next(col for col in df.columns if col.strip().lower() == pass_col.lower())
+        df['PassStatusNorm'] = df[pass_col_actual].fillna('').astype(str).str.strip().str.upper()
+    except StopIteration:
+        diagnostics.error(f"'{pass_col}' 컬럼을 찾을 수 없어 'PassStatusNorm' 생성에 실패했습니다.")
+        return {}, [], diagnostics
+
+    timestamp_col = 'PcbStartTime'
+    try:
+        timestamp_col_actual = next(col for col in df.columns if col.strip().lower() == timestamp_col.lower())
+    except StopIteration:
+        diagnostics.error(f"'{timestamp_col}' 컬럼이 데이터에 없습니다.")
+        return {}, [], diagnostics
+
+    # === 타임스탬프 변환 ===
+    with span('analyze.timestamps', rows=len(df)):
+        # 1. YYYYMMDDHHmmss 형식 변환 시도 (문자열 전용)
+        df['temp_converted'] = pd.to_datetime(df[timestamp_col_actual].astype(str).str.strip(), format='%Y%m%d%H%M%S', errors='coerce')
+
+        # 2. 유닉스 타임스탬프 (초 / 밀리초) 변환 시도
+        numeric_series = pd.to_numeric(df[timestamp_col_actual].astype(str).str.strip(), errors='coerce')
+        seconds_converted = pd.to_datetime(numeric_series, unit='s', errors='coerce')
+        milliseconds_converted = pd.to_datetime(numeric_series, unit='ms', errors='coerce')
+
+        final_series = df['temp_converted'].copy()
+        is_na = final_series.isnull()
+
+        # 초 단위 변환 결과 사용 (1980년 이후의 날짜만 유효한 것으로 간주하여 1970년 에러 방지)
+        is_valid_seconds = seconds_converted.notnull() & (seconds_converted.dt.year > 1980)
+        final_series[is_na & is_valid_seconds] = seconds_converted[is_na & is_valid_seconds]
+        is_na = final_series.isnull()
+
+        # 밀리초 단위 변환 결과 사용
+        final_series[is_na] = milliseconds_converted[is_na]
+
+        df = df.drop(columns=['temp_converted'], errors='ignore')
+
+    if final_series.isnull().all():
+        diagnostics.warning(f"타임스탬프 변환에 실패했습니다. '{timestamp_col_actual}' 컬럼의 형식을 확인해주세요.")
+        return {}, [], diagnostics
+
+    df[timestamp_col_actual] = final_series
+
+    jig_col = 'PcbMaxIrPwr'
+    if jig_col not in df.columns:
+        df[jig_col] = 'DefaultJig'
+
+    with span('analyze.summary', rows=len(df)):
+        summary_data = _summarize_by_jig(df, jig_col, timestamp_col_actual, with_qc_counts=True,
+                                         process='pcb', pass_history=pass_history, diagnostics=diagnostics)
+    all_dates = sorted(list(df[timestamp_col_actual].dt.date.dropna().unique()))
+    return summary_data, all_dates, diagnostics
+
+
+def _analyze_simple(df: pd.DataFrame, stamp_col: str, pass_col: str, jig_col: str,
+                    diagnostics: Diagnostics, process: str, pass_history=None) -> AnalyzeResult:
+    """Fw / Batadc: 타임스탬프를 pandas 기본 파서로 변환한 뒤 Jig × 날짜별로 집계합니다."""
+    with span('analyze.clean_strings', rows=len(df)):
+        for col in df.columns:
+            df[col] = df[col].apply(clean_string_format)
+
+    with span('analyze.timestamps', rows=len(df)):
+        df[stamp_col] = pd.to_datetime(df[stamp_col], errors='coerce')
+    df['PassStatusNorm'] = df[pass_col].fillna('').astype(str).str.strip().str.upper()
+
+    if jig_col not in df.columns:
+        df[jig_col] = 'DefaultJig'
+
+    with span('analyze.summary', rows=len(df)):
+        summary_data = _summarize_by_jig(df, jig_col, stamp_col, process=process, pass_history=pass_history,
+                                         diagnostics=diagnostics)
+    all_dates = sorted(list(df[stamp_col].dt.date.dropna().unique()))
+    return summary_data, all_dates, diagnostics
+
+
+def analyze_fw(df: pd.DataFrame, diagnostics: Optional[Diagnostics] = None, pass_history=None) -> AnalyzeResult:
+    """Fw 데이터 분석 (Jig: FwPC)"""
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+    return _analyze_simple(df, 'FwStamp', 'FwPass', 'FwPC', diagnostics, 'fw', pass_history)
+
+
+def analyze_batadc(df: pd.DataFrame, diagnostics: Optional[Diagnostics] = None, pass_history=None) -> AnalyzeResult:
+    """Batadc 데이터 분석 (Jig: BatadcPC)"""
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+    return _analyze_simple(df, 'BatadcStamp', 'BatadcPass', 'BatadcPC', diagnostics, 'batadc', pass_history)
+
+
+def analyze_rftx(df: pd.DataFrame, diagnostics: Optional[Diagnostics] = None, pass_history=None) -> AnalyzeResult:
+    """RfTx 데이터 분석 (Jig: RfTxPC). 타임스탬프 변환 실패 시 (None, None) 을 반환합니다."""
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+
+    with span('analyze.clean_strings', rows=len(df)):
+        for col in df.columns:
+            df[col] = df[col].apply(clean_string_format)
+
+    original_col_name = 'RfTxStamp'
+    if original_col_name not in df.columns:
+        diagnostics.error(f"'{original_col_name}' 컬럼이 데이터에 없습니다.")
+        return None, None, diagnostics
+
+    # 밀리초 → 초 → 'YYYY-MM-DD HH:MM:SS' → 'YYYY/MM/DD HH:MM:SS' 순서로 변환 시도
+    converted_series = None
+    attempts = [
+        {'unit': 'ms'},
+        {'unit': 's'},
+        {'format': '%Y-%m-%d %H:%M:%S'},
+        {'format': '%Y/%m/%d %H:%M:%S'},
+    ]
+    with span('analyze.timestamps', rows=len(df)):
+        for kwargs in attempts:
+            if converted_series is not None and not converted_series.isnull().all():
+                break
+            try:
+                converted_series = pd.to_datetime(df[original_col_name], errors='coerce', **kwargs)
+            except Exception:
+                pass
+
+    if converted_series is None or converted_series.isnull().all():
+        diagnostics.warning(f"타임스탬프 변환에 실패했습니다. {original_col_name} 컬럼의 형식을 확인해주세요.")
+        return None, None, diagnostics
+    df[original_col_name] = converted_series
+
+    df['PassStatusNorm'] = df['RfTxPass'].fillna('').astype(str).str.strip().str.upper()
+
+    if 'RfTxPC' not in df.columns:
+        df['RfTxPC'] = 'DefaultJig'
+
+    with span('analyze.summary', rows=len(df)):
+        summary_data = _summarize_by_jig(df, 'RfTxPC', original_col_name, process='rftx', pass_history=pass_history,
+                                         diagnostics=diagnostics)
+    all_dates = sorted(list(df[original_col_name].dt.date.dropna().unique()))
+    return summary_data, all_dates, diagnostics
+
+
+def analyze_semi(df: pd.DataFrame, diagnostics: Optional[Diagnostics] = None, pass_history=None) -> AnalyzeResult:
+    """
+    SemiAssy 데이터 분석. 가성불량은 같은 날짜/Jig 안에서 PASS 이력이 있는 SNumber의 FAIL입니다.
+    (날짜 단위 판정이므로 pass_history는 사용하지 않습니다. 다른 분석 함수와 호출 형태를 맞추기 위한 인자)
+    상세 데이터 대신 SNumber 목록을 저장합니다. 실패 시 (None, []) 를 반환합니다.
+    """
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+    try:
+        required_columns = ['SNumber', 'SemiAssyStartTime', 'SemiAssyMaxSolarVolt', 'SemiAssyPass']
+        missing_columns = [col for col in required_columns if col not in df.columns]
+
+        if missing_columns:
+            raise ValueError(f"필수 컬럼이 없습니다: {missing_columns}")
+
+        with span('analyze.clean_strings', rows=len(df)):
+            for col in df.columns:
+                df[col] = df[col].apply(clean_semi_string_format)
+
+        with span('analyze.timestamps', rows=len(df)):
+            df['SemiAssyStartTime'] = pd.to_datetime(df['SemiAssyStartTime'], format='%Y%m%d%H%M%S', errors='coerce')
+        df['PassStatusNorm'] = df['SemiAssyPass'].fillna('').astype(str).str.strip().str.upper()
+
+        df_valid = df.dropna(subset=['SemiAssyStartTime']).copy()
+
+        if df_valid.empty:
+            raise ValueError("유효한 날짜 데이터가 없습니다.")
+
+        # Jig로 사용할 컬럼을 동적으로 찾습니다. 없으면 기본값을 사용합니다.
+        if 'SemiAssyMaxSolarVolt' in df_valid.columns and not df_valid['SemiAssyMaxSolarVolt'].isna().all():
+            jig_column = 'SemiAssyMaxSolarVolt'
+        elif 'BatadcPC' in df_valid.columns and not df_valid['BatadcPC'].isna().all():
+            jig_column = 'BatadcPC'
+        else:
+            df_valid['DEFAULT_JIG'] = 'SemiAssy_JIG'
+            jig_column = 'DEFAULT_JIG'
+
+        with span('analyze.summary', rows=len(df_valid)):
+            summary_data = {}
+
+            for jig, group in df_valid.groupby(jig_column):
+                if pd.isna(jig) or str(jig).strip() == '':
+                    continue
+
+                for d, day_group in group.groupby(group['SemiAssyStartTime'].dt.date):
+                    if pd.isna(d):
+                        continue
+
+                    date_iso = pd.to_datetime(d).strftime("%Y-%m-%d")
+
+                    ever_passed_sns = day_group[day_group['PassStatusNorm'] == 'O']['SNumber'].unique()
+
+                    pass_df = day_group[day_group['PassStatusNorm'] == 'O']
+                    fail_df = day_group[day_group['PassStatusNorm'] == 'X']
+                    false_defect_df = fail_df[fail_df['SNumber'].isin(ever_passed_sns)]
+                    true_defect_df = fail_df[~fail_df['SNumber'].isin(ever_passed_sns)]
+
+                    pass_sns = pass_df['SNumber'].unique().tolist()
+                    false_defect_sns = false_defect_df['SNumber'].unique().tolist()
+                    true_defect_sns = true_defect_df['SNumber'].unique().tolist()
+                    fail_sns = fail_df['SNumber'].unique().tolist()
+
+                    pass_count = len(pass_df)
+                    total_test = len(day_group)
+                    rate = 100 * pass_count / total_test if total_test > 0 else 0
+
+                    summary_data.setdefault(jig, {})[date_iso] = {
+                        'total_test': total_test,
+                        'pass': pass_count,
+                        'false_defect': len(false_defect_df),
+                        'true_defect': len(true_defect_df),
+                        'fail': len(fail_df),
+                        'pass_rate': f"{rate:.1f}%",
+
+                        'pass_sns': pass_sns,
+                        'false_defect_sns': false_defect_sns,
+                        'true_defect_sns': true_defect_sns,
+                        'fail_sns': fail_sns,
+
+                        'pass_unique_count': len(pass_sns),
+                        'false_defect_unique_count': len(false_defect_sns),
+                        'true_defect_unique_count': len(true_defect_sns),
+                        'fail_unique_count': len(fail_sns)
+                    }
+
+        all_dates = sorted(list(df_valid['SemiAssyStartTime'].dt.date.dropna().unique()))
+        return summary_data, all_dates, diagnostics
+    except Exception as e:
+        diagnostics.error(f"Semi 데이터 분석 중 오류가 발생했습니다: {e}")
+        return None, [], diagnostics
+
+
+# 공정 키(Pcb/Fw/RfTx/Semi/Batadc) → 분석 함수
+ANALYZERS: Dict[str, Callable[..., AnalyzeResult]] = {
+    'Pcb': analyze_pcb,
+    'Fw': analyze_fw,
+    'RfTx': analyze_rftx,
+    'Semi': analyze_semi,
+    'Batadc': analyze_batadc,
+}
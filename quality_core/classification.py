@@ -0,0 +1,140 @@
+# quality_core/classification.py
+# run_analysis(pandas 경로)의 가성/진성 분류와 일자별 crosstab.
+# 입력: get_query_and_columns / parquet_mirror.load_item_measurements 가 돌려주는 측정 long frame
+#       (SNumber, StartTime, Measure_Item, Test_Value, MinLimit, MaxLimit, Spec_Result_Detail)
+# 반환 형태는 duckdb_engine.run_daily_summary 의 'daily' 와 같습니다: {Date_Only: (건수, summary_table)}
+# 쿼리 결과를 청크 단위로 읽는 경로(quality_core.queries.iter_item_measurements)는 DailySummaryAccumulator로 집계합니다.
+
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from profiling import span
+
+SUMMARY_INDEX = ['Pass', '가성불량', '진성불량', 'Total']
+SUMMARY_COLUMNS = ['Pass', '미달', '초과', '제외', 'Total']
+SUMMARY_DETAILS = ['Pass', '미달', '초과', '제외']
+
+
+def classify_snumbers(df_measurements: pd.DataFrame) -> pd.DataFrame:
+    """
+    SNumber별로 기간 내 Pass 이력이 있으면 '가성불량', 없으면 '진성불량'으로 분류하여
+    Date_Only / Has_Pass / SNumber_Category 컬럼을 붙인 사본을 반환합니다.
+    """
+    df_final = df_measurements.copy()
+    df_final['Date_Only'] = df_final['StartTime'].str[:10]
+
+    # SNumber별 Pass 여부 확인
+    snumber_pass_status = df_final[df_final['Spec_Result_Detail'] == 'Pass'].groupby('SNumber').size().reset_index(name='PassCount')
+    snumber_pass_status['Has_Pass'] = snumber_pass_status['PassCount'] > 0
+    df_final = pd.merge(df_final, snumber_pass_status[['SNumber', 'Has_Pass']], on='SNumber', how='left').fillna({'Has_Pass': False})
+
+    # SNumber별 가성/진성 분류
+    snumber_classification = df_final.groupby('SNumber').agg({
+        'Has_Pass': 'first'
+    }).reset_index()
+
+    snumber_classification['SNumber_Category'] = snumber_classification['Has_Pass'].apply(
+        lambda x: '가성불량' if x else '진성불량'
+    )
+
+    return pd.merge(df_final, snumber_classification[['SNumber', 'SNumber_Category']], on='SNumber', how='left')
+
+
+class DailySummaryAccumulator:
+    """
+    summarize_daily의 증분 버전 - 측정 long frame을 청크 단위로 add() 하고 마지막에 result()로 같은 결과를 만듭니다.
+    행을 모아 두지 않고 다음 값만 유지하므로 메모리는 행 수가 아닌 그룹 수에 비례합니다.
+      - Pass 행이 있는 SNumber 집합
+      - 확정된 (일자, 분류, 판정) 건수 - Pass 행, 이미 Pass 이력이 있는 SNumber의 불량 행(가성불량)
+      - 아직 Pass 이력이 없는 SNumber별 (일자, 판정) 불량 건수 - 뒤 청크에서 Pass가 나오면 가성불량으로 옮기고,
+        끝까지 없으면 진성불량으로 확정합니다. (가성/진성은 기간 전체의 Pass 이력으로 정해지기 때문입니다)
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.days = set()
+        self.pass_snumbers = set()
+        self._summary_rows: Dict[str, int] = {}
+        self._counts: Dict[Tuple[str, str, str], int] = {}
+        self._pending: Dict[str, Dict[Tuple[str, str], int]] = {}
+
+    def _count(self, day: str, category: str, detail: str, n: int) -> None:
+        key = (day, category, detail)
+        self._counts[key] = self._counts.get(key, 0) + n
+
+    def add(self, df_measurements: pd.DataFrame) -> None:
+        """측정 long frame 청크 1개를 집계에 더합니다. (SNumber, StartTime, Spec_Result_Detail 컬럼 사용)"""
+        if df_measurements.empty:
+            return
+        self.rows += len(df_measurements)
+        day = df_measurements['StartTime'].str[:10]
+        detail = df_measurements['Spec_Result_Detail']
+        snumber = df_measurements['SNumber']
+        self.days.update(day.dropna().unique())
+
+        in_summary = detail.isin(SUMMARY_DETAILS)
+        for day_value, n in day[in_summary].value_counts().items():
+            self._summary_rows[day_value] = self._summary_rows.get(day_value, 0) + int(n)
+
+        # 1. 이 청크의 Pass (같은 청크의 앞/뒤 불량 행도 가성불량이 되도록 먼저 반영)
+        is_pass = (detail == 'Pass').to_numpy()
+        for day_value, n in day[is_pass].value_counts().items():
+            self._count(day_value, 'Pass', 'Pass', int(n))
+        for sn in snumber[is_pass].dropna().unique():
+            if sn in self.pass_snumbers:
+                continue
+            self.pass_snumbers.add(sn)
+            for (day_value, detail_value), n in self._pending.pop(sn, {}).items():
+                self._count(day_value, '가성불량', detail_value, n)
+
+        # 2. 불량(미달/초과/제외) 행: Pass 이력이 있으면 가성불량 확정, 없으면 SNumber별 대기
+        is_fail = (in_summary & ~(detail == 'Pass')).to_numpy()
+        if not is_fail.any():
+            return
+        df_fail = pd.DataFrame({'SNumber': snumber[is_fail], 'Day': day[is_fail], 'Detail': detail[is_fail]})
+        fail_snumbers = df_fail['SNumber'].dropna().unique()
+        passed = {sn for sn in fail_snumbers if sn in self.pass_snumbers}
+        has_pass = df_fail['SNumber'].isin(passed)
+        for (day_value, detail_value), n in df_fail[has_pass].groupby(['Day', 'Detail']).size().items():
+            self._count(day_value, '가성불량', detail_value, int(n))
+        for (sn, day_value, detail_value), n in df_fail[~has_pass].groupby(['SNumber', 'Day', 'Detail']).size().items():
+            pending = self._pending.setdefault(sn, {})
+            pending[(day_value, detail_value)] = pending.get((day_value, detail_value), 0) + int(n)
+
+    def result(self) -> Dict[str, Tuple[int, pd.DataFrame]]:
+        """일자별 (건수, summary_table) - summarize_daily와 같은 형태입니다."""
+        counts = dict(self._counts)
+        for pending in self._pending.values():
+            for (day_value, detail_value), n in pending.items():
+                key = (day_value, '진성불량', detail_value)
+                counts[key] = counts.get(key, 0) + n
+
+        tables: Dict[str, pd.DataFrame] = {}
+        for (day_value, category, detail_value), n in counts.items():
+            table = tables.get(day_value)
+            if table is None:
+                table = tables[day_value] = pd.DataFrame(0, index=SUMMARY_INDEX, columns=SUMMARY_COLUMNS, dtype='int64')
+            table.loc[category, detail_value] += n
+
+        daily = {}
+        for day_value in sorted(tables):
+            table = tables[day_value]
+            table['Total'] = table[SUMMARY_DETAILS].sum(axis=1)
+            table.loc['Total'] = table.loc[['Pass', '가성불량', '진성불량']].sum(axis=0)
+            table.index.name = 'Final_Failure_Category'
+            table.columns.name = 'Spec_Result_Detail'
+            daily[day_value] = (self._summary_rows.get(day_value, 0), table)
+        return daily
+
+
+def summarize_daily(df_measurements: pd.DataFrame) -> Dict[str, Tuple[int, pd.DataFrame]]:
+    """
+    일자별 Final_Failure_Category × Spec_Result_Detail 집계 테이블을 만듭니다.
+    (행: Pass/가성불량/진성불량/Total, 열: Pass/미달/초과/제외/Total)
+    청크 단위로 읽는 경우에는 DailySummaryAccumulator를 직접 사용합니다.
+    """
+    accumulator = DailySummaryAccumulator()
+    with span('classify.summary', rows=len(df_measurements)):
+        accumulator.add(df_measurements)
+        return accumulator.result()
@@ -0,0 +1,49 @@
+# quality_core/diagnostics.py
+# 리더/분석 함수가 화면에 직접 출력(st.warning, st.error)하지 않고 메시지를 모아 반환하기 위한 컨테이너입니다.
+# Streamlit 화면에서는 st_diagnostics.render_diagnostics()로 출력하고,
+# 배치/벤치마크/워커 프로세스에서는 messages를 로그로 남기거나 무시합니다.
+
+from typing import Dict, List, Optional
+
+INFO = 'info'
+WARNING = 'warning'
+ERROR = 'error'
+
+
+class Diagnostics:
+    """분석 과정의 메시지(info/warning/error)와 공정별 필드 매핑을 보관합니다."""
+
+    def __init__(self):
+        self.messages: List[Dict[str, str]] = []
+        # {공정 키: 헤더 탐지에 사용된 실제 컬럼 목록} - 기존 st.session_state.field_mapping 과 같은 형태
+        self.field_mapping: Dict[str, List[str]] = {}
+
+    def add(self, level: str, message: str) -> None:
+        self.messages.append({'level': level, 'message': message})
+
+    def info(self, message: str) -> None:
+        self.add(INFO, message)
+
+    def warning(self, message: str) -> None:
+        self.add(WARNING, message)
+
+    def error(self, message: str) -> None:
+        self.add(ERROR, message)
+
+    @property
+    def has_errors(self) -> bool:
+        return any(m['level'] == ERROR for m in self.messages)
+
+    def extend(self, other: Optional['Diagnostics']) -> 'Diagnostics':
+        """다른 Diagnostics의 메시지와 필드 매핑을 합칩니다."""
+        if other is not None and other is not self:
+            self.messages.extend(other.messages)
+            self.field_mapping.update(other.field_mapping)
+        return self
+
+    def to_dict(self) -> Dict[str, object]:
+        """JSON 직렬화용 (배치 리포트 등)"""
+        return {'messages': list(self.messages), 'field_mapping': dict(self.field_mapping)}
+
+    def __repr__(self) -> str:
+        return f"Diagnostics(messages={self.messages!r}, field_mapping={self.field_mapping!r})"
@@ -0,0 +1,126 @@
+# quality_core/metadata.py
+# 대시보드 사이드바/삭제 화면이 쓰는 DB 메타데이터(품목별 PC 목록, 주차 목록, 품목별 기간, Spec 테이블)를
+# 한 번에 읽습니다. 품목 테이블을 조인해야 하는 주차별 행 수(load_week_counts)는 삭제 화면에서만 따로 읽습니다. 호출 측은 DB 세대 번호(db_ingest.get_db_generation, 적재/삭제마다 증가)를 키로 캐시하고,
+# DB 파일 서명(db_file_signature)이 바뀌지 않았으면 SQLite에 접근하지 않고 캐시를 그대로 사용합니다.
+# conn은 sqlite3 연결 또는 storage.Storage.connect()가 빌려준 연결(? 파라미터, MySQL 포함)입니다.
+
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from db_ingest import get_db_generation
+from storage import DB_ERRORS
+from quality_core.queries import DATE_COLUMN_MAP, ITEM_OPTIONS
+from quality_core.reports import ITEM_TABLES, SPEC_TABLES
+
+# 품목별 유형 필터 목록 (사이드바 '측정 유형 선택')
+MEASURE_ITEMS_MAP = {
+    'pcb': ['전체', 'SleepCurr', 'BatVolt', 'IrCurr', 'IrPwr', 'WirelessVolt', 'UsbCurr', 'WirelessUsbVolt', 'Led'],
+    'semi': ['전체', 'BatVolt', 'SolarVolt'],
+    'fw': ['전체', 'FileCheck'],
+    'rftx': ['전체', 'Power', 'Modul', 'CFOD'],
+    'batadc': ['전체', 'Level', 'VoiceTh']
+}
+
+# 품목 → T_PC_INFO.PC_Type (semi는 PC 구분 없음)
+PC_TYPES = {'pcb': 'PCB', 'fw': 'FW', 'rftx': 'RFTX', 'batadc': 'BATADC'}
+
+
+def db_file_signature(db_file_name: str) -> Optional[Tuple]:
+    """DB 파일(+ WAL)의 (크기, 수정 시각). 쓰기가 없으면 그대로이므로 SQLite를 열지 않고 변경 여부를 판단합니다."""
+    signature = []
+    for path in (db_file_name, f"{db_file_name}-wal"):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+            continue
+        signature.append((stat.st_size, stat.st_mtime_ns))
+    return tuple(signature) if signature[0] is not None else None
+
+
+def _read_list(conn: sqlite3.Connection, query: str, params: Iterable = ()) -> List[Any]:
+    try:
+        return [row[0] for row in conn.execute(query, tuple(params))]
+    except DB_ERRORS:
+        return []
+
+
+def load_db_metadata(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    DB 메타데이터를 읽습니다.
+    반환: {'generation', 'pc_by_item': {품목: [PC_ID]}, 'weeks': [WEEK_NO 내림차순],
+           'date_bounds': {품목: (최소, 최대) 또는 None},
+           'specs': {품목: DataFrame}}
+    """
+    metadata: Dict[str, Any] = {'generation': get_db_generation(conn)}
+
+    metadata['pc_by_item'] = {
+        item_key: _read_list(conn, "SELECT DISTINCT PC_ID FROM T_PC_INFO WHERE PC_Type = ? ORDER BY PC_ID", (pc_type,))
+        for item_key, pc_type in PC_TYPES.items()
+    }
+
+    metadata['weeks'] = _read_list(
+        conn, "SELECT DISTINCT WEEK_NO FROM T_MASTER_DATA WHERE WEEK_NO IS NOT NULL ORDER BY WEEK_NO DESC"
+    )
+
+    # 품목별 기간 (시간 컬럼 인덱스의 처음/끝만 읽습니다)
+    # MIN과 MAX를 한 SELECT에 함께 쓰면 SQLite가 인덱스 전체를 훑으므로 각각 스칼라 서브쿼리로 나눕니다.
+    date_bounds = {}
+    for item_key in ITEM_OPTIONS:
+        date_col = DATE_COLUMN_MAP[item_key]
+        try:
+            first, last = conn.execute(
+                f"SELECT (SELECT MIN({date_col}) FROM {ITEM_TABLES[item_key]}), (SELECT MAX({date_col}) FROM {ITEM_TABLES[item_key]})"
+            ).fetchone()
+        except DB_ERRORS:
+            first = last = None
+        date_bounds[item_key] = (first, last) if first is not None else None
+    metadata['date_bounds'] = date_bounds
+
+    specs = {}
+    for item_key, spec_table in SPEC_TABLES.items():
+        try:
+            specs[item_key] = pd.read_sql_query(
+                f"SELECT Spec_ID, Measure_Item, Min_Value, Max_Value, Start_Date FROM {spec_table} ORDER BY Spec_ID", conn
+            )
+        except Exception:
+            specs[item_key] = pd.DataFrame(columns=['Spec_ID', 'Measure_Item', 'Min_Value', 'Max_Value', 'Start_Date'])
+    metadata['specs'] = specs
+    return metadata
+
+
+def load_week_counts(conn: sqlite3.Connection) -> Dict[str, Dict[str, int]]:
+    """
+    주차별 행 수 {WEEK_NO: {'master', 'pcb', 'semi'}} - 주차마다 COUNT 쿼리를 반복하지 않고 GROUP BY 한 번씩으로 계산합니다.
+    품목 테이블 전체를 T_MASTER_DATA와 조인하므로(행 수에 비례) 사이드바 메타데이터와 분리하여 삭제 화면에서만 읽습니다.
+    """
+    week_counts: Dict[str, Dict[str, int]] = {}
+    for week, count in conn.execute(
+        "SELECT WEEK_NO, COUNT(*) FROM T_MASTER_DATA WHERE WEEK_NO IS NOT NULL GROUP BY WEEK_NO"
+    ):
+        week_counts[week] = {'master': count, 'pcb': 0, 'semi': 0}
+    for item_key in ('pcb', 'semi'):
+        for week, count in conn.execute(
+            f"SELECT M.WEEK_NO, COUNT(*) FROM {ITEM_TABLES[item_key]} AS I JOIN T_MASTER_DATA AS M ON M.SNumber = I.SNumber "
+            f"WHERE M.WEEK_NO IS NOT NULL GROUP BY M.WEEK_NO"
+        ):
+            week_counts.setdefault(week, {'master': 0, 'pcb': 0, 'semi': 0})[item_key] = count
+    return week_counts
+
+
+def count_week_rows(week_counts: Dict[str, Dict[str, int]], weeks: Iterable[str]) -> Dict[str, int]:
+    """선택한 주차들의 삭제 대상 행 수 합계 {'master', 'pcb', 'semi'} (week_counts: load_week_counts 결과)"""
+    total = {'master': 0, 'pcb': 0, 'semi': 0}
+    for week in weeks:
+        for key, count in week_counts.get(week, {}).items():
+            total[key] += count
+    return total
+
+
+def range_has_data(metadata: Dict[str, Any], item_key: str, start: str, end: str) -> bool:
+    """조회 기간이 품목 데이터 기간과 겹치는지 (겹치지 않으면 쿼리 없이 '데이터 없음'으로 처리)"""
+    bounds = metadata['date_bounds'].get(item_key)
+    return bounds is not None and start <= bounds[1] and end >= bounds[0]
@@ -0,0 +1,88 @@
+# quality_core/qc.py
+# PCB 측정 컬럼의 Min/Max 제한값 비교(QC)와 QC 결과 집계.
+
+from typing import Dict, Optional
+
+import pandas as pd
+
+from quality_core.diagnostics import Diagnostics
+
+# QC 체크를 수행하는 PCB 메인 측정 컬럼 목록
+PCB_QC_COLUMNS = [
+    'PcbSleepCurr', 'PcbIrCurr', 'PcbIrPwr',
+    'PcbWirelessVolt', 'PcbBatVolt', 'PcbUsbCurr', 'PcbWirelessUsbVolt', 'PcbLed'
+]
+
+
+def clean_string_format(value):
+    """'="...' 형식의 문자열을 정리하는 함수"""
+    if isinstance(value, str) and value.startswith('="') and value.endswith('"'):
+        return value[2:-1]
+    return value
+
+
+def apply_qc_check(df: pd.DataFrame, main_col: str, diagnostics: Optional[Diagnostics] = None) -> pd.DataFrame:
+    """특정 컬럼에 대해 Min/Max 컬럼을 찾아 '미달', '초과', 'Pass'를 분류합니다. (df에 '<컬럼>_QC' 추가)"""
+
+    # 1. 대응되는 Min/Max 컬럼 이름 찾기
+    min_col_name = main_col.replace('Pcb', 'PcbMin')
+    max_col_name = main_col.replace('Pcb', 'PcbMax')
+
+    cols_lower = {col.strip().lower(): col for col in df.columns}
+
+    try:
+        min_col_actual = cols_lower[min_col_name.lower()]
+        max_col_actual = cols_lower[max_col_name.lower()]
+    except KeyError:
+        # Min/Max 컬럼이 없으면 경고를 남기고 건너뜁니다.
+        if diagnostics is not None:
+            diagnostics.warning(f"QC 체크 건너뜀: '{main_col}'에 대한 필수 제한 컬럼 ('{min_col_name}' 또는 '{max_col_name}')을 찾을 수 없습니다. 컬럼 이름을 확인해주세요.")
+        return df
+
+    # 2. QC Status 컬럼을 즉시 생성 및 비교를 위한 숫자 변환
+    qc_col = main_col + '_QC'
+    df[qc_col] = 'Pass'
+
+    # 비교를 위해 숫자로 변환합니다 (변환 실패 시 NaN).
+    main_values = pd.to_numeric(df[main_col].astype(str).str.strip(), errors='coerce')
+    min_limits = pd.to_numeric(df[min_col_actual].astype(str).str.strip(), errors='coerce')
+    max_limits = pd.to_numeric(df[max_col_actual].astype(str).str.strip(), errors='coerce')
+
+    # 3. '측정값 0' 제외 로직 (최우선 적용)
+    is_zero_value = (main_values == 0)
+    df.loc[is_zero_value, qc_col] = '제외'
+
+    # 4. 나머지 QC 로직 적용 (0이 아니며, 제외되지 않은 행에 대해서만)
+    is_not_excluded = ~is_zero_value
+
+    below_min = (main_values < min_limits) & is_not_excluded
+    df.loc[below_min, qc_col] = '미달'
+
+    above_max = (main_values > max_limits) & is_not_excluded
+    df.loc[above_max, qc_col] = '초과'
+
+    # 데이터 부족/결측치 처리: 값 중 하나라도 NaN인 경우
+    is_na = (main_values.isnull() | min_limits.isnull() | max_limits.isnull()) & is_not_excluded
+    df.loc[is_na, qc_col] = '데이터 부족'
+
+    return df
+
+
+def _count_qc_statuses(df_source: pd.DataFrame) -> Dict[str, int]:
+    counts = {'미달': 0, '초과': 0, '제외': 0}
+    for qc_col in [col for col in df_source.columns if col.endswith('_QC')]:
+        status_counts = df_source[qc_col].value_counts()
+        for status in counts:
+            counts[status] += status_counts.get(status, 0)
+    return counts
+
+
+def get_defect_counts_false(df_source: pd.DataFrame) -> Dict[str, int]:
+    """가성불량 DF의 미달2, 초과2, 제외2 건수 (진성불량 키와 충돌하지 않도록 '2'를 붙입니다)"""
+    counts = _count_qc_statuses(df_source)
+    return {'미달2': counts['미달'], '초과2': counts['초과'], '제외2': counts['제외']}
+
+
+def get_defect_counts_true(df_source: pd.DataFrame) -> Dict[str, int]:
+    """진성불량 DF의 미달, 초과, 제외 건수"""
+    return _count_qc_statuses(df_source)
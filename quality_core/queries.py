@@ -0,0 +1,184 @@
+# quality_core/queries.py
+# run_analysis의 1단계(측정값 long frame) SQL. 품목별로 T_ITEM_* 측정 컬럼을 UNION ALL 하고
+# Spec 비교로 Spec_Result_Detail(Pass/미달/초과/제외)을 분류합니다.
+# 파라미터: (start, end, measure_item LIKE 패턴, limit)
+
+import sqlite3
+from typing import Iterator, Optional
+
+import pandas as pd
+
+DATE_COLUMN_MAP = {'fw': 'FwStamp', 'rftx': 'RfTxStamp', 'batadc': 'BatadcStamp', 'semi': 'SemiAssyStartTime', 'pcb': 'PcbStartTime'}
+ITEM_OPTIONS = ('pcb', 'semi', 'fw', 'rftx', 'batadc')
+
+
+def get_query_and_columns(item_key, date_col, pc_id):
+    """SQL 쿼리 템플릿을 생성하고 마스터 패스 필드를 반환합니다. (T_ITEM 테이블 사용)"""
+    item_key = item_key.lower()
+    
+    # ✅✅✅ FW 쿼리 (677~692줄)
+    if item_key == 'fw':
+        fw_pc_filter = ""
+        if pc_id and pc_id != '전체':
+            fw_pc_filter = f" AND T1.FwPC = '{pc_id.replace(chr(39), chr(39)+chr(39))}'"
+        
+        query_template = f"""
+        SELECT T1.SNumber, T1.{date_col} AS StartTime, 'FileCheck' AS Measure_Item, T1.FwFile AS Test_Value, 
+               NULL AS MinLimit, NULL AS MaxLimit,
+            CASE 
+                WHEN T1.FwPass = 'o' OR T1.FwPass = 'O' THEN 'Pass'
+                WHEN T1.FwPass = 'x' OR T1.FwPass = 'X' THEN '미달'
+                WHEN T1.FwPass IS NULL OR T1.FwPass = '' OR T1.FwPass = 'None' OR T1.FwPass = 'nan' THEN '제외'
+                ELSE '제외'
+            END AS Spec_Result_Detail
+        FROM T_ITEM_FW AS T1
+        WHERE T1.{date_col} BETWEEN ? AND ? AND T1.FwFile LIKE ? {fw_pc_filter} LIMIT ?;
+        """
+        master_pass_field = 'FwPass'
+        return query_template, master_pass_field
+
+    # ✅✅✅ RFTX 쿼리 (694~712줄)
+    elif item_key == 'rftx':
+        rftx_pc_filter = ""
+        if pc_id and pc_id != '전체':
+            rftx_pc_filter = f" AND T1.RfTxPC = '{pc_id.replace(chr(39), chr(39)+chr(39))}'"
+        
+        query_template = f"""
+        SELECT U.SNumber, U.{date_col} AS StartTime, U.Measure_Item, U.Test_Value, 
+               NULL AS MinLimit, NULL AS MaxLimit,
+            CASE 
+                WHEN U.RfTxPass = 'o' OR U.RfTxPass = 'O' THEN 'Pass'
+                WHEN U.RfTxPass = 'x' OR U.RfTxPass = 'X' THEN '미달'
+                WHEN U.RfTxPass IS NULL OR U.RfTxPass = '' OR U.RfTxPass = 'None' OR U.RfTxPass = 'nan' THEN '제외'
+                ELSE '제외'
+            END AS Spec_Result_Detail
+        FROM (
+            SELECT T1.SNumber, T1.{date_col}, T1.RfTxPower AS Test_Value, 'Power' AS Measure_Item, T1.RfTxPass FROM T_ITEM_RFTX AS T1 WHERE 1=1 {rftx_pc_filter}
+            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.RfTxModul AS Test_Value, 'Modul' AS Measure_Item, T1.RfTxPass FROM T_ITEM_RFTX AS T1 WHERE 1=1 {rftx_pc_filter}
+            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.RfTxCFOD AS Test_Value, 'CFOD' AS Measure_Item, T1.RfTxPass FROM T_ITEM_RFTX AS T1 WHERE 1=1 {rftx_pc_filter}
+        ) AS U
+        WHERE U.{date_col} BETWEEN ? AND ? AND U.Measure_Item LIKE ? LIMIT ?;
+        """
+        master_pass_field = 'RfTxPass'
+        return query_template, master_pass_field
+
+    # ✅✅✅ BATADC 쿼리 (714~733줄)
+    elif item_key == 'batadc':
+        batadc_pc_filter = ""
+        if pc_id and pc_id != '전체':
+            batadc_pc_filter = f" AND T1.BatadcPC = '{pc_id.replace(chr(39), chr(39)+chr(39))}'"
+        
+        query_template = f"""
+        SELECT U.SNumber, U.{date_col} AS StartTime, U.Measure_Item, U.Test_Value, 
+               NULL AS MinLimit, NULL AS MaxLimit,
+            CASE 
+                WHEN U.BatadcPass = 'o' OR U.BatadcPass = 'O' THEN 'Pass'
+                WHEN U.BatadcPass = 'x' OR U.BatadcPass = 'X' THEN '미달'
+                WHEN U.BatadcPass IS NULL OR U.BatadcPass = '' OR U.BatadcPass = 'None' OR U.BatadcPass = 'nan' THEN '제외'
+                ELSE '제외'
+            END AS Spec_Result_Detail
+        FROM (
+            SELECT T1.SNumber, T1.{date_col}, T1.BatadcLevel AS Test_Value, 'Level' AS Measure_Item, T1.BatadcPass FROM T_ITEM_BATADC AS T1 WHERE 1=1 {batadc_pc_filter}
+            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.BatadcVoiceTh AS Test_Value, 'VoiceTh' AS Measure_Item, T1.BatadcPass FROM T_ITEM_BATADC AS T1 WHERE 1=1 {batadc_pc_filter}
+        ) AS U
+        WHERE U.{date_col} BETWEEN ? AND ? AND U.Measure_Item LIKE ? LIMIT ?;
+        """
+        master_pass_field = 'BatadcPass'
+        return query_template, master_pass_field
+
+    # ✅✅✅ SEMI 쿼리 (735~756줄)
+    elif item_key == 'semi':
+        query_template = f"""
+        SELECT U.SNumber, U.{date_col} AS StartTime, U.Measure_Item, U.Test_Value, 
+               S.Min_Value AS MinLimit, S.Max_Value AS MaxLimit,
+            CASE 
+                WHEN U.SemiAssyPass = 'o' OR U.SemiAssyPass = 'O' THEN 'Pass'
+                WHEN U.SemiAssyPass = 'x' OR U.SemiAssyPass = 'X' THEN (
+                    CASE
+                        WHEN U.Test_Value IS NULL OR U.Test_Value = 0.0 THEN '제외'
+                        WHEN S.Min_Value IS NULL AND S.Max_Value IS NULL THEN '제외'
+                        WHEN U.Test_Value < S.Min_Value THEN '미달'
+                        WHEN U.Test_Value > S.Max_Value THEN '초과'
+                        ELSE '제외'
+                    END
+                )
+                WHEN U.SemiAssyPass IS NULL OR U.SemiAssyPass = '' OR U.SemiAssyPass = 'None' OR U.SemiAssyPass = 'nan' THEN '제외'
+                ELSE '제외'
+            END AS Spec_Result_Detail
+        FROM (
+            SELECT T1.SNumber, T1.{date_col}, T1.SemiAssyBatVolt AS Test_Value, 'BatVolt' AS Measure_Item, T1.SemiAssyPass FROM T_ITEM_SEMI AS T1
+            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.SemiAssySolarVolt AS Test_Value, 'SolarVolt' AS Measure_Item, T1.SemiAssyPass FROM T_ITEM_SEMI AS T1
+        ) AS U
+        LEFT JOIN T_SPEC_SEMI AS S ON U.Measure_Item = S.Measure_Item
+        WHERE U.{date_col} BETWEEN ? AND ? AND U.Measure_Item LIKE ? LIMIT ?;
+        """
+        master_pass_field = 'SemiAssyPass'
+        return query_template, master_pass_field
+        
+    # ✅✅✅ PCB 쿼리 (758~795줄)
+    elif item_key == 'pcb':
+        pcb_pc_filter = ""
+        if pc_id and pc_id != '전체':
+            pcb_pc_filter = f" WHERE T1.pcbPC = '{pc_id.replace(chr(39), chr(39)+chr(39))}'"
+        
+        query_template = f"""
+        SELECT 
+            U.SNumber, U.{date_col} AS StartTime, U.Measure_Item, U.Test_Value, 
+            S.Min_Value AS MinLimit, S.Max_Value AS MaxLimit,
+            CASE 
+                WHEN U.PcbPass = 'o' OR U.PcbPass = 'O' THEN 'Pass'
+                WHEN U.PcbPass = 'x' OR U.PcbPass = 'X' THEN (
+                    CASE
+                        WHEN U.Test_Value IS NULL OR U.Test_Value = 0.0 THEN '제외'
+                        WHEN S.Min_Value IS NULL AND S.Max_Value IS NULL THEN '제외'
+                        WHEN U.Test_Value < S.Min_Value THEN '미달'
+                        WHEN U.Test_Value > S.Max_Value THEN '초과'
+                        ELSE '제외'
+                    END
+                )
+                WHEN U.PcbPass IS NULL OR U.PcbPass = '' OR U.PcbPass = 'None' OR U.PcbPass = 'nan' THEN '제외'
+                ELSE '제외'
+            END AS Spec_Result_Detail
+        FROM (
+            SELECT T1.SNumber, T1.{date_col}, T1.PcbSleepCurr AS Test_Value, 'SleepCurr' AS Measure_Item, T1.SleepCurr_Spec_ID AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
+            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbBatVolt AS Test_Value, 'BatVolt' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
+            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbIrCurr AS Test_Value, 'IrCurr' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
+            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbIrPwr AS Test_Value, 'IrPwr' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
+            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbWirelessVolt AS Test_Value, 'WirelessVolt' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
+            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbUsbCurr AS Test_Value, 'UsbCurr' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
+            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbWirelessUsbVolt AS Test_Value, 'WirelessUsbVolt' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
+            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbLed AS Test_Value, 'Led' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
+        ) AS U
+        LEFT JOIN T_SPEC_PCB AS S 
+            ON (U.Spec_ID IS NOT NULL AND U.Spec_ID = S.Spec_ID AND U.Measure_Item = S.Measure_Item)
+            OR (U.Spec_ID IS NULL AND U.Measure_Item = S.Measure_Item)
+        WHERE 
+             U.{date_col} BETWEEN ? AND ?
+             AND U.Measure_Item LIKE ?
+        LIMIT ?;
+        """
+        master_pass_field = 'PcbPass'
+        return query_template, master_pass_field
+
+    else:
+        raise ValueError(f"지원되지 않는 항목: '{item_key}'")
+
+
+def load_item_measurements(conn: sqlite3.Connection, item_key: str, start_date_str: str, end_date_str: str,
+                           pc_id: Optional[str] = None, limit: int = -1) -> pd.DataFrame:
+    """SQLite에서 기간 측정값 long frame을 읽습니다. (limit=-1 이면 제한 없음)"""
+    item_key = item_key.lower()
+    sql, _ = get_query_and_columns(item_key, DATE_COLUMN_MAP.get(item_key, 'Stamp'), pc_id)
+    return pd.read_sql_query(sql, conn, params=(start_date_str, end_date_str, '%%', int(limit)))
+
+
+def iter_item_measurements(storage, item_key: str, start_date_str: str, end_date_str: str, pc_id: Optional[str] = None,
+                           limit: Optional[int] = None, chunk_rows: int = 50000) -> Iterator[pd.DataFrame]:
+    """
+    load_item_measurements의 스트리밍 버전 - storage.Storage에서 chunk_rows 행씩 읽습니다. (limit이 None이면 제한 없음)
+    결과 전체를 메모리에 두지 않으므로 청크마다 DailySummaryAccumulator 등에 바로 넘겨 집계합니다.
+    """
+    item_key = item_key.lower()
+    sql, _ = get_query_and_columns(item_key, DATE_COLUMN_MAP.get(item_key, 'Stamp'), pc_id)
+    params = (start_date_str, end_date_str, '%%', int(limit) if limit else storage.no_limit)
+    return storage.iter_frames(sql, params, chunk_rows=chunk_rows)
@@ -0,0 +1,234 @@
+# quality_core/readers.py
+# 공정별 CSV 리더. 키워드로 헤더 행을 찾아 DataFrame을 로드합니다.
+# 입력은 bytes, 파일 경로, getvalue()/read()가 있는 파일 객체(Streamlit UploadedFile 포함)를 모두 받습니다.
+# 경로가 아닌 입력은 임시 파일로 옮긴 뒤(source_path) pandas가 메모리 맵과 자체 디코딩으로 읽습니다.
+# 반환: (DataFrame 또는 None, Diagnostics)  - 헤더 탐지에 사용한 컬럼은 diagnostics.field_mapping[공정]에 기록합니다.
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from profiling import span
+from quality_core.diagnostics import Diagnostics
+
+ReadResult = Tuple[Optional[pd.DataFrame], Diagnostics]
+
+DEFAULT_ENCODINGS = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr', 'latin1']
+SEMI_ENCODINGS = ['utf-8-sig', 'utf-8', 'cp949', 'euc-kr', 'latin-1']
+
+PCB_KEYWORDS = ['snumber', 'pcbstarttime', 'pcbmaxirpwr', 'pcbpass', 'pcbsleepcurr']
+FW_KEYWORDS = ['SNumber', 'FwStamp', 'FwPC', 'FwPass']
+RFTX_KEYWORDS = ['SNumber', 'RfTxStamp', 'RfTxPC', 'RfTxPass']
+SEMI_KEYWORDS = ['SNumber', 'SemiAssyStartTime', 'SemiAssyPass', 'SemiAssySolarVolt']  # 필수 키워드만 확인
+BATADC_KEYWORDS = ['SNumber', 'BatadcStamp', 'BatadcPC', 'BatadcPass', 'BatadcRssiRx']
+
+# 업로드 내용을 임시 파일로 옮길 때의 블록 크기 / 헤더 탐색 시 한 번에 읽는 행 수
+SPOOL_BLOCK_SIZE = 1024 * 1024
+HEADER_SCAN_CHUNK_ROWS = 5000
+
+
+def read_source_bytes(source: Any) -> bytes:
+    """bytes / 경로 / 파일 객체에서 전체 내용을 bytes로 가져옵니다."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read()
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+    return source.read()
+
+
+def _spool(source: Any, target) -> None:
+    """source 내용을 target 파일에 블록 단위로 복사합니다. (BytesIO/UploadedFile은 내부 버퍼를 복사 없이 씁니다)"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        target.write(source)
+    elif hasattr(source, 'getbuffer'):
+        with source.getbuffer() as view:
+            target.write(view)
+    else:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        shutil.copyfileobj(source, target, SPOOL_BLOCK_SIZE)
+
+
+def spool_to_temp_file(source: Any, suffix: str = '.csv') -> str:
+    """source 내용을 임시 파일에 옮겨 쓰고 경로를 반환합니다. (삭제는 호출 측 담당)"""
+    fd, path = tempfile.mkstemp(prefix='upload_', suffix=suffix)
+    try:
+        with span('read.spool'):
+            with os.fdopen(fd, 'wb') as f:
+                _spool(source, f)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+@contextmanager
+def source_path(source: Any) -> Iterator[str]:
+    """
+    source를 pandas가 직접 열 수 있는 파일 경로로 제공합니다.
+    경로는 그대로 쓰고, bytes / 파일 객체는 임시 파일에 옮겨 쓴 뒤 블록이 끝나면 삭제합니다.
+    리더는 이 경로를 memory_map=True와 encoding으로 읽으므로 파일 전체를 bytes/str로 복사하지 않습니다.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        yield os.fspath(source)
+        return
+    path = spool_to_temp_file(source)
+    try:
+        yield path
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _find_header_row(path: str, encoding: str, is_header: Callable[[list], bool], nrows: Optional[int] = None,
+                     **read_kwargs) -> Optional[int]:
+    """
+    header=None으로 앞에서부터 HEADER_SCAN_CHUNK_ROWS 행씩 읽으며 is_header(행 값 목록)가 참인 첫 행 번호를 찾습니다.
+    nrows가 주어지면 그 행 수까지만 확인합니다. (행 번호는 read_csv(header=...)에 그대로 사용할 수 있습니다)
+    """
+    with span('read.header_search') as current:
+        scanned = 0
+        reader = pd.read_csv(path, header=None, encoding=encoding, memory_map=True, nrows=nrows,
+                             chunksize=HEADER_SCAN_CHUNK_ROWS, **read_kwargs)
+        with reader:
+            for df_temp in reader:
+                scanned += len(df_temp)
+                current.set_rows(scanned)
+                for i, *values in df_temp.itertuples(index=True, name=None):
+                    if is_header(values):
+                        return i
+    return None
+
+
+def _read_body(path: str, encoding: str, header_row: int, **read_kwargs) -> pd.DataFrame:
+    with span('read.parse') as current:
+        df = pd.read_csv(path, header=header_row, encoding=encoding, memory_map=True, **read_kwargs)
+        current.set_rows(len(df))
+    return df
+
+
+def _is_pcb_header(values) -> bool:
+    row_values_lower = [str(x).strip().lower().replace('\t', '') for x in values]
+    # 필수 키워드가 모두 포함된 행을 찾습니다.
+    return all(keyword in row_values_lower for keyword in PCB_KEYWORDS)
+
+
+def read_pcb_csv(source: Any, diagnostics: Optional[Diagnostics] = None) -> ReadResult:
+    """
+    PCB 데이터에 맞는 키워드로 헤더를 찾아 DataFrame을 로드합니다.
+    인코딩을 바꿔 가며 헤더 행을 찾고(파일 전체 범위, 청크 단위), 찾은 인코딩으로 본문을 읽습니다.
+    """
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+    try:
+        with source_path(source) as path:
+            for encoding in DEFAULT_ENCODINGS:
+                try:
+                    header_row = _find_header_row(path, encoding, _is_pcb_header,
+                                                  na_filter=False, dtype=str, skipinitialspace=True)
+                    if header_row is not None:
+                        df = _read_body(path, encoding, header_row, dtype=str, skipinitialspace=True)
+
+                        # 필드 매핑: 키워드에 해당하는 실제 컬럼명
+                        actual_cols_lower = {col.strip().lower(): col for col in df.columns}
+                        diagnostics.field_mapping['Pcb'] = [
+                            actual_cols_lower[keyword] for keyword in PCB_KEYWORDS if keyword in actual_cols_lower
+                        ]
+                        return df, diagnostics
+                except UnicodeDecodeError:
+                    continue
+                except Exception:
+                    continue
+
+        diagnostics.error("파일 헤더를 찾을 수 없습니다. 필수 컬럼이 누락되었거나 형식이 다릅니다.")
+        return None, diagnostics
+    except Exception as e:
+        diagnostics.error(f"파일을 읽는 중 심각한 오류가 발생했습니다: {e}")
+        return None, diagnostics
+
+
+def _read_with_exact_keywords(source: Any, keywords, diagnostics: Diagnostics) -> Optional[pd.DataFrame]:
+    """앞 100행에서 keywords가 모두 있는 행을 헤더로 사용합니다. (Fw / RfTx / Batadc 공통)"""
+    def is_header(values) -> bool:
+        row_values = [str(x).strip() for x in values if pd.notna(x)]
+        return all(keyword in row_values for keyword in keywords)
+
+    try:
+        with source_path(source) as path:
+            for encoding in DEFAULT_ENCODINGS:
+                try:
+                    header_row = _find_header_row(path, encoding, is_header, nrows=100)
+                    if header_row is not None:
+                        return _read_body(path, encoding, header_row)
+                except Exception:
+                    continue
+        return None
+    except Exception:
+        return None
+
+
+def read_fw_csv(source: Any, diagnostics: Optional[Diagnostics] = None) -> ReadResult:
+    """Fw 데이터에 맞는 키워드로 헤더를 찾아 DataFrame을 로드합니다."""
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+    return _read_with_exact_keywords(source, FW_KEYWORDS, diagnostics), diagnostics
+
+
+def read_rftx_csv(source: Any, diagnostics: Optional[Diagnostics] = None) -> ReadResult:
+    """RfTx 데이터에 맞는 키워드로 헤더를 찾아 DataFrame을 로드합니다."""
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+    # RfTx는 헤더 탐지 키워드 목록을 그대로 필드 매핑으로 사용합니다.
+    diagnostics.field_mapping['RfTx'] = list(RFTX_KEYWORDS)
+    return _read_with_exact_keywords(source, RFTX_KEYWORDS, diagnostics), diagnostics
+
+
+def read_batadc_csv(source: Any, diagnostics: Optional[Diagnostics] = None) -> ReadResult:
+    """Batadc 데이터에 맞는 키워드로 헤더를 찾아 DataFrame을 로드합니다."""
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+    return _read_with_exact_keywords(source, BATADC_KEYWORDS, diagnostics), diagnostics
+
+
+def _is_semi_header(values) -> bool:
+    row_values = [str(x).strip() for x in values if pd.notna(x) and str(x).strip() != '']
+    matched_keywords = sum(1 for kw in SEMI_KEYWORDS if any(kw in str(val) for val in row_values))
+    return matched_keywords >= len(SEMI_KEYWORDS)
+
+
+def read_semi_csv(source: Any, diagnostics: Optional[Diagnostics] = None) -> ReadResult:
+    """SemiAssy 데이터에 맞는 키워드로 헤더를 찾아 DataFrame을 로드합니다. (부분 일치, 앞 20행)"""
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+    try:
+        with source_path(source) as path:
+            for encoding in SEMI_ENCODINGS:
+                try:
+                    header_row = _find_header_row(path, encoding, _is_semi_header, nrows=20, skipinitialspace=True)
+                    if header_row is not None:
+                        df = _read_body(path, encoding, header_row, skipinitialspace=True)
+                        df.columns = df.columns.str.strip()
+
+                        if df.columns[0] == '' or pd.isna(df.columns[0]) or str(df.columns[0]).strip() == '':
+                            df = df.iloc[:, 1:].copy()
+
+                        return df, diagnostics
+                except Exception:
+                    continue
+        return None, diagnostics
+    except Exception:
+        return None, diagnostics
+
+
+# 공정 키(Pcb/Fw/RfTx/Semi/Batadc) → 리더
+READERS: Dict[str, Callable[..., ReadResult]] = {
+    'Pcb': read_pcb_csv,
+    'Fw': read_fw_csv,
+    'RfTx': read_rftx_csv,
+    'Semi': read_semi_csv,
+    'Batadc': read_batadc_csv,
+}
@@ -0,0 +1,179 @@
+# quality_core/reports.py
+# 품목 × 일자별 집계(run_analysis와 같은 Pass/가성불량/진성불량 × Pass/미달/초과/제외 테이블)를
+# 미리 계산하여 파일로 저장하고, 대시보드에서 재사용합니다.
+#   reports/<item>/<YYYY-MM-DD>.json : 캐시 (집계 테이블 + 계산 당시 DB 지문)
+#   reports/<item>/<YYYY-MM-DD>.csv  : 사람이 보는 집계 테이블
+# 지문(해당 일자 행 수 / 최대 rowid / Spec 테이블 요약)이 현재 DB와 다르면 캐시를 사용하지 않습니다.
+# 가성/진성 판정은 조회 기간 안의 Pass 이력 기준이므로, 캐시는 '하루 단위 조회'에만 그대로 쓸 수 있습니다.
+
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from quality_core.classification import SUMMARY_INDEX, SUMMARY_COLUMNS, DailySummaryAccumulator
+from quality_core.queries import DATE_COLUMN_MAP, ITEM_OPTIONS, iter_item_measurements
+from storage import open_storage
+
+REPORT_DIR = './reports'
+
+ITEM_TABLES = {'pcb': 'T_ITEM_PCB', 'semi': 'T_ITEM_SEMI', 'fw': 'T_ITEM_FW', 'rftx': 'T_ITEM_RFTX', 'batadc': 'T_ITEM_BATADC'}
+SPEC_TABLES = {'pcb': 'T_SPEC_PCB', 'semi': 'T_SPEC_SEMI'}
+
+
+def _day_bounds(day: str) -> Tuple[str, str]:
+    return f"{day} 00:00:00", f"{day} 23:59:59"
+
+
+def report_path(report_dir: str, item_key: str, day: str, ext: str = 'json') -> str:
+    return os.path.join(report_dir, item_key, f"{day}.{ext}")
+
+
+def day_fingerprint(conn: sqlite3.Connection, item_key: str, day: str) -> List[Any]:
+    """해당 일자 품목 행 수 / 최대 rowid (+ Spec 테이블 요약). 시간 컬럼 인덱스로 계산합니다."""
+    start, end = _day_bounds(day)
+    date_col = DATE_COLUMN_MAP[item_key]
+    count, max_rowid = conn.execute(
+        f"SELECT COUNT(*), COALESCE(MAX(rowid), 0) FROM {ITEM_TABLES[item_key]} WHERE {date_col} BETWEEN ? AND ?",
+        (start, end)
+    ).fetchone()
+    fingerprint = [count, max_rowid]
+    spec_table = SPEC_TABLES.get(item_key)
+    if spec_table:
+        try:
+            fingerprint += list(conn.execute(f"SELECT COUNT(*), TOTAL(Min_Value), TOTAL(Max_Value) FROM {spec_table}").fetchone())
+        except sqlite3.Error:
+            fingerprint += [0, 0.0, 0.0]
+    return fingerprint
+
+
+def list_item_days(conn: sqlite3.Connection, item_key: str) -> List[str]:
+    """품목 테이블에 데이터가 있는 일자 목록"""
+    date_col = DATE_COLUMN_MAP[item_key]
+    rows = conn.execute(
+        f"SELECT DISTINCT substr({date_col}, 1, 10) FROM {ITEM_TABLES[item_key]} WHERE {date_col} IS NOT NULL ORDER BY 1"
+    ).fetchall()
+    return [row[0] for row in rows if row[0]]
+
+
+def compute_day_report(db_file_name: str, item_key: str, day: str) -> Dict[str, Any]:
+    """품목 1개 × 하루의 집계 리포트를 계산합니다. (PC 전체, 유형 전체, LIMIT 없음 - 측정 행은 청크 단위로 집계)"""
+    conn = sqlite3.connect(db_file_name)
+    try:
+        fingerprint = day_fingerprint(conn, item_key, day)
+    finally:
+        conn.close()
+    start, end = _day_bounds(day)
+    accumulator = DailySummaryAccumulator()
+    for df_chunk in iter_item_measurements(open_storage(db_file_name), item_key, start, end):
+        accumulator.add(df_chunk)
+
+    report = {
+        'item': item_key, 'day': day,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'fingerprint': fingerprint,
+        'measurement_rows': accumulator.rows,
+        'row_count': 0, 'table': None,
+    }
+    if accumulator.rows:
+        daily = accumulator.result()
+        if day in daily:
+            row_count, table = daily[day]
+            report['row_count'] = int(row_count)
+            report['table'] = {
+                'index': list(table.index), 'columns': list(table.columns),
+                'data': table.astype('int64').values.tolist(),
+            }
+    return report
+
+
+def write_day_report(report: Dict[str, Any], report_dir: str = REPORT_DIR) -> str:
+    """리포트를 JSON(+CSV)으로 저장합니다. 임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 파일을 봅니다."""
+    path = report_path(report_dir, report['item'], report['day'])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+    table = _table_from_report(report)
+    if table is not None:
+        table.to_csv(report_path(report_dir, report['item'], report['day'], 'csv'), encoding='utf-8-sig')
+    return path
+
+
+def _table_from_report(report: Dict[str, Any]) -> Optional[pd.DataFrame]:
+    if not report.get('table'):
+        return None
+    spec = report['table']
+    table = pd.DataFrame(spec['data'], index=spec['index'], columns=spec['columns'], dtype='int64')
+    table = table.reindex(index=SUMMARY_INDEX, columns=SUMMARY_COLUMNS, fill_value=0)
+    table.index.name = 'Final_Failure_Category'
+    table.columns.name = 'Spec_Result_Detail'
+    return table
+
+
+def load_day_report(conn: sqlite3.Connection, item_key: str, day: str,
+                    report_dir: str = REPORT_DIR) -> Optional[Dict[str, Any]]:
+    """
+    저장된 리포트를 읽어 현재 DB 지문과 일치하면 반환합니다. (없거나 오래되었으면 None)
+    반환: {'row_count', 'table', 'measurement_rows', 'generated_at'}
+    """
+    path = report_path(report_dir, item_key, day)
+    try:
+        with open(path, encoding='utf-8') as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        if report.get('fingerprint') != day_fingerprint(conn, item_key, day):
+            return None
+    except sqlite3.Error:
+        return None
+    return {
+        'row_count': report['row_count'],
+        'table': _table_from_report(report),
+        'measurement_rows': report['measurement_rows'],
+        'generated_at': report.get('generated_at'),
+    }
+
+
+def _compute_and_write(db_file_name: str, item_key: str, day: str, report_dir: str) -> str:
+    return write_day_report(compute_day_report(db_file_name, item_key, day), report_dir)
+
+
+def refresh_reports(db_file_name: str, days_by_item: Dict[str, Iterable[str]], report_dir: str = REPORT_DIR,
+                    workers: int = 1) -> Dict[str, Any]:
+    """
+    days_by_item({품목: 일자 목록})의 리포트를 다시 계산합니다. workers > 1 이면 프로세스 풀로 병렬 계산합니다.
+    반환: {'written': 저장 개수, 'errors': [(item, day, 메시지)]}
+    """
+    tasks = [(item_key, day) for item_key in ITEM_OPTIONS for day in sorted(set(days_by_item.get(item_key, ())))]
+    result = {'written': 0, 'errors': []}
+    if not tasks:
+        return result
+
+    if workers <= 1:
+        for item_key, day in tasks:
+            try:
+                _compute_and_write(db_file_name, item_key, day, report_dir)
+                result['written'] += 1
+            except Exception as e:
+                result['errors'].append((item_key, day, str(e)))
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_compute_and_write, db_file_name, item_key, day, report_dir): (item_key, day)
+                   for item_key, day in tasks}
+        for future in as_completed(futures):
+            item_key, day = futures[future]
+            try:
+                future.result()
+                result['written'] += 1
+            except Exception as e:
+                result['errors'].append((item_key, day, str(e)))
+    return result
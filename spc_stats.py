@@ -0,0 +1,596 @@
+# spc_stats.py
+# 측정 항목별 SPC(관리도 / 공정능력 Cp·Cpk) 통계.
+#   - T_SPC_MOMENTS: (품목, 측정 항목, 일자, PC, 근무조) 셀마다 건수 N / 평균 Mean / 편차 제곱합 M2 / 최솟값 / 최댓값.
+#       이 다섯 값은 셀끼리 합칠 수 있으므로(병렬 분산 합산) 임의의 기간 × PC 부분집합의 평균·표준편차를
+#       원시 측정 행 없이 저장된 셀만으로 계산합니다. (하루 × 품목의 셀 수 = 측정 항목 × PC × 근무조)
+#   - 적재 청크/동기화 배치는 행이 추가된 (품목, 일자)를 T_SPC_PENDING에 표시만 하고(청크와 함께 커밋),
+#     파일·동기화가 끝날 때 flush_spc()가 표시된 일자를 통째로 다시 계산합니다. (INSERT OR IGNORE로 건너뛴
+#     중복 행이 통계에 두 번 들어가지 않도록 증분 합산 대신 일자 단위 재계산) 주차 삭제도 해당 일자를 표시합니다.
+#   - T_SPC_SKETCH: (품목, 측정 항목, 일자, PC) 셀마다 분포 스케치 - 합칠 수 있는 분위수 다이제스트(t-digest 방식
+#       중심점 ≤ DIGEST_COMPRESSION/2 개)와 고정 구간 히스토그램. 기간 분포/백분위 밴드를 원시 값 없이 그립니다.
+#       히스토그램 구간(T_SPC_BINS)은 측정 항목마다 처음 계산할 때 한 번 정해 두어 모든 셀이 같은 구간을 씁니다.
+#       (규격이 있으면 LSL / USL이 구간 경계가 되도록, 없으면 처음 계산한 값의 분포 범위로) 전체 재계산 시 다시 정합니다.
+#   - 규격(LSL/USL)은 T_SPEC_PCB / T_SPEC_SEMI의 측정 항목별 최신 행(Start_Date, Spec_ID 순)을 사용합니다.
+#     규격 테이블이 없는 품목(RfTx / Batadc)은 Cp / Cpk 없이 관리도 통계만 계산합니다.
+#
+#   df_cap = capability_summary(conn, 'pcb', '2025-10-01', '2025-10-31', pcs=['101', '102'])
+#   df_chart = control_chart(conn, 'pcb', 'SleepCurr', '2025-10-01', '2025-10-31', by_shift=True)
+#   df_bands = quantile_bands(conn, 'pcb', 'SleepCurr', '2025-10-01', '2025-10-31')
+#   hist = histogram(conn, 'pcb', 'SleepCurr', '2025-10-01', '2025-10-31')
+
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 품목별 (테이블, 시간 컬럼, PC 컬럼, 규격 테이블, [(Measure_Item, 측정 컬럼)]) - 수치 측정 컬럼만 (Fw는 파일명이라 제외)
+SPC_ITEMS = {
+    'pcb': ('T_ITEM_PCB', 'PcbStartTime', 'pcbPC', 'T_SPEC_PCB',
+            [('SleepCurr', 'PcbSleepCurr'), ('BatVolt', 'PcbBatVolt'), ('IrCurr', 'PcbIrCurr'), ('IrPwr', 'PcbIrPwr'),
+             ('WirelessVolt', 'PcbWirelessVolt'), ('UsbCurr', 'PcbUsbCurr'), ('WirelessUsbVolt', 'PcbWirelessUsbVolt'),
+             ('Led', 'PcbLed')]),
+    'semi': ('T_ITEM_SEMI', 'SemiAssyStartTime', None, 'T_SPEC_SEMI',
+             [('BatVolt', 'SemiAssyBatVolt'), ('SolarVolt', 'SemiAssySolarVolt')]),
+    'rftx': ('T_ITEM_RFTX', 'RfTxStamp', 'RfTxPC', None,
+             [('Power', 'RfTxPower'), ('Modul', 'RfTxModul'), ('CFOD', 'RfTxCFOD')]),
+    'batadc': ('T_ITEM_BATADC', 'BatadcStamp', 'BatadcPC', None,
+               [('Level', 'BatadcLevel'), ('VoiceTh', 'BatadcVoiceTh')]),
+}
+SPC_ITEM_KEYS = list(SPC_ITEMS)
+
+MOMENTS_TABLE = 'T_SPC_MOMENTS'
+SKETCH_TABLE = 'T_SPC_SKETCH'
+BINS_TABLE = 'T_SPC_BINS'
+SPC_PENDING_TABLE = 'T_SPC_PENDING'
+
+# 근무조: SHIFT_START_HOUR 부터 12시간은 'A', 나머지는 'B' (자정 이후 야간 검사도 검사 일자에 집계)
+SHIFT_START_HOUR = 8
+SHIFT_HOURS = 12
+SHIFTS = ['A', 'B']
+
+# PC 컬럼이 없는 품목(Semi)의 PC 값
+NO_PC = ''
+
+# 관리 한계 배수 (X-bar 관리도의 ±3σ)
+SIGMA_LIMIT = 3.0
+
+# 재계산 시 한 번에 읽는 일수
+SPC_DAYS_PER_READ = 31
+
+MOMENT_COLUMNS = ['N', 'Mean', 'M2', 'Min_Value', 'Max_Value']
+
+# 분위수 다이제스트 압축 계수 (k1 척도: 셀/병합 결과당 중심점 최대 DIGEST_COMPRESSION/2 개, 꼬리일수록 촘촘)
+DIGEST_COMPRESSION = 200
+# 히스토그램: 규격 범위 안 HIST_SPEC_BINS 구간 + 양쪽 HIST_MARGIN_BINS 구간 (+ 범위 밖 미만/초과 카운트 2개)
+HIST_SPEC_BINS = 40
+HIST_MARGIN_BINS = 10
+HIST_BINS = HIST_SPEC_BINS + 2 * HIST_MARGIN_BINS
+# 규격이 없을 때 구간 범위: 처음 계산한 값의 0.1% ~ 99.9% 분위수를 양쪽으로 10% 넓힌 범위
+HIST_DATA_QUANTILES = (0.001, 0.999)
+HIST_DATA_PAD = 0.1
+DEFAULT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def create_spc_schema(cursor) -> None:
+    """T_SPC_MOMENTS / T_SPC_PENDING 테이블을 만듭니다. (커밋은 호출 측 담당)"""
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MOMENTS_TABLE} (
+            Item TEXT,
+            Measure_Item TEXT,
+            Day TEXT,
+            PC TEXT,
+            Shift TEXT,
+            N INTEGER,
+            Mean REAL,
+            M2 REAL,
+            Min_Value REAL,
+            Max_Value REAL,
+            PRIMARY KEY (Item, Measure_Item, Day, PC, Shift)
+        ) WITHOUT ROWID;
+    """)
+    # Centroids: (평균, 가중치) float64 쌍의 little-endian 바이트, Hist: int64 카운트 [미만, 구간 0..Bins-1, 초과]
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SKETCH_TABLE} (
+            Item TEXT,
+            Measure_Item TEXT,
+            Day TEXT,
+            PC TEXT,
+            N INTEGER,
+            Min_Value REAL,
+            Max_Value REAL,
+            Centroids BLOB,
+            Hist BLOB,
+            PRIMARY KEY (Item, Measure_Item, Day, PC)
+        ) WITHOUT ROWID;
+    """)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {BINS_TABLE} (
+            Item TEXT,
+            Measure_Item TEXT,
+            Low REAL,
+            Width REAL,
+            Bins INTEGER,
+            PRIMARY KEY (Item, Measure_Item)
+        ) WITHOUT ROWID;
+    """)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SPC_PENDING_TABLE} (
+            Item TEXT,
+            Day TEXT,
+            PRIMARY KEY (Item, Day)
+        ) WITHOUT ROWID;
+    """)
+
+
+def _day_bounds(day: str) -> Tuple[str, str]:
+    return f"{day} 00:00:00", f"{day} 23:59:59"
+
+
+def shift_of(times: pd.Series) -> np.ndarray:
+    """'YYYY-MM-DD HH:MM:SS' 문자열의 시(hour)로 근무조('A' / 'B')를 구합니다."""
+    hours = pd.to_numeric(times.str[11:13], errors='coerce').fillna(0).to_numpy()
+    in_first = (hours - SHIFT_START_HOUR) % 24 < SHIFT_HOURS
+    return np.where(in_first, SHIFTS[0], SHIFTS[1])
+
+
+def read_measurements(conn: sqlite3.Connection, item_key: str, days: Sequence[str]) -> pd.DataFrame:
+    """
+    품목 1개의 일자들(days) 측정 행을 한 번에 읽어 long 형태로 바꿉니다. (값이 없거나 수치가 아닌 행 제외)
+    반환 컬럼: Measure_Item, Day, PC, Shift, Test_Value
+    """
+    table, time_col, pc_col, _, measures = SPC_ITEMS[item_key]
+    columns = ['Measure_Item', 'Day', 'PC', 'Shift', 'Test_Value']
+    days = sorted(set(days))
+    if not days:
+        return pd.DataFrame(columns=columns)
+    start, end = _day_bounds(days[0])[0], _day_bounds(days[-1])[1]
+    pc_select = f"COALESCE({pc_col}, '{NO_PC}')" if pc_col else f"'{NO_PC}'"
+    df_rows = pd.read_sql_query(
+        f"SELECT {time_col} AS Test_Time, {pc_select} AS PC, {', '.join(column for _, column in measures)} "
+        f"FROM {table} WHERE {time_col} BETWEEN ? AND ?",
+        conn, params=(start, end)
+    )
+    times = df_rows['Test_Time'].astype(str)
+    df_rows['Day'] = times.str[:10]
+    df_rows['Shift'] = shift_of(times)
+    df_rows = df_rows[df_rows['Day'].isin(days)]
+
+    df_long = df_rows.melt(id_vars=['Day', 'PC', 'Shift'], value_vars=[column for _, column in measures],
+                           var_name='Column', value_name='Test_Value')
+    df_long['Test_Value'] = pd.to_numeric(df_long['Test_Value'], errors='coerce')
+    df_long = df_long.dropna(subset=['Test_Value'])
+    df_long['Measure_Item'] = df_long['Column'].map({column: name for name, column in measures})
+    return df_long[columns].reset_index(drop=True)
+
+
+def moment_cells(df_long: pd.DataFrame, item_key: str) -> pd.DataFrame:
+    """
+    read_measurements 결과의 (Measure_Item, Day, PC, Shift) 셀별 모멘트.
+    M2는 셀 평균을 먼저 구한 뒤 편차 제곱을 더하는 2-pass 방식입니다. (값이 큰 측정 항목의 자릿수 손실 방지)
+    반환 컬럼: Item, Measure_Item, Day, PC, Shift, N, Mean, M2, Min_Value, Max_Value
+    """
+    columns = ['Item', 'Measure_Item', 'Day', 'PC', 'Shift'] + MOMENT_COLUMNS
+    if df_long.empty:
+        return pd.DataFrame(columns=columns)
+    keys = ['Measure_Item', 'Day', 'PC', 'Shift']
+    deviation = df_long['Test_Value'] - df_long.groupby(keys, sort=False)['Test_Value'].transform('mean')
+    df_cells = df_long.assign(Sq_Dev=deviation * deviation).groupby(keys, sort=False).agg(
+        N=('Test_Value', 'size'), Mean=('Test_Value', 'mean'), M2=('Sq_Dev', 'sum'),
+        Min_Value=('Test_Value', 'min'), Max_Value=('Test_Value', 'max')
+    ).reset_index()
+    df_cells.insert(0, 'Item', item_key)
+    return df_cells[columns]
+
+
+def compute_moments(conn: sqlite3.Connection, item_key: str, days: Sequence[str]) -> pd.DataFrame:
+    """품목 1개 × 일자들의 (Measure_Item, Day, PC, Shift) 셀별 모멘트 (moment_cells 참고)"""
+    return moment_cells(read_measurements(conn, item_key, days), item_key)
+
+
+# ---------------------------------------------------------------------------
+# 분포 스케치: 분위수 다이제스트 + 고정 구간 히스토그램
+# ---------------------------------------------------------------------------
+
+def _compress_centroids(df: pd.DataFrame, keys: List[str], compression: int = DIGEST_COMPRESSION) -> pd.DataFrame:
+    """
+    (keys..., Mean, Weight) 중심점을 keys 그룹별로 압축합니다. (t-digest k1 척도)
+    그룹 안에서 평균 순으로 정렬한 뒤 누적 분위 q의 k(q) = δ/2π·asin(2q−1) 정수 구간이 같은 중심점을 합칩니다.
+    원시 값(Weight=1)으로 만들 때와 저장된 다이제스트를 합칠 때 같은 함수를 씁니다.
+    """
+    df = df.sort_values(keys + ['Mean'], kind='mergesort')
+    grouped = df.groupby(keys, sort=False)['Weight']
+    cum_weight = grouped.cumsum()
+    q_left = ((cum_weight - df['Weight']) / grouped.transform('sum')).to_numpy()
+    k = compression / (2 * np.pi) * np.arcsin(np.clip(2 * q_left - 1, -1, 1)) + compression / 4
+    df = df.assign(Bucket=np.clip(np.floor(k), 0, compression // 2 - 1).astype(np.int64),
+                   Weighted=df['Mean'] * df['Weight'])
+    df_merged = df.groupby(keys + ['Bucket'], sort=True).agg(Weighted=('Weighted', 'sum'), Weight=('Weight', 'sum'))
+    df_merged = df_merged.reset_index()
+    df_merged['Mean'] = df_merged['Weighted'] / df_merged['Weight']
+    return df_merged[keys + ['Mean', 'Weight']]
+
+
+def _encode_centroids(means: np.ndarray, weights: np.ndarray) -> bytes:
+    return np.column_stack([means, weights]).astype('<f8').tobytes()
+
+
+def _decode_centroids(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype='<f8').reshape(-1, 2)
+
+
+def _decode_hist(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype='<i8')
+
+
+def digest_quantiles(centroids: np.ndarray, quantiles: Sequence[float], min_value: float, max_value: float) -> np.ndarray:
+    """
+    중심점 배열([[평균, 가중치], ...], 평균 순)로 분위수를 추정합니다.
+    중심점 i는 자신이 덮는 순위(0부터)의 가운데에 두고, 양 끝(순위 0 / N−1)은 실제 최솟값/최댓값으로 선형 보간합니다.
+    (가중치 1인 중심점만 있으면 numpy.quantile의 기본(linear) 방식과 같은 값)
+    """
+    weights = centroids[:, 1]
+    total = weights.sum()
+    if total <= 0:
+        return np.full(len(quantiles), np.nan)
+    positions = np.concatenate([[0.0], np.cumsum(weights) - (weights + 1) / 2, [total - 1]])
+    values = np.concatenate([[min_value], centroids[:, 0], [max_value]])
+    return np.interp(np.asarray(quantiles, dtype=float) * (total - 1), positions, values)
+
+
+def _data_layout(values: np.ndarray, limit: Optional[float]) -> Tuple[float, float]:
+    """규격이 없거나 한쪽만 있을 때의 (Low, Width). 한쪽 규격이 있으면 그 값이 구간 경계가 되도록 맞춥니다."""
+    low, high = np.quantile(values, HIST_DATA_QUANTILES)
+    pad = (high - low) * HIST_DATA_PAD or max(abs(low) * HIST_DATA_PAD, 0.5)
+    low, high = low - pad, high + pad
+    width = (high - low) / HIST_BINS
+    if limit is not None:
+        low = limit - np.ceil((limit - low) / width) * width
+    return float(low), float(width)
+
+
+def bin_layouts(conn: sqlite3.Connection, item_key: str, df_long: Optional[pd.DataFrame] = None) -> Dict[str, Tuple[float, float, int]]:
+    """
+    측정 항목별 히스토그램 구간 (Low, Width, Bins). 저장된 구간이 없는 측정 항목은 df_long의 값으로 정해 저장합니다.
+    (커밋은 호출 측 담당)
+    """
+    layouts = {measure: (low, width, bins) for measure, low, width, bins in conn.execute(
+        f"SELECT Measure_Item, Low, Width, Bins FROM {BINS_TABLE} WHERE Item = ?", (item_key,)
+    )}
+    if df_long is None or df_long.empty:
+        return layouts
+
+    limits = spec_limits(conn, item_key)
+    for measure, values in df_long.groupby('Measure_Item', sort=False)['Test_Value']:
+        if measure in layouts:
+            continue
+        lsl, usl = limits.get(measure, (None, None))
+        if lsl is not None and usl is not None and usl > lsl:
+            width = (usl - lsl) / HIST_SPEC_BINS
+            low = lsl - HIST_MARGIN_BINS * width
+        else:
+            low, width = _data_layout(values.to_numpy(), lsl if lsl is not None else usl)
+        layouts[measure] = (float(low), float(width), HIST_BINS)
+        conn.execute(f"INSERT OR REPLACE INTO {BINS_TABLE} (Item, Measure_Item, Low, Width, Bins) VALUES (?, ?, ?, ?, ?)",
+                     (item_key, measure, float(low), float(width), HIST_BINS))
+    return layouts
+
+
+def sketch_cells(df_long: pd.DataFrame, item_key: str, layouts: Dict[str, Tuple[float, float, int]]) -> List[Tuple]:
+    """
+    read_measurements 결과의 (Measure_Item, Day, PC) 셀별 스케치 행.
+    반환: [(Item, Measure_Item, Day, PC, N, Min_Value, Max_Value, Centroids, Hist)]
+    """
+    if df_long.empty:
+        return []
+    keys = ['Measure_Item', 'Day', 'PC']
+    df_digest = _compress_centroids(df_long[keys].assign(Mean=df_long['Test_Value'], Weight=1.0), keys)
+
+    measure = df_long['Measure_Item']
+    low, width, bins = (measure.map({m: layout[i] for m, layout in layouts.items()}) for i in range(3))
+    # 0: 구간 미만, 1..Bins: 구간, Bins+1: 구간 초과
+    position = np.floor((df_long['Test_Value'] - low) / width) + 1
+    df_bins = df_long[keys].assign(Bin=np.clip(position, 0, bins + 1).astype(np.int64))
+    hist_counts = df_bins.groupby(keys + ['Bin'], sort=False).size()
+
+    df_stats = df_long.groupby(keys, sort=True)['Test_Value'].agg(['size', 'min', 'max'])
+    digests = {key: group for key, group in df_digest.groupby(keys, sort=False)[['Mean', 'Weight']]}
+    hists = {}
+    for (measure, day, pc, bin_no), count in hist_counts.items():
+        hist = hists.setdefault((measure, day, pc), np.zeros(layouts[measure][2] + 2, dtype='<i8'))
+        hist[bin_no] = count
+
+    rows = []
+    for key, (n, min_value, max_value) in zip(df_stats.index, df_stats.itertuples(index=False, name=None)):
+        digest = digests[key]
+        rows.append((item_key, *key, int(n), float(min_value), float(max_value),
+                     _encode_centroids(digest['Mean'].to_numpy(), digest['Weight'].to_numpy()), hists[key].tobytes()))
+    return rows
+
+
+def mark_spc_pending(conn: sqlite3.Connection, item_key: str, days: Iterable[str]) -> None:
+    """다시 계산할 (품목, 일자)를 T_SPC_PENDING에 표시합니다. (커밋은 호출 측 담당 - 적재 청크와 같은 트랜잭션)"""
+    if item_key not in SPC_ITEMS:
+        return
+    conn.executemany(f"INSERT OR IGNORE INTO {SPC_PENDING_TABLE} (Item, Day) VALUES (?, ?)",
+                     ((item_key, day) for day in days if isinstance(day, str) and len(day) == 10))
+
+
+def refresh_spc_days(conn: sqlite3.Connection, item_key: str, days: Iterable[str],
+                     days_per_read: int = SPC_DAYS_PER_READ) -> int:
+    """
+    품목의 일자들의 T_SPC_MOMENTS / T_SPC_SKETCH 셀을 다시 계산합니다. (커밋은 호출 측 담당) 반환: 저장한 모멘트 셀 수
+    측정 행은 days_per_read 일씩 한 번에 읽고, 모멘트와 스케치를 같은 행으로 계산합니다. (전체 재계산의 메모리 상한)
+    """
+    days = sorted(set(days))
+    n_cells = 0
+    for i in range(0, len(days), days_per_read):
+        batch = days[i:i + days_per_read]
+        df_long = read_measurements(conn, item_key, batch)
+        df_cells = moment_cells(df_long, item_key)
+        sketches = sketch_cells(df_long, item_key, bin_layouts(conn, item_key, df_long))
+        for table in (MOMENTS_TABLE, SKETCH_TABLE):
+            conn.executemany(f"DELETE FROM {table} WHERE Item = ? AND Day = ?", ((item_key, day) for day in batch))
+        if df_cells.empty:
+            continue
+        conn.executemany(
+            f"INSERT INTO {MOMENTS_TABLE} (Item, Measure_Item, Day, PC, Shift, N, Mean, M2, Min_Value, Max_Value) "
+            f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            df_cells.astype(object).itertuples(index=False, name=None)
+        )
+        conn.executemany(
+            f"INSERT INTO {SKETCH_TABLE} (Item, Measure_Item, Day, PC, N, Min_Value, Max_Value, Centroids, Hist) "
+            f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", sketches
+        )
+        n_cells += len(df_cells)
+    return n_cells
+
+
+def flush_spc(conn: sqlite3.Connection) -> int:
+    """T_SPC_PENDING에 표시된 (품목, 일자)를 다시 계산하고 표시를 지운 뒤 커밋합니다. 반환: 다시 계산한 일자 수"""
+    pending = conn.execute(f"SELECT Item, Day FROM {SPC_PENDING_TABLE} ORDER BY Item, Day").fetchall()
+    for item_key in {item for item, _ in pending}:
+        refresh_spc_days(conn, item_key, [day for item, day in pending if item == item_key])
+    conn.execute(f"DELETE FROM {SPC_PENDING_TABLE}")
+    conn.commit()
+    return len(pending)
+
+
+def _item_days(conn: sqlite3.Connection, item_key: str) -> List[str]:
+    table, time_col, _, _, _ = SPC_ITEMS[item_key]
+    rows = conn.execute(
+        f"SELECT DISTINCT substr({time_col}, 1, 10) FROM {table} WHERE {time_col} IS NOT NULL"
+    ).fetchall()
+    return [row[0] for row in rows if row[0] and len(row[0]) == 10]
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone() is not None
+
+
+def rebuild_spc(conn: sqlite3.Connection) -> int:
+    """T_SPC_MOMENTS / T_SPC_SKETCH 전체를 T_ITEM_* 로부터 다시 계산하고 커밋합니다. (히스토그램 구간도 다시 정함) 반환: 모멘트 셀 수"""
+    create_spc_schema(conn.cursor())
+    for table in (MOMENTS_TABLE, SKETCH_TABLE, BINS_TABLE):
+        conn.execute(f"DELETE FROM {table}")
+    n_cells = 0
+    for item_key, (table, _, _, _, _) in SPC_ITEMS.items():
+        if _table_exists(conn, table):
+            n_cells += refresh_spc_days(conn, item_key, _item_days(conn, item_key))
+    conn.execute(f"DELETE FROM {SPC_PENDING_TABLE}")
+    conn.commit()
+    return n_cells
+
+
+def ensure_spc(conn: sqlite3.Connection) -> bool:
+    """
+    T_SPC_MOMENTS / T_SPC_SKETCH가 비어 있는데 측정 데이터가 있으면(기존 DB) 전체 계산하고,
+    중단된 적재가 남긴 T_SPC_PENDING 표시를 처리합니다. 반환: 전체 계산 여부
+    """
+    create_spc_schema(conn.cursor())
+    rebuilt = False
+    if any(conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None for table in (MOMENTS_TABLE, SKETCH_TABLE)) and any(
+        _table_exists(conn, table) and conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is not None
+        for table, _, _, _, _ in SPC_ITEMS.values()
+    ):
+        rebuild_spc(conn)
+        rebuilt = True
+    if conn.execute(f"SELECT 1 FROM {SPC_PENDING_TABLE} LIMIT 1").fetchone() is not None:
+        flush_spc(conn)
+    return rebuilt
+
+
+# ---------------------------------------------------------------------------
+# 조회: 저장된 셀을 합쳐 기간 × PC 부분집합의 통계를 만듭니다.
+# ---------------------------------------------------------------------------
+
+def load_moments(conn: sqlite3.Connection, item_key: str, start_day: str, end_day: str,
+                 measure_item: Optional[str] = None, pcs: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """기간(일자 'YYYY-MM-DD' 포함 범위) / 측정 항목 / PC 조건의 T_SPC_MOMENTS 셀"""
+    where, params = ["Item = ?", "Day BETWEEN ? AND ?"], [item_key, start_day, end_day]
+    if measure_item:
+        where.append("Measure_Item = ?")
+        params.append(measure_item)
+    if pcs:
+        where.append(f"PC IN ({', '.join(['?'] * len(pcs))})")
+        params.extend(str(pc) for pc in pcs)
+    return pd.read_sql_query(f"SELECT * FROM {MOMENTS_TABLE} WHERE {' AND '.join(where)}", conn, params=params)
+
+
+def merge_moments(df_cells: pd.DataFrame, by: Sequence[str]) -> pd.DataFrame:
+    """
+    셀 모멘트를 by 컬럼별로 합칩니다. (병렬 분산 합산: M2 = Σ M2ᵢ + Σ nᵢ(meanᵢ − mean)²)
+    반환 컬럼: by..., N, Mean, M2, Min_Value, Max_Value, Cells, M2_Within
+    (M2_Within = Σ M2ᵢ: 셀 안 변동만 - 군내 표준편차 계산용)
+    """
+    by = list(by)
+    if df_cells.empty:
+        return pd.DataFrame(columns=by + MOMENT_COLUMNS + ['Cells', 'M2_Within'])
+    df = df_cells.copy()
+    df['Sum'] = df['N'] * df['Mean']
+    grouped = df.groupby(by, sort=True)
+    df['Group_Mean'] = grouped['Sum'].transform('sum') / grouped['N'].transform('sum')
+    df['Between'] = df['N'] * (df['Mean'] - df['Group_Mean']) ** 2
+    df_merged = df.groupby(by, sort=True).agg(
+        N=('N', 'sum'), Sum=('Sum', 'sum'), M2_Within=('M2', 'sum'), Between=('Between', 'sum'),
+        Min_Value=('Min_Value', 'min'), Max_Value=('Max_Value', 'max'), Cells=('N', 'size')
+    ).reset_index()
+    df_merged['Mean'] = df_merged['Sum'] / df_merged['N']
+    df_merged['M2'] = df_merged['M2_Within'] + df_merged['Between']
+    return df_merged[by + MOMENT_COLUMNS + ['Cells', 'M2_Within']]
+
+
+def spec_limits(conn: sqlite3.Connection, item_key: str) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    """측정 항목별 (LSL, USL) - 규격 테이블의 최신 행(Start_Date, Spec_ID 순). 규격이 없는 품목은 빈 dict"""
+    spec_table = SPC_ITEMS[item_key][3]
+    if not spec_table or not _table_exists(conn, spec_table):
+        return {}
+    rows = conn.execute(
+        f"SELECT Measure_Item, Min_Value, Max_Value FROM {spec_table} ORDER BY Start_Date, Spec_ID"
+    ).fetchall()
+    return {measure: (low, high) for measure, low, high in rows}
+
+
+def _capability(df: pd.DataFrame, limits: Dict[str, Tuple[Optional[float], Optional[float]]]) -> pd.DataFrame:
+    """merge_moments 결과(Measure_Item 포함)에 표준편차와 Cp / Cpk / Pp / Ppk를 붙입니다."""
+    df = df.copy()
+    n = df['N'].astype(float)
+    # 군내 표준편차: 셀(일자 × PC × 근무조)을 부분군으로 본 합동 표준편차, 전체 표준편차: 표본 표준편차
+    dof_within = n - df['Cells']
+    df['Std_Within'] = np.sqrt(df['M2_Within'] / dof_within.where(dof_within > 0))
+    df['Std_Overall'] = np.sqrt(df['M2'] / (n - 1).where(n > 1))
+    df['LSL'] = df['Measure_Item'].map(lambda m: limits.get(m, (None, None))[0]).astype(float)
+    df['USL'] = df['Measure_Item'].map(lambda m: limits.get(m, (None, None))[1]).astype(float)
+
+    for prefix, std_col in (('C', 'Std_Within'), ('P', 'Std_Overall')):
+        sigma = df[std_col].where(df[std_col] > 0)
+        upper = (df['USL'] - df['Mean']) / (SIGMA_LIMIT * sigma)
+        lower = (df['Mean'] - df['LSL']) / (SIGMA_LIMIT * sigma)
+        df[f'{prefix}p'] = (df['USL'] - df['LSL']) / (2 * SIGMA_LIMIT * sigma)
+        df[f'{prefix}pk'] = np.fmin(upper, lower)
+    return df.drop(columns=['M2', 'M2_Within'])
+
+
+def capability_summary(conn: sqlite3.Connection, item_key: str, start_day: str, end_day: str,
+                       pcs: Optional[Sequence[str]] = None, by_pc: bool = False,
+                       limits: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None) -> pd.DataFrame:
+    """
+    기간 × PC 부분집합의 측정 항목별 공정능력. by_pc=True 이면 PC별로 나눕니다.
+    limits({Measure_Item: (LSL, USL)})를 주지 않으면 spec_limits()를 사용합니다.
+    반환 컬럼: Measure_Item, [PC,] N, Mean, Min_Value, Max_Value, Cells, Std_Within, Std_Overall, LSL, USL,
+               Cp, Cpk (군내 σ), Pp, Ppk (전체 σ)
+    """
+    df_cells = load_moments(conn, item_key, start_day, end_day, pcs=pcs)
+    df = merge_moments(df_cells, ['Measure_Item', 'PC'] if by_pc else ['Measure_Item'])
+    return _capability(df, spec_limits(conn, item_key) if limits is None else limits).round(4)
+
+
+def control_chart(conn: sqlite3.Connection, item_key: str, measure_item: str, start_day: str, end_day: str,
+                  pcs: Optional[Sequence[str]] = None, by_shift: bool = False) -> pd.DataFrame:
+    """
+    측정 항목 1개의 X-bar 관리도 데이터. 부분군 = 일자 (by_shift=True 이면 일자 × 근무조).
+    중심선 CL은 기간 전체 평균, 한계는 CL ± 3σ/√n (σ: 부분군 합동 표준편차, n: 부분군 크기)입니다.
+    반환 컬럼: Day, [Shift,] N, Mean, Std, Min_Value, Max_Value, CL, UCL, LCL, Out_Of_Control
+    """
+    by = ['Day', 'Shift'] if by_shift else ['Day']
+    df_cells = load_moments(conn, item_key, start_day, end_day, measure_item=measure_item, pcs=pcs)
+    df = merge_moments(df_cells, by)
+    columns = by + ['N', 'Mean', 'Std', 'Min_Value', 'Max_Value', 'CL', 'UCL', 'LCL', 'Out_Of_Control']
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+
+    n_total = df['N'].sum()
+    center = (df['N'] * df['Mean']).sum() / n_total
+    dof = n_total - len(df)
+    sigma = np.sqrt(df['M2'].sum() / dof) if dof > 0 else np.nan
+    n = df['N'].astype(float)
+    df['Std'] = np.sqrt(df['M2'] / (n - 1).where(n > 1))
+    df['CL'] = center
+    df['UCL'] = center + SIGMA_LIMIT * sigma / np.sqrt(n)
+    df['LCL'] = center - SIGMA_LIMIT * sigma / np.sqrt(n)
+    df['Out_Of_Control'] = (df['Mean'] > df['UCL']) | (df['Mean'] < df['LCL'])
+    return df[columns].round(4)
+
+
+def load_sketches(conn: sqlite3.Connection, item_key: str, measure_item: str, start_day: str, end_day: str,
+                  pcs: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """기간(일자 포함 범위) / PC 조건의 측정 항목 1개 T_SPC_SKETCH 행"""
+    where, params = ["Item = ?", "Measure_Item = ?", "Day BETWEEN ? AND ?"], [item_key, measure_item, start_day, end_day]
+    if pcs:
+        where.append(f"PC IN ({', '.join(['?'] * len(pcs))})")
+        params.extend(str(pc) for pc in pcs)
+    return pd.read_sql_query(f"SELECT * FROM {SKETCH_TABLE} WHERE {' AND '.join(where)}", conn, params=params)
+
+
+def merge_sketches(df_sketches: pd.DataFrame, by: Sequence[str] = ()) -> pd.DataFrame:
+    """
+    스케치 행을 by 컬럼별로(빈 값이면 전체 1개로) 합칩니다. 중심점은 이어 붙여 다시 압축하고, 히스토그램은 더합니다.
+    반환 컬럼: by..., N, Min_Value, Max_Value, Centroids (ndarray [[평균, 가중치]]), Hist (ndarray)
+    """
+    by = list(by)
+    columns = by + ['N', 'Min_Value', 'Max_Value', 'Centroids', 'Hist']
+    if df_sketches.empty:
+        return pd.DataFrame(columns=columns)
+    group_keys = by or ['_All']
+    df_sketches = df_sketches.assign(_All=0)
+
+    decoded = [_decode_centroids(blob) for blob in df_sketches['Centroids']]
+    df_centroids = pd.DataFrame(np.concatenate(decoded), columns=['Mean', 'Weight'])
+    repeat = np.repeat(np.arange(len(df_sketches)), [len(c) for c in decoded])
+    for key in group_keys:
+        df_centroids[key] = df_sketches[key].to_numpy()[repeat]
+    df_digest = _compress_centroids(df_centroids, group_keys)
+    digests = {key: group.to_numpy() for key, group in df_digest.groupby(group_keys, sort=False)[['Mean', 'Weight']]}
+
+    df_merged = df_sketches.groupby(group_keys, sort=True).agg(
+        N=('N', 'sum'), Min_Value=('Min_Value', 'min'), Max_Value=('Max_Value', 'max'),
+        Hist=('Hist', lambda blobs: np.sum([_decode_hist(blob) for blob in blobs], axis=0))
+    ).reset_index()
+    df_merged['Centroids'] = [digests[key] for key in df_merged[group_keys].itertuples(index=False, name=None)]
+    return df_merged[columns]
+
+
+def quantile_bands(conn: sqlite3.Connection, item_key: str, measure_item: str, start_day: str, end_day: str,
+                   pcs: Optional[Sequence[str]] = None, quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                   by_day: bool = True) -> pd.DataFrame:
+    """
+    측정 항목 1개의 추정 백분위수. by_day=True 이면 일자별(백분위 밴드), False 이면 기간 전체 1행입니다.
+    반환 컬럼: [Day,] N, Min_Value, P1, P5, ..., P99, Max_Value (분위수 이름은 P + 백분율)
+    """
+    by = ['Day'] if by_day else []
+    names = [f"P{q * 100:g}" for q in quantiles]
+    df = merge_sketches(load_sketches(conn, item_key, measure_item, start_day, end_day, pcs), by)
+    if df.empty:
+        return pd.DataFrame(columns=by + ['N', 'Min_Value'] + names + ['Max_Value'])
+    values = np.vstack([digest_quantiles(c, quantiles, lo, hi)
+                        for c, lo, hi in zip(df['Centroids'], df['Min_Value'], df['Max_Value'])])
+    df_bands = pd.concat([df[by + ['N', 'Min_Value']], pd.DataFrame(values, columns=names, index=df.index),
+                          df[['Max_Value']]], axis=1)
+    return df_bands.round(4)
+
+
+def histogram(conn: sqlite3.Connection, item_key: str, measure_item: str, start_day: str, end_day: str,
+              pcs: Optional[Sequence[str]] = None) -> Optional[Dict]:
+    """
+    측정 항목 1개의 기간 히스토그램. 데이터가 없으면 None
+    반환: {'bins': DataFrame(Bin_Low, Bin_High, Count), 'below': 구간 미만 건수, 'above': 구간 초과 건수,
+           'n', 'lsl', 'usl'}
+    """
+    df = merge_sketches(load_sketches(conn, item_key, measure_item, start_day, end_day, pcs))
+    layout = bin_layouts(conn, item_key).get(measure_item)
+    if df.empty or layout is None:
+        return None
+    low, width, bins = layout
+    hist = df['Hist'].iloc[0]
+    edges = low + width * np.arange(bins + 1)
+    lsl, usl = spec_limits(conn, item_key).get(measure_item, (None, None))
+    return {
+        'bins': pd.DataFrame({'Bin_Low': edges[:-1], 'Bin_High': edges[1:], 'Count': hist[1:bins + 1]}),
+        'below': int(hist[0]), 'above': int(hist[bins + 1]), 'n': int(df['N'].iloc[0]), 'lsl': lsl, 'usl': usl,
+    }
+
+
+def list_spc_pcs(conn: sqlite3.Connection, item_key: str) -> List[str]:
+    """T_SPC_MOMENTS에 있는 품목의 PC 목록"""
+    rows = conn.execute(f"SELECT DISTINCT PC FROM {MOMENTS_TABLE} WHERE Item = ? ORDER BY PC", (item_key,)).fetchall()
+    return [row[0] for row in rows]
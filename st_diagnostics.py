@@ -0,0 +1,30 @@
+# st_diagnostics.py
+# quality_core.Diagnostics 를 Streamlit 화면에 출력하고, 필드 매핑을 st.session_state 에 반영합니다.
+
+import streamlit as st
+
+from quality_core.diagnostics import Diagnostics, INFO, WARNING, ERROR
+
+_RENDERERS = {INFO: st.info, WARNING: st.warning, ERROR: st.error}
+
+
+def render_diagnostics(diagnostics: Diagnostics) -> None:
+    """메시지를 발생 순서대로 출력합니다."""
+    for entry in diagnostics.messages:
+        _RENDERERS.get(entry['level'], st.write)(entry['message'])
+
+
+def apply_field_mapping(diagnostics: Diagnostics) -> None:
+    """리더가 기록한 필드 매핑을 st.session_state.field_mapping 에 저장합니다."""
+    if not diagnostics.field_mapping:
+        return
+    if 'field_mapping' not in st.session_state:
+        st.session_state.field_mapping = {}
+    st.session_state.field_mapping.update(diagnostics.field_mapping)
+
+
+def show(diagnostics: Diagnostics) -> Diagnostics:
+    """render_diagnostics + apply_field_mapping"""
+    apply_field_mapping(diagnostics)
+    render_diagnostics(diagnostics)
+    return diagnostics
@@ -0,0 +1,88 @@
+# st_tables.py
+# 판정 결과('미달'/'초과'/'제외'/'o'/'x'/'Pass') 강조 테이블 출력.
+# 셀마다 Python 함수를 부르는 Styler.map 대신, 컬럼별로 고유값만 분류(pd.factorize)한 뒤 NumPy 인덱싱으로
+# 색상 클래스를 만들고, 화면에 보이는 행(페이지)에만 스타일을 붙입니다. 큰 표는 TABLE_PAGE_ROWS 행씩
+# '더 보기'로 늘리며 TABLE_MAX_ROWS 행에서 멈추므로, 원본 행 수와 관계없이 출력 비용이 일정합니다.
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# 색상 클래스: 0 없음, 1 불량(미달/초과/x), 2 제외, 3 합격(o/Pass)
+CLASS_NONE, CLASS_FAIL, CLASS_EXCLUDED, CLASS_PASS = range(4)
+CLASS_CSS = np.array([
+    '',
+    'background-color: #ffcccc; color: #cc0000',
+    'background-color: #e0e0e0; color: #555555',
+    'background-color: #ccffcc',
+], dtype=object)
+
+TABLE_PAGE_ROWS = 500
+TABLE_MAX_ROWS = 5000
+
+
+def classify_value(val) -> int:
+    """값 1개의 색상 클래스 (기존 highlight_failure와 같은 규칙)"""
+    if isinstance(val, str):
+        if '초과' in val or '미달' in val or val.lower() == 'x':
+            return CLASS_FAIL
+        if '제외' in val:
+            return CLASS_EXCLUDED
+        if val.lower() in ('o', 'pass'):
+            return CLASS_PASS
+    return CLASS_NONE
+
+
+def failure_classes(df: pd.DataFrame) -> np.ndarray:
+    """
+    DataFrame 전체의 색상 클래스 배열 (행 × 컬럼, int8). 문자열이 있을 수 있는 컬럼만 보고,
+    컬럼마다 고유값만 classify_value로 분류한 뒤 코드 배열로 펼칩니다. (판정 컬럼은 고유값이 몇 개뿐)
+    """
+    classes = np.zeros(df.shape, dtype=np.int8)
+    for j in range(df.shape[1]):
+        column = df.iloc[:, j]
+        if not (pd.api.types.is_object_dtype(column) or pd.api.types.is_string_dtype(column)):
+            continue
+        codes, uniques = pd.factorize(column)
+        lookup = np.array([classify_value(val) for val in uniques] + [CLASS_NONE], dtype=np.int8)
+        classes[:, j] = lookup[codes]  # 결측(-1)은 마지막 CLASS_NONE
+    return classes
+
+
+def style_failures(df: pd.DataFrame):
+    """판정 결과 셀을 강조한 Styler - 미리 계산한 CSS 배열을 한 번에 적용합니다. (출력할 행만 넘기세요)"""
+    css = pd.DataFrame(CLASS_CSS[failure_classes(df)], index=df.index, columns=df.columns)
+    return df.style.apply(lambda _: css, axis=None)
+
+
+def _show_more_rows(state_key: str, rows: int) -> None:
+    st.session_state[state_key] = rows
+
+
+def render_failure_table(df: pd.DataFrame, key: str, page_rows: int = TABLE_PAGE_ROWS,
+                         max_rows: int = TABLE_MAX_ROWS, height: Optional[int] = 400, **dataframe_kwargs) -> None:
+    """
+    판정 강조 테이블을 앞에서부터 page_rows 행만 출력하고, '더 보기'로 page_rows 행씩 max_rows 행까지 늘립니다.
+    보이는 행 수는 st.session_state[f'{key}_rows']에 둡니다. (key는 화면에서 고유해야 합니다)
+    '더 보기'는 클릭 콜백에서 행 수를 늘리므로 st.fragment 안에서는 그 fragment만 다시 실행됩니다.
+    """
+    state_key = f'{key}_rows'
+    limit = min(len(df), max_rows)
+    shown = min(st.session_state.get(state_key, page_rows), limit)
+    kwargs = {'use_container_width': True, 'hide_index': True}
+    kwargs.update(dataframe_kwargs)
+    if height is not None:
+        kwargs['height'] = height
+    st.dataframe(style_failures(df.iloc[:shown]), **kwargs)
+
+    if shown < limit:
+        col1, col2 = st.columns([1, 4])
+        with col1:
+            st.button(f"더 보기 (+{min(page_rows, limit - shown):,}행)", key=f'{key}_more',
+                      on_click=_show_more_rows, args=(state_key, shown + page_rows))
+        with col2:
+            st.caption(f"{shown:,} / {len(df):,}행 표시")
+    elif len(df) > limit:
+        st.caption(f"{limit:,} / {len(df):,}행까지만 표시합니다. 기간이나 유형을 좁혀 조회하세요.")
@@ -0,0 +1,714 @@
+# storage.py
+# 저장소(백엔드) 추상화: SQLite 파일 / MySQL 서버를 같은 인터페이스로 다룹니다.
+# 앱과 분석 코어의 SQL은 SQLite 형식(? 파라미터)으로 작성되어 있으므로, 두 백엔드 모두 connect()가
+# "? 파라미터를 받는 DB-API 연결"(execute / executemany / cursor / commit / rollback)을 빌려줍니다.
+#
+#   storage = open_storage('./product_quality_db_final_stable-74.db')        # SQLite
+#   storage = open_storage('mysql://user:pw@db-host:3306/quality?pool_size=4')  # MySQL (pymysql)
+#   with storage.connect() as conn:                     # 풀에서 빌리고, 블록이 끝나면 돌려줍니다 (커밋은 호출 측)
+#       metadata = load_db_metadata(conn)
+#   for df in storage.iter_frames(sql, params):         # 큰 결과는 청크 단위로 (MySQL은 서버 측 커서)
+#       ...
+#   with storage.connect() as conn:
+#       storage.insert_rows(conn, 'T_MASTER_DATA', columns, rows)   # 배치 INSERT (PK 중복은 건너뜀)
+#       conn.commit()
+#
+# - MySQL 연결은 풀(pool_size개)에 두고 재사용합니다. 빌릴 때 ping으로 끊긴 연결을 다시 연결하고,
+#   돌려받을 때 커밋되지 않은 작업은 롤백합니다.
+# - 적재(db_ingest)의 파생 통계(traceability / spc_stats / jig_history)는 SQLite 전용 SQL(ATTACH, 임시 테이블,
+#   ON CONFLICT)을 쓰므로 적재는 SQLite에서 하고, copy_tables()로 서버에 게시합니다. (batch_ingest.py --publish)
+# - 두 백엔드가 같은 동작을 하는지는 check_storage()로 확인합니다. (CI에서는 SQLite, 서버는 MySQL 호환 DB)
+#
+#   python storage.py check sqlite:///./tmp_check.db
+#   python storage.py copy ./product_quality_db_final_stable-74.db mysql://user:pw@db-host/quality
+
+import argparse
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+import pandas as pd
+
+from profiling import span
+
+# iter_frames 기본 청크 행 수 / insert_rows 한 번에 보내는 행 수
+STREAM_CHUNK_ROWS = 50000
+INSERT_BATCH_ROWS = 5000
+
+# MySQL 연결 풀 기본값
+MYSQL_POOL_SIZE = 4
+MYSQL_POOL_TIMEOUT_S = 30.0
+
+# copy_tables 기본 대상: 앱이 읽는 테이블 (적재 이력/동기화 상태/대기열 테이블은 SQLite 작업용이라 제외)
+PUBLISH_TABLES = [
+    'T_DB_META', 'T_MASTER_DATA', 'T_ITEM_PCB', 'T_ITEM_SEMI', 'T_ITEM_FW', 'T_ITEM_RFTX', 'T_ITEM_BATADC',
+    'T_PC_INFO', 'T_SPEC_PCB', 'T_SPEC_SEMI', 'T_UNIT_STATUS', 'T_ATTEMPT_INDEX', 'T_SPC_MOMENTS', 'T_SPC_SKETCH', 'T_SPC_BINS',
+    'T_JIG_PASS',
+]
+
+
+class StorageError(Exception):
+    """백엔드 드라이버 오류 (MySQL 드라이버 예외는 이 예외로 바꿔 전달합니다)"""
+
+
+# 호출 측이 백엔드와 관계없이 잡을 DB 오류 (SQLite 연결은 sqlite3.Error를 그대로 냅니다)
+DB_ERRORS = (sqlite3.Error, StorageError)
+
+
+@lru_cache(maxsize=256)
+def qmark_to_format(sql: str) -> str:
+    """? 파라미터를 pymysql 형식(%s)으로 바꿉니다. 문자열 리터럴 안의 ?는 그대로 두고, 리터럴 %는 %%로 이스케이프합니다."""
+    out = []
+    quote = None
+    for ch in sql:
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"', '`'):
+            quote = ch
+        elif ch == '?':
+            out.append('%s')
+            continue
+        out.append('%%' if ch == '%' else ch)
+    return ''.join(out)
+
+
+class Storage:
+    """
+    저장소 공통 인터페이스. connect()는 ? 파라미터 DB-API 연결을 빌려주는 컨텍스트 관리자입니다.
+    name은 캐시 키/화면 표시에 쓰는 문자열입니다. (MySQL은 비밀번호를 포함하지 않습니다)
+    """
+
+    dialect = ''
+    name = ''
+    # LIMIT ? 에 넘겨 '제한 없음'을 뜻하는 값
+    no_limit: int = -1
+
+    @contextmanager
+    def connect(self):
+        raise NotImplementedError
+
+    def exists(self) -> bool:
+        """저장소에 접근할 수 있는지 (SQLite는 파일 존재 여부)"""
+        return True
+
+    def close(self) -> None:
+        """풀에 있는 연결을 모두 닫습니다."""
+
+    # ---------- 읽기 ----------
+
+    def read_frame(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        """쿼리 결과 전체를 DataFrame으로 읽습니다."""
+        frames = list(self.iter_frames(sql, params, chunk_rows=None))
+        return frames[0]
+
+    def iter_frames(self, sql: str, params: Sequence = (), chunk_rows: Optional[int] = STREAM_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """
+        쿼리 결과를 chunk_rows 행씩 DataFrame으로 돌려줍니다. (chunk_rows=None이면 전체를 한 번에)
+        결과가 없어도 컬럼만 있는 빈 DataFrame을 1개 돌려줍니다. 반복이 끝날 때까지 연결 1개를 사용합니다.
+        """
+        with self.connect() as conn:
+            cursor = self._stream_cursor(conn)
+            try:
+                cursor.execute(sql, tuple(params))
+                columns = [column[0] for column in cursor.description]
+                yielded = False
+                while True:
+                    rows = cursor.fetchall() if chunk_rows is None else cursor.fetchmany(chunk_rows)
+                    if not rows and yielded:
+                        break
+                    yielded = True
+                    yield pd.DataFrame.from_records(list(rows), columns=columns)
+                    if chunk_rows is None or len(rows) < chunk_rows:
+                        break
+            finally:
+                cursor.close()
+
+    def _stream_cursor(self, conn):
+        return conn.cursor()
+
+    def table_exists(self, table: str) -> bool:
+        return table in self.list_tables()
+
+    def list_tables(self) -> List[str]:
+        raise NotImplementedError
+
+    def table_schema(self, table: str) -> Dict[str, Any]:
+        """
+        테이블 구조 {'columns': [(이름, 선언 타입)], 'primary_key': [컬럼], 'indexes': [(이름, [컬럼], unique)]}
+        copy_tables가 다른 백엔드에 같은 테이블을 만들 때 사용합니다.
+        """
+        raise NotImplementedError
+
+    def generation(self) -> int:
+        """DB 세대 번호 (T_DB_META, 적재/삭제마다 증가. 테이블이 없으면 0)"""
+        try:
+            with self.connect() as conn:
+                row = conn.execute("SELECT Meta_Value FROM T_DB_META WHERE Meta_Key = 'generation'").fetchone()
+        except DB_ERRORS:
+            return 0
+        return int(row[0]) if row and row[0] is not None else 0
+
+    # ---------- 쓰기 ----------
+
+    def insert_sql(self, table: str, columns: Sequence[str]) -> str:
+        """PK/UNIQUE 중복 행은 건너뛰는 INSERT 문 (? 파라미터)"""
+        raise NotImplementedError
+
+    def insert_rows(self, conn, table: str, columns: Sequence[str], rows: Iterable[Sequence],
+                    batch_rows: int = INSERT_BATCH_ROWS) -> int:
+        """
+        rows를 batch_rows 행씩 executemany로 INSERT 합니다. (PK 중복 행은 건너뜀, 커밋은 호출 측 담당)
+        반환: 추가된 행 수
+        """
+        sql = self.insert_sql(table, columns)
+        inserted = 0
+        batch: List[Sequence] = []
+        for row in rows:
+            batch.append(tuple(row))
+            if len(batch) >= batch_rows:
+                inserted += self._insert_batch(conn, sql, batch)
+                batch = []
+        if batch:
+            inserted += self._insert_batch(conn, sql, batch)
+        return inserted
+
+    def insert_frame(self, conn, table: str, df: pd.DataFrame, columns: Optional[Sequence[str]] = None,
+                     batch_rows: int = INSERT_BATCH_ROWS) -> int:
+        """DataFrame 행을 insert_rows로 저장합니다. (NaN은 NULL)"""
+        columns = list(columns or df.columns)
+        if len(df) == 0:
+            return 0
+        values = df.reindex(columns=columns).astype(object)
+        values = values.where(values.notna(), None)
+        return self.insert_rows(conn, table, columns, values.itertuples(index=False, name=None), batch_rows)
+
+    def _insert_batch(self, conn, sql: str, batch: List[Sequence]) -> int:
+        raise NotImplementedError
+
+    def create_table_sql(self, table: str, schema: Dict[str, Any]) -> List[str]:
+        """table_schema() 결과로 이 백엔드의 CREATE TABLE / CREATE INDEX 문을 만듭니다."""
+        raise NotImplementedError
+
+
+class SQLiteStorage(Storage):
+    """
+    SQLite 파일 저장소. 연결은 빌릴 때마다 새로 엽니다.
+    (SQLite 연결은 여는 비용이 작고, Streamlit 스레드 간에 연결을 공유하면 안 되기 때문입니다)
+    """
+
+    dialect = 'sqlite'
+
+    def __init__(self, db_file_name: str, timeout: float = 30.0):
+        self.db_file_name = db_file_name
+        self.timeout = timeout
+        self.name = db_file_name
+
+    def __repr__(self) -> str:
+        return f"<SQLiteStorage {self.db_file_name!r}>"
+
+    @contextmanager
+    def connect(self):
+        conn = sqlite3.connect(self.db_file_name, timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.db_file_name)
+
+    def list_tables(self) -> List[str]:
+        with self.connect() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            )]
+
+    def table_schema(self, table: str) -> Dict[str, Any]:
+        with self.connect() as conn:
+            info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+            indexes = []
+            for _, index_name, unique, origin, _ in conn.execute(f"PRAGMA index_list({table})").fetchall():
+                if origin == 'pk':
+                    continue
+                columns = [row[2] for row in conn.execute(f"PRAGMA index_info({index_name})")]
+                if columns and all(columns):  # 식(expression) 인덱스는 옮기지 않습니다
+                    indexes.append((index_name, columns, bool(unique)))
+        primary_key = [row[1] for row in sorted(info, key=lambda row: row[5]) if row[5]]
+        return {'columns': [(row[1], row[2] or '') for row in info], 'primary_key': primary_key, 'indexes': indexes}
+
+    def insert_sql(self, table: str, columns: Sequence[str]) -> str:
+        return f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+
+    def _insert_batch(self, conn, sql: str, batch: List[Sequence]) -> int:
+        before = conn.total_changes
+        conn.executemany(sql, batch)
+        return conn.total_changes - before
+
+    def create_table_sql(self, table: str, schema: Dict[str, Any]) -> List[str]:
+        columns = [f"{name} {column_type}".strip() for name, column_type in schema['columns']]
+        if schema['primary_key']:
+            columns.append(f"PRIMARY KEY ({', '.join(schema['primary_key'])})")
+        statements = [f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})"]
+        for index_name, index_columns, unique in schema['indexes']:
+            statements.append(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {index_name} "
+                              f"ON {table} ({', '.join(index_columns)})")
+        return statements
+
+
+class _MySQLCursor:
+    """pymysql 커서를 ? 파라미터로 쓰게 하는 래퍼 (드라이버 예외는 StorageError로 바꿉니다)"""
+
+    def __init__(self, cursor, driver):
+        self._cursor = cursor
+        self._driver = driver
+
+    def execute(self, sql: str, params: Sequence = ()):
+        params = tuple(params) if params else None
+        with _translate_errors(self._driver):
+            self._cursor.execute(qmark_to_format(sql) if params is not None else sql, params)
+        return self
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence]):
+        with _translate_errors(self._driver):
+            self._cursor.executemany(qmark_to_format(sql), [tuple(params) for params in seq_of_params])
+        return self
+
+    def fetchone(self):
+        with _translate_errors(self._driver):
+            return self._cursor.fetchone()
+
+    def fetchmany(self, size: int):
+        with _translate_errors(self._driver):
+            return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        with _translate_errors(self._driver):
+            return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class _MySQLConnection:
+    """
+    풀에서 빌린 pymysql 연결의 래퍼. sqlite3.Connection처럼 execute()/executemany()를 바로 쓸 수 있고,
+    pandas.read_sql_query(sql, conn, params=...)도 cursor()를 통해 ? 파라미터로 동작합니다.
+    """
+
+    def __init__(self, raw, driver):
+        self.raw = raw
+        self._driver = driver
+
+    def cursor(self, cursor_class=None) -> _MySQLCursor:
+        with _translate_errors(self._driver):
+            cursor = self.raw.cursor(cursor_class) if cursor_class else self.raw.cursor()
+        return _MySQLCursor(cursor, self._driver)
+
+    def execute(self, sql: str, params: Sequence = ()) -> _MySQLCursor:
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence]) -> _MySQLCursor:
+        return self.cursor().executemany(sql, seq_of_params)
+
+    def commit(self) -> None:
+        with _translate_errors(self._driver):
+            self.raw.commit()
+
+    def rollback(self) -> None:
+        with _translate_errors(self._driver):
+            self.raw.rollback()
+
+    def close(self) -> None:
+        """풀 연결은 connect() 블록이 끝날 때 풀로 돌아가므로 여기서는 닫지 않습니다."""
+
+
+@contextmanager
+def _translate_errors(driver):
+    try:
+        yield
+    except driver.Error as e:
+        raise StorageError(str(e)) from e
+
+
+class MySQLStorage(Storage):
+    """
+    MySQL(및 MariaDB 등 MySQL 호환) 서버 저장소 - pymysql 연결을 pool_size개까지 만들어 재사용합니다.
+    풀이 모두 사용 중이면 pool_timeout초 동안 반납을 기다린 뒤 StorageError를 냅니다.
+    """
+
+    dialect = 'mysql'
+    no_limit = 18446744073709551615  # MySQL은 LIMIT -1을 허용하지 않으므로 BIGINT UNSIGNED 최댓값
+
+    # SQLite 선언 타입 → MySQL 타입. PK/인덱스의 문자열 컬럼은 VARCHAR로 만듭니다. (MySQL은 길이 없는 TEXT 컬럼에
+    # 인덱스를 만들 수 없고, InnoDB 키 길이 3072바이트 = utf8mb4 4바이트 × 100자 × 최대 5컬럼(T_SPC_MOMENTS) 이내)
+    TYPE_MAP = {'INTEGER': 'BIGINT', 'INT': 'BIGINT', 'REAL': 'DOUBLE', 'FLOAT': 'DOUBLE', 'NUMERIC': 'DOUBLE',
+                'TEXT': 'TEXT', 'BLOB': 'LONGBLOB', '': 'TEXT'}
+    KEY_TEXT_TYPE = 'VARCHAR(100)'
+
+    def __init__(self, host: str, user: str, password: str = '', database: Optional[str] = None, port: int = 3306,
+                 pool_size: int = MYSQL_POOL_SIZE, pool_timeout: float = MYSQL_POOL_TIMEOUT_S, charset: str = 'utf8mb4',
+                 **connect_kwargs):
+        import pymysql  # 선택 의존성: MySQL 저장소를 만들 때만 필요합니다.
+        self._driver = pymysql
+        self._connect_kwargs = dict(host=host, port=int(port), user=user, password=password, database=database,
+                                    charset=charset, autocommit=False, **connect_kwargs)
+        self.pool_size = max(1, int(pool_size))
+        self.pool_timeout = pool_timeout
+        self.database = database
+        self.name = f"mysql://{user}@{host}:{int(port)}/{database or ''}"
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+
+    @classmethod
+    def from_credentials(cls, credentials: Mapping[str, Any], **kwargs) -> 'MySQLStorage':
+        """st.secrets['db_credentials'] 형식(DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME)으로 만듭니다."""
+        return cls(host=credentials['DB_HOST'], port=int(credentials.get('DB_PORT', 3306)),
+                   user=credentials['DB_USER'], password=credentials.get('DB_PASSWORD', ''),
+                   database=credentials.get('DB_NAME'), **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<MySQLStorage {self.name} (연결 {self._created}/{self.pool_size}, 대기 {self._idle.qsize()})>"
+
+    # ---------- 연결 풀 ----------
+
+    def _open(self):
+        with _translate_errors(self._driver):
+            return self._driver.connect(**self._connect_kwargs)
+
+    def _checkout(self):
+        try:
+            raw = self._idle.get_nowait()
+        except queue.Empty:
+            raw = None
+            with self._lock:
+                if self._created < self.pool_size:
+                    self._created += 1
+                    create = True
+                else:
+                    create = False
+            if create:
+                try:
+                    return self._open()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            try:
+                raw = self._idle.get(timeout=self.pool_timeout)
+            except queue.Empty:
+                raise StorageError(f"MySQL 연결 풀 대기 시간 초과 ({self.pool_timeout:g}초, 풀 크기 {self.pool_size})")
+        try:
+            raw.ping(reconnect=True)  # 서버가 끊은 유휴 연결(wait_timeout)을 다시 연결합니다.
+        except self._driver.Error as e:
+            self._discard(raw)
+            raise StorageError(f"MySQL 연결 확인 실패: {e}") from e
+        return raw
+
+    def _checkin(self, raw, broken: bool = False) -> None:
+        if not broken:
+            try:
+                raw.rollback()  # 커밋하지 않은 작업은 다음 사용자에게 넘기지 않습니다.
+            except self._driver.Error:
+                broken = True
+        if broken:
+            self._discard(raw)
+        else:
+            self._idle.put(raw)
+
+    def _discard(self, raw) -> None:
+        try:
+            raw.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    @contextmanager
+    def connect(self):
+        raw = self._checkout()
+        broken = False
+        try:
+            yield _MySQLConnection(raw, self._driver)
+        except (self._driver.OperationalError, self._driver.InterfaceError):
+            broken = True
+            raise
+        except StorageError as e:
+            broken = isinstance(e.__cause__, (self._driver.OperationalError, self._driver.InterfaceError))
+            raise
+        finally:
+            self._checkin(raw, broken)
+
+    def close(self) -> None:
+        while True:
+            try:
+                raw = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(raw)
+
+    def exists(self) -> bool:
+        try:
+            with self.connect() as conn:
+                conn.execute("SELECT 1").fetchone()
+            return True
+        except DB_ERRORS:
+            return False
+
+    # ---------- 읽기 ----------
+
+    def _stream_cursor(self, conn: _MySQLConnection) -> _MySQLCursor:
+        # 서버 측 커서(SSCursor): 결과를 fetchmany 크기만큼만 받아오므로 큰 결과도 클라이언트 메모리가 일정합니다.
+        return conn.cursor(self._driver.cursors.SSCursor)
+
+    def list_tables(self) -> List[str]:
+        with self.connect() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME"
+            ).fetchall()]
+
+    def table_schema(self, table: str) -> Dict[str, Any]:
+        with self.connect() as conn:
+            columns = conn.execute(
+                "SELECT COLUMN_NAME, COLUMN_TYPE, COLUMN_KEY FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = ? ORDER BY ORDINAL_POSITION", (table,)
+            ).fetchall()
+            statistics = conn.execute(
+                "SELECT INDEX_NAME, COLUMN_NAME, NON_UNIQUE FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = ? ORDER BY INDEX_NAME, SEQ_IN_INDEX", (table,)
+            ).fetchall()
+        indexes: Dict[str, Tuple[List[str], bool]] = {}
+        for index_name, column, non_unique in statistics:
+            indexes.setdefault(index_name, ([], not non_unique))[0].append(column)
+        primary = indexes.pop('PRIMARY', ([], True))[0]
+        return {'columns': [(row[0], row[1]) for row in columns], 'primary_key': primary,
+                'indexes': [(name, cols, unique) for name, (cols, unique) in indexes.items()]}
+
+    # ---------- 쓰기 ----------
+
+    def insert_sql(self, table: str, columns: Sequence[str]) -> str:
+        return f"INSERT IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+
+    def _insert_batch(self, conn: _MySQLConnection, sql: str, batch: List[Sequence]) -> int:
+        # pymysql은 INSERT ... VALUES 의 executemany를 여러 행 VALUES 문 하나(최대 max_stmt_length)로 묶어 보냅니다.
+        cursor = conn.executemany(sql, batch)
+        try:
+            return max(cursor.rowcount, 0)
+        finally:
+            cursor.close()
+
+    def create_table_sql(self, table: str, schema: Dict[str, Any]) -> List[str]:
+        key_columns = set(schema['primary_key'])
+        for _, index_columns, _ in schema['indexes']:
+            key_columns.update(index_columns)
+        columns = []
+        for name, column_type in schema['columns']:
+            mapped = self.TYPE_MAP.get(column_type.upper().split('(')[0].strip(), column_type or 'TEXT')
+            if name in key_columns and mapped == 'TEXT':
+                mapped = self.KEY_TEXT_TYPE
+            columns.append(f"`{name}` {mapped}")
+        if schema['primary_key']:
+            columns.append(f"PRIMARY KEY ({', '.join(f'`{c}`' for c in schema['primary_key'])})")
+        for index_name, index_columns, unique in schema['indexes']:
+            columns.append(f"{'UNIQUE ' if unique else ''}KEY `{index_name}` ({', '.join(f'`{c}`' for c in index_columns)})")
+        return [f"CREATE TABLE IF NOT EXISTS `{table}` ({', '.join(columns)}) DEFAULT CHARSET=utf8mb4"]
+
+
+def open_storage(target) -> Storage:
+    """
+    저장소를 엽니다. target: Storage(그대로 반환) / SQLite 파일 경로 / 'sqlite:///경로' /
+    'mysql://사용자:비밀번호@호스트:포트/DB?pool_size=4&pool_timeout=30'
+    """
+    if isinstance(target, Storage):
+        return target
+    text = str(target)
+    if text.startswith('mysql://') or text.startswith('mysql+pymysql://'):
+        url = urlparse(text)
+        options = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        kwargs: Dict[str, Any] = {}
+        if 'pool_size' in options:
+            kwargs['pool_size'] = int(options.pop('pool_size'))
+        if 'pool_timeout' in options:
+            kwargs['pool_timeout'] = float(options.pop('pool_timeout'))
+        if 'charset' in options:
+            kwargs['charset'] = options.pop('charset')
+        if options:
+            raise ValueError(f"지원하지 않는 MySQL 옵션: {', '.join(sorted(options))}")
+        return MySQLStorage(host=url.hostname or 'localhost', port=url.port or 3306, user=unquote(url.username or ''),
+                            password=unquote(url.password or ''), database=url.path.lstrip('/') or None, **kwargs)
+    if text.startswith('sqlite:///'):
+        text = text[len('sqlite:///'):]
+    elif '://' in text:
+        raise ValueError(f"지원하지 않는 저장소 주소: {text.split('://')[0]}://")
+    return SQLiteStorage(text)
+
+
+# ==========================================================
+# 저장소 간 복사 (SQLite 적재 DB → MySQL 서버 게시)
+# ==========================================================
+
+def copy_table(source: Storage, target: Storage, table: str, chunk_rows: int = STREAM_CHUNK_ROWS,
+               batch_rows: int = INSERT_BATCH_ROWS) -> int:
+    """
+    source의 테이블을 target에 그대로 옮깁니다. target에 테이블이 없으면 source 구조로 만들고, 있으면 비운 뒤 채웁니다.
+    (적재 후 재계산되는 파생 테이블과 삭제된 주차까지 맞추기 위해 증분이 아닌 교체 방식입니다)
+    source는 청크 단위로 스트리밍하고 target은 한 트랜잭션으로 씁니다. 반환: 복사한 행 수
+    """
+    with span(f'storage.copy.{table}') as current:
+        schema = source.table_schema(table)
+        columns = [name for name, _ in schema['columns']]
+        select_sql = f"SELECT {', '.join(columns)} FROM {table}"
+        copied = 0
+        with target.connect() as conn:
+            for statement in target.create_table_sql(table, schema):
+                conn.execute(statement)
+            conn.execute(f"DELETE FROM {table}")
+            for df in source.iter_frames(select_sql, chunk_rows=chunk_rows):
+                copied += target.insert_frame(conn, table, df, columns, batch_rows)
+            conn.commit()
+        current.set_rows(copied)
+    return copied
+
+
+def copy_tables(source, target, tables: Optional[Iterable[str]] = None, chunk_rows: int = STREAM_CHUNK_ROWS,
+                batch_rows: int = INSERT_BATCH_ROWS, log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """
+    source의 테이블들을 target에 복사합니다. (기본: PUBLISH_TABLES 중 source에 있는 테이블)
+    T_DB_META(세대 번호)를 마지막에 복사하므로, 도중에 실패하면 target을 읽는 앱의 캐시는 이전 세대로 남습니다.
+    반환: {'success', 'stats': {테이블: 행 수}, 'log'}
+    """
+    source, target = open_storage(source), open_storage(target)
+    log_messages: List[str] = []
+    stats: Dict[str, int] = {}
+    existing = set(source.list_tables())
+    tables = [table for table in (tables or PUBLISH_TABLES) if table in existing]
+    tables.sort(key=lambda table: table == 'T_DB_META')
+    try:
+        for table in tables:
+            started = time.perf_counter()
+            stats[table] = copy_table(source, target, table, chunk_rows, batch_rows)
+            message = f"✅ {table}: {stats[table]:,}행 복사 ({time.perf_counter() - started:.1f}s)"
+            log_messages.append(message)
+            log(message)
+    except DB_ERRORS as e:
+        log_messages.append(f"❌ {table} 복사 실패: {e}")
+        return {'success': False, 'stats': stats, 'log': '\n'.join(log_messages)}
+    return {'success': True, 'stats': stats, 'log': '\n'.join(log_messages)}
+
+
+# ==========================================================
+# 백엔드 동작 확인 (CI: SQLite / 서버: MySQL 호환 DB)
+# ==========================================================
+
+CHECK_TABLE = 'T_STORAGE_CHECK'
+
+
+def check_storage(storage) -> Dict[str, Any]:
+    """
+    저장소가 앱이 기대하는 동작을 하는지 확인합니다. 임시 테이블 CHECK_TABLE을 만들고 마지막에 지웁니다.
+    - ? 파라미터 / 문자열 리터럴의 ?, % / 한글 값
+    - insert_rows 배치 경계와 PK 중복 건너뛰기 (추가된 행 수)
+    - iter_frames 청크 분할 / 빈 결과의 컬럼
+    - 커밋하지 않은 작업은 연결 반납 시 롤백
+    반환: {'success', 'log'}
+    """
+    storage = open_storage(storage)
+    log_messages: List[str] = []
+    failures = 0
+
+    def expect(label: str, actual, expected) -> None:
+        nonlocal failures
+        ok = actual == expected
+        failures += not ok
+        log_messages.append(f"{'✅' if ok else '❌'} {label}: {actual!r}" + ('' if ok else f" (기대값 {expected!r})"))
+
+    schema = {'columns': [('Id', 'INTEGER'), ('Name', 'TEXT'), ('Value', 'REAL')], 'primary_key': ['Id'],
+              'indexes': [(f'IX_{CHECK_TABLE}_Name', ['Name'], False)]}
+    rows = [(i, f'이름{i % 3}', i / 2) for i in range(10)]
+    try:
+        with storage.connect() as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {CHECK_TABLE}")
+            for statement in storage.create_table_sql(CHECK_TABLE, schema):
+                conn.execute(statement)
+            expect("배치 INSERT (4행 단위)", storage.insert_rows(conn, CHECK_TABLE, ['Id', 'Name', 'Value'], rows, batch_rows=4), 10)
+            expect("PK 중복 건너뛰기", storage.insert_rows(conn, CHECK_TABLE, ['Id', 'Name', 'Value'], rows[8:] + [(10, '새 값', 5.0)]), 1)
+            conn.commit()
+            expect("? 파라미터 / 리터럴 '?%'", conn.execute(
+                f"SELECT COUNT(*), '?%' FROM {CHECK_TABLE} WHERE Name = ? AND Id >= ?", ('이름1', 2)).fetchone(), (2, '?%'))
+
+        with storage.connect() as conn:
+            conn.execute(f"DELETE FROM {CHECK_TABLE}")  # 커밋하지 않음 → 반납 시 롤백
+        expect("미커밋 작업 롤백", storage.read_frame(f"SELECT COUNT(*) AS N FROM {CHECK_TABLE}")['N'].tolist(), [11])
+
+        sizes = [len(df) for df in storage.iter_frames(f"SELECT Id, Name FROM {CHECK_TABLE} ORDER BY Id", chunk_rows=4)]
+        expect("스트리밍 청크 (4행 단위)", sizes, [4, 4, 3])
+        empty = list(storage.iter_frames(f"SELECT Id, Name FROM {CHECK_TABLE} WHERE Id < ?", (0,)))
+        expect("빈 결과 컬럼", [list(df.columns) for df in empty], [['Id', 'Name']])
+        expect("LIKE 패턴 파라미터", len(storage.read_frame(f"SELECT Name FROM {CHECK_TABLE} WHERE Name LIKE ?", ('이름%',))), 10)
+        with storage.connect() as conn:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)  # pandas: SQLAlchemy가 아닌 DB-API 연결 경고
+                frame = pd.read_sql_query(f"SELECT Id, Value FROM {CHECK_TABLE} WHERE Id BETWEEN ? AND ? ORDER BY Id", conn, params=(2, 4))
+        expect("pandas.read_sql_query (? 파라미터)", frame['Value'].tolist(), [1.0, 1.5, 2.0])
+        expect("테이블 목록", CHECK_TABLE in storage.list_tables(), True)
+    except DB_ERRORS as e:
+        failures += 1
+        log_messages.append(f"❌ 실행 실패: {e}")
+    finally:
+        try:
+            with storage.connect() as conn:
+                conn.execute(f"DROP TABLE IF EXISTS {CHECK_TABLE}")
+                conn.commit()
+        except DB_ERRORS:
+            pass
+    return {'success': failures == 0, 'log': '\n'.join(log_messages)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="저장소 동작 확인 / 저장소 간 테이블 복사")
+    commands = parser.add_subparsers(dest='command', required=True)
+    check_parser = commands.add_parser('check', help="저장소 동작 확인 (임시 테이블 사용)")
+    check_parser.add_argument('url', help="SQLite 경로 또는 mysql://사용자:비밀번호@호스트:포트/DB")
+    copy_parser = commands.add_parser('copy', help="source의 테이블을 target에 복사 (target 테이블은 교체)")
+    copy_parser.add_argument('source')
+    copy_parser.add_argument('target')
+    copy_parser.add_argument('--tables', nargs='*', default=None, help=f"복사할 테이블 (기본: {' '.join(PUBLISH_TABLES)})")
+    copy_parser.add_argument('--chunk-rows', type=int, default=STREAM_CHUNK_ROWS)
+    copy_parser.add_argument('--batch-rows', type=int, default=INSERT_BATCH_ROWS)
+    args = parser.parse_args(argv)
+
+    if args.command == 'check':
+        result = check_storage(args.url)
+        print(result['log'])
+    else:
+        started = time.perf_counter()
+        result = copy_tables(args.source, args.target, args.tables, args.chunk_rows, args.batch_rows,
+                             log=lambda message: print(message, flush=True))
+        if not result['success']:
+            print(result['log'].splitlines()[-1])
+        print(f"복사 완료: {sum(result['stats'].values()):,}행 / {time.perf_counter() - started:.1f}s")
+    return 0 if result['success'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,6 +7,7 @@ from typing import Dict, Optional
 from config import ANALYSIS_KEYS, TAB_PROPS_MAP
 from analysis_main import display_analysis_result 
 # from chart_generator import create_simple_bar_chart 
+from summary_cube import get_summary_cube, cube_to_frame
 
 # 2. 각 CSV 분석 모듈 임포트 (기존 코드 유지)
 from csv2 import read_csv_with_dynamic_header, analyze_data
@@ -94,83 +95,35 @@ def generate_dynamic_summary_table(df: pd.DataFrame, selected_fields: list, prop
     # }
     
 
-    JIG_COL = props.get('jig_col')
-    TIMESTAMP_COL = props.get('timestamp_col')
-
     analysis_key = 'Pcb'
-    summary_data = st.session_state.analysis_data[analysis_key][0]
-    
+    summary_data, all_dates = st.session_state.analysis_data[analysis_key]
     
-    # 3. 데이터프레임 준비 및 Date/Jig 추출
-    try:
-        df_temp = df.copy()
-        df_temp['Date'] = pd.to_datetime(df_temp[TIMESTAMP_COL], errors='coerce').dt.date
-    except Exception:
-        st.error(f"테이블 생성 실패: 날짜 컬럼({TIMESTAMP_COL}) 변환 오류.")
-        # st.session_state['summary_df_for_chart'] = None
-        return None
-        
-    df_temp['Jig'] = df_temp[JIG_COL] # 이미 analysis_utils에서 생성됨
-    # df_temp['Test'] = df_temp['QC_Test_Col'].str.replace('_QC', '') if 'QC_Test_Col' in df_temp.columns else (df_temp[qc_columns[0]].apply(lambda x: qc_columns[0].replace('_QC', '')) if qc_columns else pd.NA)
-    
-    # 4. Summary Data를 기반으로 최종 테이블 데이터 재구성
-    final_table_data = []
-
-    jig_date_combinations = df_temp[[JIG_COL, 'Date']].drop_duplicates().itertuples(index=False)
-
-    for row in jig_date_combinations:
-        current_jig = getattr(row, JIG_COL.replace(' ', '_'))
-        current_date = getattr(row, 'Date')
-        current_date_iso = current_date.strftime("%Y-%m-%d")
-        
-        day_summary = summary_data.get(current_jig, {}).get(current_date_iso, {})
-        
-        if day_summary:
-            row_data = {
-                'Date': current_date,
-                'Jig': current_jig,
-                
-                'Pass': day_summary.get('pass', 0),
-                
-                # # ⭐ [핵심 수정]: 가성불량 총합은 가성불량 세부 항목만 합산합니다.
-                # '가성불량_미달': day_summary.get('false_defect_미달', 0),
-                # '가성불량_초과': day_summary.get('false_defect_초과', 0),
-                # '가성불량_제외': day_summary.get('false_defect_제외', 0),
-                # '가성불량': day_summary.get('false_defect_미달', 0) + day_summary.get('false_defect_초과', 0) + day_summary.get('false_defect_제외', 0),
-                
-                # # ⭐ [핵심 수정]: 진성불량 총합은 진성불량 세부 항목만 합산합니다.
-                # '진성불량_미달': day_summary.get('true_defect_미달', 0),
-                # '진성불량_초과': day_summary.get('true_defect_초과', 0),
-                # '진성불량_제외': day_summary.get('true_defect_제외', 0),
-                # '진성불량': day_summary.get('true_defect_미달', 0) + day_summary.get('true_defect_초과', 0) + day_summary.get('true_defect_제외', 0),
-                
-                # 'Failure': day_summary.get('fail', 0),
-                # 'Total': day_summary.get('total_test', 0),
-                # 'Failure Rate (%)': day_summary.get('pass_rate', '0.0%') 
-                # [수정] Pass/Fail 및 가성/진성 총합은 day_summary에서 직접 가져옵니다.
-                'Pass': day_summary.get('pass', 0),
-                
-                '가성불량': day_summary.get('false_defect', 0),
-                '가성불량_미달': day_summary.get('false_defect_미달', 0),
-                '가성불량_초과': day_summary.get('false_defect_초과', 0),
-                '가성불량_제외': day_summary.get('false_defect_제외', 0),
-                
-                '진성불량': day_summary.get('true_defect', 0),
-                '진성불량_미달': day_summary.get('true_defect_미달', 0),
-                '진성불량_초과': day_summary.get('true_defect_초과', 0),
-                '진성불량_제외': day_summary.get('true_defect_제외', 0),
-                
-                'Failure': day_summary.get('fail', 0),
-                'Total': day_summary.get('total_test', 0),
-                'Failure Rate (%)': day_summary.get('pass_rate', '0.0%')
-            }
-            final_table_data.append(row_data)
+    # 3. 분석 직후 생성된 요약 큐브에서 현재 필터 조건(날짜/Jig)의 (Date, Jig) 셀을 슬라이스합니다.
+    cube_data = get_summary_cube(analysis_key, summary_data, all_dates)
+    selection = st.session_state.get(f'filter_selection_{analysis_key}')
+    if selection is None:
+        selection = {'jigs': None, 'start': min(all_dates), 'end': max(all_dates)}
+    df_cells = cube_to_frame(cube_data, selection['start'], selection['end'], selection['jigs'])
 
-    if not final_table_data:
+    if df_cells.empty:
         st.warning("Summary Data에서 일치하는 데이터 포인트를 찾을 수 없습니다. (필터 조건 확인 필요)")
         return None
 
-    summary_df = pd.DataFrame(final_table_data)
+    # 4. 큐브 셀을 최종 테이블 컬럼으로 매핑
+    summary_df = pd.DataFrame({
+        'Date': df_cells['Date'],
+        'Jig': df_cells['Jig'],
+        'Pass': df_cells['pass'],
+        '가성불량': df_cells['false_defect'],
+        '가성불량_미달': df_cells['false_defect_미달'],
+        '가성불량_초과': df_cells['false_defect_초과'],
+        '가성불량_제외': df_cells['false_defect_제외'],
+        '진성불량': df_cells['true_defect'],
+        '진성불량_미달': df_cells['true_defect_미달'],
+        '진성불량_초과': df_cells['true_defect_초과'],
+        '진성불량_제외': df_cells['true_defect_제외'],
+        'Failure': df_cells['fail'],
+    })
     # [수정] Final_cols 정의는 로직을 따르도록 재구성
     # [수정] Failure Rate를 Total Failure를 기반으로 다시 계산
     # Failure는 이미 day_summary에서 계산되어 들어왔으므로, 최종 Failure Rate를 계산합니다.
@@ -474,7 +427,11 @@ def main():
                         with st.spinner("데이터 분석 및 저장 중..."):
                             summary_data, all_dates = props['analyzer'](df)
                             st.session_state.analysis_data[key] = (summary_data, all_dates)
+                            # 새 결과 객체를 저장하면 데이터 토큰이 바뀌어 필터 인덱스/요약 큐브/SNumber 인덱스가 다시 만들어집니다.
                             st.session_state.analysis_results[key] = df.copy() 
+                            # 기간/Jig 요약용 큐브(날짜 × Jig × metric)를 분석 직후 한 번만 생성
+                            if summary_data and all_dates:
+                                get_summary_cube(key, summary_data, all_dates)
                             st.session_state.analysis_time[key] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                             
                             final_df = st.session_state.analysis_results[key]
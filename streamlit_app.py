@@ -1,615 +1,58 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
 import sqlite3
 import os
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns 
-import matplotlib as mpl
 import numpy as np
 
-# ----------------- ⚠️ 폰트 및 스타일 설정 ⚠️ -----------------
-# 챠트 한글 깨짐 방지 설정 및 스타일
-plt.rcParams['font.family'] = 'Malgun Gothic'
-mpl.rcParams['axes.unicode_minus'] = False 
-
 # ----------------- ⚠️ 상수 정의 ⚠️ -----------------
-DB_FILE_NAME = r'./product_quality_db_final_stable-74.db' 
-DATE_COLUMN_MAP = {'fw': 'FwStamp', 'rftx': 'RfTxStamp', 'batadc': 'BatadcStamp', 'semi': 'SemiAssyStartTime', 'pcb': 'PcbStartTime'}
-ITEM_OPTIONS = ('pcb', 'semi', 'fw', 'rftx', 'batadc')
-DB_TABLES = ['T_MASTER_DATA', 'T_ITEM_PCB', 'T_ITEM_SEMI', 'T_ITEM_FW', 'T_ITEM_RFTX', 'T_ITEM_BATADC', 'T_PC_INFO', 'T_SPEC_PCB', 'T_SPEC_SEMI']
+from config import DB_FILE_NAME, PARQUET_MIRROR_DIR
+from storage import PUBLISH_TABLES, open_storage
+# 테이블 미리보기 목록: 저장소가 게시하는 테이블과 같게 유지합니다. (T_DB_META는 내부 세대 번호라 제외)
+DB_TABLES = [table for table in PUBLISH_TABLES if table != 'T_DB_META']
 
 # PC 컬럼명 (스키마 확인 결과)
 PC_COLUMN_NAME = 'PC_ID'
+# 불량 유형별 조회 표가 한 번에 불러오는 최대 측정 행 수 (조회 행 제한이 0이거나 더 클 때 적용)
+DEFECT_DRILLDOWN_MAX_ROWS = 100000
 
 # ==========================================================
-# DB 저장 관련 헬퍼 함수들
+# DB 저장 관련 헬퍼 함수들 (db_ingest.py로 분리)
 # ==========================================================
-
-def calculate_week_number(date_str):
-    """'YYYY-MM-DD HH:MM:SS' 형식에서 ISO 주차(YYYY-W##)를 계산합니다."""
-    try:
-        dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-        return f"{dt.year}-W{dt.isocalendar()[1]:02d}"
-    except:
-        return None
-
-def transform_datetime_columns(df_source, columns_to_transform):
-    """Epoch 또는 YYYYMMDDhhmmss.f 형태의 숫자 컬럼을 문자열 날짜로 변환합니다."""
-    for col in columns_to_transform:
-        if col in df_source.columns:
-            
-            # ✅ FutureWarning 해결: 명시적으로 컬럼을 object 타입으로 변환 후 문자열 할당
-            if df_source[col].dtype in ['float64', 'int64']:
-                df_source[col] = df_source[col].astype('object')
-                mask = df_source[col].notna()
-                df_source.loc[mask, col] = df_source.loc[mask, col].astype(str)
-
-            dt_str_series = df_source[col].astype(str).str.split(r'\.', expand=True)[0]
-            is_potential_datetime = (dt_str_series.str.len() >= 14) & (dt_str_series.str.startswith('20'))
-            
-            try:
-                dt_series_format = pd.to_datetime(dt_str_series.where(is_potential_datetime), format='%Y%m%d%H%M%S', errors='coerce')
-                mask_success = dt_series_format.notna()
-                if mask_success.any():
-                    formatted_dates = dt_series_format[mask_success].dt.strftime('%Y-%m-%d %H:%M:%S')
-                    df_source.loc[mask_success, col] = formatted_dates.values
-            except ValueError: pass
-            
-            if df_source[col].dtype != 'object':
-                df_source[col] = df_source[col].astype(str)
-            
-            is_numeric_epoch = df_source[col].str.contains(r'^\d+\.\d+$', na=False).fillna(False)
-            
-            try:
-                if is_numeric_epoch.any():
-                    dt_series_epoch = pd.to_datetime(df_source.loc[is_numeric_epoch, col].astype(float), unit='ms', origin='unix', errors='coerce', utc=True).dt.tz_convert('Asia/Seoul')
-                    str_series_epoch = dt_series_epoch.dt.strftime('%Y-%m-%d %H:%M:%S')
-                    mask_success_epoch = str_series_epoch.notna()
-                    if mask_success_epoch.any():
-                        df_source.loc[is_numeric_epoch, col] = str_series_epoch.values
-            except: pass
-            
-            df_source[col] = df_source[col].astype(str).replace('nan', None, regex=True)
-            df_source.loc[df_source[col] == '<NA>', col] = None
-                
-    return df_source
-
-def create_initial_db_schema(cursor, conn):
-    """DB 초기 스키마를 생성합니다."""
-    cursor.execute("PRAGMA foreign_keys = ON;")
-    
-    # 1. T_MASTER_DATA
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS T_MASTER_DATA (
-            SNumber TEXT PRIMARY KEY,
-            ICount INTEGER,
-            Stamp TEXT,
-            FwPass TEXT,          
-            BatPass TEXT,         
-            RfTxPass TEXT,        
-            PcbPass TEXT,         
-            SemiAssyPass TEXT,    
-            BatadcPass TEXT,      
-            WEEK_NO TEXT 
-        );
-    """)
-    
-    # ✅ 기존 테이블에 WEEK_NO 컬럼이 없으면 추가
-    try:
-        cursor.execute("SELECT WEEK_NO FROM T_MASTER_DATA LIMIT 1")
-    except:
-        try:
-            cursor.execute("ALTER TABLE T_MASTER_DATA ADD COLUMN WEEK_NO TEXT")
-            conn.commit()
-            print("✅ T_MASTER_DATA에 WEEK_NO 컬럼을 추가했습니다.")
-        except Exception as e:
-            print(f"⚠️ WEEK_NO 컬럼 추가 실패 (이미 존재할 수 있음): {e}")
-
-    # 2. T_PC_INFO
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS T_PC_INFO (
-            PC_ID TEXT PRIMARY KEY,
-            PC_Type TEXT
-        );
-    """)
-    
-    # 3. T_SPEC_PCB
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS T_SPEC_PCB (
-            Spec_ID INTEGER PRIMARY KEY,
-            Measure_Item TEXT,
-            Min_Value REAL,
-            Max_Value REAL,
-            Start_Date TEXT,
-            Spec_Key TEXT UNIQUE
-        );
-    """)
-    
-    # 4. T_SPEC_SEMI
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS T_SPEC_SEMI (
-            Spec_ID INTEGER PRIMARY KEY,
-            Measure_Item TEXT,
-            Min_Value REAL,
-            Max_Value REAL,
-            Start_Date TEXT,
-            Spec_Key TEXT UNIQUE
-        );
-    """)
-    
-    # 5. T_ITEM_PCB
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS T_ITEM_PCB (
-            SNumber TEXT,
-            PcbStartTime TEXT,
-            PcbStopTime TEXT,
-            PcbPass TEXT,
-            PcbSleepCurr REAL,
-            PcbBatVolt REAL,
-            PcbIrCurr REAL,
-            PcbIrPwr REAL,
-            PcbWirelessVolt REAL,
-            PcbUsbCurr REAL,
-            PcbWirelessUsbVolt REAL,
-            PcbLed REAL,
-            SleepCurr_Spec_ID INTEGER,
-            pcbPC TEXT,
-            PcbMaxIrPwr REAL,
-            PRIMARY KEY (SNumber, PcbStartTime),
-            FOREIGN KEY (SNumber) REFERENCES T_MASTER_DATA (SNumber)
-        );
-    """)
-
-    # 6. T_ITEM_SEMI
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS T_ITEM_SEMI (
-            SNumber TEXT, 
-            SemiAssyStartTime TEXT, 
-            SemiAssyStopTime TEXT, 
-            SemiAssyPass TEXT, 
-            SemiAssyBatVolt REAL, 
-            SemiAssySolarVolt REAL, 
-            BatVolt_Spec_ID INTEGER,
-            semiPC TEXT,
-            SemiAssyMaxBatVolt REAL,
-            PRIMARY KEY (SNumber, SemiAssyStartTime),
-            FOREIGN KEY (SNumber) REFERENCES T_MASTER_DATA (SNumber)
-        );
-    """)
-    
-    # 7. T_ITEM_FW (Pass 컬럼 추가)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS T_ITEM_FW (
-            SNumber TEXT, FwStamp TEXT, FwPC TEXT, FwWrMAC TEXT, FwFile TEXT, FwPass TEXT,
-            PRIMARY KEY (SNumber, FwStamp),
-            FOREIGN KEY (SNumber) REFERENCES T_MASTER_DATA (SNumber)
-        );
-    """)
-    
-    # ✅ 기존 테이블에 FwPass 컬럼 추가 (없으면)
-    try:
-        cursor.execute("SELECT FwPass FROM T_ITEM_FW LIMIT 1")
-    except:
-        try:
-            cursor.execute("ALTER TABLE T_ITEM_FW ADD COLUMN FwPass TEXT")
-            conn.commit()
-            print("✅ T_ITEM_FW에 FwPass 컬럼 추가")
-        except Exception as e:
-            print(f"⚠️ FwPass 컬럼 추가 실패: {e}")
-    
-    # 8. T_ITEM_RFTX (Pass 컬럼 추가)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS T_ITEM_RFTX (
-            SNumber TEXT, RfTxStamp TEXT, RfTxPC TEXT, RfTxPower REAL, RfTxModul REAL, RfTxCFOD REAL, RfTxPass TEXT,
-            PRIMARY KEY (SNumber, RfTxStamp),
-            FOREIGN KEY (SNumber) REFERENCES T_MASTER_DATA (SNumber)
-        );
-    """)
-    
-    # ✅ 기존 테이블에 RfTxPass 컬럼 추가 (없으면)
-    try:
-        cursor.execute("SELECT RfTxPass FROM T_ITEM_RFTX LIMIT 1")
-    except:
-        try:
-            cursor.execute("ALTER TABLE T_ITEM_RFTX ADD COLUMN RfTxPass TEXT")
-            conn.commit()
-            print("✅ T_ITEM_RFTX에 RfTxPass 컬럼 추가")
-        except Exception as e:
-            print(f"⚠️ RfTxPass 컬럼 추가 실패: {e}")
-    
-    # 9. T_ITEM_BATADC (Pass 컬럼 추가)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS T_ITEM_BATADC (
-            SNumber TEXT, BatadcStamp TEXT, BatadcPC TEXT, BatadcBtVer TEXT, BatadcLevel REAL, 
-            BatadcVoiceTh REAL, BatadcVoiceLvl REAL, BatadcRssiRx REAL, BatadcRssiTx REAL, 
-            BatadcOffRaw1 REAL, BatadcOnBase REAL, BatadcOnDiff REAL, BatadcSar TEXT, BatadcPass TEXT,
-            PRIMARY KEY (SNumber, BatadcStamp),
-            FOREIGN KEY (SNumber) REFERENCES T_MASTER_DATA (SNumber)
-        );
-    """)
-    
-    # ✅ 기존 테이블에 BatadcPass 컬럼 추가 (없으면)
-    try:
-        cursor.execute("SELECT BatadcPass FROM T_ITEM_BATADC LIMIT 1")
-    except:
-        try:
-            cursor.execute("ALTER TABLE T_ITEM_BATADC ADD COLUMN BatadcPass TEXT")
-            conn.commit()
-            print("✅ T_ITEM_BATADC에 BatadcPass 컬럼 추가")
-        except Exception as e:
-            print(f"⚠️ BatadcPass 컬럼 추가 실패: {e}")
-    
-    conn.commit()
-
-def create_or_update_pc_info_streamlit(df_source, conn):
-    """T_PC_INFO 테이블을 생성 또는 업데이트합니다 (APPEND 모드)"""
-    PC_FIELD_MAP = {
-        'FwPC': 'FW', 'RfTxPC': 'RFTX', 'BatadcPC': 'BATADC'
-    }
-
-    pc_data = []
-
-    # pcbPC: PcbMaxIrPwr 값(100, 101, 102, 103)을 그대로 PC_ID로 사용
-    if 'PcbMaxIrPwr' in df_source.columns:
-        df_pcb_values = df_source[['PcbMaxIrPwr']].dropna().drop_duplicates()
-        for value in df_pcb_values['PcbMaxIrPwr']:
-            if isinstance(value, (int, float, np.float64)):
-                pc_id = str(int(value))
-                pc_data.append({'PC_ID': pc_id, 'PC_Type': 'PCB'})
-
-    # 기존 PC 코드 로직 (FwPC, RfTxPC, BatadcPC)
-    for col_name, item_prefix in PC_FIELD_MAP.items():
-        if col_name in df_source.columns:
-            unique_values = df_source[col_name].dropna().unique()
-            for value in unique_values:
-                pc_id = str(value)
-                pc_type = item_prefix
-                pc_data.append({'PC_ID': pc_id, 'PC_Type': pc_type})
-
-    if not pc_data:
-        return {'count': 0, 'message': "⚠️ T_PC_INFO: 추가할 PC 데이터가 없습니다."}
-
-    df_pc_info = pd.DataFrame(pc_data).drop_duplicates(subset=['PC_ID'])
-    
-    # 기존 PC_INFO 조회
-    try:
-        df_existing_pc = pd.read_sql("SELECT PC_ID FROM T_PC_INFO", conn)
-        if len(df_existing_pc) > 0:
-            df_new_pc = df_pc_info[~df_pc_info['PC_ID'].isin(df_existing_pc['PC_ID'])]
-            if len(df_new_pc) == 0:
-                return {'count': 0, 'message': "ℹ️ T_PC_INFO: 추가할 신규 PC 데이터가 없습니다."}
-            df_pc_info = df_new_pc
-    except:
-        pass
-    
-    df_pc_info.to_sql('T_PC_INFO', conn, if_exists='append', index=False)
-    return {'count': len(df_pc_info), 'message': f"✅ T_PC_INFO: {len(df_pc_info)}행 추가"}
-
-def extract_and_save_spec_streamlit(df_source, prefix, items_map, spec_table_name, conn):
-    """Min/Max 추출 및 Spec 테이블 저장 (REPLACE 모드)"""
-    all_spec_data = []
-    
-    for item_name, (min_col_suffix, max_col_suffix) in items_map.items():
-        min_col = f'{prefix}{min_col_suffix}{item_name}' 
-        max_col = f'{prefix}{max_col_suffix}{item_name}'
-        
-        if min_col not in df_source.columns or max_col not in df_source.columns:
-            continue
-            
-        df_temp = df_source.dropna(subset=[min_col, max_col]).copy()
-        if len(df_temp) == 0:
-            continue
-            
-        unique_specs = df_temp[[min_col, max_col]].drop_duplicates()
-        unique_specs['Spec_Key'] = unique_specs.apply(
-            lambda row: f"{item_name}_{row[min_col]}_{row[max_col]}", axis=1
-        )
-
-        for index, row in unique_specs.iterrows():
-            all_spec_data.append({
-                'Measure_Item': item_name, 
-                'Min_Value': row[min_col], 
-                'Max_Value': row[max_col], 
-                'Spec_Key': row['Spec_Key'], 
-                'Start_Date': '2025-01-01'
-            })
-            
-    if not all_spec_data:
-        return {'count': 0, 'message': f"⚠️ {spec_table_name}: 저장할 고유 Min/Max 조합을 찾을 수 없습니다."}
-
-    df_spec = pd.DataFrame(all_spec_data).drop_duplicates(subset=['Spec_Key'])
-    df_spec['Spec_ID'] = range(1, len(df_spec) + 1)
-    df_spec = df_spec[['Spec_ID', 'Measure_Item', 'Min_Value', 'Max_Value', 'Start_Date', 'Spec_Key']]
-    
-    df_spec.to_sql(spec_table_name, conn, if_exists='replace', index=False)
-    return {'count': len(df_spec), 'message': f"✅ {spec_table_name}: {len(df_spec)}행 저장 (REPLACE)"}
-
-def process_and_save_csv_to_db(df_original, db_file_name):
-    """CSV 데이터를 처리하여 DB에 저장합니다. (APPEND 모드)"""
-    log_messages = []
-    stats = {}
-    
-    try:
-        # 1. DB 연결 및 스키마 생성
-        conn = sqlite3.connect(db_file_name)
-        cursor = conn.cursor()
-        
-        # 스키마가 없으면 생성
-        create_initial_db_schema(cursor, conn)
-        
-        cursor.execute("PRAGMA foreign_keys = ON;")
-        log_messages.append("✅ DB 연결 및 스키마 확인 성공")
-        
-        # 2. 날짜 컬럼 변환
-        DATE_COLUMNS_TO_CONVERT = [
-            'Stamp', 'SemiAssyStartTime', 'SemiAssyStopTime', 'PcbStartTime', 'PcbStopTime', 
-            'FwStamp', 'BatStamp', 'RfTxStamp', 'BatadcStamp'
-        ]
-        df_original = transform_datetime_columns(df_original, DATE_COLUMNS_TO_CONVERT)
-        log_messages.append("✅ 날짜 컬럼 변환 완료")
-        
-        # 3. WEEK_NO 계산
-        df_original['WEEK_NO'] = df_original['Stamp'].apply(calculate_week_number)
-        log_messages.append("✅ WEEK_NO 계산 완료")
-        
-        # 4. pcbPC 컬럼 생성
-        if 'PcbMaxIrPwr' in df_original.columns:
-            df_original['pcbPC'] = df_original['PcbMaxIrPwr'].apply(
-                lambda x: str(int(x)) if pd.notna(x) and isinstance(x, (int, float, np.float64)) else None
-            )
-            log_messages.append("✅ pcbPC 컬럼 생성 완료")
-        else:
-            df_original['pcbPC'] = None
-            log_messages.append("⚠️ PcbMaxIrPwr 컬럼 없음 - pcbPC는 NULL")
-        
-        # 5. semiPC는 NULL
-        df_original['semiPC'] = None
-        
-        # ✅ 6. T_MASTER_DATA 저장 (Pass 제거 - SNumber, ICount, Stamp, WEEK_NO만)
-        # MASTER_COLUMNS = ['SNumber', 'ICount', 'Stamp', 'WEEK_NO']
-        MASTER_COLUMNS = ['SNumber', 'ICount', 'Stamp', 'FwPass', 'BatPass', 'RfTxPass', 'PcbPass', 'SemiAssyPass', 'BatadcPass', 'WEEK_NO']
-
-        df_master = df_original.dropna(subset=['SNumber']).copy()
-        df_master = df_master[MASTER_COLUMNS].drop_duplicates(subset=['SNumber'])
-        
-        # 기존 SNumber 확인 후 신규만 추가
-        try:
-            existing_snumbers = pd.read_sql("SELECT SNumber FROM T_MASTER_DATA", conn)
-        except:
-            existing_snumbers = pd.DataFrame(columns=['SNumber'])
-        
-        df_master_new = df_master[~df_master['SNumber'].isin(existing_snumbers['SNumber'])]
-        
-        if len(df_master_new) > 0:
-            df_master_new.to_sql('T_MASTER_DATA', conn, if_exists='append', index=False)
-            stats['master'] = len(df_master_new)
-            log_messages.append(f"✅ T_MASTER_DATA: {len(df_master_new)}행 추가")
-        else:
-            stats['master'] = 0
-            log_messages.append("ℹ️ T_MASTER_DATA: 신규 데이터 없음")
-        
-        # ✅ 7. T_ITEM_PCB 저장 (PcbPass 포함)
-        PCB_VALUE_COLUMNS = ['SNumber', 'PcbStartTime', 'PcbStopTime', 'PcbPass', 'PcbSleepCurr', 'PcbBatVolt', 'PcbIrCurr', 'PcbIrPwr', 'PcbWirelessVolt', 'PcbUsbCurr', 'PcbWirelessUsbVolt', 'PcbLed', 'pcbPC', 'PcbMaxIrPwr']
-        
-        df_pcb = df_original.dropna(subset=['SNumber', 'PcbStartTime']).copy()
-        
-        # ✅ PcbPass 컬럼 추가 (CSV에서 가져오기)
-        if 'PcbPass' in df_pcb.columns:
-            df_pcb['PcbPass'] = df_pcb['PcbPass'].astype(str).str.lower().replace({'nan': None, 'none': None})
-        else:
-            df_pcb['PcbPass'] = None
-            log_messages.append("⚠️ CSV에 PcbPass 컬럼 없음 - NULL로 저장")
-        
-        if len(df_pcb) > 0:
-            try:
-                existing_pcb = pd.read_sql("SELECT SNumber, PcbStartTime FROM T_ITEM_PCB", conn)
-            except:
-                existing_pcb = pd.DataFrame(columns=['SNumber', 'PcbStartTime'])
-            
-            if len(existing_pcb) > 0:
-                df_pcb = df_pcb.merge(existing_pcb, on=['SNumber', 'PcbStartTime'], how='left', indicator=True)
-                df_pcb_new = df_pcb[df_pcb['_merge'] == 'left_only'].drop(columns=['_merge'])
-            else:
-                df_pcb_new = df_pcb
-            
-            df_pcb_new = df_pcb_new.drop_duplicates(subset=['SNumber', 'PcbStartTime'], keep='first')
-            
-            if len(df_pcb_new) > 0:
-                df_pcb_new[PCB_VALUE_COLUMNS].to_sql('T_ITEM_PCB', conn, if_exists='append', index=False)
-                stats['pcb'] = len(df_pcb_new)
-                log_messages.append(f"✅ T_ITEM_PCB: {len(df_pcb_new)}행 추가")
-            else:
-                stats['pcb'] = 0
-                log_messages.append("ℹ️ T_ITEM_PCB: 신규 데이터 없음")
-        else:
-            stats['pcb'] = 0
-            log_messages.append("⚠️ T_ITEM_PCB: 데이터 없음")
-        
-        # ✅ 8. T_ITEM_SEMI 저장 (SemiAssyPass 포함)
-        SEMI_VALUE_COLUMNS = ['SNumber', 'SemiAssyStartTime', 'SemiAssyStopTime', 'SemiAssyPass', 'SemiAssyBatVolt', 'SemiAssySolarVolt', 'semiPC']
-        df_semi = df_original.dropna(subset=['SNumber', 'SemiAssyStartTime']).copy()
-        
-        # ✅ SemiAssyPass 컬럼 추가
-        if 'SemiAssyPass' in df_semi.columns:
-            df_semi['SemiAssyPass'] = df_semi['SemiAssyPass'].astype(str).str.lower().replace({'nan': None, 'none': None})
-        else:
-            df_semi['SemiAssyPass'] = None
-            log_messages.append("⚠️ CSV에 SemiAssyPass 컬럼 없음 - NULL로 저장")
-        
-        if len(df_semi) > 0:
-            try:
-                existing_semi = pd.read_sql("SELECT SNumber, SemiAssyStartTime FROM T_ITEM_SEMI", conn)
-            except:
-                existing_semi = pd.DataFrame(columns=['SNumber', 'SemiAssyStartTime'])
-            
-            df_semi = df_semi.merge(existing_semi, on=['SNumber', 'SemiAssyStartTime'], how='left', indicator=True)
-            df_semi_new = df_semi[df_semi['_merge'] == 'left_only'].drop(columns=['_merge'])
-            
-            if len(df_semi_new) > 0:
-                df_semi_new[SEMI_VALUE_COLUMNS].to_sql('T_ITEM_SEMI', conn, if_exists='append', index=False)
-                stats['semi'] = len(df_semi_new)
-                log_messages.append(f"✅ T_ITEM_SEMI: {len(df_semi_new)}행 추가")
-            else:
-                stats['semi'] = 0
-                log_messages.append("ℹ️ T_ITEM_SEMI: 신규 데이터 없음")
-        else:
-            stats['semi'] = 0
-            log_messages.append("⚠️ T_ITEM_SEMI: 데이터 없음")
-        
-        # ✅ 9. T_ITEM_FW 저장 (FwPass 포함)
-        FW_COLUMNS = ['SNumber', 'FwStamp', 'FwPC', 'FwWrMAC', 'FwFile', 'FwPass']
-        df_fw = df_original.dropna(subset=['SNumber', 'FwStamp']).copy()
-        
-        if 'FwPass' in df_fw.columns:
-            df_fw['FwPass'] = df_fw['FwPass'].astype(str).str.lower().replace({'nan': None, 'none': None})
-        else:
-            df_fw['FwPass'] = None
-        
-        if len(df_fw) > 0:
-            try:
-                existing_fw = pd.read_sql("SELECT SNumber, FwStamp FROM T_ITEM_FW", conn)
-            except:
-                existing_fw = pd.DataFrame(columns=['SNumber', 'FwStamp'])
-            
-            if len(existing_fw) > 0:
-                df_fw = df_fw.merge(existing_fw, on=['SNumber', 'FwStamp'], how='left', indicator=True)
-                df_fw_new = df_fw[df_fw['_merge'] == 'left_only'].drop(columns=['_merge'])
-            else:
-                df_fw_new = df_fw
-            
-            df_fw_new = df_fw_new.drop_duplicates(subset=['SNumber', 'FwStamp'], keep='first')
-            
-            if len(df_fw_new) > 0:
-                df_fw_new[FW_COLUMNS].to_sql('T_ITEM_FW', conn, if_exists='append', index=False)
-                stats['fw'] = len(df_fw_new)
-                log_messages.append(f"✅ T_ITEM_FW: {len(df_fw_new)}행 추가")
-            else:
-                stats['fw'] = 0
-                log_messages.append("ℹ️ T_ITEM_FW: 신규 데이터 없음")
-        else:
-            stats['fw'] = 0
-            log_messages.append("⚠️ T_ITEM_FW: 데이터 없음")
-        
-        # ✅ 10. T_ITEM_RFTX 저장 (RfTxPass 포함)
-        RFTX_COLUMNS = ['SNumber', 'RfTxStamp', 'RfTxPC', 'RfTxPower', 'RfTxModul', 'RfTxCFOD', 'RfTxPass']
-        df_rftx = df_original.dropna(subset=['SNumber', 'RfTxStamp']).copy()
-        
-        if 'RfTxPass' in df_rftx.columns:
-            df_rftx['RfTxPass'] = df_rftx['RfTxPass'].astype(str).str.lower().replace({'nan': None, 'none': None})
-        else:
-            df_rftx['RfTxPass'] = None
-        
-        if len(df_rftx) > 0:
-            try:
-                existing_rftx = pd.read_sql("SELECT SNumber, RfTxStamp FROM T_ITEM_RFTX", conn)
-            except:
-                existing_rftx = pd.DataFrame(columns=['SNumber', 'RfTxStamp'])
-            
-            if len(existing_rftx) > 0:
-                df_rftx = df_rftx.merge(existing_rftx, on=['SNumber', 'RfTxStamp'], how='left', indicator=True)
-                df_rftx_new = df_rftx[df_rftx['_merge'] == 'left_only'].drop(columns=['_merge'])
-            else:
-                df_rftx_new = df_rftx
-            
-            df_rftx_new = df_rftx_new.drop_duplicates(subset=['SNumber', 'RfTxStamp'], keep='first')
-            
-            if len(df_rftx_new) > 0:
-                df_rftx_new[RFTX_COLUMNS].to_sql('T_ITEM_RFTX', conn, if_exists='append', index=False)
-                stats['rftx'] = len(df_rftx_new)
-                log_messages.append(f"✅ T_ITEM_RFTX: {len(df_rftx_new)}행 추가")
-            else:
-                stats['rftx'] = 0
-                log_messages.append("ℹ️ T_ITEM_RFTX: 신규 데이터 없음")
-        else:
-            stats['rftx'] = 0
-            log_messages.append("⚠️ T_ITEM_RFTX: 데이터 없음")
-        
-        # ✅ 11. T_ITEM_BATADC 저장 (BatadcPass 포함)
-        BATADC_COLUMNS = ['SNumber', 'BatadcStamp', 'BatadcPC', 'BatadcBtVer', 'BatadcLevel', 'BatadcVoiceTh', 'BatadcVoiceLvl', 'BatadcRssiRx', 'BatadcRssiTx', 'BatadcOffRaw1', 'BatadcOnBase', 'BatadcOnDiff', 'BatadcSar', 'BatadcPass']
-        df_batadc = df_original.dropna(subset=['SNumber', 'BatadcStamp']).copy()
-        
-        if 'BatadcPass' in df_batadc.columns:
-            df_batadc['BatadcPass'] = df_batadc['BatadcPass'].astype(str).str.lower().replace({'nan': None, 'none': None})
-        else:
-            df_batadc['BatadcPass'] = None
-        
-        if len(df_batadc) > 0:
-            try:
-                existing_batadc = pd.read_sql("SELECT SNumber, BatadcStamp FROM T_ITEM_BATADC", conn)
-            except:
-                existing_batadc = pd.DataFrame(columns=['SNumber', 'BatadcStamp'])
-            
-            if len(existing_batadc) > 0:
-                df_batadc = df_batadc.merge(existing_batadc, on=['SNumber', 'BatadcStamp'], how='left', indicator=True)
-                df_batadc_new = df_batadc[df_batadc['_merge'] == 'left_only'].drop(columns=['_merge'])
-            else:
-                df_batadc_new = df_batadc
-            
-            df_batadc_new = df_batadc_new.drop_duplicates(subset=['SNumber', 'BatadcStamp'], keep='first')
-            
-            if len(df_batadc_new) > 0:
-                df_batadc_new[BATADC_COLUMNS].to_sql('T_ITEM_BATADC', conn, if_exists='append', index=False)
-                stats['batadc'] = len(df_batadc_new)
-                log_messages.append(f"✅ T_ITEM_BATADC: {len(df_batadc_new)}행 추가")
-            else:
-                stats['batadc'] = 0
-                log_messages.append("ℹ️ T_ITEM_BATADC: 신규 데이터 없음")
-        else:
-            stats['batadc'] = 0
-            log_messages.append("⚠️ T_ITEM_BATADC: 데이터 없음")
-        
-        # 12. T_PC_INFO 저장
-        log_messages.append("\n📋 T_PC_INFO 테이블 생성/업데이트 시작...")
-        pc_info_result = create_or_update_pc_info_streamlit(df_original, conn)
-        stats['pc_info'] = pc_info_result['count']
-        log_messages.append(pc_info_result['message'])
-        
-        # 13. T_SPEC_PCB 저장
-        PCB_ITEMS_MAP = {
-            'SleepCurr': ('Min', 'Max'), 
-            'BatVolt': ('Min', 'Max'), 
-            'IrCurr': ('Min', 'Max'), 
-            'IrPwr': ('Min', 'Max'), 
-            'WirelessVolt': ('Min', 'Max'), 
-            'UsbCurr': ('Min', 'Max'), 
-            'WirelessUsbVolt': ('Min', 'Max'), 
-            'Led': ('Min', 'Max')
-        }
-        spec_pcb_result = extract_and_save_spec_streamlit(df_original, 'Pcb', PCB_ITEMS_MAP, 'T_SPEC_PCB', conn)
-        stats['spec_pcb'] = spec_pcb_result['count']
-        log_messages.append(spec_pcb_result['message'])
-        
-        # 14. T_SPEC_SEMI 저장
-        SEMI_ITEMS_MAP = {
-            'BatVolt': ('Min', 'Max'), 
-            'SolarVolt': ('Min', 'Max')
-        }
-        spec_semi_result = extract_and_save_spec_streamlit(df_original, 'SemiAssy', SEMI_ITEMS_MAP, 'T_SPEC_SEMI', conn)
-        stats['spec_semi'] = spec_semi_result['count']
-        log_messages.append(spec_semi_result['message'])
-        
-        conn.commit()
-        conn.close()
-        log_messages.append("\n✅ DB 저장 완료")
-        
-        return {
-            'success': True,
-            'stats': stats,
-            'log': '\n'.join(log_messages)
-        }
-        
-    except Exception as e:
-        return {
-            'success': False,
-            'error': str(e),
-            'log': '\n'.join(log_messages)
-        }
+from db_ingest import (
+    process_and_save_csv_stream_to_db, compute_source_key, delete_weeks_from_db, INGEST_CHUNK_ROWS
+)
+from quality_core.queries import DATE_COLUMN_MAP, ITEM_OPTIONS, get_query_and_columns
+from quality_core.readers import spool_to_temp_file
+from quality_core.reports import REPORT_DIR
+from quality_core.metadata import MEASURE_ITEMS_MAP, count_week_rows, db_file_signature, load_db_metadata, load_week_counts
+from st_diagnostics import render_diagnostics
+from st_tables import render_failure_table, style_failures
+import job_runner
+from job_runner import JobRunner
+from profiling import PROFILE_LOG_PATH, run_profiled, summarize_spans
+from lazy_imports import import_times, lazy_module, mark_startup, record_import_time
+import spc_stats
+import traceability
+
+# 기능 모듈 (지연 import): 기간 분석(duckdb 포함)과 Parquet 미러 관리는 해당 화면/버튼에서 처음 사용할 때 import합니다.
+# 사이드바에 필요한 모듈(pandas, DB 메타데이터, 적재 함수)만 위에서 import하여 첫 화면을 빠르게 띄웁니다.
+analysis_core = lazy_module('quality_core.analysis')
+parquet_mirror = lazy_module('parquet_mirror')
+record_import_time('streamlit_app', time.perf_counter() - _IMPORT_STARTED)
 
 # ==========================================================
 # 1. 핵심 DB 및 쿼리 정의 함수
 # ==========================================================
 
+@st.cache_resource(show_spinner=False)
+def get_storage(db_name):
+    """DB 이름(SQLite 경로 또는 mysql:// 주소)별 저장소 - 프로세스에서 1개를 만들어 세션/재실행 간에 공유합니다. (MySQL 연결 풀 재사용)"""
+    return open_storage(db_name)
+
 def get_db_connection(db_name):
     """DB 연결을 새로 열어 반환합니다 (스레드 오류 방지)."""
     if not os.path.exists(db_name):
@@ -617,192 +60,48 @@ def get_db_connection(db_name):
     # ⚠️ 스레딩 문제 해결: 연결 객체는 스레드 내에서 생성되어야 함
     return sqlite3.connect(db_name)
 
-@st.cache_data
-def get_pc_info_list(_conn): 
-    """T_PC_INFO 테이블에서 PC_ID 목록을 로드하여 캐싱합니다."""
-    try:
-        df_pc = pd.read_sql_query("SELECT PC_ID FROM T_PC_INFO ORDER BY PC_ID", _conn)
-        pc_list = df_pc['PC_ID'].tolist()
-        return ['전체'] + pc_list
-    except Exception as e:
-        # T_PC_INFO가 없으면 T_MASTER_DATA에서 추출
-        try:
-            df_pc = pd.read_sql_query("SELECT DISTINCT PC_ID FROM T_MASTER_DATA WHERE PC_ID IS NOT NULL ORDER BY PC_ID", _conn)
-            pc_list = df_pc['PC_ID'].tolist()
-            return ['전체'] + pc_list
-        except:
-            st.warning(f"⚠️ PC 목록 로드 실패: {str(e)}")
-            return ['전체']
-
-
-
-def get_query_and_columns(item_key, date_col, pc_id):
-    """SQL 쿼리 템플릿을 생성하고 마스터 패스 필드를 반환합니다. (T_ITEM 테이블 사용)"""
-    item_key = item_key.lower()
-    
-    # ✅✅✅ FW 쿼리 (677~692줄)
-    if item_key == 'fw':
-        fw_pc_filter = ""
-        if pc_id and pc_id != '전체':
-            fw_pc_filter = f" AND T1.FwPC = '{pc_id.replace(chr(39), chr(39)+chr(39))}'"
-        
-        query_template = f"""
-        SELECT T1.SNumber, T1.{date_col} AS StartTime, 'FileCheck' AS Measure_Item, T1.FwFile AS Test_Value, 
-               NULL AS MinLimit, NULL AS MaxLimit,
-            CASE 
-                WHEN T1.FwPass = 'o' OR T1.FwPass = 'O' THEN 'Pass'
-                WHEN T1.FwPass = 'x' OR T1.FwPass = 'X' THEN '미달'
-                WHEN T1.FwPass IS NULL OR T1.FwPass = '' OR T1.FwPass = 'None' OR T1.FwPass = 'nan' THEN '제외'
-                ELSE '제외'
-            END AS Spec_Result_Detail
-        FROM T_ITEM_FW AS T1
-        WHERE T1.{date_col} BETWEEN ? AND ? AND T1.FwFile LIKE ? {fw_pc_filter} LIMIT ?;
-        """
-        master_pass_field = 'FwPass'
-        return query_template, master_pass_field
-
-    # ✅✅✅ RFTX 쿼리 (694~712줄)
-    elif item_key == 'rftx':
-        rftx_pc_filter = ""
-        if pc_id and pc_id != '전체':
-            rftx_pc_filter = f" AND T1.RfTxPC = '{pc_id.replace(chr(39), chr(39)+chr(39))}'"
-        
-        query_template = f"""
-        SELECT U.SNumber, U.{date_col} AS StartTime, U.Measure_Item, U.Test_Value, 
-               NULL AS MinLimit, NULL AS MaxLimit,
-            CASE 
-                WHEN U.RfTxPass = 'o' OR U.RfTxPass = 'O' THEN 'Pass'
-                WHEN U.RfTxPass = 'x' OR U.RfTxPass = 'X' THEN '미달'
-                WHEN U.RfTxPass IS NULL OR U.RfTxPass = '' OR U.RfTxPass = 'None' OR U.RfTxPass = 'nan' THEN '제외'
-                ELSE '제외'
-            END AS Spec_Result_Detail
-        FROM (
-            SELECT T1.SNumber, T1.{date_col}, T1.RfTxPower AS Test_Value, 'Power' AS Measure_Item, T1.RfTxPass FROM T_ITEM_RFTX AS T1 WHERE 1=1 {rftx_pc_filter}
-            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.RfTxModul AS Test_Value, 'Modul' AS Measure_Item, T1.RfTxPass FROM T_ITEM_RFTX AS T1 WHERE 1=1 {rftx_pc_filter}
-            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.RfTxCFOD AS Test_Value, 'CFOD' AS Measure_Item, T1.RfTxPass FROM T_ITEM_RFTX AS T1 WHERE 1=1 {rftx_pc_filter}
-        ) AS U
-        WHERE U.{date_col} BETWEEN ? AND ? AND U.Measure_Item LIKE ? LIMIT ?;
-        """
-        master_pass_field = 'RfTxPass'
-        return query_template, master_pass_field
-
-    # ✅✅✅ BATADC 쿼리 (714~733줄)
-    elif item_key == 'batadc':
-        batadc_pc_filter = ""
-        if pc_id and pc_id != '전체':
-            batadc_pc_filter = f" AND T1.BatadcPC = '{pc_id.replace(chr(39), chr(39)+chr(39))}'"
-        
-        query_template = f"""
-        SELECT U.SNumber, U.{date_col} AS StartTime, U.Measure_Item, U.Test_Value, 
-               NULL AS MinLimit, NULL AS MaxLimit,
-            CASE 
-                WHEN U.BatadcPass = 'o' OR U.BatadcPass = 'O' THEN 'Pass'
-                WHEN U.BatadcPass = 'x' OR U.BatadcPass = 'X' THEN '미달'
-                WHEN U.BatadcPass IS NULL OR U.BatadcPass = '' OR U.BatadcPass = 'None' OR U.BatadcPass = 'nan' THEN '제외'
-                ELSE '제외'
-            END AS Spec_Result_Detail
-        FROM (
-            SELECT T1.SNumber, T1.{date_col}, T1.BatadcLevel AS Test_Value, 'Level' AS Measure_Item, T1.BatadcPass FROM T_ITEM_BATADC AS T1 WHERE 1=1 {batadc_pc_filter}
-            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.BatadcVoiceTh AS Test_Value, 'VoiceTh' AS Measure_Item, T1.BatadcPass FROM T_ITEM_BATADC AS T1 WHERE 1=1 {batadc_pc_filter}
-        ) AS U
-        WHERE U.{date_col} BETWEEN ? AND ? AND U.Measure_Item LIKE ? LIMIT ?;
-        """
-        master_pass_field = 'BatadcPass'
-        return query_template, master_pass_field
-
-    # ✅✅✅ SEMI 쿼리 (735~756줄)
-    elif item_key == 'semi':
-        query_template = f"""
-        SELECT U.SNumber, U.{date_col} AS StartTime, U.Measure_Item, U.Test_Value, 
-               S.Min_Value AS MinLimit, S.Max_Value AS MaxLimit,
-            CASE 
-                WHEN U.SemiAssyPass = 'o' OR U.SemiAssyPass = 'O' THEN 'Pass'
-                WHEN U.SemiAssyPass = 'x' OR U.SemiAssyPass = 'X' THEN (
-                    CASE
-                        WHEN U.Test_Value IS NULL OR U.Test_Value = 0.0 THEN '제외'
-                        WHEN S.Min_Value IS NULL AND S.Max_Value IS NULL THEN '제외'
-                        WHEN U.Test_Value < S.Min_Value THEN '미달'
-                        WHEN U.Test_Value > S.Max_Value THEN '초과'
-                        ELSE '제외'
-                    END
-                )
-                WHEN U.SemiAssyPass IS NULL OR U.SemiAssyPass = '' OR U.SemiAssyPass = 'None' OR U.SemiAssyPass = 'nan' THEN '제외'
-                ELSE '제외'
-            END AS Spec_Result_Detail
-        FROM (
-            SELECT T1.SNumber, T1.{date_col}, T1.SemiAssyBatVolt AS Test_Value, 'BatVolt' AS Measure_Item, T1.SemiAssyPass FROM T_ITEM_SEMI AS T1
-            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.SemiAssySolarVolt AS Test_Value, 'SolarVolt' AS Measure_Item, T1.SemiAssyPass FROM T_ITEM_SEMI AS T1
-        ) AS U
-        LEFT JOIN T_SPEC_SEMI AS S ON U.Measure_Item = S.Measure_Item
-        WHERE U.{date_col} BETWEEN ? AND ? AND U.Measure_Item LIKE ? LIMIT ?;
-        """
-        master_pass_field = 'SemiAssyPass'
-        return query_template, master_pass_field
-        
-    # ✅✅✅ PCB 쿼리 (758~795줄)
-    elif item_key == 'pcb':
-        pcb_pc_filter = ""
-        if pc_id and pc_id != '전체':
-            pcb_pc_filter = f" WHERE T1.pcbPC = '{pc_id.replace(chr(39), chr(39)+chr(39))}'"
-        
-        query_template = f"""
-        SELECT 
-            U.SNumber, U.{date_col} AS StartTime, U.Measure_Item, U.Test_Value, 
-            S.Min_Value AS MinLimit, S.Max_Value AS MaxLimit,
-            CASE 
-                WHEN U.PcbPass = 'o' OR U.PcbPass = 'O' THEN 'Pass'
-                WHEN U.PcbPass = 'x' OR U.PcbPass = 'X' THEN (
-                    CASE
-                        WHEN U.Test_Value IS NULL OR U.Test_Value = 0.0 THEN '제외'
-                        WHEN S.Min_Value IS NULL AND S.Max_Value IS NULL THEN '제외'
-                        WHEN U.Test_Value < S.Min_Value THEN '미달'
-                        WHEN U.Test_Value > S.Max_Value THEN '초과'
-                        ELSE '제외'
-                    END
-                )
-                WHEN U.PcbPass IS NULL OR U.PcbPass = '' OR U.PcbPass = 'None' OR U.PcbPass = 'nan' THEN '제외'
-                ELSE '제외'
-            END AS Spec_Result_Detail
-        FROM (
-            SELECT T1.SNumber, T1.{date_col}, T1.PcbSleepCurr AS Test_Value, 'SleepCurr' AS Measure_Item, T1.SleepCurr_Spec_ID AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
-            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbBatVolt AS Test_Value, 'BatVolt' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
-            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbIrCurr AS Test_Value, 'IrCurr' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
-            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbIrPwr AS Test_Value, 'IrPwr' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
-            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbWirelessVolt AS Test_Value, 'WirelessVolt' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
-            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbUsbCurr AS Test_Value, 'UsbCurr' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
-            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbWirelessUsbVolt AS Test_Value, 'WirelessUsbVolt' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
-            UNION ALL SELECT T1.SNumber, T1.{date_col}, T1.PcbLed AS Test_Value, 'Led' AS Measure_Item, NULL AS Spec_ID, T1.PcbPass FROM T_ITEM_PCB AS T1{pcb_pc_filter}
-        ) AS U
-        LEFT JOIN T_SPEC_PCB AS S 
-            ON (U.Spec_ID IS NOT NULL AND U.Spec_ID = S.Spec_ID AND U.Measure_Item = S.Measure_Item)
-            OR (U.Spec_ID IS NULL AND U.Measure_Item = S.Measure_Item)
-        WHERE 
-             U.{date_col} BETWEEN ? AND ?
-             AND U.Measure_Item LIKE ?
-        LIMIT ?;
-        """
-        master_pass_field = 'PcbPass'
-        return query_template, master_pass_field
+@st.cache_data(max_entries=4, show_spinner=False)
+def _load_db_metadata_cached(db_name, generation):
+    """DB 세대 번호별 메타데이터 (세대가 바뀌어야 다시 읽습니다)"""
+    with get_storage(db_name).connect() as conn:
+        return load_db_metadata(conn)
+
+def get_db_metadata(db_name=DB_FILE_NAME):
+    """
+    사이드바/삭제 화면/분석이 공유하는 DB 메타데이터 (PC 목록, 주차 목록, 품목별 기간, Spec 테이블)
+    DB 파일 서명이 직전과 같으면 SQLite에 접근하지 않고 session_state의 값을 반환합니다.
+    서명이 바뀌면 세대 번호만 읽고, 세대가 같으면(적재/삭제 없음) 캐시를 그대로 사용합니다.
+    파일 서명이 없는 서버 저장소(mysql://)는 매번 세대 번호만 읽습니다.
+    """
+    signature = db_file_signature(db_name)
+    cached = st.session_state.get('db_metadata')
+    if cached is not None and signature is not None and cached['db_name'] == db_name and cached['signature'] == signature:
+        return cached['metadata']
+
+    storage = get_storage(db_name)
+    if not storage.exists():
+        return None
+    generation = storage.generation()
+    metadata = _load_db_metadata_cached(db_name, generation)
+    st.session_state['db_metadata'] = {'db_name': db_name, 'signature': signature, 'metadata': metadata}
+    return metadata
 
-    else:
-        raise ValueError(f"지원되지 않는 항목: '{item_key}'")
+@st.cache_data(max_entries=4, show_spinner=False)
+def get_week_counts(db_name, generation):
+    """DB 세대 번호별 주차별 행 수 (삭제 화면 전용 - 품목 테이블 조인이라 사이드바 메타데이터와 분리)"""
+    with get_storage(db_name).connect() as conn:
+        return load_week_counts(conn)
 
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_table_preview(db_name, generation, table_name, rows):
+    """DB 테이블 미리보기 (DB 세대 번호별 캐시 - 미리보기를 연 채로 다른 위젯을 조작해도 다시 읽지 않습니다)"""
+    return get_storage(db_name).read_frame(f"SELECT * FROM {table_name} LIMIT {int(rows)}")
 
 
 # ----------------- Pandas 스타일링 함수 (불량 강조) -----------------
 def style_df_failure(df):
-    """Pandas DataFrame에서 '미달'/'초과'/'제외' 결과를 시각적으로 강조합니다."""
-    def highlight_failure(val):
-        if isinstance(val, str):
-            if '초과' in val or '미달' in val or val.lower() == 'x':
-                return 'background-color: #ffcccc; color: #cc0000' 
-            elif '제외' in val:
-                return 'background-color: #e0e0e0; color: #555555'
-            elif val.lower() == 'o' or val.lower() == 'pass':
-                return 'background-color: #ccffcc'
-        return ''
-    styled_df = df.style.applymap(highlight_failure)
-    return styled_df
+    """Pandas DataFrame에서 '미달'/'초과'/'제외' 결과를 시각적으로 강조합니다. (작은 표용 - 큰 표는 render_failure_table)"""
+    return style_failures(df)
 
 
 # ==========================================================
@@ -975,8 +274,61 @@ def style_df_failure(df):
 #     finally:
 #         if conn:
 #             conn.close()
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_defect_frame(db_name, generation, start_date_str, end_date_str, item_key, limit, pc_id, measure_item_filter):
+    """
+    불량 유형별 조회용 측정 행과 SNumber 가성/진성 분류 (DB 세대 번호 + 분석 조건별 캐시).
+    1차/2차 분류만 바꿔 다시 조회할 때는 SQLite를 다시 읽지 않고 이 결과를 필터링합니다.
+    조회 행은 DEFECT_DRILLDOWN_MAX_ROWS를 넘지 않습니다. (조회 행 제한 0 = 기간 분석만 제한 없음)
+    반환: (df_final, 유형 필터 전 행 수, 최대 행 수에서 잘렸는지 여부)
+    """
+    date_col = DATE_COLUMN_MAP.get(item_key, 'Stamp')
+    # ✅ get_query_and_columns 사용 (T_ITEM 테이블 기반)
+    SQL_STEP1_WITH_PC, master_pass_field = get_query_and_columns(item_key, date_col, pc_id)
+    
+    item_filter = '%%'
+    storage = get_storage(db_name)
+    row_cap = min(limit, DEFECT_DRILLDOWN_MAX_ROWS) if limit else DEFECT_DRILLDOWN_MAX_ROWS
+    params_step1 = (start_date_str, end_date_str, item_filter, row_cap)
+    df_filtered_all = storage.read_frame(SQL_STEP1_WITH_PC, params_step1)
+    capped = row_cap == DEFECT_DRILLDOWN_MAX_ROWS and len(df_filtered_all) >= row_cap
+    
+    # ✅ measure_item_filter 적용
+    before_filter = len(df_filtered_all)
+    if measure_item_filter != '전체':
+        df_filtered_all = df_filtered_all[df_filtered_all['Measure_Item'] == measure_item_filter]
+    if df_filtered_all.empty:
+        return df_filtered_all, before_filter, capped
+    
+    # ✅ 데이터 처리 (run_analysis와 동일)
+    df_final = df_filtered_all.copy()
+    df_final['Date_Only'] = df_final['StartTime'].str[:10]
+    
+    # ✅ SNumber별 Pass 여부 확인
+    snumber_pass_status = df_final[df_final['Spec_Result_Detail'] == 'Pass'].groupby('SNumber').size().reset_index(name='PassCount')
+    snumber_pass_status['Has_Pass'] = snumber_pass_status['PassCount'] > 0
+    df_final = pd.merge(df_final, snumber_pass_status[['SNumber', 'Has_Pass']], on='SNumber', how='left').fillna({'Has_Pass': False})
+    
+    # ✅ SNumber별 가성/진성 분류
+    snumber_classification = df_final.groupby('SNumber').agg({
+        'Has_Pass': 'first'
+    }).reset_index()
+    
+    snumber_classification['SNumber_Category'] = snumber_classification['Has_Pass'].apply(
+        lambda x: '가성불량' if x else '진성불량'
+    )
+    
+    df_final = pd.merge(df_final, snumber_classification[['SNumber', 'SNumber_Category']], on='SNumber', how='left')
+    
+    # ✅ Final_Failure_Category 결정 (Pass → Pass, 미달/초과/제외 → SNumber 분류, 그 외 → 판정값 그대로)
+    detail = df_final['Spec_Result_Detail']
+    df_final['Final_Failure_Category'] = np.where(
+        detail.isin(['미달', '초과', '제외']), df_final['SNumber_Category'], detail
+    )
+    return df_final, before_filter, capped
+
 def show_snumbers_by_defect_type(category_1st, category_2nd, analysis_params):
-    """불량 유형(1차/2차)에 따라 해당하는 SNumber 목록을 조회합니다."""
+    """불량 유형(1차/2차)에 따라 해당하는 SNumber 목록을 조회합니다. (조회 데이터는 load_defect_frame 캐시 사용)"""
     
     st.subheader(f"📋 조회 결과: {category_1st} → {category_2nd}")
     
@@ -993,65 +345,22 @@ def show_snumbers_by_defect_type(category_1st, category_2nd, analysis_params):
         item_key = item.lower()
         start_date_str = start_date.strftime('%Y-%m-%d 00:00:00')
         end_date_str = end_date.strftime('%Y-%m-%d 23:59:59')
-        date_col = DATE_COLUMN_MAP.get(item_key, 'Stamp')
         
         st.info(f"📊 조건: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')} | {item.upper()} | PC: {pc_id} | 유형: {measure_item_filter}")
         
-        conn = get_db_connection(DB_FILE_NAME)
-        
-        # ✅ get_query_and_columns 사용 (T_ITEM 테이블 기반)
-        SQL_STEP1_WITH_PC, master_pass_field = get_query_and_columns(item_key, date_col, pc_id)
-        
-        item_filter = '%%'
-        params_step1 = (start_date_str, end_date_str, item_filter, limit)
-        
         with st.spinner("데이터 추출 중..."):
-            df_filtered_all = pd.read_sql_query(SQL_STEP1_WITH_PC, conn, params=params_step1)
-            
-            # ✅ measure_item_filter 적용
-            if measure_item_filter != '전체':
-                before_filter = len(df_filtered_all)
-                df_filtered_all = df_filtered_all[df_filtered_all['Measure_Item'] == measure_item_filter]
-                after_filter = len(df_filtered_all)
-                st.info(f"✅ 유형 필터링: {before_filter}건 → {after_filter}건 (유형: {measure_item_filter})")
+            df_final, before_filter, capped = load_defect_frame(
+                DB_FILE_NAME, current_db_generation(), start_date_str, end_date_str, item_key, limit, pc_id, measure_item_filter
+            )
+        if capped:
+            st.warning(f"⚠️ 조회 행이 최대 {DEFECT_DRILLDOWN_MAX_ROWS:,}건으로 제한되었습니다. 기간을 줄이면 전체 행을 볼 수 있습니다.")
+        if measure_item_filter != '전체':
+            st.info(f"✅ 유형 필터링: {before_filter}건 → {len(df_final)}건 (유형: {measure_item_filter})")
         
-        if df_filtered_all.empty:
+        if df_final.empty:
             st.warning("⚠️ 해당 조건에 맞는 데이터가 없습니다.")
             return
         
-        # ✅ 데이터 처리 (run_analysis와 동일)
-        df_filtered_all['Date_Only'] = df_filtered_all['StartTime'].str[:10]
-        df_final = df_filtered_all.copy()
-        
-        # ✅ SNumber별 Pass 여부 확인
-        snumber_pass_status = df_final[df_final['Spec_Result_Detail'] == 'Pass'].groupby('SNumber').size().reset_index(name='PassCount')
-        snumber_pass_status['Has_Pass'] = snumber_pass_status['PassCount'] > 0
-        df_final = pd.merge(df_final, snumber_pass_status[['SNumber', 'Has_Pass']], on='SNumber', how='left').fillna({'Has_Pass': False})
-        
-        # ✅ SNumber별 가성/진성 분류
-        snumber_classification = df_final.groupby('SNumber').agg({
-            'Has_Pass': 'first'
-        }).reset_index()
-        
-        snumber_classification['SNumber_Category'] = snumber_classification['Has_Pass'].apply(
-            lambda x: '가성불량' if x else '진성불량'
-        )
-        
-        df_final = pd.merge(df_final, snumber_classification[['SNumber', 'SNumber_Category']], on='SNumber', how='left')
-        
-        # ✅ Final_Failure_Category 결정
-        def classify_failure_final(row):
-            detail = row['Spec_Result_Detail']
-            
-            if detail == 'Pass':
-                return 'Pass'
-            elif detail in ['미달', '초과', '제외']:
-                return row['SNumber_Category']
-            else:
-                return detail
-        
-        df_final['Final_Failure_Category'] = df_final.apply(classify_failure_final, axis=1)
-        
         # ✅ 필터링 (최종 1차/2차 분류 조건에 맞는 행만 남김)
         df_filtered = df_final[
             (df_final['Final_Failure_Category'] == category_1st) &
@@ -1077,8 +386,7 @@ def show_snumbers_by_defect_type(category_1st, category_2nd, analysis_params):
         # 날짜별로 그룹화하여 표시
         df_filtered['Date_Only'] = df_filtered['StartTime'].str[:10]
         
-        for date in sorted(df_filtered['Date_Only'].unique()):
-            df_date = df_filtered[df_filtered['Date_Only'] == date]
+        for date, df_date in df_filtered.groupby('Date_Only', sort=True):
             records_on_date = len(df_date)
             snumbers_on_date = df_date['SNumber'].unique().tolist()
             unique_count = len(snumbers_on_date)
@@ -1119,8 +427,8 @@ def show_snumbers_by_defect_type(category_1st, category_2nd, analysis_params):
                 # 번호 추가
                 df_display.insert(0, '번호', range(1, len(df_display) + 1))
                 
-                # 스타일 적용하여 표시
-                st.dataframe(style_df_failure(df_display), use_container_width=True, hide_index=True, height=400)
+                # 스타일 적용하여 표시 (보이는 페이지만 스타일링, '더 보기'로 확장)
+                render_failure_table(df_display, key=f"defect_table_{date}_{category_1st}_{category_2nd}")
                 
                 # 선택 가능한 selectbox 추가
                 selected_sn = st.selectbox(
@@ -1131,6 +439,8 @@ def show_snumbers_by_defect_type(category_1st, category_2nd, analysis_params):
                 
                 if st.button(f"상세 조회", key=f"detail_btn_{date}_{category_1st}_{category_2nd}"):
                     st.markdown("---")
+                    if conn is None:
+                        conn = get_db_connection(DB_FILE_NAME)
                     # ✅ 날짜 필터 전달
                     show_single_snumber_detail(
                         selected_sn, 
@@ -1171,7 +481,14 @@ def search_snumber(search_pattern, conn):
         return []
 
 
-def show_snumber_detail(snumber_input, item_key):
+@st.cache_data(max_entries=32, show_spinner=False)
+def find_snumbers(db_name, generation, search_pattern):
+    """SNumber 패턴 검색 결과 (DB 세대 번호 + 패턴별 캐시 - 다른 위젯을 조작해도 다시 검색하지 않습니다)"""
+    with get_storage(db_name).connect() as conn:
+        return search_snumber(search_pattern, conn)
+
+
+def show_snumber_detail(snumber_input, item_key, pc_id=None):
     """SNumber 상세 조회를 독립적으로 수행합니다."""
     if not snumber_input:
         st.info("⬆️ 위의 입력창에 조회할 SNumber를 입력하고 버튼을 누르세요.")
@@ -1184,7 +501,7 @@ def show_snumber_detail(snumber_input, item_key):
 
     try:
         # 1. 먼저 검색 수행
-        matching_snumbers = search_snumber(snumber_input, conn)
+        matching_snumbers = find_snumbers(DB_FILE_NAME, current_db_generation(), snumber_input)
         
         if not matching_snumbers:
             st.warning(f"⚠️ '{snumber_input}' 패턴과 일치하는 SNumber가 없습니다.")
@@ -1212,13 +529,13 @@ def show_snumber_detail(snumber_input, item_key):
             
             if st.button("선택한 SNumber 상세 조회", key="detail_from_selected"):
                 # show_single_snumber_detail(selected_snumber, item_key, conn)
-                show_single_snumber_detail(selected_snumber, item_key, conn, selected_pc_id)
+                show_single_snumber_detail(selected_snumber, item_key, conn, pc_id)
         
         # 3. 검색 결과가 1개인 경우 바로 상세 조회
         else:
             snumber_to_show = matching_snumbers[0]
             st.info(f"✅ 일치하는 SNumber: {snumber_to_show}")
-            show_single_snumber_detail(snumber_to_show, item_key, conn, selected_pc_id)
+            show_single_snumber_detail(snumber_to_show, item_key, conn, pc_id)
             
     except Exception as e:
         st.error(f"❌ 조회 중 오류 발생: {e}")
@@ -1337,120 +654,560 @@ def show_single_snumber_detail(snumber, item_key, conn, pc_id=None, start_date=N
         st.code(traceback.format_exc())
 
 
-# ==========================================================
-# STREAMLIT APP 실행 함수
-# ==========================================================
+@st.fragment
+def show_defect_query():
+    """
+    (fragment) 불량 유형별 SNumber 조회 탭. 분류 선택/조회/'더 보기'는 이 탭만 다시 실행하며,
+    조회 데이터는 분석 조건별로 캐시(load_defect_frame)하므로 분류만 바꿔 조회하면 SQLite를 다시 읽지 않습니다.
+    """
+    st.markdown("### 불량 분류별 SNumber 목록 조회")
+    st.info("💡 먼저 데이터 분석을 실행한 후에 이 기능을 사용하세요!")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        category_1st = st.selectbox(
+            "1차 분류 선택",
+            ["Pass", "가성불량", "진성불량"],
+            key="category_1st_select"
+        )
+    
+    with col2:
+        category_2nd = st.selectbox(
+            "2차 분류 선택",
+            ["Pass", "미달", "초과", "제외"],
+            key="category_2nd_select"
+        )
+    
+    with col3:
+        st.write("")  # 간격 조정
+        st.write("")  # 간격 조정
+        query_by_category_btn = st.button(
+            "🔍 조회", 
+            key="query_by_category_btn",
+            type="primary"
+        )
+    
+    # 불량 유형별 조회 실행
+    if query_by_category_btn:
+        if not st.session_state.get('analysis_executed', False):
+            st.warning("⚠️ 먼저 '데이터 분석 실행' 버튼을 눌러 데이터를 분석해주세요!")
+        else:
+            # session_state에 불량 조회 정보 저장
+            st.session_state['defect_query_executed'] = True
+            st.session_state['defect_category_1st'] = category_1st
+            st.session_state['defect_category_2nd'] = category_2nd
+    
+    # 불량 조회 결과 표시
+    defect_query_container = st.container()
+    with defect_query_container:
+        if st.session_state.get('defect_query_executed', False):
+            show_snumbers_by_defect_type(
+                st.session_state['defect_category_1st'],
+                st.session_state['defect_category_2nd'],
+                st.session_state['analysis_params']
+            )
 
-def run_analysis(start_date, end_date, item, limit, pc_id, measure_item_filter='전체'):
-    """데이터 분석을 실행합니다. (T_ITEM 테이블만 사용)"""
+
+@st.fragment
+def show_snumber_search(item_key, pc_id):
+    """
+    (fragment) SNumber 직접 검색 탭. 입력/검색/선택은 이 탭만 다시 실행하며, 검색 결과는 패턴별로 캐시(find_snumbers)합니다.
+    item_key / pc_id는 사이드바 값이므로 사이드바를 바꾸면(전체 재실행) 새 값으로 호출됩니다.
+    """
+    st.markdown("### SNumber 직접 검색")
+    st.markdown("""
+    **💡 검색 팁:**
+    - 전체 SNumber 입력: `THSRBN5901480USMJNYAH9226`
+    - 일부만 입력: `THSR`, `9226`, `BN590`
+    - 와일드카드 사용: `THSR*`, `*9226`, `*BN590*`
+    """)
     
-    conn = None
-    try:
-        item_key = item.lower()
-        limit = int(limit)
+    snumber_input_main = st.text_input(
+        "조회할 SNumber 입력 (일부만 입력해도 자동 검색)", 
+        value="", 
+        placeholder="예: THSR, *9226, THSRBN590*",
+        key="snumber_input_main"
+    )
+    
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        search_clicked = st.button("🔍 검색 및 상세 조회", key="detail_query_btn_main", type="secondary")
+    
+    # 검색/상세 조회 섹션 (독립된 컨테이너)
+    detail_container = st.container()
+    
+    with detail_container:
+        if search_clicked:
+            if snumber_input_main:
+                # session_state에 검색 실행 플래그 설정
+                st.session_state['search_executed'] = True
+                st.session_state['search_query'] = snumber_input_main
+            else:
+                st.warning("⚠️ SNumber를 입력해주세요.")
         
-        start_date_str = start_date.strftime('%Y-%m-%d 00:00:00')
-        end_date_str = end_date.strftime('%Y-%m-%d 23:59:59')
-        date_col = DATE_COLUMN_MAP.get(item_key, 'Stamp') 
+        # 검색이 실행되었으면 결과 표시
+        if st.session_state.get('search_executed', False):
+            show_snumber_detail(st.session_state['search_query'], item_key, pc_id)
 
-        conn = get_db_connection(DB_FILE_NAME) 
-        
-        # ✅ T_ITEM 테이블만 사용하는 쿼리
-        SQL_STEP1, master_pass_field = get_query_and_columns(item_key, date_col, pc_id) 
-        item_filter = '%%'
-        params_step1 = (start_date_str, end_date_str, item_filter, limit)
-        
-        st.info(f"조회 기간: **{start_date_str}** 부터 **{end_date_str}** 까지 | 항목: **{item.upper()}** | PC: **{pc_id}** | 유형: **{measure_item_filter}**")
 
-        # 2. 데이터 추출
-        with st.spinner("DB에서 데이터 추출 및 분류 중..."):
-            df_filtered_all = pd.read_sql_query(SQL_STEP1, conn, params=params_step1)
-            
-            # ✅ measure_item_filter 적용
-            if measure_item_filter != '전체':
-                before_filter = len(df_filtered_all)
-                df_filtered_all = df_filtered_all[df_filtered_all['Measure_Item'] == measure_item_filter]
-                after_filter = len(df_filtered_all)
-                st.info(f"✅ 유형 필터링: {before_filter}건 → {after_filter}건 (유형: {measure_item_filter})")
+@st.fragment
+def show_unit_traceability():
+    """(fragment) 공정별 최신 결과 조건(T_UNIT_STATUS)으로 SNumber를 찾고, 선택한 SNumber의 전체 공정 이력을 표시합니다."""
+    conn = get_db_connection(DB_FILE_NAME)
+    if conn is None:
+        st.warning("⚠️ DB 파일이 없습니다. 먼저 CSV를 업로드해 DB를 만드세요.")
+        return
 
-            # ❌ SQL_STEP2 완전 제거! (T_MASTER_DATA 사용 안 함)
-            
-        if df_filtered_all.empty:
-            st.warning("⚠️ 해당 기간에 조회된 데이터가 없습니다.")
+    try:
+        rebuilt = traceability.ensure_traceability(conn)
+        if rebuilt:
+            st.info(f"ℹ️ 기존 DB의 공정 이력 테이블({', '.join(rebuilt)})을 처음 계산했습니다.")
+
+        stage_labels = {key: traceability.STAGE_NAMES[key] for key in traceability.STAGE_KEYS}
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            passed = st.multiselect("최신 결과 PASS 공정", traceability.STAGE_KEYS, format_func=stage_labels.get, key="trace_passed")
+        with col2:
+            failed = st.multiselect("최신 결과 FAIL 공정", traceability.STAGE_KEYS, format_func=stage_labels.get, key="trace_failed")
+        with col3:
+            missing = st.multiselect("검사 이력 없는 공정", traceability.STAGE_KEYS, format_func=stage_labels.get, key="trace_missing")
+
+        today = datetime.now().date()
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            start_day = st.date_input("검사 시작일", value=today - timedelta(days=today.weekday()), key="trace_start")
+        with col2:
+            end_day = st.date_input("검사 종료일", value=today, key="trace_end")
+        with col3:
+            time_stage = st.selectbox(
+                "기간 기준 공정", [None] + traceability.STAGE_KEYS,
+                format_func=lambda key: "자동 (FAIL 공정 / 최근 검사)" if key is None else stage_labels[key],
+                key="trace_time_stage"
+            )
+        with col4:
+            limit = st.number_input("최대 조회 건수", min_value=100, max_value=100000, value=10000, step=1000, key="trace_limit")
+
+        if st.button("🧬 조건 조회", key="trace_query_btn", type="primary"):
+            started = time.perf_counter()
+            st.session_state['trace_result'] = traceability.find_units(
+                conn, passed=passed, failed=failed, missing=missing,
+                start=start_day.strftime('%Y-%m-%d 00:00:00'), end=end_day.strftime('%Y-%m-%d 23:59:59'),
+                time_stage=time_stage, limit=limit
+            )
+            st.session_state['trace_elapsed'] = time.perf_counter() - started
+
+        df_units = st.session_state.get('trace_result')
+        if df_units is None:
+            st.info("⬆️ 공정 조건과 기간을 선택하고 '조건 조회' 버튼을 누르세요. (예: PCB PASS + RfTx FAIL, 이번 주)")
+            return
+        if df_units.empty:
+            st.warning("⚠️ 조건에 맞는 SNumber가 없습니다.")
             return
 
+        st.success(f"✅ {len(df_units):,}건 조회 ({st.session_state['trace_elapsed']:.3f}초)")
+        df_view = df_units[['SNumber', 'Last_Time', 'WEEK_NO']].copy()
+        df_view.insert(1, '공정 흐름', [traceability.describe_flow(row) for row in df_units.to_dict('records')])
+        for _, name, _, _, _, _ in traceability.STAGES:
+            df_view[f'{name}_Time'] = df_units[f'{name}_Time']
+            df_view[f'{name}_Tests'] = df_units[f'{name}_Tests']
+        st.dataframe(df_view, use_container_width=True, hide_index=True, height=400)
+
+        selected = st.multiselect(
+            "공정 이력을 볼 SNumber 선택 (최대 20개)", df_units['SNumber'].tolist(), max_selections=20, key="trace_selected"
+        )
+        if selected:
+            df_history = traceability.unit_history(conn, selected)
+            st.dataframe(style_df_failure(df_history), use_container_width=True, hide_index=True)
     except Exception as e:
-        st.error(f"❌ 데이터 추출 오류: {e}")
-        import traceback
-        st.code(traceback.format_exc())
+        st.error(f"❌ 공정 이력 조회 중 오류 발생: {e}")
+    finally:
+        conn.close()
+
+
+@st.fragment
+def show_retest_metrics():
+    """(fragment) 공정별 재검사 지표(T_ATTEMPT_INDEX): 재검사율, 첫 시도 합격률, 다른 지그에서 재검사 후 합격 건수"""
+    conn = get_db_connection(DB_FILE_NAME)
+    if conn is None:
+        st.warning("⚠️ DB 파일이 없습니다. 먼저 CSV를 업로드해 DB를 만드세요.")
         return
+
+    try:
+        rebuilt = traceability.ensure_traceability(conn)
+        if rebuilt:
+            st.info(f"ℹ️ 기존 DB의 공정 이력 테이블({', '.join(rebuilt)})을 처음 계산했습니다.")
+
+        today = datetime.now().date()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            stage = st.selectbox("공정", traceability.STAGE_KEYS, format_func=traceability.STAGE_NAMES.get, key="retest_stage")
+        with col2:
+            start_day = st.date_input("최종 검사 시작일", value=today - timedelta(days=today.weekday()), key="retest_start")
+        with col3:
+            end_day = st.date_input("최종 검사 종료일", value=today, key="retest_end")
+        start = start_day.strftime('%Y-%m-%d 00:00:00')
+        end = end_day.strftime('%Y-%m-%d 23:59:59')
+
+        df_total = traceability.retest_summary(conn, stage, start, end)
+        if df_total.empty:
+            st.warning("⚠️ 해당 기간에 최종 검사된 SNumber가 없습니다.")
+            return
+
+        total = df_total.iloc[0]
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("SNumber", f"{int(total['Units']):,}", f"검사 {int(total['Attempts']):,}회", delta_color="off")
+        col2.metric("재검사율", f"{total['Retest_Rate']:.1%}", f"{int(total['Retested']):,}건", delta_color="off")
+        col3.metric("첫 시도 합격률 (FPY)", f"{total['FPY']:.1%}", f"최종 {total['Final_Yield']:.1%}", delta_color="off")
+        col4.metric("다른 지그에서 재검사 후 합격", f"{int(total['Passed_On_Other_Jig']):,}",
+                    f"재검사 후 합격 {int(total['Passed_On_Retry']):,}", delta_color="off")
+
+        st.markdown("##### 첫 시도 지그별")
+        st.dataframe(traceability.retest_summary(conn, stage, start, end, by_jig=True), use_container_width=True, hide_index=True)
+    except Exception as e:
+        st.error(f"❌ 재검사 지표 조회 중 오류 발생: {e}")
     finally:
-        if conn:
-            conn.close() 
+        conn.close()
 
-    # ✅✅✅ 3. 데이터 처리 및 가성/진성 분류
-    
-    df_filtered_all['Date_Only'] = df_filtered_all['StartTime'].str[:10]
-    df_final = df_filtered_all.copy()
-    
-    # ✅ SNumber별 Pass 여부 확인
-    snumber_pass_status = df_final[df_final['Spec_Result_Detail'] == 'Pass'].groupby('SNumber').size().reset_index(name='PassCount')
-    snumber_pass_status['Has_Pass'] = snumber_pass_status['PassCount'] > 0
-    df_final = pd.merge(df_final, snumber_pass_status[['SNumber', 'Has_Pass']], on='SNumber', how='left').fillna({'Has_Pass': False})
-    
-    # ✅ SNumber별 가성/진성 분류
-    snumber_classification = df_final.groupby('SNumber').agg({
-        'Has_Pass': 'first'
-    }).reset_index()
-    
-    snumber_classification['SNumber_Category'] = snumber_classification['Has_Pass'].apply(
-        lambda x: '가성불량' if x else '진성불량'
-    )
-    
-    df_final = pd.merge(df_final, snumber_classification[['SNumber', 'SNumber_Category']], on='SNumber', how='left')
-    
-    # ✅ 날짜별 집계
-    unique_dates = sorted(df_final['Date_Only'].unique())
-    
-    st.subheader(f"📈 {item.upper()} 항목 | 기간 ({len(unique_dates)}일) 상세 분석")
 
-    for date_only in unique_dates:
-        df_day = df_final[df_final['Date_Only'] == date_only].copy()
+@st.fragment
+def show_spc_metrics():
+    """(fragment) 측정 항목별 공정능력(Cp / Cpk)과 X-bar 관리도 - 적재 시 계산해 둔 T_SPC_MOMENTS 셀을 합쳐 계산합니다."""
+    conn = get_db_connection(DB_FILE_NAME)
+    if conn is None:
+        st.warning("⚠️ DB 파일이 없습니다. 먼저 CSV를 업로드해 DB를 만드세요.")
+        return
 
-        # ✅ Final_Failure_Category 결정
-        def classify_failure_final(row):
-            detail = row['Spec_Result_Detail']
-            
-            if detail == 'Pass':
-                return 'Pass'
-            elif detail in ['미달', '초과', '제외']:
-                return row['SNumber_Category']
-            else:
-                return detail
+    try:
+        if spc_stats.ensure_spc(conn):
+            st.info("ℹ️ 기존 DB의 SPC 통계 테이블(T_SPC_MOMENTS / T_SPC_SKETCH)을 처음 계산했습니다.")
+
+        today = datetime.now().date()
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            item_key = st.selectbox("품목", spc_stats.SPC_ITEM_KEYS, format_func=str.upper, key="spc_item")
+        with col2:
+            start_day = st.date_input("시작일", value=today - timedelta(days=today.weekday()), key="spc_start")
+        with col3:
+            end_day = st.date_input("종료일", value=today, key="spc_end")
+        with col4:
+            pcs = st.multiselect("PC (비우면 전체)", spc_stats.list_spc_pcs(conn, item_key), key="spc_pcs")
+        start, end = start_day.strftime('%Y-%m-%d'), end_day.strftime('%Y-%m-%d')
+
+        by_pc = st.checkbox("PC별로 나누기", key="spc_by_pc")
+        df_cap = spc_stats.capability_summary(conn, item_key, start, end, pcs=pcs or None, by_pc=by_pc)
+        if df_cap.empty:
+            st.warning("⚠️ 해당 기간에 측정값이 없습니다.")
+            return
+        if df_cap['LSL'].isna().all() and df_cap['USL'].isna().all():
+            st.caption("이 품목은 규격 테이블(T_SPEC_*)이 없어 Cp / Cpk를 계산하지 않습니다.")
+        st.dataframe(df_cap, use_container_width=True, hide_index=True)
 
-        df_day['Final_Failure_Category'] = df_day.apply(classify_failure_final, axis=1)
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            measures = [name for name, _ in spc_stats.SPC_ITEMS[item_key][4]]
+            measure_item = st.selectbox("관리도 측정 항목", measures, key="spc_measure")
+        with col2:
+            by_shift = st.checkbox("부분군: 일자 × 근무조", key="spc_by_shift")
+        df_chart = spc_stats.control_chart(conn, item_key, measure_item, start, end, pcs=pcs or None, by_shift=by_shift)
+        if df_chart.empty:
+            return
+        index = df_chart['Day'] + ' ' + df_chart['Shift'] if by_shift else df_chart['Day']
+        st.line_chart(df_chart.set_index(index)[['Mean', 'CL', 'UCL', 'LCL']])
+        n_out = int(df_chart['Out_Of_Control'].sum())
+        if n_out:
+            st.warning(f"⚠️ 관리 한계를 벗어난 부분군 {n_out}개")
+        st.dataframe(df_chart, use_container_width=True, hide_index=True)
+
+        # 분포: 적재 시 저장한 스케치(T_SPC_SKETCH)를 합친 히스토그램과 일자별 백분위 밴드
+        st.markdown(f"##### {measure_item} 분포")
+        hist = spc_stats.histogram(conn, item_key, measure_item, start, end, pcs=pcs or None)
+        if hist is not None:
+            df_hist = hist['bins']
+            df_hist.index = df_hist['Bin_Low'].map(lambda value: f"{value:.4g}")
+            st.bar_chart(df_hist['Count'])
+            spec_text = f"LSL {hist['lsl']} / USL {hist['usl']}" if hist['lsl'] is not None or hist['usl'] is not None else "규격 없음"
+            st.caption(f"{hist['n']:,}건 | {spec_text} | 구간 미만 {hist['below']:,}건 / 구간 초과 {hist['above']:,}건")
+        df_bands = spc_stats.quantile_bands(conn, item_key, measure_item, start, end, pcs=pcs or None)
+        if not df_bands.empty:
+            st.line_chart(df_bands.set_index('Day')[['P5', 'P25', 'P50', 'P75', 'P95']])
+            st.dataframe(df_bands, use_container_width=True, hide_index=True)
+    except Exception as e:
+        st.error(f"❌ SPC 통계 조회 중 오류 발생: {e}")
+    finally:
+        conn.close()
 
-        # 집계 테이블 생성
-        df_summary = df_day[df_day['Spec_Result_Detail'].isin(['Pass', '미달', '초과', '제외'])].copy()
-        
-        if not df_summary.empty:
-            summary_table = pd.crosstab(
-                index=df_summary['Final_Failure_Category'], 
-                columns=df_summary['Spec_Result_Detail'], 
-                margins=True, 
-                margins_name="Total"
-            )
-            summary_table = summary_table.reindex(
-                index=['Pass', '가성불량', '진성불량', 'Total'],
-                columns=['Pass', '미달', '초과', '제외', 'Total'], 
-                fill_value=0
-            )
-            
-            st.markdown(f"#### 🗓️ {date_only} ({len(df_summary)} 건)")
-            st.dataframe(summary_table, use_container_width=True)
+
+# ==========================================================
+# STREAMLIT APP 실행 함수
+# ==========================================================
+
+def show_daily_summary_table(date_only, row_count, summary_table):
+    """일자별 집계 테이블 1개를 출력합니다. (pandas / DuckDB 경로 공통)"""
+    st.markdown(f"#### 🗓️ {date_only} ({row_count} 건)")
+    st.dataframe(summary_table, use_container_width=True)
+
+def show_profile_panel(spans):
+    """성능 프로파일 span을 단계별 합계와 실행 순서 표로 출력합니다. (사이드바 '🐞 성능 프로파일' 사용 시)"""
+    if not spans:
+        return
+    total_sec = sum(record['duration_s'] or 0 for record in spans if record['depth'] == 0)
+    with st.expander(f"🐞 성능 프로파일 ({len(spans)}개 구간, {total_sec:.2f}s)", expanded=False):
+        df_total = pd.DataFrame(summarize_spans(spans)).rename(columns={
+            'name': '단계', 'calls': '횟수', 'duration_s': '시간(s)', 'rows': '행 수', 'peak_mb': '최대 메모리(MB)'
+        })
+        st.markdown("**단계별 합계**")
+        st.dataframe(df_total, use_container_width=True, hide_index=True)
+
+        df_spans = pd.DataFrame(spans)
+        df_spans['name'] = ['　' * depth + name for depth, name in zip(df_spans['depth'], df_spans['name'])]
+        df_spans = df_spans[['name', 'start_s', 'duration_s', 'rows', 'peak_mb']].rename(columns={
+            'name': '단계', 'start_s': '시작(s)', 'duration_s': '시간(s)', 'rows': '행 수', 'peak_mb': '최대 메모리(MB)'
+        })
+        st.markdown("**실행 순서**")
+        st.dataframe(df_spans, use_container_width=True, hide_index=True)
+        st.caption(f"JSONL 기록: {PROFILE_LOG_PATH}")
+
+def render_analysis_result(analysis):
+    """quality_core.analysis.analyze_period 결과를 출력합니다. (바로 실행 / 백그라운드 작업 공통)"""
+    render_diagnostics(analysis['diagnostics'])
+    show_profile_panel(analysis.get('profile'))
+    if analysis['traceback']:
+        st.code(analysis['traceback'])
+    if analysis['daily'] is None:
+        return
+
+    st.subheader(f"📈 {analysis['item'].upper()} 항목 | 기간 ({analysis['n_days']}일) 상세 분석")
+    for date_only, (row_count, summary_table) in analysis['daily'].items():
+        show_daily_summary_table(date_only, row_count, summary_table)
+    if analysis['report_generated_at']:
+        st.caption(f"⚡ 사전 계산 리포트 사용 (생성: {analysis['report_generated_at']})")
 
     st.success("✔️ 전체 기간 분석 및 테이블 출력 완료!")
 
+def compute_analysis(start_date, end_date, item, limit, pc_id, measure_item_filter='전체', data_source='SQLite', engine='pandas', profile=False):
+    """
+    데이터 분석을 계산합니다. (T_ITEM 테이블만 사용, data_source='Parquet'이면 Parquet 미러에서 조회)
+    engine='DuckDB'이면 분류/집계를 DuckDB SQL로 처리합니다. (결과 테이블은 동일)
+    profile=True이면 단계별 시간/행 수/메모리를 기록하여 결과의 'profile'에 담습니다. 반환: analyze_period 결과
+    """
+    with st.spinner("DB에서 데이터 추출 및 분류 중..."):
+        analysis, spans = run_profiled(
+            'run_analysis', analysis_core.analyze_period,
+            start_date, end_date, item, limit, pc_id, measure_item_filter, data_source, engine,
+            DB_FILE_NAME, REPORT_DIR, PARQUET_MIRROR_DIR, db_metadata=get_db_metadata(DB_FILE_NAME),
+            enabled=profile
+        )
+    analysis['profile'] = spans
+    return analysis
+
+def run_analysis(start_date, end_date, item, limit, pc_id, measure_item_filter='전체', data_source='SQLite', engine='pandas', profile=False):
+    """데이터 분석을 계산하고 결과를 출력합니다. 반환: analyze_period 결과"""
+    analysis = compute_analysis(start_date, end_date, item, limit, pc_id, measure_item_filter, data_source, engine, profile)
+    render_analysis_result(analysis)
+    return analysis
+
+def current_db_generation(db_name=DB_FILE_NAME):
+    """현재 DB 세대 번호 (메타데이터 캐시 사용 - 적재/삭제가 있을 때만 바뀝니다). DB가 없으면 None"""
+    metadata = get_db_metadata(db_name)
+    return metadata['generation'] if metadata else None
+
+def show_analysis_result(params):
+    """
+    '데이터 분석 실행'으로 고정된 조건(params)의 분석 결과를 출력합니다. (바로 실행 모드)
+    결과는 (조건, DB 세대 번호)가 같으면 session_state의 값을 그대로 출력하므로, 사이드바나 다른 탭의 위젯을
+    조작해도 다시 계산하지 않습니다. 적재/삭제로 DB 세대가 바뀌면 같은 조건으로 다시 계산합니다.
+    """
+    result_key = (tuple(sorted(params.items())), current_db_generation())
+    if st.session_state.get('analysis_result_key') != result_key or st.session_state.get('analysis_result') is None:
+        st.session_state['analysis_result'] = compute_analysis(
+            params['start'], params['end'], params['item'], params['limit'], params['pc_id'],
+            params.get('measure_item_filter', '전체'), params.get('data_source', 'SQLite'),
+            params.get('engine', 'pandas'), params.get('profile', False)
+        )
+        st.session_state['analysis_result_key'] = result_key
+    render_analysis_result(st.session_state['analysis_result'])
+
+def read_db_file_for_download():
+    """(다운로드 클릭 시 호출) 현재 DB 파일 내용"""
+    with open(DB_FILE_NAME, 'rb') as f:
+        return f.read()
+
+def save_uploaded_csv_streaming(uploaded_file, chunk_rows):
+    """업로드된 CSV를 청크 단위로 DB에 적재하며 진행률을 표시합니다. (중단 시 같은 파일로 재실행하면 이어서 적재)"""
+    source_key = compute_source_key(uploaded_file, chunk_rows)
+    progress_bar = st.progress(0.0, text="청크 적재 준비 중...")
+    total_bytes = max(uploaded_file.size, 1)
+
+    def on_chunk_done(chunk_no, rows_done, stats):
+        ratio = min(uploaded_file.tell() / total_bytes, 1.0)
+        progress_bar.progress(ratio, text=f"청크 {chunk_no + 1} 완료 | 누적 {rows_done:,}행 처리")
+
+    uploaded_file.seek(0)
+    save_result = process_and_save_csv_stream_to_db(
+        uploaded_file, DB_FILE_NAME, chunk_rows=chunk_rows,
+        source_key=source_key, progress_callback=on_chunk_done,
+        mirror_dir=PARQUET_MIRROR_DIR
+    )
+    progress_bar.progress(1.0, text="적재 완료" if save_result['success'] else "적재 중단")
+    return save_result
+
+# ==========================================================
+# 3-1. 백그라운드 작업 (CSV 적재 / 주차 삭제 / 분석)
+# ==========================================================
+
+# 실행 중인 작업의 진행 상황(fragment)을 다시 그리는 주기 (초)
+JOB_POLL_INTERVAL_SEC = 1.0
+
+JOB_STATUS_LABELS = {
+    job_runner.QUEUED: '⏳ 대기', job_runner.RUNNING: '🔄 실행 중', job_runner.DONE: '✅ 완료',
+    job_runner.FAILED: '❌ 실패', job_runner.CANCELLED: '⛔ 취소됨'
+}
+
+@st.cache_resource
+def get_job_runner():
+    """프로세스당 하나의 작업 실행기 (세션 간 공유, 스크립트 재실행과 무관하게 유지)"""
+    return JobRunner()
+
+def ingest_csv_job(ctx, upload, chunk_rows, profile=False):
+    """
+    (작업) 업로드 CSV를 임시 파일로 옮겨 청크 단위로 DB에 적재하고 임시 파일을 삭제합니다.
+    임시 파일은 작업이 실제로 시작될 때 만들므로, 시작 전에 취소된 작업은 파일을 남기지 않습니다.
+    반환: process_and_save_csv_stream_to_db 결과
+    """
+    ctx.progress(0.0, "업로드 파일 준비 중")
+    csv_path = spool_to_temp_file(upload)
+    try:
+        total_bytes = max(os.path.getsize(csv_path), 1)
+        with open(csv_path, 'rb') as source:
+            source_key = compute_source_key(source, chunk_rows)
+
+            def on_chunk_done(chunk_no, rows_done, stats):
+                ctx.set_stats(stats)
+                ctx.log(f"청크 {chunk_no + 1} 완료 | 누적 {rows_done:,}행 처리")
+                # 완료된 청크는 커밋되어 있으므로 여기서 취소해도 같은 파일로 다시 저장하면 이어서 적재합니다.
+                ctx.progress(min(source.tell() / total_bytes, 0.99), f"청크 {chunk_no + 1} 적재 완료 (누적 {rows_done:,}행)")
+
+            ctx.progress(0.0, "청크 적재 준비 중")
+            save_result, spans = run_profiled(
+                'ingest_csv', process_and_save_csv_stream_to_db,
+                source, DB_FILE_NAME, chunk_rows=chunk_rows,
+                source_key=source_key, progress_callback=on_chunk_done,
+                mirror_dir=PARQUET_MIRROR_DIR, enabled=profile
+            )
+    finally:
+        os.remove(csv_path)
+    save_result['profile'] = spans
+    if save_result.get('stats'):
+        ctx.set_stats(save_result['stats'])
+    return save_result
+
+def delete_weeks_job(ctx, weeks):
+    """(작업) 선택한 주차를 DB와 Parquet 미러에서 삭제합니다. 반환: 테이블별 삭제 행 수"""
+    ctx.progress(0.1, f"DB에서 {len(weeks)}개 주차 삭제 중")
+    deleted = delete_weeks_from_db(DB_FILE_NAME, weeks)
+    ctx.set_stats(deleted)
+    for table_name, count in deleted.items():
+        ctx.log(f"✅ {table_name}: {count:,}행 삭제")
+    # DB 삭제가 커밋된 뒤에는 미러도 반드시 맞춰야 하므로 취소를 확인하지 않습니다.
+    ctx.progress(0.8, "Parquet 미러 파티션 삭제 중", check_cancel=False)
+    removed = parquet_mirror.delete_weeks_from_mirror(list(weeks), PARQUET_MIRROR_DIR)
+    ctx.log(f"✅ Parquet 미러: {removed}개 파티션 삭제")
+    return deleted
+
+def analysis_job(ctx, params, db_metadata):
+    """(작업) 기간별 분석을 계산합니다. 반환: analyze_period 결과"""
+    analysis, spans = run_profiled(
+        'analysis_job', analysis_core.analyze_period,
+        params['start'], params['end'], params['item'], params['limit'], params['pc_id'],
+        params.get('measure_item_filter', '전체'), params.get('data_source', 'SQLite'), params.get('engine', 'pandas'),
+        DB_FILE_NAME, REPORT_DIR, PARQUET_MIRROR_DIR, db_metadata=db_metadata, progress=ctx.progress,
+        enabled=params.get('profile', False)
+    )
+    analysis['profile'] = spans
+    return analysis
+
+def submit_session_job(slot, kind, label, fn, *args, writes_db=False):
+    """작업을 등록하고 현재 세션의 slot(ingest / delete / analysis)에 job_id를 기록합니다."""
+    job_id = get_job_runner().submit(kind, label, fn, *args, writes_db=writes_db)
+    st.session_state.setdefault('job_ids', {})[slot] = job_id
+    return job_id
+
+def get_session_job(slot):
+    """현재 세션 slot의 작업 스냅샷 (없으면 None)"""
+    return get_job_runner().get(st.session_state.get('job_ids', {}).get(slot))
+
+def clear_session_job(slot):
+    job_id = st.session_state.get('job_ids', {}).pop(slot, None)
+    if job_id:
+        get_job_runner().forget(job_id)
+
+def show_job_progress(job, slot):
+    """작업 단계/진행률/통계/로그를 출력하고, 실행 중이면 취소 버튼을 표시합니다."""
+    st.progress(min(max(job['progress'], 0.0), 1.0), text=f"{JOB_STATUS_LABELS.get(job['status'], job['status'])} | {job['label']} - {job['stage']}")
+    if job['stats']:
+        st.caption(' | '.join(f"{key}: {value:,}" if isinstance(value, int) else f"{key}: {value}" for key, value in job['stats'].items()))
+    if job['log']:
+        with st.expander(f"📝 작업 로그 ({len(job['log'])}줄)", expanded=False):
+            st.code('\n'.join(job['log'][-200:]))
+    if job['status'] == job_runner.FAILED:
+        st.error(f"❌ 작업 실패: {job['error']}")
+        if job['traceback']:
+            st.code(job['traceback'])
+    if job['status'] not in job_runner.FINISHED_STATES:
+        if st.button("⛔ 작업 취소", key=f'cancel_job_{slot}'):
+            get_job_runner().cancel(job['job_id'])
+
+@st.fragment(run_every=JOB_POLL_INTERVAL_SEC)
+def poll_job_progress(slot):
+    """
+    (fragment) 실행 중인 작업의 진행 상황만 주기적으로 다시 그립니다. (분석 결과 등 페이지의 나머지는 다시 실행하지 않음)
+    작업이 끝나면 전체 화면을 한 번 다시 실행하여 결과와 DB 메타데이터를 갱신합니다. 그 실행에서는 이 fragment를
+    호출하지 않으므로 주기적 갱신도 멈춥니다.
+    """
+    job = get_session_job(slot)
+    if job is None or job['status'] in job_runner.FINISHED_STATES:
+        st.rerun()
+    show_job_progress(job, slot)
+
+def show_session_job(job, slot):
+    """작업이 실행 중이면 진행 상황 fragment(주기적 갱신), 끝났으면 최종 상태를 출력합니다."""
+    if job['status'] in job_runner.FINISHED_STATES:
+        show_job_progress(job, slot)
+    else:
+        poll_job_progress(slot)
+
+def show_save_result(save_result):
+    """CSV 저장 결과(통계/로그)를 출력합니다."""
+    if save_result['success']:
+        st.success("🎉 데이터가 성공적으로 DB에 저장되었습니다!")
+        
+        # 저장 통계 표시
+        st.markdown("### 📊 저장 통계")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("T_MASTER_DATA", f"{save_result['stats'].get('master', 0):,}행")
+            st.metric("T_ITEM_PCB", f"{save_result['stats'].get('pcb', 0):,}행")
+            st.metric("T_ITEM_SEMI", f"{save_result['stats'].get('semi', 0):,}행")
+        with col2:
+            st.metric("T_ITEM_FW", f"{save_result['stats'].get('fw', 0):,}행")
+            st.metric("T_ITEM_RFTX", f"{save_result['stats'].get('rftx', 0):,}행")
+            st.metric("T_ITEM_BATADC", f"{save_result['stats'].get('batadc', 0):,}행")
+        with col3:
+            st.metric("T_PC_INFO", f"{save_result['stats'].get('pc_info', 0):,}행")
+            st.metric("T_SPEC_PCB", f"{save_result['stats'].get('spec_pcb', 0):,}행")
+            st.metric("T_SPEC_SEMI", f"{save_result['stats'].get('spec_semi', 0):,}행")
+        
+        # 로그 표시
+        with st.expander("📝 저장 로그 보기", expanded=False):
+            st.code(save_result['log'])
+        show_profile_panel(save_result.get('profile'))
+    else:
+        st.error(f"❌ DB 저장 중 오류 발생: {save_result['error']}")
+        with st.expander("📝 저장 로그 보기", expanded=False):
+            st.code(save_result['log'])
+
 # ==========================================================
 # 4. 메인 실행 함수
 # ==========================================================
@@ -1478,18 +1235,22 @@ def main():
         
         if uploaded_file is not None:
             try:
-                df_uploaded = pd.read_csv(uploaded_file, encoding='utf-8', low_memory=False, dtype={'SNumber': str})
+                # 미리보기는 상위 100행만 읽습니다. (전체 적재는 청크 단위 스트리밍)
+                df_preview = pd.read_csv(uploaded_file, encoding='utf-8', low_memory=False, dtype={'SNumber': str}, nrows=100)
+                uploaded_file.seek(0)
                 
-                st.success(f"✅ 파일 '{uploaded_file.name}' 업로드 성공! (총 {len(df_uploaded):,}행)")
+                st.success(f"✅ 파일 '{uploaded_file.name}' 업로드 성공! ({uploaded_file.size / (1024 * 1024):,.1f} MB)")
                 
                 with st.expander("📋 업로드된 데이터 미리보기 (상위 100행)", expanded=False):
-                    st.dataframe(df_uploaded.head(100), use_container_width=True, height=400)
+                    st.dataframe(df_preview, use_container_width=True, height=400)
+                
+                chunk_rows = st.number_input("적재 청크 크기 (행)", min_value=1000, value=INGEST_CHUNK_ROWS, step=10000, key='ingest_chunk_rows_create')
                 
                 if st.button("💾 DB 생성 및 저장", type="primary", key='create_db_btn'):
                     with st.spinner("DB를 생성하고 데이터를 저장하는 중..."):
                         try:
-                            # DB 생성 및 저장
-                            save_result = process_and_save_csv_to_db(df_uploaded, DB_FILE_NAME)
+                            # DB 생성 및 청크 단위 저장
+                            save_result = save_uploaded_csv_streaming(uploaded_file, int(chunk_rows))
                             
                             if save_result['success']:
                                 st.success("🎉 DB가 생성되고 데이터가 저장되었습니다!")
@@ -1561,8 +1322,8 @@ def main():
         
         st.markdown("---")
         
-        # UI 요소 로딩 (공통)
-        conn_ui = get_db_connection(DB_FILE_NAME)
+        # UI 요소 로딩 (공통) - DB 메타데이터는 적재/삭제가 있을 때만 다시 읽습니다.
+        db_metadata = get_db_metadata(DB_FILE_NAME)
         
         # 날짜/품목 입력 필드
         default_start = datetime(2025, 10, 20).date()
@@ -1570,50 +1331,20 @@ def main():
         start_date_ui = st.date_input("🗓️ 시작 날짜 (From)", default_start)
         end_date_ui = st.date_input("🗓️ 종료 날짜 (To)", default_end)
         item_ui = st.selectbox("품목 선택", ITEM_OPTIONS, index=0, key='item_select')
-        limit_ui = st.number_input("조회 행 제한 (Limit)", min_value=1000, value=100000, step=1000, key='limit_select')
+        limit_ui = st.number_input("조회 행 제한 (Limit, 0 = 제한 없음)", min_value=0, value=100000, step=10000, key='limit_select',
+                                   help="기간 분석은 측정 행을 청크 단위로 읽어 바로 집계하므로 0(제한 없음)으로 조회해도 메모리가 늘지 않습니다. "
+                                        f"불량 유형별 조회 표는 조회한 행을 모두 보관하므로 항상 최대 {DEFECT_DRILLDOWN_MAX_ROWS:,}건까지만 불러옵니다.")
+        item_bounds = db_metadata['date_bounds'].get(item_ui) if db_metadata else None
+        if item_bounds:
+            st.caption(f"{item_ui.upper()} 데이터 기간: {item_bounds[0][:10]} ~ {item_bounds[1][:10]}")
         
         st.markdown("---")
         
         # ✅ 품목별 PC 구분 동적 변경
         st.subheader("🖥️ PC 구분")
         
-        pc_filter_options = ['전체']
-        try:
-            if item_ui == 'pcb':
-                # PCB는 100, 101, 102, 103
-                df_pc_filtered = pd.read_sql(
-                    "SELECT DISTINCT PC_ID FROM T_PC_INFO WHERE PC_Type = 'PCB' ORDER BY PC_ID",
-                    conn_ui
-                )
-                if len(df_pc_filtered) > 0:
-                    pc_filter_options.extend(df_pc_filtered['PC_ID'].tolist())
-            elif item_ui == 'fw':
-                # FW PC 목록
-                df_pc_filtered = pd.read_sql(
-                    "SELECT DISTINCT PC_ID FROM T_PC_INFO WHERE PC_Type = 'FW' ORDER BY PC_ID",
-                    conn_ui
-                )
-                if len(df_pc_filtered) > 0:
-                    pc_filter_options.extend(df_pc_filtered['PC_ID'].tolist())
-            elif item_ui == 'rftx':
-                # RFTX PC 목록
-                df_pc_filtered = pd.read_sql(
-                    "SELECT DISTINCT PC_ID FROM T_PC_INFO WHERE PC_Type = 'RFTX' ORDER BY PC_ID",
-                    conn_ui
-                )
-                if len(df_pc_filtered) > 0:
-                    pc_filter_options.extend(df_pc_filtered['PC_ID'].tolist())
-            elif item_ui == 'batadc':
-                # BATADC PC 목록
-                df_pc_filtered = pd.read_sql(
-                    "SELECT DISTINCT PC_ID FROM T_PC_INFO WHERE PC_Type = 'BATADC' ORDER BY PC_ID",
-                    conn_ui
-                )
-                if len(df_pc_filtered) > 0:
-                    pc_filter_options.extend(df_pc_filtered['PC_ID'].tolist())
-            # semi는 PC가 없으므로 '전체'만
-        except Exception as e:
-            st.warning(f"⚠️ PC 목록 조회 실패: {e}")
+        # semi는 PC가 없으므로 '전체'만
+        pc_filter_options = ['전체'] + (db_metadata['pc_by_item'].get(item_ui, []) if db_metadata else [])
         
         selected_pc_id = st.selectbox(
             f"{item_ui.upper()} PC 선택",
@@ -1624,27 +1355,49 @@ def main():
         st.markdown("---")
         st.subheader("📊 유형 필터")
         
-        # 품목별 유형 목록 정의
-        measure_items_map = {
-            'pcb': ['전체', 'SleepCurr', 'BatVolt', 'IrCurr', 'IrPwr', 'WirelessVolt', 'UsbCurr', 'WirelessUsbVolt', 'Led'],
-            'semi': ['전체', 'BatVolt', 'SolarVolt'],
-            'fw': ['전체', 'FileCheck'],
-            'rftx': ['전체', 'Power', 'Modul', 'CFOD'],
-            'batadc': ['전체', 'Level', 'VoiceTh']
-        }
-        
         # 선택된 품목에 따른 유형 목록 표시
-        available_items = measure_items_map.get(item_ui, ['전체'])
+        available_items = MEASURE_ITEMS_MAP.get(item_ui, ['전체'])
         measure_item_filter = st.selectbox(
             "측정 유형 선택",
             available_items,
             key='measure_item_filter'
         )
         
+        df_item_specs = db_metadata['specs'].get(item_ui) if db_metadata else None
+        if df_item_specs is not None and not df_item_specs.empty:
+            if measure_item_filter != '전체':
+                df_item_specs = df_item_specs[df_item_specs['Measure_Item'] == measure_item_filter]
+            with st.expander(f"📏 Spec 기준 ({len(df_item_specs)}건)", expanded=False):
+                st.dataframe(df_item_specs, use_container_width=True, hide_index=True)
+        
         st.markdown("---")
+        st.subheader("🗄️ 데이터 소스")
+        data_source_ui = st.radio(
+            "조회 소스",
+            ['SQLite', 'Parquet'],
+            key='data_source_select',
+            horizontal=True,
+            help="Parquet: WEEK_NO 파티션 미러에서 필요한 컬럼/기간만 읽습니다. 미러가 없으면 SQLite로 조회합니다."
+        )
+        engine_ui = st.radio(
+            "분석 엔진",
+            ['pandas', 'DuckDB'],
+            key='analysis_engine_select',
+            horizontal=True,
+            help="DuckDB: 분류/가성·진성 판정/일자별 집계를 컬럼형 SQL 엔진에서 처리합니다. (결과 테이블 동일)"
+        )
+        profile_enabled = st.checkbox(
+            "🐞 성능 프로파일", key='profile_enabled',
+            help=f"분석/CSV 적재의 단계별 시간·행 수·최대 메모리를 결과 아래에 표시하고 {PROFILE_LOG_PATH} 에 기록합니다. (메모리 추적으로 실행이 다소 느려집니다)"
+        )
+        if profile_enabled:
+            with st.expander("⏱️ 모듈 import 시간 (이 프로세스)", expanded=False):
+                st.dataframe(pd.DataFrame(import_times()).rename(columns={'module': '모듈', 'seconds': '시간(s)'}),
+                             use_container_width=True, hide_index=True)
+                st.caption("기능 모듈(기간 분석, Parquet 미러)은 처음 사용할 때 import됩니다.")
         
-        # DB 연결 닫기
-        conn_ui.close()
+        st.markdown("---")
+    mark_startup('sidebar')
 
     # --- 2. 메인 화면: 선택된 액션에 따른 UI 렌더링 ---
     
@@ -1658,17 +1411,14 @@ def main():
             preview_rows = st.session_state['preview_rows_count']  # ✅ 변경된 키
             
             try:
-                conn_preview = get_db_connection(DB_FILE_NAME)
-                df_preview = pd.read_sql_query(f"SELECT * FROM {preview_table} LIMIT {preview_rows}", conn_preview)
-                conn_preview.close()
+                df_preview = load_table_preview(DB_FILE_NAME, current_db_generation(), preview_table, preview_rows)
                 
                 st.success(f"✅ {preview_table} 테이블 | 총 {len(df_preview):,}행 조회")
                 
-                # 다운로드 버튼
-                csv = df_preview.to_csv(index=False).encode('utf-8-sig')
+                # 다운로드 버튼 (CSV 변환은 버튼을 눌렀을 때만 수행합니다)
                 st.download_button(
                     label="📥 CSV 다운로드",
-                    data=csv,
+                    data=lambda: df_preview.to_csv(index=False).encode('utf-8-sig'),
                     file_name=f"{preview_table}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv"
                 )
@@ -1687,8 +1437,14 @@ def main():
         
         st.header("📊 기간별 품질 분석 결과")
         
-        # ✅ 분석 실행 버튼
-        if st.button("🔍 데이터 분석 실행", key='run_analysis_btn', type="primary"):
+        # ✅ 분석 실행 버튼 (백그라운드 실행 시 위젯을 조작해도 분석이 중단되지 않습니다)
+        analysis_in_background = st.checkbox(
+            "⏳ 백그라운드에서 실행", key='analysis_in_background',
+            help="긴 기간/대용량 분석을 작업으로 실행하고 진행 상황을 표시합니다. 완료되면 결과가 아래에 표시됩니다."
+        )
+        analysis_job_state = get_session_job('analysis')
+        analysis_running = analysis_job_state is not None and analysis_job_state['status'] not in job_runner.FINISHED_STATES
+        if st.button("🔍 데이터 분석 실행", key='run_analysis_btn', type="primary", disabled=analysis_running):
             start_datetime = datetime(start_date_ui.year, start_date_ui.month, start_date_ui.day)
             end_datetime = datetime(end_date_ui.year, end_date_ui.month, end_date_ui.day)
             end_datetime_inclusive = end_datetime + timedelta(hours=23, minutes=59, seconds=59)
@@ -1704,8 +1460,18 @@ def main():
                     'item': item_ui,
                     'limit': limit_ui,
                     'pc_id': selected_pc_id,
-                    'measure_item_filter': measure_item_filter
+                    'measure_item_filter': measure_item_filter,
+                    'data_source': data_source_ui,
+                    'engine': engine_ui,
+                    'background': analysis_in_background,
+                    'profile': profile_enabled
                 }
+                st.session_state.pop('analysis_result', None)
+                st.session_state.pop('analysis_result_key', None)
+                clear_session_job('analysis')
+                if analysis_in_background:
+                    submit_session_job('analysis', 'analysis', f"{item_ui.upper()} 분석 ({start_date_ui} ~ {end_date_ui})",
+                                       analysis_job, st.session_state['analysis_params'], get_db_metadata(DB_FILE_NAME))
         
         # ✅ 분석이 실행되었으면 결과를 고정된 컨테이너에 표시
         if st.session_state.get('analysis_executed', False):
@@ -1714,106 +1480,47 @@ def main():
             # 고정된 컨테이너에 분석 결과 표시
             analysis_container = st.container()
             with analysis_container:
-                run_analysis(
-                    params['start'], 
-                    params['end'], 
-                    params['item'], 
-                    params['limit'], 
-                    params['pc_id'],
-                    params.get('measure_item_filter', '전체')
-                )
+                if params.get('background'):
+                    # 백그라운드 분석: 실행 중이면 진행 상황, 완료되면 결과를 세션에 옮겨 출력합니다.
+                    analysis_job_state = get_session_job('analysis')
+                    if analysis_job_state is not None:
+                        if analysis_job_state['status'] == job_runner.DONE:
+                            st.session_state['analysis_result'] = analysis_job_state['result']
+                            clear_session_job('analysis')
+                        else:
+                            show_session_job(analysis_job_state, 'analysis')
+                    if st.session_state.get('analysis_result') is not None:
+                        render_analysis_result(st.session_state['analysis_result'])
+                else:
+                    show_analysis_result(params)
         
         # ✅ 상세 조회 섹션 (항상 표시)
         st.markdown("---")
         st.header("🔎 불량 유형별 SNumber 조회")
         
         # 탭으로 두 가지 조회 방법 제공
-        tab1, tab2 = st.tabs(["📊 불량 유형별 조회", "🔍 SNumber 직접 검색"])
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 불량 유형별 조회", "🔍 SNumber 직접 검색", "🧬 공정 이력 추적", "🔁 재검사 지표", "📈 SPC / Cpk"])
      
         with tab1:
-            st.markdown("### 불량 분류별 SNumber 목록 조회")
-            st.info("💡 먼저 데이터 분석을 실행한 후에 이 기능을 사용하세요!")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                category_1st = st.selectbox(
-                    "1차 분류 선택",
-                    ["Pass", "가성불량", "진성불량"],
-                    key="category_1st_select"
-                )
-            
-            with col2:
-                category_2nd = st.selectbox(
-                    "2차 분류 선택",
-                    ["Pass", "미달", "초과", "제외"],
-                    key="category_2nd_select"
-                )
-            
-            with col3:
-                st.write("")  # 간격 조정
-                st.write("")  # 간격 조정
-                query_by_category_btn = st.button(
-                    "🔍 조회", 
-                    key="query_by_category_btn",
-                    type="primary"
-                )
-            
-            # 불량 유형별 조회 실행
-            if query_by_category_btn:
-                if not st.session_state.get('analysis_executed', False):
-                    st.warning("⚠️ 먼저 '데이터 분석 실행' 버튼을 눌러 데이터를 분석해주세요!")
-                else:
-                    # session_state에 불량 조회 정보 저장
-                    st.session_state['defect_query_executed'] = True
-                    st.session_state['defect_category_1st'] = category_1st
-                    st.session_state['defect_category_2nd'] = category_2nd
-            
-            # 불량 조회 결과 표시
-            defect_query_container = st.container()
-            with defect_query_container:
-                if st.session_state.get('defect_query_executed', False):
-                    show_snumbers_by_defect_type(
-                        st.session_state['defect_category_1st'],
-                        st.session_state['defect_category_2nd'],
-                        st.session_state['analysis_params']
-                    )
+            show_defect_query()
         
         with tab2:
-            st.markdown("### SNumber 직접 검색")
-            st.markdown("""
-            **💡 검색 팁:**
-            - 전체 SNumber 입력: `THSRBN5901480USMJNYAH9226`
-            - 일부만 입력: `THSR`, `9226`, `BN590`
-            - 와일드카드 사용: `THSR*`, `*9226`, `*BN590*`
-            """)
-            
-            snumber_input_main = st.text_input(
-                "조회할 SNumber 입력 (일부만 입력해도 자동 검색)", 
-                value="", 
-                placeholder="예: THSR, *9226, THSRBN590*",
-                key="snumber_input_main"
-            )
-            
-            col1, col2 = st.columns([1, 4])
-            with col1:
-                search_clicked = st.button("🔍 검색 및 상세 조회", key="detail_query_btn_main", type="secondary")
-            
-            # 검색/상세 조회 섹션 (독립된 컨테이너)
-            detail_container = st.container()
-            
-            with detail_container:
-                if search_clicked:
-                    if snumber_input_main:
-                        # session_state에 검색 실행 플래그 설정
-                        st.session_state['search_executed'] = True
-                        st.session_state['search_query'] = snumber_input_main
-                    else:
-                        st.warning("⚠️ SNumber를 입력해주세요.")
-                
-                # 검색이 실행되었으면 결과 표시
-                if st.session_state.get('search_executed', False):
-                    show_snumber_detail(st.session_state['search_query'], item_ui)
+            show_snumber_search(item_ui, selected_pc_id)
+
+        with tab3:
+            st.markdown("### SNumber 공정 이력 추적 (Pcb → Semi → Fw → RfTx → Batadc)")
+            st.caption("공정별 최신 검사 결과 기준으로 조회합니다. 재검사로 통과한 공정은 PASS로 집계됩니다.")
+            show_unit_traceability()
+
+        with tab4:
+            st.markdown("### 공정별 재검사 지표")
+            st.caption("공정의 마지막 검사가 기간 안에 있는 SNumber 기준입니다. 시도 순서는 검사 시각 순서로 매깁니다.")
+            show_retest_metrics()
+
+        with tab5:
+            st.markdown("### 측정 항목별 공정능력 (Cp / Cpk) 및 X-bar 관리도")
+            st.caption("적재 시 일자 × PC × 근무조 단위로 계산해 둔 통계를 합칩니다. Cp / Cpk는 군내 σ, Pp / Ppk는 전체 σ 기준입니다.")
+            show_spc_metrics()
 
     elif main_action == "DB 업로드 및 저장":
         st.header("📁 CSV 파일 업로드 및 DB 누적 저장")
@@ -1837,69 +1544,56 @@ def main():
         
         if uploaded_file is not None:
             try:
-                # CSV 파일 읽기
-                df_uploaded = pd.read_csv(uploaded_file, encoding='utf-8', low_memory=False, dtype={'SNumber': str})
+                # CSV 파일 샘플 읽기 (전체 적재는 청크 단위 스트리밍)
+                df_sample = pd.read_csv(uploaded_file, encoding='utf-8', low_memory=False, dtype={'SNumber': str}, nrows=1000)
+                uploaded_file.seek(0)
                 
-                st.success(f"✅ 파일 '{uploaded_file.name}' 업로드 성공! (총 {len(df_uploaded):,}행)")
+                st.success(f"✅ 파일 '{uploaded_file.name}' 업로드 성공! ({uploaded_file.size / (1024 * 1024):,.1f} MB)")
                 
                 # 데이터 미리보기
                 with st.expander("📋 업로드된 데이터 미리보기 (상위 100행)", expanded=False):
-                    st.dataframe(df_uploaded.head(100), use_container_width=True, height=400)
+                    st.dataframe(df_sample.head(100), use_container_width=True, height=400)
                 
                 # 컬럼 정보
-                with st.expander("📊 컬럼 정보", expanded=False):
+                with st.expander("📊 컬럼 정보 (상위 1,000행 기준)", expanded=False):
                     col_info = pd.DataFrame({
-                        '컬럼명': df_uploaded.columns,
-                        '데이터 타입': df_uploaded.dtypes.astype(str).values,  # ✅ Arrow 에러 방지
-                        'NULL 개수': df_uploaded.isnull().sum().values,
-                        '고유값 개수': [df_uploaded[col].nunique() for col in df_uploaded.columns]
+                        '컬럼명': df_sample.columns,
+                        '데이터 타입': df_sample.dtypes.astype(str).values,  # ✅ Arrow 에러 방지
+                        'NULL 개수': df_sample.isnull().sum().values,
+                        '고유값 개수': [df_sample[col].nunique() for col in df_sample.columns]
                     })
                     st.dataframe(col_info, use_container_width=True)
                 
                 st.markdown("---")
                 
-                # DB 저장 버튼
-                if st.button("💾 DB에 저장 (APPEND 모드)", type="primary", key='save_to_db_btn'):
-                    with st.spinner("데이터를 DB에 저장하는 중..."):
-                        try:
-                            # DB 저장 프로세스 실행
-                            save_result = process_and_save_csv_to_db(df_uploaded, DB_FILE_NAME)
-                            
-                            if save_result['success']:
-                                st.success("🎉 데이터가 성공적으로 DB에 저장되었습니다!")
-                                
-                                # 저장 통계 표시
-                                st.markdown("### 📊 저장 통계")
-                                
-                                col1, col2, col3 = st.columns(3)
-                                with col1:
-                                    st.metric("T_MASTER_DATA", f"{save_result['stats'].get('master', 0):,}행")
-                                    st.metric("T_ITEM_PCB", f"{save_result['stats'].get('pcb', 0):,}행")
-                                    st.metric("T_ITEM_SEMI", f"{save_result['stats'].get('semi', 0):,}행")
-                                with col2:
-                                    st.metric("T_ITEM_FW", f"{save_result['stats'].get('fw', 0):,}행")
-                                    st.metric("T_ITEM_RFTX", f"{save_result['stats'].get('rftx', 0):,}행")
-                                    st.metric("T_ITEM_BATADC", f"{save_result['stats'].get('batadc', 0):,}행")
-                                with col3:
-                                    st.metric("T_PC_INFO", f"{save_result['stats'].get('pc_info', 0):,}행")
-                                    st.metric("T_SPEC_PCB", f"{save_result['stats'].get('spec_pcb', 0):,}행")
-                                    st.metric("T_SPEC_SEMI", f"{save_result['stats'].get('spec_semi', 0):,}행")
-                                
-                                # 로그 표시
-                                with st.expander("📝 저장 로그 보기", expanded=False):
-                                    st.code(save_result['log'])
-                                    
-                            else:
-                                st.error(f"❌ DB 저장 중 오류 발생: {save_result['error']}")
-                                
-                        except Exception as e:
-                            st.error(f"❌ 저장 중 예상치 못한 오류 발생: {e}")
-                            import traceback
-                            st.code(traceback.format_exc())
+                chunk_rows = st.number_input(
+                    "적재 청크 크기 (행)", min_value=1000, value=INGEST_CHUNK_ROWS, step=10000, key='ingest_chunk_rows',
+                    help="CSV를 이 행 수 단위로 나누어 저장합니다. 중단 시 같은 파일/같은 청크 크기로 다시 저장하면 완료된 청크는 건너뜁니다."
+                )
+                
+                # DB 저장 버튼 (백그라운드 작업 - 적재 중에 다른 화면을 조작해도 중단되지 않습니다)
+                ingest_job = get_session_job('ingest')
+                ingest_running = ingest_job is not None and ingest_job['status'] not in job_runner.FINISHED_STATES
+                if st.button("💾 DB에 저장 (APPEND 모드)", type="primary", key='save_to_db_btn', disabled=ingest_running):
+                    clear_session_job('ingest')
+                    # 업로드 객체를 넘기고, 작업이 시작될 때 임시 파일로 옮깁니다. (작업이 끝나면 삭제)
+                    submit_session_job('ingest', 'ingest', f"CSV 적재: {uploaded_file.name}", ingest_csv_job,
+                                       uploaded_file, int(chunk_rows), profile_enabled, writes_db=True)
             
             except Exception as e:
                 st.error(f"❌ CSV 파일 읽기 실패: {e}")
         
+        # 적재 작업 진행 상황 / 결과 (파일 선택을 바꿔도 유지)
+        ingest_job = get_session_job('ingest')
+        if ingest_job is not None:
+            st.markdown("### ⏳ 적재 작업")
+            show_session_job(ingest_job, 'ingest')
+            if ingest_job['status'] == job_runner.DONE:
+                show_save_result(ingest_job['result'])
+            if ingest_job['status'] in job_runner.FINISHED_STATES and st.button("닫기", key='close_ingest_job'):
+                clear_session_job('ingest')
+                st.rerun()
+        
         st.markdown("---")
         
         # DB 다운로드 섹션
@@ -1909,20 +1603,38 @@ def main():
             file_size = os.path.getsize(DB_FILE_NAME) / (1024 * 1024)  # MB
             st.info(f"현재 DB 파일 크기: **{file_size:.2f} MB**")
             
-            with open(DB_FILE_NAME, 'rb') as f:
-                db_data = f.read()
-            
             download_filename = f"product_quality_db_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
             
+            # DB 내용은 버튼을 눌렀을 때만 읽습니다. (화면을 다시 그릴 때마다 DB 전체를 메모리에 올리지 않음)
             st.download_button(
                 label="💾 DB 파일 다운로드",
-                data=db_data,
+                data=read_db_file_for_download,
                 file_name=download_filename,
                 mime="application/x-sqlite3",
                 help="현재 DB 파일을 다운로드합니다"
             )
         else:
             st.warning("⚠️ DB 파일이 존재하지 않습니다.")
+        
+        st.markdown("---")
+        
+        # Parquet 미러 섹션
+        st.header("🧊 Parquet 미러 (WEEK_NO 파티션)")
+        
+        if not parquet_mirror.is_available():
+            st.warning("⚠️ pyarrow가 설치되어 있지 않아 Parquet 미러를 사용할 수 없습니다.")
+        else:
+            st.info(f"미러 경로: **{PARQUET_MIRROR_DIR}** | CSV 저장 시 신규 행이 자동으로 추가 기록됩니다.")
+            st.caption("기존 DB 데이터를 미러에 반영하거나 미러가 DB와 어긋난 경우 재구성하세요. (기존 미러는 덮어씁니다)")
+            
+            if st.button("🔁 DB 전체로 미러 재구성", key='rebuild_parquet_mirror'):
+                with st.spinner("DB → Parquet 미러 재구성 중..."):
+                    try:
+                        written = parquet_mirror.export_db_to_mirror(DB_FILE_NAME, PARQUET_MIRROR_DIR)
+                        st.success("✅ 미러 재구성 완료")
+                        st.dataframe(pd.DataFrame([{'테이블': k, '행 수': f"{v:,}"} for k, v in written.items()]), hide_index=True)
+                    except Exception as e:
+                        st.error(f"❌ 미러 재구성 실패: {e}")
     
     elif main_action == "DB 삭제":
         st.header("🗑️ DB 데이터 삭제 (주차별)")
@@ -1936,37 +1648,31 @@ def main():
         
         st.markdown("---")
         
-        # DB에서 WEEK_NO 목록 조회
+        # DB에서 WEEK_NO 목록 조회 (메타데이터 캐시, 주차별 행 수는 세대 번호별 캐시)
         try:
-            conn_delete = get_db_connection(DB_FILE_NAME)
-            df_weeks = pd.read_sql("SELECT DISTINCT WEEK_NO FROM T_MASTER_DATA WHERE WEEK_NO IS NOT NULL ORDER BY WEEK_NO DESC", conn_delete)
-            week_list = df_weeks['WEEK_NO'].tolist()
+            db_metadata = get_db_metadata(DB_FILE_NAME)
+            week_list = db_metadata['weeks'] if db_metadata else []
             
             if len(week_list) == 0:
                 st.info("ℹ️ 삭제할 데이터가 없습니다. (WEEK_NO가 없음)")
-                conn_delete.close()
             else:
                 # 주차별 데이터 통계
                 st.subheader("📊 주차별 데이터 현황")
                 
+                week_counts = get_week_counts(DB_FILE_NAME, db_metadata['generation'])
                 week_stats = []
                 for week in week_list:
-                    master_count = pd.read_sql(f"SELECT COUNT(*) as cnt FROM T_MASTER_DATA WHERE WEEK_NO = '{week}'", conn_delete)['cnt'][0]
-                    pcb_count = pd.read_sql(f"SELECT COUNT(*) as cnt FROM T_ITEM_PCB WHERE SNumber IN (SELECT SNumber FROM T_MASTER_DATA WHERE WEEK_NO = '{week}')", conn_delete)['cnt'][0]
-                    semi_count = pd.read_sql(f"SELECT COUNT(*) as cnt FROM T_ITEM_SEMI WHERE SNumber IN (SELECT SNumber FROM T_MASTER_DATA WHERE WEEK_NO = '{week}')", conn_delete)['cnt'][0]
-                    
+                    counts = week_counts.get(week, {'master': 0, 'pcb': 0, 'semi': 0})
                     week_stats.append({
                         'WEEK_NO': week,
-                        'MASTER': f"{master_count:,}",
-                        'PCB': f"{pcb_count:,}",
-                        'SEMI': f"{semi_count:,}"
+                        'MASTER': f"{counts['master']:,}",
+                        'PCB': f"{counts['pcb']:,}",
+                        'SEMI': f"{counts['semi']:,}"
                     })
                 
                 df_stats = pd.DataFrame(week_stats)
                 st.dataframe(df_stats, use_container_width=True, hide_index=True)
                 
-                conn_delete.close()
-                
                 st.markdown("---")
                 
                 # 삭제할 주차 선택
@@ -1981,15 +1687,9 @@ def main():
                 if selected_weeks:
                     st.warning(f"⚠️ 선택된 주차: {', '.join(selected_weeks)}")
                     
-                    # 삭제될 데이터 미리보기
-                    conn_preview = get_db_connection(DB_FILE_NAME)
-                    week_filter = "', '".join(selected_weeks)
-                    
-                    delete_master = pd.read_sql(f"SELECT COUNT(*) as cnt FROM T_MASTER_DATA WHERE WEEK_NO IN ('{week_filter}')", conn_preview)['cnt'][0]
-                    delete_pcb = pd.read_sql(f"SELECT COUNT(*) as cnt FROM T_ITEM_PCB WHERE SNumber IN (SELECT SNumber FROM T_MASTER_DATA WHERE WEEK_NO IN ('{week_filter}'))", conn_preview)['cnt'][0]
-                    delete_semi = pd.read_sql(f"SELECT COUNT(*) as cnt FROM T_ITEM_SEMI WHERE SNumber IN (SELECT SNumber FROM T_MASTER_DATA WHERE WEEK_NO IN ('{week_filter}'))", conn_preview)['cnt'][0]
-                    
-                    conn_preview.close()
+                    # 삭제될 데이터 미리보기 (주차별 행 수 합계)
+                    delete_counts = count_week_rows(week_counts, selected_weeks)
+                    delete_master, delete_pcb, delete_semi = delete_counts['master'], delete_counts['pcb'], delete_counts['semi']
                     
                     st.info(f"""
                     📊 **삭제될 데이터:**
@@ -2003,53 +1703,28 @@ def main():
                     confirm_delete = st.checkbox(f"위 내용을 확인했으며, 선택한 주차({', '.join(selected_weeks)})의 데이터를 삭제하겠습니다")
                     
                     if confirm_delete:
-                        if st.button("🗑️ 선택한 주차 데이터 삭제", type="secondary"):
-                            try:
-                                conn_del = get_db_connection(DB_FILE_NAME)
-                                cursor = conn_del.cursor()
-                                
-                                # FOREIGN KEY 제약조건 임시 비활성화
-                                cursor.execute("PRAGMA foreign_keys = OFF;")
-                                
-                                week_filter = "', '".join(selected_weeks)
-                                
-                                # SNumber 목록 추출
-                                snumber_query = f"SELECT SNumber FROM T_MASTER_DATA WHERE WEEK_NO IN ('{week_filter}')"
-                                df_snumbers = pd.read_sql(snumber_query, conn_del)
-                                snumber_list = df_snumbers['SNumber'].tolist()
-                                
-                                if len(snumber_list) > 0:
-                                    snumber_filter = "', '".join(snumber_list)
-                                    
-                                    # 관련 테이블 삭제
-                                    cursor.execute(f"DELETE FROM T_ITEM_PCB WHERE SNumber IN ('{snumber_filter}')")
-                                    cursor.execute(f"DELETE FROM T_ITEM_SEMI WHERE SNumber IN ('{snumber_filter}')")
-                                    cursor.execute(f"DELETE FROM T_ITEM_FW WHERE SNumber IN ('{snumber_filter}')")
-                                    cursor.execute(f"DELETE FROM T_ITEM_RFTX WHERE SNumber IN ('{snumber_filter}')")
-                                    cursor.execute(f"DELETE FROM T_ITEM_BATADC WHERE SNumber IN ('{snumber_filter}')")
-                                    
-                                    # 마스터 데이터 삭제
-                                    cursor.execute(f"DELETE FROM T_MASTER_DATA WHERE WEEK_NO IN ('{week_filter}')")
-                                
-                                # FOREIGN KEY 제약조건 다시 활성화
-                                cursor.execute("PRAGMA foreign_keys = ON;")
-                                
-                                conn_del.commit()
-                                conn_del.close()
-                                
-                                st.success(f"✅ 선택한 주차({', '.join(selected_weeks)})의 데이터가 삭제되었습니다.")
-                                st.info("페이지를 새로고침하세요.")
-                                
-                                if st.button("🔄 새로고침"):
-                                    st.rerun()
-                                    
-                            except Exception as e:
-                                st.error(f"❌ 데이터 삭제 실패: {e}")
-                                import traceback
-                                st.code(traceback.format_exc())
+                        delete_job = get_session_job('delete')
+                        delete_running = delete_job is not None and delete_job['status'] not in job_runner.FINISHED_STATES
+                        if st.button("🗑️ 선택한 주차 데이터 삭제", type="secondary", disabled=delete_running):
+                            # T_ITEM_* / T_MASTER_DATA 및 Parquet 미러의 해당 WEEK_NO 파티션 삭제 (백그라운드 작업)
+                            clear_session_job('delete')
+                            submit_session_job('delete', 'delete', f"주차 삭제: {', '.join(selected_weeks)}",
+                                               delete_weeks_job, list(selected_weeks), writes_db=True)
                 
         except Exception as e:
             st.error(f"❌ WEEK_NO 조회 실패: {e}")
+        
+        # 삭제 작업 진행 상황 / 결과 (완료되면 DB 세대가 바뀌어 주차 목록도 자동으로 갱신됩니다)
+        delete_job = get_session_job('delete')
+        if delete_job is not None:
+            st.markdown("---")
+            st.markdown("### ⏳ 삭제 작업")
+            show_session_job(delete_job, 'delete')
+            if delete_job['status'] == job_runner.DONE:
+                st.success(f"✅ {delete_job['label']} 완료")
+            if delete_job['status'] in job_runner.FINISHED_STATES and st.button("닫기", key='close_delete_job'):
+                clear_session_job('delete')
+                st.rerun()
 
 
 if __name__ == "__main__":
@@ -1,37 +1,25 @@
 import streamlit as st
-import pymysql # 또는 사용하는 데이터베이스에 맞는 라이브러리 (psycopg2, sqlalchemy 등)
+from storage import MySQLStorage
 
-# secrets.toml에 저장된 정보 불러오기
-DB_HOST = st.secrets["db_credentials"]["DB_HOST"]
-DB_PORT = st.secrets["db_credentials"]["DB_PORT"]
-DB_USER = st.secrets["db_credentials"]["DB_USER"]
-DB_PASSWORD = st.secrets["db_credentials"]["DB_PASSWORD"]
+# secrets.toml에 저장된 정보 불러오기 (DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME)
+credentials = st.secrets["db_credentials"]
 
 st.write("데이터베이스 연결 정보 불러오기 완료!")
 
+@st.cache_resource
+def get_storage():
+    # 연결 풀은 프로세스에서 1개만 만들고 재실행/세션 간에 재사용합니다.
+    return MySQLStorage.from_credentials(credentials)
+
 try:
-    # 데이터베이스 연결
-    connection = pymysql.connect(
-        host=DB_HOST,
-        port=DB_PORT,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        cursorclass=pymysql.cursors.DictCursor
-    )
+    # 데이터베이스 연결 (풀에서 빌리고, 블록이 끝나면 풀로 돌려줍니다)
+    storage = get_storage()
+    with storage.connect() as conn:
+        message = conn.execute("SELECT 'Hello, World!' AS message").fetchone()[0]
 
     st.success("데이터베이스에 성공적으로 연결되었습니다.")
-
-    # 연결 테스트 (예시: 쿼리 실행)
-    # with connection.cursor() as cursor:
-    #    sql = "SELECT 'Hello, World!' as message"
-    #    cursor.execute(sql)
-    #    result = cursor.fetchone()
-    #    st.write(result['message'])
+    st.write(message)
+    st.info(f"연결 풀: {storage!r}")
 
 except Exception as e:
     st.error(f"데이터베이스 연결에 실패했습니다: {e}")
-
-finally:
-    if 'connection' in locals() and connection.open:
-        connection.close()
-        st.info("데이터베이스 연결이 종료되었습니다.")
@@ -1,18 +1,16 @@
 import streamlit as st
-import pymysql
+from storage import MySQLStorage
 
+@st.cache_resource
 def connect_to_db():
-    conn = pymysql.connect(
-        host=st.secrets["db_credentials"]["DB_HOST"],
-        port=st.secrets["db_credentials"]["DB_PORT"],
-        user=st.secrets["db_credentials"]["DB_USER"],
-        password=st.secrets["db_credentials"]["DB_PASSWORD"]
-    )
-    return conn
+    # 재실행마다 새 연결을 만들지 않도록 연결 풀을 가진 저장소를 프로세스에서 1개만 만듭니다.
+    return MySQLStorage.from_credentials(st.secrets["db_credentials"])
 
 try:
-    conn = connect_to_db()
+    storage = connect_to_db()
+    with storage.connect() as conn:
+        conn.execute("SELECT 1").fetchone()
     st.success("데이터베이스에 성공적으로 연결되었습니다!")
-    # ... 여기에 데이터프레임을 처리하는 로직을 추가합니다. ...
+    # ... 여기에 데이터프레임을 처리하는 로직을 추가합니다. (storage.read_frame / storage.iter_frames) ...
 except Exception as e:
     st.error(f"연결 실패: {e}")
@@ -0,0 +1,100 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from datetime import date
+from typing import Dict, Any, List, Optional
+
+from data_token import get_data_token
+
+# 큐브의 metric 축 순서 (analyze_* 함수가 summary_data[jig][date_iso]에 저장하는 키)
+CUBE_METRICS = [
+    'total_test', 'pass', 'false_defect', 'true_defect', 'fail',
+    'false_defect_미달', 'false_defect_초과', 'false_defect_제외',
+    'true_defect_미달', 'true_defect_초과', 'true_defect_제외',
+]
+METRIC_INDEX = {name: i for i, name in enumerate(CUBE_METRICS)}
+
+
+def build_summary_cube(summary_data: Dict, all_dates: List[date]) -> Dict[str, Any]:
+    """
+    summary_data(jig → date_iso → 집계)를 날짜 × Jig × metric 의 dense NumPy 큐브로 변환합니다.
+    분석 직후 한 번만 생성하며, 이후 기간/Jig 집계는 슬라이스 합으로 처리합니다.
+    """
+    dates = sorted(all_dates)
+    date_days = np.array([np.datetime64(d, 'D') for d in dates], dtype='datetime64[D]').astype(np.int64)
+    date_pos = {d.strftime('%Y-%m-%d'): i for i, d in enumerate(dates)}
+
+    jigs = sorted(summary_data.keys(), key=str)
+    jig_pos = {jig: i for i, jig in enumerate(jigs)}
+
+    cube = np.zeros((len(dates), len(jigs), len(CUBE_METRICS)), dtype=np.int64)
+    for jig, per_date in summary_data.items():
+        j = jig_pos[jig]
+        for date_iso, data_point in per_date.items():
+            d = date_pos.get(date_iso)
+            if d is None:
+                continue
+            cube[d, j, :] = [data_point.get(m, 0) for m in CUBE_METRICS]
+
+    return {
+        'cube': cube,
+        'dates': dates,
+        'date_days': date_days,
+        'jigs': jigs,
+        'jig_pos': jig_pos,
+    }
+
+
+def get_summary_cube(analysis_key: str, summary_data: Dict, all_dates: List[date]) -> Dict[str, Any]:
+    """세션 상태에 캐싱된 큐브를 반환합니다. 데이터 토큰이 바뀌면(새 업로드/분석) 다시 생성합니다."""
+    state_key = f'summary_cube_{analysis_key}'
+    cached = st.session_state.get(state_key)
+    token = get_data_token(analysis_key)
+
+    if cached is None or cached.get('token') != token:
+        cached = build_summary_cube(summary_data, all_dates)
+        cached['token'] = token
+        st.session_state[state_key] = cached
+    return cached
+
+
+def slice_cube(cube_data: Dict[str, Any], start_date: date, end_date: date, jigs: Optional[List[Any]] = None):
+    """
+    기간 [start_date, end_date]와 Jig 부분집합에 해당하는 큐브 조각을 반환합니다.
+    반환: (날짜 목록, Jig 목록, 부분 큐브[날짜, Jig, metric])
+    """
+    date_days = cube_data['date_days']
+    lo = int(np.searchsorted(date_days, np.datetime64(start_date, 'D').astype(np.int64), side='left'))
+    hi = int(np.searchsorted(date_days, np.datetime64(end_date, 'D').astype(np.int64), side='right'))
+
+    if jigs is None:
+        jig_names = cube_data['jigs']
+        sub = cube_data['cube'][lo:hi]
+    else:
+        jig_names = [jig for jig in jigs if jig in cube_data['jig_pos']]
+        jig_idx = [cube_data['jig_pos'][jig] for jig in jig_names]
+        sub = cube_data['cube'][lo:hi][:, jig_idx, :]
+
+    return cube_data['dates'][lo:hi], jig_names, sub
+
+
+def daily_totals(cube_data: Dict[str, Any], start_date: date, end_date: date, jigs: Optional[List[Any]] = None) -> pd.DataFrame:
+    """기간/Jig 조건의 날짜별 합계 (index: 날짜, columns: CUBE_METRICS)"""
+    dates, _, sub = slice_cube(cube_data, start_date, end_date, jigs)
+    return pd.DataFrame(sub.sum(axis=1), index=dates, columns=CUBE_METRICS)
+
+
+def cube_to_frame(cube_data: Dict[str, Any], start_date: date, end_date: date, jigs: Optional[List[Any]] = None) -> pd.DataFrame:
+    """
+    기간/Jig 조건의 (Date, Jig) 단위 long-format DataFrame을 반환합니다.
+    total_test가 0인 셀(해당 Jig의 데이터가 없는 날짜)은 제외합니다.
+    """
+    dates, jig_names, sub = slice_cube(cube_data, start_date, end_date, jigs)
+    if sub.size == 0:
+        return pd.DataFrame(columns=['Date', 'Jig'] + CUBE_METRICS)
+
+    d_idx, j_idx = np.nonzero(sub[:, :, METRIC_INDEX['total_test']])
+    df = pd.DataFrame(sub[d_idx, j_idx, :], columns=CUBE_METRICS)
+    df.insert(0, 'Jig', [jig_names[j] for j in j_idx])
+    df.insert(0, 'Date', [dates[d] for d in d_idx])
+    return df
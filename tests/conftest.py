@@ -0,0 +1,47 @@
+# tests/conftest.py
+# 공용 픽스처: 저장소 루트를 import 경로에 추가하고, 합성 TM2360E 데이터(benchmarks.synthetic)를 한 번만 생성합니다.
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+SYNTHETIC_ROWS = 3000
+
+
+@pytest.fixture(scope='session')
+def synthetic_paths(tmp_path_factory):
+    """공정별 내보내기 CSV와 DB 적재용 통합 CSV 경로 {이름: 경로} (세션 당 1회 생성)"""
+    from benchmarks.synthetic import write_exports
+    return write_exports(str(tmp_path_factory.mktemp('synthetic')), SYNTHETIC_ROWS, seed=0)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'quality.db')
+
+
+@pytest.fixture
+def session_state():
+    """Streamlit bare 모드의 session_state (테스트마다 비움)"""
+    import streamlit as st
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    st.session_state['analysis_results'] = {}
+    yield st.session_state
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+
+@pytest.fixture(scope='session')
+def loaded_db(synthetic_paths, tmp_path_factory):
+    """합성 DB 적재 CSV를 적재한 SQLite DB 경로 (세션 당 1회 적재 - 테스트에서 수정하지 마세요)"""
+    from db_ingest import process_and_save_csv_stream_to_db
+    path = str(tmp_path_factory.mktemp('loaded') / 'quality.db')
+    result = process_and_save_csv_stream_to_db(synthetic_paths['db'], path)
+    assert result['success'], result.get('error')
+    return path
@@ -0,0 +1,66 @@
+# tests/test_analysis_storage.py
+# 기간별 분석(analyze_period)이 storage 저장소를 통해 읽는지 확인합니다.
+# SQLite가 아닌 저장소는 SQLite 파일을 그대로 빌려주는 테스트용 Storage로 대신합니다. (MySQL 서버 없이 확인)
+
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+
+from quality_core.analysis import analyze_period
+from quality_core.diagnostics import WARNING
+from storage import Storage
+
+START, END = datetime(2025, 10, 1), datetime(2025, 10, 14)
+
+
+class ServerLikeStorage(Storage):
+    """SQLite 파일을 읽지만 SQLiteStorage가 아닌 저장소 (서버 백엔드처럼 취급됩니다)"""
+
+    dialect = 'server'
+
+    def __init__(self, db_file_name):
+        self.db_file_name = db_file_name
+        self.name = f"server://{db_file_name}"
+
+    @contextmanager
+    def connect(self):
+        conn = sqlite3.connect(self.db_file_name)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+def _analyze(target, tmp_path, data_source='SQLite', engine='pandas', item='pcb'):
+    return analyze_period(START, END, item, 0, '전체', '전체', data_source, engine, target,
+                          str(tmp_path / 'reports'), str(tmp_path / 'mirror'))
+
+
+def _warnings(result):
+    return [m['message'] for m in result['diagnostics'].messages if m['level'] == WARNING]
+
+
+@pytest.mark.parametrize('item', ['pcb', 'fw', 'rftx'])
+def test_storage_backend_matches_sqlite_path(loaded_db, tmp_path, item):
+    expected = _analyze(loaded_db, tmp_path, item=item)
+    actual = _analyze(ServerLikeStorage(loaded_db), tmp_path, item=item)
+    assert expected['daily'] and actual['traceback'] is None
+    assert actual['daily'].keys() == expected['daily'].keys()
+    for day, (count, table) in expected['daily'].items():
+        assert actual['daily'][day][0] == count
+        assert actual['daily'][day][1].equals(table)
+
+
+@pytest.mark.parametrize('data_source, engine', [('Parquet', 'pandas'), ('SQLite', 'DuckDB')])
+def test_file_only_accelerators_fall_back_on_server_storage(loaded_db, tmp_path, data_source, engine):
+    result = _analyze(ServerLikeStorage(loaded_db), tmp_path, data_source=data_source, engine=engine)
+    assert result['daily']
+    assert any('SERVER' in message for message in _warnings(result))
+
+
+def test_unreachable_storage_reports_error(tmp_path):
+    result = _analyze(str(tmp_path / 'missing.db'), tmp_path)
+    assert result['daily'] is None
+    assert result['diagnostics'].has_errors
@@ -0,0 +1,72 @@
+# tests/test_data_token.py
+# 분석 결과 객체에 묶인 데이터 토큰과, 토큰으로 캐시하는 필터 인덱스/SNumber 인덱스/요약 큐브의 갱신 여부를 확인합니다.
+
+from datetime import date
+
+import pandas as pd
+
+from analysis_utils import get_filter_index
+from data_token import get_data_token, new_data_token
+from df_search import get_snumber_index
+from summary_cube import get_summary_cube
+
+PROPS = {'jig_col': 'PcbMaxIrPwr', 'timestamp_col': 'PcbStartTime'}
+
+
+def _upload(snumbers):
+    return pd.DataFrame({
+        'SNumber': snumbers,
+        'PcbMaxIrPwr': ['J1', 'J2', 'J1'][:len(snumbers)],
+        'PcbStartTime': ['2025-10-01 10:00:00', '2025-10-02 10:00:00', '2025-10-03 10:00:00'][:len(snumbers)],
+    })
+
+
+def test_token_is_stable_for_same_result_object(session_state):
+    session_state['analysis_results']['pcb'] = _upload(['A1', 'A2', 'A3'])
+    assert get_data_token('pcb') == get_data_token('pcb')
+
+
+def test_token_changes_when_result_object_is_replaced(session_state):
+    session_state['analysis_results']['pcb'] = _upload(['A1', 'A2', 'A3'])
+    first = get_data_token('pcb')
+    session_state['analysis_results']['pcb'] = _upload(['A1', 'A2', 'A3'])
+    assert get_data_token('pcb') != first
+
+
+def test_new_data_token_forces_refresh(session_state):
+    session_state['analysis_results']['pcb'] = _upload(['A1', 'A2', 'A3'])
+    first = get_data_token('pcb')
+    assert new_data_token('pcb') != first
+    assert get_data_token('pcb') != first
+
+
+def test_tokens_are_per_analysis_key(session_state):
+    session_state['analysis_results']['pcb'] = _upload(['A1'])
+    session_state['analysis_results']['fw'] = _upload(['A1'])
+    assert get_data_token('pcb') != get_data_token('fw')
+
+
+def test_caches_rebuild_after_reupload_with_same_row_count(session_state):
+    """진입 앱이 new_data_token을 호출하지 않고 결과만 교체해도 파생 캐시가 새 업로드를 반영해야 합니다."""
+    first = _upload(['A1', 'A2', 'A3'])
+    session_state['analysis_results']['pcb'] = first
+    filter_index = get_filter_index('pcb', first, PROPS)
+    assert get_filter_index('pcb', first, PROPS) is filter_index
+    assert set(get_snumber_index('pcb', first)['values']) == {'A1', 'A2', 'A3'}
+
+    second = _upload(['B1', 'B2', 'B3'])
+    session_state['analysis_results']['pcb'] = second
+    assert set(get_filter_index('pcb', second, PROPS)['df_sorted']['SNumber']) == {'B1', 'B2', 'B3'}
+    assert set(get_snumber_index('pcb', second)['values']) == {'B1', 'B2', 'B3'}
+
+
+def test_summary_cube_rebuilds_after_reanalysis(session_state):
+    dates = [date(2025, 10, 1)]
+    session_state['analysis_results']['pcb'] = _upload(['A1'])
+    cube = get_summary_cube('pcb', {'J1': {'2025-10-01': {'total_test': 5}}}, dates)
+    assert get_summary_cube('pcb', {'J1': {'2025-10-01': {'total_test': 5}}}, dates) is cube
+
+    session_state['analysis_results']['pcb'] = _upload(['A1'])
+    rebuilt = get_summary_cube('pcb', {'J9': {'2025-10-01': {'total_test': 7}}}, dates)
+    assert rebuilt['jigs'] == ['J9']
+    assert int(rebuilt['cube'].sum()) == 7
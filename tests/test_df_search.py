@@ -0,0 +1,57 @@
+# tests/test_df_search.py
+# SNumber 검색 인덱스(match_snumbers)가 기존 str.contains(query, case=False) 검색과 같은 행을 찾는지 확인합니다.
+
+import pandas as pd
+import pytest
+
+from df_search import build_snumber_index, match_snumbers
+
+SNUMBERS = [
+    'ABC1001', 'abc1002', 'XABC2001', 'AB-3001', 'ABD4001', 'ZZ9999', 'A.C5001', 'aXc6001',
+    'P1234567', 'P12345', 'Q0000', 'AB*', 'abc', None, 'ÄBC7001', 'abc1001',
+]
+
+QUERIES = [
+    'abc', 'ABC', 'ABC*', 'AB*', 'ab', '^ab', 'c$', '1$', 'a.c', 'A\\.C', '[0-9]{5}', '^p\\d+7$',
+    'x|zz', '(?:ab)+c', 'b?c1', '-', 'AB-', '9999', 'nomatch', 'äbc', 'Ä',
+]
+
+
+def _frame():
+    return pd.DataFrame({'SNumber': pd.array(SNUMBERS * 3, dtype='string'), 'Row': range(len(SNUMBERS) * 3)})
+
+
+def _baseline_rows(df, query):
+    return df[df['SNumber'].str.contains(query, na=False, case=False)]
+
+
+def _index_rows(df, query):
+    return df[df['SNumber'].isin(match_snumbers(build_snumber_index(df), query))]
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_index_matches_str_contains(query):
+    df = _frame()
+    pd.testing.assert_frame_equal(_index_rows(df, query), _baseline_rows(df, query))
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_numpy_fallback_matches_str_contains(query):
+    """pyarrow가 없을 때의 NumPy 부분 문자열 검색도 같은 결과여야 합니다."""
+    df = _frame()
+    index = build_snumber_index(df)
+    index['lower_arrow'] = None
+    matched = match_snumbers(index, query)
+    pd.testing.assert_frame_equal(df[df['SNumber'].isin(matched)], _baseline_rows(df, query))
+
+
+def test_trailing_star_is_a_regex_quantifier():
+    """'ABC*'는 접두어 검색이 아니라 'AB' 뒤에 C가 0개 이상인 정규식입니다."""
+    matched = set(match_snumbers(build_snumber_index(_frame()), 'ABC*'))
+    assert {'AB-3001', 'ABD4001', 'XABC2001'} <= matched
+
+
+def test_invalid_pattern_falls_back_to_substring():
+    df = pd.DataFrame({'SNumber': ['A(1', 'B(2', 'A1']})
+    assert list(match_snumbers(build_snumber_index(df), 'A(')) == ['A(1']
+
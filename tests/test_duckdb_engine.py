@@ -0,0 +1,34 @@
+# tests/test_duckdb_engine.py
+# DuckDB 엔진과 SQLite(pandas) 경로의 분류/일자 집계가 같은지 (duckdb_engine.check_engine_parity),
+# 연결을 만들다 실패하면 DuckDB 연결을 닫는지 확인합니다.
+
+import pytest
+
+duckdb = pytest.importorskip('duckdb')
+
+import duckdb_engine
+
+
+def test_engine_parity(tmp_path):
+    result = duckdb_engine.check_engine_parity(str(tmp_path))
+    assert result['success'], result['log']
+
+
+def test_failed_attach_closes_connection(tmp_path, monkeypatch):
+    opened = []
+    real_connect = duckdb.connect
+
+    def tracking_connect(*args, **kwargs):
+        con = real_connect(*args, **kwargs)
+        opened.append(con)
+        return con
+
+    monkeypatch.setattr(duckdb_engine.duckdb, 'connect', tracking_connect)
+    # 존재하지 않는 DB를 ATTACH (sqlite 확장을 받을 수 없는 환경에서는 INSTALL 단계에서 실패)
+    with pytest.raises(Exception):
+        duckdb_engine._get_connection(str(tmp_path / 'missing' / 'none.db'), 'sqlite', str(tmp_path))
+
+    assert len(opened) == 1
+    with pytest.raises(duckdb.ConnectionException):
+        opened[0].execute("SELECT 1")
+    assert not any(key[0].endswith('none.db') for key in duckdb_engine._connections)
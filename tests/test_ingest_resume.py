@@ -0,0 +1,134 @@
+# tests/test_ingest_resume.py
+# 청크 단위 CSV 적재의 재개(T_INGEST_LOG)와 주차 삭제 후 재적재, Parquet 미러 일치 여부를 확인합니다.
+
+import os
+import sqlite3
+
+import pytest
+
+from db_ingest import ITEM_TABLE_SPECS, delete_weeks_from_db, process_and_save_csv_stream_to_db
+
+CHUNK_ROWS = 700
+TABLES = ['T_MASTER_DATA'] + [spec[1] for spec in ITEM_TABLE_SPECS]
+
+
+def _counts(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLES}
+    finally:
+        conn.close()
+
+
+def _ingest_log_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM T_INGEST_LOG").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _ingest(csv_path, db_path, **kwargs):
+    result = process_and_save_csv_stream_to_db(csv_path, db_path, chunk_rows=CHUNK_ROWS, source_key='src', **kwargs)
+    assert result['success'], result.get('error')
+    return result
+
+
+def _weeks(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [row[0] for row in conn.execute("SELECT DISTINCT WEEK_NO FROM T_MASTER_DATA ORDER BY WEEK_NO")]
+    finally:
+        conn.close()
+
+
+def test_completed_ingest_clears_log(synthetic_paths, db_path):
+    _ingest(synthetic_paths['db'], db_path)
+    assert _ingest_log_rows(db_path) == 0
+    assert _counts(db_path)['T_MASTER_DATA'] > 0
+
+
+def test_interrupted_ingest_resumes_from_log(synthetic_paths, tmp_path, db_path):
+    expected_path = str(tmp_path / 'expected.db')
+    _ingest(synthetic_paths['db'], expected_path)
+
+    def stop_after_second_chunk(chunk_no, rows_done, stats):
+        if chunk_no == 1:
+            raise RuntimeError('중단')
+
+    result = process_and_save_csv_stream_to_db(synthetic_paths['db'], db_path, chunk_rows=CHUNK_ROWS,
+                                               source_key='src', progress_callback=stop_after_second_chunk)
+    assert not result['success']
+    assert _ingest_log_rows(db_path) == 2
+
+    result = _ingest(synthetic_paths['db'], db_path)
+    assert "2개 청크 건너뜀" in result['log']
+    assert _counts(db_path) == _counts(expected_path)
+    assert _ingest_log_rows(db_path) == 0
+
+
+def test_delete_then_reimport_restores_rows(synthetic_paths, db_path):
+    _ingest(synthetic_paths['db'], db_path)
+    full = _counts(db_path)
+    weeks = _weeks(db_path)
+    assert len(weeks) > 1
+
+    # 중단된 다른 적재의 이력이 남아 있어도 주차 삭제가 지웁니다.
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO T_INGEST_LOG (Source_Key, Chunk_No, Row_Count, Done_At) VALUES ('src', 0, 1, '')")
+    conn.commit()
+    conn.close()
+
+    deleted = delete_weeks_from_db(db_path, weeks[-1:])
+    assert deleted['T_MASTER_DATA'] > 0
+    assert deleted['T_INGEST_LOG'] == 1
+    assert _counts(db_path)['T_MASTER_DATA'] == full['T_MASTER_DATA'] - deleted['T_MASTER_DATA']
+
+    result = _ingest(synthetic_paths['db'], db_path)
+    assert "건너뜀" not in result['log']
+    assert _counts(db_path) == full
+
+
+def test_mirror_matches_db_after_delete_and_reimport(synthetic_paths, tmp_path, db_path):
+    ds = pytest.importorskip('pyarrow.dataset')
+    import parquet_mirror
+
+    mirror_dir = str(tmp_path / 'mirror')
+
+    def mismatches():
+        conn = sqlite3.connect(db_path)
+        try:
+            result = {}
+            for table in parquet_mirror.MIRROR_TABLES:
+                table_dir = os.path.join(mirror_dir, table)
+                n_db = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                n_mirror = ds.dataset(table_dir, format='parquet', partitioning='hive').count_rows() \
+                    if os.path.isdir(table_dir) else 0
+                if n_db != n_mirror:
+                    result[table] = (n_db, n_mirror)
+            return result
+        finally:
+            conn.close()
+
+    _ingest(synthetic_paths['db'], db_path, mirror_dir=mirror_dir)
+    assert mismatches() == {}
+
+    delete_weeks_from_db(db_path, _weeks(db_path)[-1:], mirror_dir)
+    assert mismatches() == {}
+
+    _ingest(synthetic_paths['db'], db_path, mirror_dir=mirror_dir)
+    assert mismatches() == {}
+
+
+def test_batch_ingest_clears_log_and_reimports_after_delete(synthetic_paths, db_path):
+    from batch_ingest import ingest_files
+
+    result = ingest_files([synthetic_paths['db']], db_path, chunk_rows=CHUNK_ROWS, log=lambda message: None)
+    assert result['success']
+    assert _ingest_log_rows(db_path) == 0
+    full = _counts(db_path)
+
+    delete_weeks_from_db(db_path, _weeks(db_path)[-1:])
+    result = ingest_files([synthetic_paths['db']], db_path, chunk_rows=CHUNK_ROWS, log=lambda message: None)
+    assert result['files'][0]['skipped_chunks'] == 0
+    assert _counts(db_path) == full
@@ -0,0 +1,64 @@
+# tests/test_traceability.py
+# T_ATTEMPT_INDEX의 시도 순서가 스테이션 검사 회차(ICount)를 따르고, ICount가 없으면 검사 시각 순서로 매겨지는지 확인합니다.
+
+import sqlite3
+
+import pandas as pd
+
+from db_ingest import create_initial_db_schema, process_and_save_csv_to_db
+
+
+def _fw_frame(snumber, icounts, hours, results):
+    return pd.DataFrame({
+        'SNumber': [snumber] * len(hours),
+        'ICount': icounts,
+        'Stamp': [20251001080000] * len(hours),
+        'FwStamp': [20251001000000 + h * 10000 for h in hours],
+        'FwPass': results,
+        'FwPC': [f'PC{i}' for i in range(len(hours))],
+    })
+
+
+def _attempts(db_path, snumber):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT substr(Test_Time, 12, 2), Attempt_No, Result, Is_First, Is_Last FROM T_ATTEMPT_INDEX "
+            "WHERE SNumber = ? AND Stage = 'fw' ORDER BY Attempt_No", (snumber,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_attempts_follow_icount_when_clock_disagrees(db_path):
+    # 11시 검사가 1회차, 10시 검사가 2회차 (스테이션 시계 보정 등)
+    result = process_and_save_csv_to_db(_fw_frame('S1', [2, 1, 3], [10, 11, 12], ['X', 'X', 'O']), db_path)
+    assert result['success'], result.get('error')
+    assert _attempts(db_path, 'S1') == [('11', 1, 'x', 1, 0), ('10', 2, 'x', 0, 0), ('12', 3, 'o', 0, 1)]
+
+
+def test_attempts_fall_back_to_time_without_icount(db_path):
+    frame = _fw_frame('S2', [None, None, None], [12, 10, 11], ['O', 'X', 'X'])
+    assert process_and_save_csv_to_db(frame, db_path)['success']
+    assert [row[:2] for row in _attempts(db_path, 'S2')] == [('10', 1), ('11', 2), ('12', 3)]
+
+
+def test_partially_missing_icount_uses_time_for_that_unit(db_path):
+    frame = _fw_frame('S3', [3, None, 1], [10, 11, 12], ['X', 'X', 'O'])
+    assert process_and_save_csv_to_db(frame, db_path)['success']
+    assert [row[:2] for row in _attempts(db_path, 'S3')] == [('10', 1), ('11', 2), ('12', 3)]
+
+
+def test_existing_item_tables_get_icount_column(db_path):
+    """ICount 컬럼이 없던 DB도 스키마 확인 때 컬럼이 추가되고, 기존 행은 검사 시각 순서로 매겨집니다."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE T_MASTER_DATA (SNumber TEXT PRIMARY KEY, ICount INTEGER, Stamp TEXT, WEEK_NO TEXT)")
+    conn.execute("CREATE TABLE T_ITEM_FW (SNumber TEXT, FwStamp TEXT, FwPC TEXT, FwWrMAC TEXT, FwFile TEXT, FwPass TEXT, "
+                 "PRIMARY KEY (SNumber, FwStamp))")
+    conn.executemany("INSERT INTO T_ITEM_FW (SNumber, FwStamp, FwPC, FwPass) VALUES (?, ?, ?, ?)",
+                     [('S4', '2025-10-01 11:00:00', 'PC1', 'o'), ('S4', '2025-10-01 10:00:00', 'PC0', 'x')])
+    conn.commit()
+    create_initial_db_schema(conn.cursor(), conn)
+    assert 'ICount' in [row[1] for row in conn.execute("PRAGMA table_info(T_ITEM_FW)")]
+    conn.close()
+    assert _attempts(db_path, 'S4') == [('10', 1, 'x', 1, 0), ('11', 2, 'o', 0, 1)]
@@ -0,0 +1,459 @@
+# traceability.py
+# SNumber 단위 공정 이력(Pcb → Semi → Fw → RfTx → Batadc) 추적.
+#   - T_UNIT_STATUS: SNumber별 공정마다 최신 검사 시각/결과/검사 횟수와 공정 상태 비트맵을 미리 계산해 둔 테이블
+#       (T_ATTEMPT_INDEX의 공정별 마지막 시도 행으로 만듭니다)
+#       Seen_Mask / Pass_Mask / Fail_Mask : 공정 비트(Pcb=1, Semi=2, Fw=4, RfTx=8, Batadc=16)의 OR (최신 결과 기준)
+#       Status_Code = Pass_Mask | (Fail_Mask << 5) : 조건을 만족하는 코드 목록을 IN 으로 찾도록 인덱스를 둡니다.
+#   - T_ATTEMPT_INDEX: (SNumber, 공정)별 검사 시도 순서(스테이션 검사 회차 ICount, 없으면 검사 시각). 검사 행마다 시도 번호/전체 시도 수/직전 시도와의 간격(초)/
+#       지그(PC) 변경 여부/첫 시도 지그·결과/첫·마지막 시도 플래그를 둡니다.
+#       재검사율, 첫 시도 합격률(FPY), "다른 지그에서 재검사 후 합격"을 Is_Last 행의 조건 합계로 바로 구합니다.
+#   - 적재 청크/동기화 배치는 SNumber를 T_TRACE_PENDING에 표시만 하고(청크와 함께 커밋), 파일·동기화가 끝날 때
+#     flush_pending()이 표시된 SNumber를 한 번씩 다시 계산합니다. (여러 청크에 걸친 SNumber의 중복 계산 방지,
+#     중단된 적재의 남은 표시는 다음 스키마 확인 때 처리) 주차 삭제는 해당 SNumber의 행을 지웁니다.
+#     다시 계산한 시도의 PASS 행은 Jig PASS 이력(jig_history.T_JIG_PASS)에도 추가하고, 주차 삭제 시 함께 지웁니다.
+#   - 조건 조회("이번 주 PCB 통과 후 RfTx 불합격")는 Status_Code 인덱스 + 시각 범위로,
+#     이력 조회는 T_ITEM_* 기본 키(SNumber, 시각)로 찾으므로 전체 스캔이 없습니다.
+#
+#   codes = find_units(conn, passed=['pcb'], failed=['rftx'], start='2025-10-13 00:00:00', end='2025-10-19 23:59:59')
+#   history = unit_history(conn, codes['SNumber'])
+#   retest = retest_summary(conn, 'rftx', '2025-10-13 00:00:00', '2025-10-19 23:59:59', by_jig=True)
+
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from jig_history import JIG_PASS_VERSION, create_jig_pass_schema, jig_pass_version, rebuild_jig_passes, record_attempt_passes
+
+# (키, 표시 이름, 테이블, 시간 컬럼, Pass 컬럼, PC 컬럼) - 공정 순서대로
+STAGES = [
+    ('pcb', 'Pcb', 'T_ITEM_PCB', 'PcbStartTime', 'PcbPass', 'pcbPC'),
+    ('semi', 'Semi', 'T_ITEM_SEMI', 'SemiAssyStartTime', 'SemiAssyPass', 'semiPC'),
+    ('fw', 'Fw', 'T_ITEM_FW', 'FwStamp', 'FwPass', 'FwPC'),
+    ('rftx', 'RfTx', 'T_ITEM_RFTX', 'RfTxStamp', 'RfTxPass', 'RfTxPC'),
+    ('batadc', 'Batadc', 'T_ITEM_BATADC', 'BatadcStamp', 'BatadcPass', 'BatadcPC'),
+]
+STAGE_KEYS = [stage[0] for stage in STAGES]
+STAGE_NAMES = {stage[0]: stage[1] for stage in STAGES}
+STAGE_BITS = {stage[0]: 1 << i for i, stage in enumerate(STAGES)}
+ALL_STAGES_MASK = (1 << len(STAGES)) - 1
+
+# T_ITEM_* 의 Pass 컬럼은 적재 시 소문자로 정규화됩니다. (o: PASS, x: FAIL)
+PASS_VALUE = 'o'
+FAIL_VALUE = 'x'
+
+UNIT_STATUS_TABLE = 'T_UNIT_STATUS'
+ATTEMPT_TABLE = 'T_ATTEMPT_INDEX'
+# SNumber 단위로 다시 계산되는 파생 테이블 (주차 삭제 시 함께 지웁니다)
+# (계산 순서: T_UNIT_STATUS는 T_ATTEMPT_INDEX의 마지막 시도 행으로 만듭니다)
+DERIVED_TABLES = [ATTEMPT_TABLE, UNIT_STATUS_TABLE]
+PENDING_TABLE = 'T_TRACE_PENDING'
+_KEYS_TABLE = 'temp._unit_keys'
+# flush_pending 한 번에 다시 계산하고 커밋하는 SNumber 수
+PENDING_FLUSH_BATCH = 20000
+# 갱신 대기 SNumber가 기존 SNumber 수의 이 비율 이상이면 키 단위 갱신 대신 전체를 다시 계산합니다. (첫 적재 등)
+FULL_REBUILD_RATIO = 0.5
+
+
+def _stage_columns(name: str) -> List[str]:
+    return [f'{name}_Time', f'{name}_Result', f'{name}_Tests']
+
+
+UNIT_STATUS_COLUMNS = (
+    ['SNumber']
+    + [col for _, name, _, _, _, _ in STAGES for col in _stage_columns(name)]
+    + ['Seen_Mask', 'Pass_Mask', 'Fail_Mask', 'Status_Code', 'Last_Time', 'WEEK_NO']
+)
+
+ATTEMPT_COLUMNS = [
+    'SNumber', 'Stage', 'Test_Time', 'Attempt_No', 'Attempt_Count', 'Gap_Seconds', 'PC', 'Prev_PC', 'Jig_Changed',
+    'First_PC', 'First_Result', 'Result', 'Is_First', 'Is_Last'
+]
+
+
+def create_unit_status_schema(cursor) -> None:
+    """T_UNIT_STATUS 테이블과 조회 인덱스를 만듭니다. (커밋은 호출 측 담당)"""
+    stage_defs = ',\n'.join(
+        f"            {name}_Time TEXT, {name}_Result TEXT, {name}_Tests INTEGER" for _, name, _, _, _, _ in STAGES
+    )
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {UNIT_STATUS_TABLE} (
+            SNumber TEXT PRIMARY KEY,
+{stage_defs},
+            Seen_Mask INTEGER,
+            Pass_Mask INTEGER,
+            Fail_Mask INTEGER,
+            Status_Code INTEGER,
+            Last_Time TEXT,
+            WEEK_NO TEXT
+        );
+    """)
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS IX_{UNIT_STATUS_TABLE}_Status ON {UNIT_STATUS_TABLE} (Status_Code, Last_Time)")
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS IX_{UNIT_STATUS_TABLE}_Last ON {UNIT_STATUS_TABLE} (Last_Time)")
+
+
+def create_attempt_schema(cursor) -> None:
+    """T_ATTEMPT_INDEX 테이블과 조회 인덱스를 만듭니다. (커밋은 호출 측 담당)"""
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {ATTEMPT_TABLE} (
+            SNumber TEXT,
+            Stage TEXT,
+            Test_Time TEXT,
+            Attempt_No INTEGER,
+            Attempt_Count INTEGER,
+            Gap_Seconds REAL,
+            PC TEXT,
+            Prev_PC TEXT,
+            Jig_Changed INTEGER,
+            First_PC TEXT,
+            First_Result TEXT,
+            Result TEXT,
+            Is_First INTEGER,
+            Is_Last INTEGER,
+            PRIMARY KEY (SNumber, Stage, Attempt_No)
+        );
+    """)
+    # 기간별 지표는 공정의 마지막 시도 행만 읽습니다.
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS IX_{ATTEMPT_TABLE}_Last ON {ATTEMPT_TABLE} (Stage, Is_Last, Test_Time)")
+
+
+def add_attempt_order_columns(cursor) -> None:
+    """
+    이미 있는 T_ITEM_* 테이블에 ICount(검사 회차) 컬럼이 없으면 추가합니다. (T_ATTEMPT_INDEX 시도 순서 기준)
+    컬럼 추가 전에 적재된 행은 NULL이라 그 (SNumber, 공정)은 검사 시각 순서로 매깁니다.
+    """
+    for _, _, table, _, _, _ in STAGES:
+        columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()]
+        if columns and 'ICount' not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN ICount INTEGER")
+
+
+def create_traceability_schema(cursor) -> None:
+    """traceability 파생 테이블(T_UNIT_STATUS, T_ATTEMPT_INDEX)을 모두 만듭니다."""
+    add_attempt_order_columns(cursor)
+    create_unit_status_schema(cursor)
+    create_attempt_schema(cursor)
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {PENDING_TABLE} (SNumber TEXT PRIMARY KEY)")
+    create_jig_pass_schema(cursor)
+
+
+def _status_insert_sql(only_keys: bool) -> str:
+    """
+    T_ATTEMPT_INDEX의 공정별 마지막 시도 행(Is_Last)을 SNumber 단위로 펼쳐 T_UNIT_STATUS에 넣는 INSERT ... SELECT.
+    only_keys=True 이면 임시 키 테이블의 SNumber만, False 이면 전체를 계산합니다. (T_ATTEMPT_INDEX를 먼저 갱신해야 합니다)
+    """
+    key_filter = f"AND SNumber IN (SELECT SNumber FROM {_KEYS_TABLE})" if only_keys else ''
+    pivot = ', '.join(
+        f"MAX(CASE WHEN Stage = '{key}' THEN Test_Time END) AS {name}_Time, "
+        f"MAX(CASE WHEN Stage = '{key}' THEN Result END) AS {name}_Result, "
+        f"MAX(CASE WHEN Stage = '{key}' THEN Attempt_Count END) AS {name}_Tests"
+        for key, name, _, _, _, _ in STAGES
+    )
+    stage_values = ', '.join(f"{name}_Time, {name}_Result, {name}_Tests" for _, name, _, _, _, _ in STAGES)
+
+    def mask(condition: str) -> str:
+        return ' | '.join(f"(CASE WHEN {condition.format(name=name)} THEN {STAGE_BITS[key]} ELSE 0 END)"
+                          for key, name, _, _, _, _ in STAGES)
+
+    seen_mask = mask("{name}_Time IS NOT NULL")
+    pass_mask = mask("{name}_Result = '" + PASS_VALUE + "'")
+    fail_mask = mask("{name}_Result = '" + FAIL_VALUE + "'")
+    last_time = "NULLIF(MAX(" + ', '.join(f"COALESCE({name}_Time, '')" for _, name, _, _, _, _ in STAGES) + "), '')"
+    columns = ', '.join(UNIT_STATUS_COLUMNS)
+    select_columns = columns.replace('Status_Code', f'Pass_Mask | (Fail_Mask << {len(STAGES)})')
+    return (
+        f"WITH s AS (SELECT SNumber, {pivot} FROM {ATTEMPT_TABLE} WHERE Is_Last = 1 {key_filter} GROUP BY SNumber) "
+        f"INSERT INTO {UNIT_STATUS_TABLE} ({columns}) "
+        f"SELECT {select_columns} FROM ("
+        f"SELECT s.SNumber, {stage_values}, "
+        f"{seen_mask} AS Seen_Mask, {pass_mask} AS Pass_Mask, {fail_mask} AS Fail_Mask, "
+        f"{last_time} AS Last_Time, m.WEEK_NO "
+        f"FROM s LEFT JOIN T_MASTER_DATA m ON m.SNumber = s.SNumber"
+        f") WHERE Seen_Mask > 0"
+    )
+
+
+def _attempt_insert_sql(only_keys: bool) -> str:
+    """
+    T_ITEM_* 검사 행에 (SNumber, 공정)별 시도 순서를 매겨 T_ATTEMPT_INDEX에 넣는 INSERT ... SELECT. (윈도 함수)
+    모든 윈도 함수가 같은 정렬(w)을 쓰도록 ROWS 프레임을 지정해 정렬을 한 번만 합니다.
+    같은 SNumber의 시도는 스테이션 검사 회차(ICount) 순서이고, 같은 회차는 검사 시각 순서입니다.
+    (SNumber, 공정)의 행 중 하나라도 ICount가 없으면(ICount 컬럼 추가 전에 적재된 행) 그 공정은 검사 시각 순서로 매깁니다.
+    Gap_Seconds / Prev_PC / Jig_Changed 는 첫 시도에서 NULL입니다.
+    """
+    key_filter = f"WHERE SNumber IN (SELECT SNumber FROM {_KEYS_TABLE})" if only_keys else 'WHERE SNumber IS NOT NULL'
+    tests = ' UNION ALL '.join(
+        f"SELECT SNumber, '{key}' AS Stage, {time_col} AS t, LOWER(TRIM({pass_col})) AS r, "
+        f"{pc_col} AS pc, ICount AS n FROM {table} {key_filter}"
+        for key, _, table, time_col, pass_col, pc_col in STAGES
+    )
+    # 시도 정렬 키: 공정의 모든 행에 ICount가 있을 때만 ICount, 아니면 NULL(→ 검사 시각만으로 정렬)
+    ordered = (
+        f"SELECT SNumber, Stage, t, r, pc, CASE WHEN MIN(n IS NOT NULL) OVER (PARTITION BY SNumber, Stage) "
+        f"THEN n END AS o FROM ({tests})"
+    )
+    columns = ', '.join(ATTEMPT_COLUMNS)
+    return (
+        f"INSERT INTO {ATTEMPT_TABLE} ({columns}) "
+        f"SELECT SNumber, Stage, Test_Time, Attempt_No, Attempt_Count, Gap_Seconds, PC, Prev_PC, "
+        f"CASE WHEN Attempt_No = 1 THEN NULL ELSE PC IS NOT Prev_PC END, "
+        f"First_PC, First_Result, Result, Attempt_No = 1, Attempt_No = Attempt_Count FROM ("
+        f"SELECT SNumber, Stage, t AS Test_Time, ROW_NUMBER() OVER w AS Attempt_No, "
+        f"COUNT(*) OVER (w ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) AS Attempt_Count, "
+        f"ROUND((julianday(t) - julianday(LAG(t) OVER w)) * 86400, 3) AS Gap_Seconds, "
+        f"pc AS PC, LAG(pc) OVER w AS Prev_PC, FIRST_VALUE(pc) OVER (w ROWS UNBOUNDED PRECEDING) AS First_PC, "
+        f"FIRST_VALUE(r) OVER (w ROWS UNBOUNDED PRECEDING) AS First_Result, r AS Result "
+        f"FROM ({ordered}) WINDOW w AS (PARTITION BY SNumber, Stage ORDER BY o, t))"
+    )
+
+
+def _load_keys(conn: sqlite3.Connection, snumbers: Iterable) -> None:
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS _unit_keys (SNumber TEXT PRIMARY KEY)")
+    conn.execute(f"DELETE FROM {_KEYS_TABLE}")
+    conn.executemany(f"INSERT OR IGNORE INTO {_KEYS_TABLE} (SNumber) VALUES (?)",
+                     ((str(sn),) for sn in snumbers if sn is not None and not pd.isna(sn)))
+
+
+# 파생 테이블 → 전체/키 단위 INSERT ... SELECT 생성 함수
+_BUILDERS = {ATTEMPT_TABLE: _attempt_insert_sql, UNIT_STATUS_TABLE: _status_insert_sql}
+
+
+def refresh_traceability(conn: sqlite3.Connection, snumbers: Optional[Iterable] = None, keys_sql: Optional[str] = None) -> int:
+    """
+    snumbers(또는 keys_sql이 돌려주는 SNumber)의 T_UNIT_STATUS / T_ATTEMPT_INDEX 행을 다시 계산합니다. (커밋은 호출 측 담당)
+    이력이 모두 삭제된 SNumber는 행이 지워집니다. 반환: 갱신 대상 SNumber 수
+    """
+    _load_keys(conn, snumbers or ())
+    if keys_sql:
+        conn.execute(f"INSERT OR IGNORE INTO {_KEYS_TABLE} (SNumber) SELECT SNumber FROM ({keys_sql}) WHERE SNumber IS NOT NULL")
+    return _refresh_loaded_keys(conn)
+
+
+def _refresh_loaded_keys(conn: sqlite3.Connection) -> int:
+    n_keys = conn.execute(f"SELECT COUNT(*) FROM {_KEYS_TABLE}").fetchone()[0]
+    if n_keys:
+        for table, build_sql in _BUILDERS.items():
+            conn.execute(f"DELETE FROM {table} WHERE SNumber IN (SELECT SNumber FROM {_KEYS_TABLE})")
+            conn.execute(build_sql(True))
+        record_attempt_passes(conn, f"SELECT SNumber FROM {_KEYS_TABLE}")
+    conn.execute(f"DELETE FROM {_KEYS_TABLE}")
+    return n_keys
+
+
+def mark_pending(conn: sqlite3.Connection, snumbers: Optional[Iterable] = None, keys_sql: Optional[str] = None) -> None:
+    """다시 계산할 SNumber를 T_TRACE_PENDING에 표시합니다. (커밋은 호출 측 담당 - 적재 청크와 같은 트랜잭션)"""
+    conn.executemany(f"INSERT OR IGNORE INTO {PENDING_TABLE} (SNumber) VALUES (?)",
+                     ((str(sn),) for sn in snumbers or () if sn is not None and not pd.isna(sn)))
+    if keys_sql:
+        conn.execute(f"INSERT OR IGNORE INTO {PENDING_TABLE} (SNumber) SELECT SNumber FROM ({keys_sql}) WHERE SNumber IS NOT NULL")
+
+
+def flush_pending(conn: sqlite3.Connection, batch_size: int = PENDING_FLUSH_BATCH) -> int:
+    """
+    T_TRACE_PENDING의 SNumber를 batch_size개씩 다시 계산하고 표시를 지운 뒤 커밋합니다. 반환: 갱신한 SNumber 수
+    대기 SNumber가 기존의 FULL_REBUILD_RATIO 이상이면 전체를 다시 계산합니다. (대부분을 지우고 다시 넣는 것보다 빠름)
+    """
+    n_pending = conn.execute(f"SELECT COUNT(*) FROM {PENDING_TABLE}").fetchone()[0]
+    n_units = conn.execute(f"SELECT COUNT(*) FROM {UNIT_STATUS_TABLE}").fetchone()[0]
+    if n_pending and n_pending >= n_units * FULL_REBUILD_RATIO:
+        rebuild_traceability(conn)
+        conn.execute(f"DELETE FROM {PENDING_TABLE}")
+        conn.commit()
+        return n_pending
+
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS _unit_keys (SNumber TEXT PRIMARY KEY)")
+    conn.execute(f"DELETE FROM {_KEYS_TABLE}")
+    total = 0
+    while True:
+        conn.execute(f"INSERT INTO {_KEYS_TABLE} (SNumber) SELECT SNumber FROM {PENDING_TABLE} LIMIT ?", (int(batch_size),))
+        conn.execute(f"DELETE FROM {PENDING_TABLE} WHERE SNumber IN (SELECT SNumber FROM {_KEYS_TABLE})")
+        n_keys = _refresh_loaded_keys(conn)
+        conn.commit()
+        if not n_keys:
+            return total
+        total += n_keys
+
+
+def rebuild_traceability(conn: sqlite3.Connection, tables: Optional[Sequence[str]] = None) -> Dict[str, int]:
+    """파생 테이블(기본: 전체)을 T_ITEM_* 로부터 다시 계산하고 커밋합니다. 반환: 테이블별 행 수"""
+    create_traceability_schema(conn.cursor())
+    counts = {}
+    for table in [table for table in DERIVED_TABLES if table in (tables or DERIVED_TABLES)]:
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(_BUILDERS[table](False))
+        counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        if table == ATTEMPT_TABLE:
+            record_attempt_passes(conn)
+    conn.commit()
+    return counts
+
+
+def ensure_traceability(conn: sqlite3.Connection) -> List[str]:
+    """
+    파생 테이블이 없거나 비어 있는데 검사 데이터가 있으면(기존 DB) 그 테이블만 전체 계산하고,
+    중단된 적재가 남긴 T_TRACE_PENDING 표시를 처리합니다. 반환: 전체 계산한 테이블 목록
+    """
+    create_traceability_schema(conn.cursor())
+    empty = [table for table in DERIVED_TABLES if conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None]
+    has_data = bool(empty) and any(
+        conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone() is not None
+        and conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is not None
+        for _, _, table, _, _, _ in STAGES
+    )
+    if has_data:
+        rebuild_traceability(conn, empty)
+    if jig_pass_version(conn) < JIG_PASS_VERSION:
+        # T_JIG_PASS가 생기기 전의 DB, 또는 파일 분석의 PASS가 섞여 있을 수 있는 DB: 적재된 시도의 PASS 행으로 다시 채웁니다.
+        rebuild_jig_passes(conn)
+    if conn.execute(f"SELECT 1 FROM {PENDING_TABLE} LIMIT 1").fetchone() is not None:
+        flush_pending(conn)
+    conn.commit()
+    return empty if has_data else []
+
+
+def status_codes(passed: Sequence[str] = (), failed: Sequence[str] = ()) -> List[int]:
+    """최신 결과가 passed 공정은 모두 PASS, failed 공정은 모두 FAIL인 Status_Code 목록"""
+    pass_required = sum(STAGE_BITS[key] for key in set(passed))
+    fail_required = sum(STAGE_BITS[key] for key in set(failed))
+    codes = []
+    for pass_mask in range(ALL_STAGES_MASK + 1):
+        if pass_mask & pass_required != pass_required:
+            continue
+        for fail_mask in range(ALL_STAGES_MASK + 1):
+            if fail_mask & fail_required == fail_required and not pass_mask & fail_mask:
+                codes.append(pass_mask | (fail_mask << len(STAGES)))
+    return codes
+
+
+def find_units(conn: sqlite3.Connection, passed: Sequence[str] = (), failed: Sequence[str] = (),
+               missing: Sequence[str] = (), start: Optional[str] = None, end: Optional[str] = None,
+               time_stage: Optional[str] = None, limit: int = 10000) -> pd.DataFrame:
+    """
+    공정별 최신 결과 조건으로 SNumber를 찾습니다.
+    passed / failed: 최신 결과가 PASS / FAIL인 공정, missing: 검사 이력이 없는 공정 (공정 키: pcb/semi/fw/rftx/batadc)
+    start / end ('YYYY-MM-DD HH:MM:SS')는 time_stage 공정의 최신 검사 시각에 적용합니다.
+    (time_stage가 없으면 failed의 마지막 공정, 그것도 없으면 전체 공정 중 최신 시각 Last_Time)
+    반환: T_UNIT_STATUS 행 (시각 역순, 최대 limit건)
+    """
+    where, params = [], []
+    if passed or failed:
+        codes = status_codes(passed, failed)
+        if not codes:
+            return pd.DataFrame(columns=UNIT_STATUS_COLUMNS)
+        where.append(f"Status_Code IN ({', '.join(str(code) for code in codes)})")
+    missing_mask = sum(STAGE_BITS[key] for key in set(missing))
+    if missing_mask:
+        where.append(f"(Seen_Mask & {missing_mask}) = 0")
+
+    if time_stage is None and failed:
+        time_stage = max(failed, key=STAGE_KEYS.index)
+    time_col = f"{STAGE_NAMES[time_stage]}_Time" if time_stage else 'Last_Time'
+    if start:
+        where.append(f"{time_col} >= ?")
+        params.append(start)
+    if end:
+        where.append(f"{time_col} <= ?")
+        params.append(end)
+
+    sql = f"SELECT * FROM {UNIT_STATUS_TABLE}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {time_col} DESC LIMIT ?"
+    return pd.read_sql_query(sql, conn, params=params + [int(limit)])
+
+
+def unit_status(conn: sqlite3.Connection, snumbers: Iterable) -> pd.DataFrame:
+    """지정한 SNumber들의 T_UNIT_STATUS 행"""
+    _load_keys(conn, snumbers)
+    df = pd.read_sql_query(
+        f"SELECT s.* FROM {_KEYS_TABLE} k JOIN {UNIT_STATUS_TABLE} s ON s.SNumber = k.SNumber ORDER BY s.SNumber", conn
+    )
+    conn.execute(f"DELETE FROM {_KEYS_TABLE}")
+    return df
+
+
+def unit_history(conn: sqlite3.Connection, snumbers: Iterable) -> pd.DataFrame:
+    """
+    SNumber들의 전체 공정 검사 이력 (공정 순서 → 검사 시각 순).
+    반환 컬럼: SNumber, Stage, Test_Time, Result, PC, Is_Latest (공정별 최신 검사 여부)
+    """
+    _load_keys(conn, snumbers)
+    union = ' UNION ALL '.join(
+        f"SELECT t.SNumber, '{name}' AS Stage, {i} AS Stage_No, t.{time_col} AS Test_Time, "
+        f"LOWER(TRIM(t.{pass_col})) AS Result, t.{pc_col} AS PC "
+        f"FROM {_KEYS_TABLE} k JOIN {table} t ON t.SNumber = k.SNumber"
+        for i, (_, name, table, time_col, pass_col, pc_col) in enumerate(STAGES)
+    )
+    df = pd.read_sql_query(f"SELECT * FROM ({union}) ORDER BY SNumber, Stage_No, Test_Time", conn)
+    conn.execute(f"DELETE FROM {_KEYS_TABLE}")
+    df['Is_Latest'] = ~df.duplicated(subset=['SNumber', 'Stage_No'], keep='last')
+    return df.drop(columns=['Stage_No'])
+
+
+def attempt_index(conn: sqlite3.Connection, snumbers: Iterable, stage: Optional[str] = None) -> pd.DataFrame:
+    """지정한 SNumber들의 시도 순서 행 (SNumber → 공정 순서 → 시도 번호 순)"""
+    _load_keys(conn, snumbers)
+    stage_filter = "WHERE a.Stage = ?" if stage else ''
+    order = 'CASE a.Stage ' + ' '.join(f"WHEN '{key}' THEN {i}" for i, key in enumerate(STAGE_KEYS)) + ' END'
+    df = pd.read_sql_query(
+        f"SELECT a.* FROM {_KEYS_TABLE} k JOIN {ATTEMPT_TABLE} a ON a.SNumber = k.SNumber {stage_filter} "
+        f"ORDER BY a.SNumber, {order}, a.Attempt_No",
+        conn, params=[stage] if stage else None
+    )
+    conn.execute(f"DELETE FROM {_KEYS_TABLE}")
+    return df
+
+
+def retest_summary(conn: sqlite3.Connection, stage: str, start: Optional[str] = None, end: Optional[str] = None,
+                   by_jig: bool = False) -> pd.DataFrame:
+    """
+    공정 하나의 재검사 지표. 마지막 시도 시각이 start~end 인 SNumber를 대상으로 합니다.
+    by_jig=True 이면 첫 시도 지그(First_PC)별로 나눕니다.
+    반환 컬럼: [First_PC,] Units, Attempts, Retested, First_Pass, Final_Pass, Passed_On_Retry,
+               Passed_On_Other_Jig, Retest_Rate, FPY, Final_Yield, Avg_Retest_Gap_s
+    (Passed_On_Other_Jig: 첫 시도 불합격 후 첫 시도와 다른 지그에서 최종 합격)
+    """
+    where, params = ["Stage = ?", "Is_Last = 1"], [stage]
+    if start:
+        where.append("Test_Time >= ?")
+        params.append(start)
+    if end:
+        where.append("Test_Time <= ?")
+        params.append(end)
+    group_col = "First_PC, " if by_jig else ''
+    df = pd.read_sql_query(
+        f"SELECT {group_col}COUNT(*) AS Units, SUM(Attempt_Count) AS Attempts, "
+        f"SUM(Attempt_Count > 1) AS Retested, "
+        f"SUM(First_Result = '{PASS_VALUE}') AS First_Pass, "
+        f"SUM(Result = '{PASS_VALUE}') AS Final_Pass, "
+        f"SUM(Result = '{PASS_VALUE}' AND First_Result IS NOT '{PASS_VALUE}') AS Passed_On_Retry, "
+        f"SUM(Result = '{PASS_VALUE}' AND First_Result IS NOT '{PASS_VALUE}' AND PC IS NOT First_PC) AS Passed_On_Other_Jig, "
+        f"SUM(CASE WHEN Attempt_Count > 1 THEN Gap_Seconds END) AS Gap_Sum "
+        f"FROM {ATTEMPT_TABLE} WHERE {' AND '.join(where)}"
+        + (" GROUP BY First_PC ORDER BY First_PC" if by_jig else ''),
+        conn, params=params
+    )
+    df = df[df['Units'] > 0].reset_index(drop=True)
+    df['Retest_Rate'] = (df['Retested'] / df['Units']).round(4)
+    df['FPY'] = (df['First_Pass'] / df['Units']).round(4)
+    df['Final_Yield'] = (df['Final_Pass'] / df['Units']).round(4)
+    # 마지막 시도의 직전 간격 평균 (재검사된 SNumber 기준)
+    df['Avg_Retest_Gap_s'] = (df['Gap_Sum'] / df['Retested'].where(df['Retested'] > 0)).round(1)
+    return df.drop(columns=['Gap_Sum'])
+
+
+def describe_flow(row: Dict) -> str:
+    """T_UNIT_STATUS 행 1개를 'Pcb ✅ → Semi ✅ → Fw ❌ → RfTx · → Batadc ·' 형태로 요약합니다."""
+    parts = []
+    for key, name, _, _, _, _ in STAGES:
+        bit = STAGE_BITS[key]
+        if row['Pass_Mask'] & bit:
+            mark = '✅'
+        elif row['Fail_Mask'] & bit:
+            mark = '❌'
+        elif row['Seen_Mask'] & bit:
+            mark = '❔'
+        else:
+            mark = '·'
+        parts.append(f"{name} {mark}")
+    return ' → '.join(parts)